@@ -16,10 +16,13 @@ List of functions:
 
 List of standard and non-standard modules used:
 	sys
+	re
+	species_registry.py
 
 Procedure:
 	1. Loading required modules; assigning command-line arguments.
-	2. Creating reference dictionary for shortened and official species names.
+	2. Creating reference dictionary for shortened and official species names from the
+		species registry.
 	3. Iterating over the tree file and changing the species designations, writing 
 		out the new tree versions to the output file as each one is created. 
 
@@ -27,6 +30,13 @@ Known bugs and limitations:
 	- There is no quality-checking integrated into the code.
 	- The output file name is not user-defined, but is instead based on the input
 		file name.  
+	- The species_registry.py module (in the OG_Comparisons/ directory of this repository) must
+		be located in the same directory as this program (ex. when all programs are copied into
+		the same Scripts/ directory, as in the README), or in a directory listed in the
+		PYTHONPATH environment variable (ex. PYTHONPATH=../OG_Comparisons). The species
+		registry file (species_registry.tsv) is found next to the species_registry.py module,
+		or in a ReferenceFiles/ directory next to the directory of the module (as in this
+		repository), or can be given with the SPECIES_REGISTRY environment variable.
 
 Usage
 	./ale_tree_spp_names.py input_tree
@@ -43,6 +53,8 @@ This script was written for Python 3.8.12, in Spyder 5.1.5.
 
 #import necessary modules
 import sys #allows assignment of command line arguments
+import re #enables regex pattern matching
+from species_registry import load_registry, registry_map #species registry
 
 
 #assign command line arguments; load input and output files
@@ -60,38 +72,16 @@ output_tree = '.'.join(input_name_list)
 
 #Part 2: Create reference dictionary for shortened and official species names
 
-species_dict = {"A_lanta": "Anaeramoeba_lanta_160522", 
-						  "A_ignava_BM": "BM_newprots_may21.anaeromoeba", 
-						  "A_flamelloides_BS": "BS_newprots_may21.anaeromoeba", 
-						  "C_membranifera": "Carpediemonas_membranifera.PRJNA719540", 
-						  "D_fragilis": "Dientamoeba_fragilis.43352.aa", 
-						  "G_intestinalis_A_EukProt": "EP00701_Giardia_intestinalis", 
-						  "Trepomonas_PC1": "EP00703_Trepomonas_sp_PC1", 
-						  "P_pyriformis": "EP00708_Paratrimastix_pyriformis", 
-						  "A_paluster": "EP00764_Aduncisulcus_paluster", 
-						  "C_caulleryi": "EP00766_Chilomastix_caulleryi", 
-						  "C_cuspidata": "EP00767_Chilomastix_cuspidata", 
-						  "D_brevis": "EP00768_Dysnectes_brevis", 
-						  "E_cyprinoides": "EP00769_Ergobibamus_cyprinoides", 
-						  "M_exilis": "EP00770_Monocercomonoides_exilis", 
-						  "T_marina": "EP00771_Trimastix_marina", 
-						  "Barthelona_PAP020": "EP00792_Barthelona_sp_PAP020", 
-						  "G_intestinalis_ADH": "GiardiaDB_GintestinalisADH", 
-						  "G_intestinalis_BGS": "GiardiaDB_GintestinalisBGS", 
-						  #"G_intestinalis_BGS_B": "GiardiaDB_GintestinalisBGS_B", 
-						  "G_intestinalis_EP15": "GiardiaDB_GintestinalisEP15", 
-						  "G_intestinalis_A_NCBI": "Giardia_intestinalis.PRJNA1439", 
-						  "G_muris": "Giardia_muris.PRJNA524057", 
-						  "H_meleagridis_OLD": "Histomonas_meleagridis.135588.aa", 
-						  "H_meleagridis_NEW": "Histomonas_meleagridis.PRJNA594289", 
-						  "K_bialata": "Kipferlia_bialata.PRJDB5223", 
-						  "P_hominis": "Pentatrichomonas_hominis.5728.aa", 
-						  "A_flamelloides_SC": "SC_newprots_may21.anaeromoeba", 
-						  "S_salmonicida": "Spironucleus_salmonicida.PRJNA60811", 
-						  "T_gallinarum": "Tetratrichomonas_gallinarum.5730.aa", 
-						  "T_foetus": "Tritrichomonas_foetus.PRJNA345179", 
-						  "T_vaginalis_GenBank": "Trichomonas_vaginalis_GenBank.PRJNA16084", 
-						  "T_vaginalis_RefSeq": "Trichomonas_vaginalis_RefSeq.G3"}
+#the shortened species names and the species tree names are taken from the species registry
+#dictionary format: species_dict[shortened_species_name] = species_tree_name
+#the species tree names already have "-" characters in place of the "_" characters
+species_dict = registry_map(load_registry(), 'Short_Name', 'Tree_Name')
+
+#create a single regular expression matching any of the shortened species names
+#longer names are tried first, so that names that start with another species' name
+#(ex. G_intestinalis_BGS_B & G_intestinalis_BGS) are not cut short
+species_pattern = re.compile('|'.join(re.escape(spp_key) for spp_key in
+									  sorted(species_dict.keys(), key=len, reverse=True)))
 
 
 '''
@@ -129,26 +119,17 @@ with open(input_tree, "r") as infile, open(output_tree, "w") as outfile:
 		#iterate over the tree file line by line
 		tree_line = line.strip()
 		#save the old gene tree to a variable, stripping the end-line character
-		if "G_intestinalis_BGS_B__" in tree_line: 
-			#check to see if thee BGS_B Giardia genome occurs in the tree
-			#if it occurs, overwrite the genome prior to match searching
-			tree_line = tree_line.replace("G_intestinalis_BGS_B__", "GiardiaDB-GintestinalisBGS-B__")
-		for spp_key in species_dict.keys(): 
-			#iterate over the keys of the dictionary, 
-			#to identify which of the species occur in the tree file
-			if spp_key in tree_line: 
-				#check to see if the shorter species designation occurs in the gene tree
-				#if it is, save the full species designation to a variable
-				#and replace the "_" characters with "-" characters in the species names
-				value_edit = species_dict[spp_key].replace("_", "-")
-				#and overwrite the tree with the full species designation
-				tree_line = tree_line.replace(spp_key, value_edit)
-				tree_line = tree_line.replace("__", "_")
-				#the modifications to the naming scheme with regards to the underscores is necessary
-				#because ALE (or at least the container version of it)
-				#doesn't accept the `separators` argument shown on their GitHub
-				#that would allow the user to specify the separator 
-				#between a species name and gene ID
+		#replace all of the shortened species designations in the gene tree in a single pass
+		#with the full species designations (with "-" characters in place of the "_" characters)
+		tree_line, spp_count = species_pattern.subn(lambda spp_match: species_dict[spp_match.group(0)], tree_line)
+		if spp_count > 0: 
+			#if any species were found in the tree
+			tree_line = tree_line.replace("__", "_")
+			#the modifications to the naming scheme with regards to the underscores is necessary
+			#because ALE (or at least the container version of it)
+			#doesn't accept the `separators` argument shown on their GitHub
+			#that would allow the user to specify the separator 
+			#between a species name and gene ID
 		#once all species have been checked, write out the new tree to the output file
 		#write each tree to a new line
 		outfile.write(tree_line + "\n")
@@ -11,35 +11,72 @@ Description:
 		a FASTA file containing the amino acid sequences of all proteins in a given
 		orthologous group. This is intended for use as an input for a Multiple Sequence
 		Alignment (MSA) program.
+	Any number of og_prot_list.py output files (or directories containing them) can be
+		given in a single run, as well as tables in the same format containing the proteins
+		of many orthologous groups (in which case an MSA prep FASTA file is created for each
+		orthologous group in the table).
+	The sequences are read from the species FASTA files with a random-access FASTA index (see
+		fasta_index.py), which is created next to each FASTA file the first time it is used.
+		Each species FASTA file is read only once per run, in a single forward pass over the
+		proteins of all of the requested orthologous groups, and each sequence is written
+		to the MSA prep FASTA files of all of the orthologous groups it belongs to. At most
+		max_open_files output files are kept open at the same time.
 
 List of functions:
-	No functions are defined in this script.
+	og_species_proteins(input_db):
+		Creates a dictionary of the MSA prep FASTA files of the OGs in an input file, to
+		dictionaries of species FASTA files to the proteins of the OG contained within them.
+	write_record(writer_dict, output_fasta, record):
+		Writes a FASTA record to an MSA prep FASTA file, using a bounded pool of open files.
 
 List of standard and non-standard modules used:
 	sys
 	os
+	glob
+	collections.OrderedDict
 	pandas
+	fasta_index.py
+	species_registry.py
 
 Procedure:
 	1. Loading required modules; assigning command line arguments.
-	2. Importing data into Pandas dataframe and creating dictionary of FASTA files
-		to protein sequences contained within them.
-	3. Creating reference dictionary for file names and species IDs.
-	4. Extracting sequence data from files to create MSA prep FASTA file.
-	5. Writing out results in single-line FASTA formatting.
+	2. Importing data into Pandas dataframes and creating dictionaries of FASTA files
+		to protein sequences contained within them, for each OG.
+	3. Creating reference dictionary for file names and species IDs from the species registry.
+	4. For each species, extracting sequence data from the indexed species FASTA file
+		in a single pass, and writing out the sequences to the MSA prep FASTA files
+		of their OGs in single-line FASTA formatting.
 
 Known bugs and limitations:
 	- There is no quality-checking integrated into the code.
-	- The output file name is based on the input file name.
+	- The output file name is based on the input file name. For input files containing
+		more than 1 OG, the OG ID is added to the file name, in the format:
+		[input_file_basename]__[OG_ID]_MSAprep.fasta
+	- Directories given as input are searched for .txt files.
+	- The headers of the output files are made from the protein IDs (the first word of the
+		headers of the species FASTA files).
+	- The FASTA index files ([species_file].fai) are written next to the species FASTA
+		files, so the data directory must be writable the first time each file is used.
+	- The species_registry.py module (in the OG_Comparisons/ directory of this repository) must
+		be located in the same directory as this program (ex. when all programs are copied into
+		the same Scripts/ directory, as in the README), or in a directory listed in the
+		PYTHONPATH environment variable (ex. PYTHONPATH=../OG_Comparisons). The species
+		registry file (species_registry.tsv) is found next to the species_registry.py module,
+		or in a ReferenceFiles/ directory next to the directory of the module (as in this
+		repository), or can be given with the SPECIES_REGISTRY environment variable.
+	- The fasta_index.py module must be located in the same directory as this program. The
+		atomic_output.py module it imports (in the DB_Construct/ directory of this repository)
+		must be located there as well, or in a directory listed in the PYTHONPATH environment
+		variable (ex. PYTHONPATH=../OG_Comparisons:../DB_Construct).
 
 Usage
-	./extract_OG_MSA.py input_db data_path
+	./extract_OG_MSA.py input_db [input_db ...] data_path
 	OR
-	python extract_OG_MSA.py input_db data_path
+	python extract_OG_MSA.py input_db [input_db ...] data_path
 
-	Where the input_db is file in the format:
+	Where the input_db is file (or directory of files) in the format:
 		Query\tSpecies_ID\t[OG_PROGRAM]_OG
-	Where data_path is a string input in quotation marks on the command line of the
+	Where data_path (the last argument) is a string input in quotation marks on the command line of the
 		absolute path to the directory where the data FASTA files are located.
 		This should include a trailing backslash.
 
@@ -54,121 +91,136 @@ This script was written for Python 3.8.12, in Spyder 5.1.5.
 #import necessary modules
 import sys #allows assignment of command line arguments
 import os #allow access to computer files
+import glob #enables searching for the input files in a directory
+from collections import OrderedDict #keeps track of the order in which output files were used
 import pandas as pd #facilitates manipulation of dataframes in Python
+from fasta_index import load_fasta_index, iter_sequences #random-access FASTA index
+from species_registry import load_registry, registry_map #species registry
 
 
 #assign command line arguments; load input and output files
-input_db = sys.argv[1]
-#input_db = "TEST_SonicParanoid_OG__OG_25.txt"
+input_list = sys.argv[1:-1]
+#input_list = ["TEST_SonicParanoid_OG__OG_25.txt"]
 
-data_path = sys.argv[2]
+data_path = sys.argv[-1]
 #data_path = "C:/Users/V/Documents/LundUni/Trich_Parab/Thesis_Work/ALE/"
 
-#output file name should be based on input file name
-base = os.path.basename(input_db)
-out_full = os.path.splitext(base)[0]
-#determine basename of input file
-output_fasta = out_full + "_MSAprep.fasta"
-
-
-#Part 2: Import data into Pandas dataframe & create species dictionary
-
-#read in the Metamonad database to a Pandas dataframe
-input_df = pd.read_csv(input_db, sep = '\t', header=0)
-#then extract the name of the OG
-query_og_id = input_df.iloc[:, 2].to_list()[0]
-#transform the data in the 'Species_Id' column into the actual file names
-input_df['Species_Id'] = input_df['Species_Id'] + '_edit.fasta'
-
-
-#create a dictionary in the format: species_dict[species_file_name] = list_of_proteins
-#this will allow easier analysis
-grouped_species_df = input_df.groupby('Species_Id')['Query'].apply(list).reset_index(name="Species_members")
-#the proteins in the 'Query' column are grouped into lists according to the species FASTA file they are from
-#the new column of lists is named 'Species_members'
-species_dict = grouped_species_df.set_index('Species_Id').to_dict()['Species_members']
-#the new dataframe is converted into a dictionary,
-#where the OG IDs are the keys, and the lists of protein members of the OGs are the values
+#directories are searched for the og_prot_list.py output files
+input_db_list = []
+for input_path in input_list:
+	#iterate over the input arguments
+	if os.path.isdir(input_path):
+		input_db_list.extend(sorted(glob.glob(os.path.join(input_path, '*.txt'))))
+	else:
+		input_db_list.append(input_path)
+
+#the maximum number of output files that are open at the same time
+max_open_files = 256
+
+
+#Part 2: Define functions to create species dictionaries & write out results
+
+def og_species_proteins(input_db):
+	#read in the og_prot_list.py output file to a Pandas dataframe
+	input_df = pd.read_csv(input_db, sep = '\t', header=0)
+	#identify the column containing the OG IDs
+	og_col = input_df.columns[2]
+	#transform the data in the 'Species_Id' column into the actual file names
+	input_df['Species_Id'] = input_df['Species_Id'] + '_edit.fasta'
+
+	#output file name should be based on input file name
+	base = os.path.basename(input_db)
+	out_full = os.path.splitext(base)[0]
+	#determine basename of input file
+	og_id_list = input_df[og_col].unique().tolist()
+
+	#create a dictionary in the format: og_output_dict[output_fasta] = species_dict
+	og_output_dict = {}
+	if len(og_id_list) <= 1:
+		#files produced by og_prot_list.py contain a single OG
+		og_output_dict[out_full + "_MSAprep.fasta"] = input_df
+	else:
+		#tables containing many OGs get 1 output file per OG
+		for og_id, og_df in input_df.groupby(og_col, sort=False):
+			og_output_dict[out_full + "__" + str(og_id) + "_MSAprep.fasta"] = og_df
+
+	for output_fasta, og_df in og_output_dict.items():
+		#create a dictionary in the format: species_dict[species_file_name] = list_of_proteins
+		#this will allow easier analysis
+		grouped_species_df = og_df.groupby('Species_Id')['Query'].apply(list).reset_index(name="Species_members")
+		#the proteins in the 'Query' column are grouped into lists according to the species FASTA file they are from
+		#the new column of lists is named 'Species_members'
+		og_output_dict[output_fasta] = grouped_species_df.set_index('Species_Id').to_dict()['Species_members']
+		#the new dataframe is converted into a dictionary,
+		#where the species file names are the keys, and the lists of proteins are the values
+	#define objects to return
+	return og_output_dict
+
+
+def write_record(writer_dict, output_fasta, record):
+	#writer_dict contains the open output files, in the order they were last used
+	if output_fasta in writer_dict:
+		#mark the file as the most recently used
+		writer_dict.move_to_end(output_fasta)
+	else:
+		if len(writer_dict) >= max_open_files:
+			#close the least recently used file
+			writer_dict.popitem(last=False)[1].close()
+		#the output files were emptied at the start of the run, so they are opened for appending
+		writer_dict[output_fasta] = open(output_fasta, "a")
+	writer_dict[output_fasta].write(record)
 
 
 #Part 3: Create reference dictionary for file names and species IDs
 
-species_fasta_ref_dict = {"Anaeramoeba_lanta_160522_edit.fasta": "A_lanta__", 
-						  "BM_newprots_may21.anaeromoeba_edit.fasta": "A_ignava_BM__", 
-						  "BS_newprots_may21.anaeromoeba_edit.fasta": "A_flamelloides_BS__", 
-						  "Carpediemonas_membranifera.PRJNA719540_edit.fasta": "C_membranifera__", 
-						  "Dientamoeba_fragilis.43352.aa_edit.fasta": "D_fragilis__", 
-						  "EP00701_Giardia_intestinalis_edit.fasta": "G_intestinalis_A_EukProt__", 
-						  "EP00703_Trepomonas_sp_PC1_edit.fasta": "Trepomonas_PC1__", 
-						  "EP00708_Paratrimastix_pyriformis_edit.fasta": "P_pyriformis__", 
-						  "EP00764_Aduncisulcus_paluster_edit.fasta": "A_paluster__", 
-						  "EP00766_Chilomastix_caulleryi_edit.fasta": "C_caulleryi__", 
-						  "EP00767_Chilomastix_cuspidata_edit.fasta": "C_cuspidata__", 
-						  "EP00768_Dysnectes_brevis_edit.fasta": "D_brevis__", 
-						  "EP00769_Ergobibamus_cyprinoides_edit.fasta": "E_cyprinoides__", 
-						  "EP00770_Monocercomonoides_exilis_edit.fasta": "M_exilis__", 
-						  "EP00771_Trimastix_marina_edit.fasta": "T_marina__", 
-						  "EP00792_Barthelona_sp_PAP020_edit.fasta": "Barthelona_PAP020__", 
-						  "GiardiaDB_GintestinalisADH_edit.fasta": "G_intestinalis_ADH__", 
-						  "GiardiaDB_GintestinalisBGS_edit.fasta": "G_intestinalis_BGS__", 
-						  "GiardiaDB_GintestinalisBGS_B_edit.fasta": "G_intestinalis_BGS_B__", 
-						  "GiardiaDB_GintestinalisEP15_edit.fasta": "G_intestinalis_EP15__", 
-						  "Giardia_intestinalis.PRJNA1439_edit.fasta": "G_intestinalis_A_NCBI__", 
-						  "Giardia_muris.PRJNA524057_edit.fasta": "G_muris__", 
-						  "Histomonas_meleagridis.135588.aa_edit.fasta": "H_meleagridis_OLD__", 
-						  "Histomonas_meleagridis.PRJNA594289_edit.fasta": "H_meleagridis_NEW__", 
-						  "Kipferlia_bialata.PRJDB5223_edit.fasta": "K_bialata__", 
-						  "Pentatrichomonas_hominis.5728.aa_edit.fasta": "P_hominis__", 
-						  "SC_newprots_may21.anaeromoeba_edit.fasta": "A_flamelloides_SC__", 
-						  "Spironucleus_salmonicida.PRJNA60811_edit.fasta": "S_salmonicida__", 
-						  "Tetratrichomonas_gallinarum.5730.aa_edit.fasta": "T_gallinarum__", 
-						  "Trichomonas_foetus.PRJNA345179_edit.fasta": "T_foetus__", 
-						  "Trichomonas_vaginalis_GenBank.PRJNA16084_edit.fasta": "T_vaginalis_GenBank__", 
-						  "Trichomonas_vaginalis_RefSeq.G3_edit.fasta": "T_vaginalis_RefSeq__"}
-
-
-#Part 4: Extract sequence data from files to create MSA prep FASTA file
-
-#create new empty dictionary for protein IDs and protein sequences
-seq_dict = {}
-
-for key in species_dict.keys():
-	#iterate over the dictionary via its keys (ie. file names)
-	file_path = data_path + key
-	#define the full file name including the path
-	spp_prot_list = species_dict[key]
-	#pull out the query protein IDs into a list
-	with open(file_path, 'r') as infile:
-		#open the species FASTA proteome file for reading
-		for line in infile:
-			#iterate over the file line by line
-			for prot in spp_prot_list:
-				#iterate over the list of query prot IDs
-				if prot in line:
-					#if the query protein is found in the line
-					header_start = line[1:].strip()
-					#remove the ">" header line indicator and strip the endline character
-					for ref_species_key in species_fasta_ref_dict.keys():
-						#iterate over the FASTA reference dictionary
-						if key == ref_species_key: 
-							#find the location of the species FASTA name reference
-							#and copy the header version of the species ID to a variable
-							species_header_name = species_fasta_ref_dict[ref_species_key]
-					header = species_header_name + header_start
-					#create the new FASTA header as a combination of the original encoded protein ID
-					#and the shortened species ID name designed for the header
-					seq_line = next(infile).strip()
-					#identify the sequence line associated with the header
-					#and remove the endline character
-					#finally, add the header and protein sequence to the dictionary
-					seq_dict[header] = seq_line
-
-
-#Part 5: Write out results to new FASTA file
-
-with open(output_fasta, "w") as outfile:
-	#open the output file for writing
-	for prot_key in seq_dict.keys():
-		#iterate over the encoded protein headers
-		#and write the header and sequence lines out in FASTA format
-		outfile.write(">" + prot_key + "\n" + seq_dict[prot_key] + "\n")
+#the species FASTA file names and the shortened species IDs used in the headers are taken from the species registry
+#dictionary format: species_fasta_ref_dict[species_file_name] = shortened_species_ID__
+registry_df = load_registry()
+species_fasta_ref_dict = {species_id + '_edit.fasta': short_name + '__' for species_id, short_name in
+						  registry_map(registry_df, 'Species_Id', 'Short_Name').items()}
+
+
+#Part 4: Extract sequence data from files & write out results to new FASTA files
+
+#create the dictionary in the format: species_job_dict[species_file_name][protein] = list_of_output_files
+#so that each species FASTA file is only read once, no matter how many OGs use it
+species_job_dict = {}
+for input_db in input_db_list:
+	#iterate over the input files
+	for output_fasta, species_dict in og_species_proteins(input_db).items():
+		#iterate over the OGs in the input file
+		#create (or empty) the output file, so that OGs without any sequences still get an output file
+		open(output_fasta, "w").close()
+		for key, spp_prot_list in species_dict.items():
+			#iterate over the dictionary via its keys (ie. file names)
+			for prot in dict.fromkeys(spp_prot_list):
+				#each protein is only written once to each output file
+				species_job_dict.setdefault(key, {}).setdefault(prot, []).append(output_fasta)
+
+
+#the open output files, in the format: writer_dict[output_fasta] = open_file
+writer_dict = OrderedDict()
+try:
+	for key in sorted(species_job_dict.keys()):
+		#iterate over the species files in alphabetical order
+		#so that the sequences of each OG are in the same order as in the single-OG version of this program
+		file_path = data_path + key
+		#define the full file name including the path
+		#load the index of the species FASTA proteome file (creating it if necessary)
+		fasta_index = load_fasta_index(file_path)
+		#copy the header version of the species ID to a variable
+		species_header_name = species_fasta_ref_dict[key]
+		prot_job_dict = species_job_dict[key]
+		for prot, seq_line in iter_sequences(file_path, prot_job_dict.keys(), fasta_index):
+			#read the sequences of the query protein IDs from the species FASTA proteome file
+			#these are read in the order of the FASTA file
+			#create the new FASTA header as a combination of the encoded protein ID
+			#and the shortened species ID name designed for the header
+			record = ">" + species_header_name + prot + "\n" + seq_line + "\n"
+			for output_fasta in prot_job_dict[prot]:
+				#and write the header and sequence lines out in FASTA format to the files of all of its OGs
+				write_record(writer_dict, output_fasta, record)
+finally:
+	#close the output files that are still open
+	for outfile in writer_dict.values():
+		outfile.close()
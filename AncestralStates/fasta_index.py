@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+#!/bin/python
+"""
+
+Title: fasta_index.py
+Date: 2026-10-18
+Author: Virág Varga
+
+Description:
+	This module contains the random-access FASTA index used by the extract_OG_MSA.py program
+		to extract the sequences of the proteins of orthologous groups from the species
+		FASTA files (ex. the *_edit.fasta files with encoded headers).
+	The index is written next to each FASTA file (named [fasta_file].fai), in the format of
+		the FASTA index files of samtools faidx:
+			name\tlength\toffset\tline_bases\tline_width
+		Where name is the protein ID (the first word of the FASTA header), length is the
+		number of amino acids in the sequence, offset is the byte position in the FASTA file
+		at which the sequence starts, line_bases is the number of amino acids on each line of
+		the sequence and line_width is the number of bytes on each line of the sequence
+		(including the endline characters).
+	The index is created the first time a FASTA file is used, and is re-created if the FASTA
+		file is modified after the index was written. Sequences are then read by seeking to
+		their offset in the FASTA file, instead of scanning the whole file.
+
+List of functions:
+	build_fasta_index(fasta_file, index_file):
+		Creates the index of a FASTA file, and writes it out.
+	load_fasta_index(fasta_file, index_file):
+		Loads the index of a FASTA file, after creating it if necessary.
+	iter_sequences(fasta_file, name_list, fasta_index):
+		Reads the sequences of a list of proteins from a FASTA file one at a time, in a single
+		forward pass through the file.
+	fetch_sequences(fasta_file, name_list, fasta_index):
+		Reads the sequences of a list of proteins from a FASTA file into a dictionary.
+
+List of standard and non-standard modules used:
+	os
+	atomic_output.py
+
+Procedure:
+	1. Loading required modules; defining the index file format.
+	2. Defining the functions of the module.
+
+Known bugs and limitations:
+	- There is no quality-checking integrated into the code.
+	- If a protein ID occurs more than once in a FASTA file, only its first record is indexed.
+	- The line_bases & line_width columns describe the first line of each sequence. Sequences
+		with lines of different lengths can still be read with this module (but not with
+		samtools faidx).
+	- This is a module, not a stand-alone program. It should be imported by scripts
+		located in the same directory.
+	- The atomic_output.py module (in the DB_Construct/ directory of this repository) must be
+		located in the same directory as this module (ex. when all programs are copied into the
+		same Scripts/ directory, as in the README), or in a directory listed in the PYTHONPATH
+		environment variable (ex. PYTHONPATH=../DB_Construct).
+
+Usage:
+	from fasta_index import load_fasta_index, fetch_sequences, iter_sequences
+
+This script was written for Python 3.8.12, in Spyder 5.1.5.
+
+"""
+
+
+# Part 1: Loading required modules; defining the index file format.
+
+#import necessary modules
+import os #allow access to computer files
+from atomic_output import atomic_output #writing of complete files only
+
+
+#the file extension added to the FASTA file name to name its index
+fasta_index_ext = '.fai'
+
+
+# Part 2: Defining the functions of the module.
+
+def build_fasta_index(fasta_file, index_file=None):
+	#the index is written next to the FASTA file, unless another location is given
+	index_file = index_file or fasta_file + fasta_index_ext
+	#create the dictionary in the format:
+	#fasta_index[name] = (length, offset, line_bases, line_width)
+	fasta_index = {}
+	#the record currently being read, in the format: [name, length, offset, line_bases, line_width]
+	record = None
+	with open(fasta_file, 'rb') as infile:
+		#the file is read in binary mode, so that the byte positions of the lines are known
+		offset = 0
+		for line in infile:
+			#iterate over the file line by line
+			if line.startswith(b'>'):
+				#identify the header lines, and save the previous record
+				if record is not None and record[0] not in fasta_index:
+					fasta_index[record[0]] = tuple(record[1:])
+				#the protein ID is the first word of the header
+				header_words = line[1:].split()
+				name = header_words[0].decode() if header_words else ''
+				#the sequence starts on the line after the header
+				record = [name, 0, offset + len(line), 0, 0]
+			elif record is not None:
+				#sequence lines are counted without the endline characters
+				line_bases = len(line.rstrip(b'\r\n'))
+				if record[1] == 0:
+					#the line lengths are taken from the first line of the sequence
+					record[3] = line_bases
+					record[4] = len(line)
+				record[1] += line_bases
+			offset += len(line)
+		if record is not None and record[0] not in fasta_index:
+			#save the final record
+			fasta_index[record[0]] = tuple(record[1:])
+
+	with atomic_output(index_file) as outfile:
+		for name, (length, seq_offset, line_bases, line_width) in fasta_index.items():
+			outfile.write(name + '\t' + str(length) + '\t' + str(seq_offset) + '\t' + str(line_bases) + '\t' + str(line_width) + '\n')
+	#define objects to return
+	return fasta_index
+
+
+def load_fasta_index(fasta_file, index_file=None):
+	#the index is written next to the FASTA file, unless another location is given
+	index_file = index_file or fasta_file + fasta_index_ext
+	if not os.path.isfile(index_file) or os.path.getmtime(index_file) < os.path.getmtime(fasta_file):
+		#if the index doesn't exist, or the FASTA file has been modified since it was written,
+		#create the index of the FASTA file
+		return build_fasta_index(fasta_file, index_file)
+	#otherwise, import the existing index
+	fasta_index = {}
+	with open(index_file, 'r') as infile:
+		for line in infile:
+			#iterate over the index file line by line
+			name, length, seq_offset, line_bases, line_width = line.rstrip('\n').split('\t')
+			fasta_index[name] = (int(length), int(seq_offset), int(line_bases), int(line_width))
+	#define objects to return
+	return fasta_index
+
+
+def iter_sequences(fasta_file, name_list, fasta_index):
+	#only the proteins in the index can be read, and each protein is only read once
+	#the proteins are read in the order of the FASTA file, so that a single forward pass is made through the file
+	name_list = sorted({name for name in name_list if name in fasta_index}, key=lambda name: fasta_index[name][1])
+	with open(fasta_file, 'rb') as infile:
+		for name in name_list:
+			#iterate over the proteins
+			#and go to the start of the sequence of each
+			infile.seek(fasta_index[name][1])
+			seq_line_list = []
+			for line in infile:
+				#read the sequence lines until the next header
+				if line.startswith(b'>'):
+					break
+				seq_line_list.append(line.rstrip(b'\r\n'))
+			#return the protein ID and sequence of each protein as it is read
+			yield name, b''.join(seq_line_list).decode()
+
+
+def fetch_sequences(fasta_file, name_list, fasta_index):
+	#create the dictionary in the format: seq_dict[name] = sequence
+	#the proteins are in the order of the FASTA file
+	#define objects to return
+	return dict(iter_sequences(fasta_file, name_list, fasta_index))
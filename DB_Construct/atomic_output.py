@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+#!/bin/python
+"""
+
+Title: atomic_output.py
+Date: 2026-10-18
+Author: Virág Varga
+
+Description:
+	This module contains the atomic file writing used by the programs & modules that write
+		files which are re-used by later runs (ex. checkpoints, caches, indexes, manifests,
+		species database files and the pipeline state file), so that an interrupted run never
+		leaves a partial file behind to be mistaken for a complete one.
+	The contents are written to a temporary file next to the output file (named
+		[output_file].tmp), which then replaces the output file in a single step once it has
+		been written completely. If writing fails, the temporary file is removed, and the
+		earlier version of the output file (if there is one) is left as it was.
+
+List of functions:
+	atomic_output(output_file, mode):
+		Opens a temporary file for writing, which replaces the output file once it is closed.
+
+List of standard and non-standard modules used:
+	os
+	contextlib
+
+Procedure:
+	1. Loading required modules.
+	2. Defining the functions of the module.
+
+Known bugs and limitations:
+	- There is no quality-checking integrated into the code.
+	- The temporary file is named after the output file, so the same output file should not
+		be written by more than 1 process at the same time.
+	- This is a module, not a stand-alone program. It should be located in the same directory
+		as the scripts importing it (ex. the Scripts/ directory that all of the scripts are
+		run from in the workflow), or in a directory listed in the PYTHONPATH environment
+		variable (ex. PYTHONPATH=../DB_Construct).
+
+Usage:
+	from atomic_output import atomic_output
+	with atomic_output(output_file) as outfile:
+		outfile.write(...)
+
+This script was written for Python 3.8.12, in Spyder 5.1.5.
+
+"""
+
+
+# Part 1: Loading required modules.
+
+#import necessary modules
+import os #allow access to computer files
+from contextlib import contextmanager #allows creation of functions used with the "with" statement
+
+
+# Part 2: Defining the functions of the module.
+
+@contextmanager
+def atomic_output(output_file, mode='w'):
+	#write to a temporary file first, so that an interrupted run never leaves a partial output file
+	temp_file = output_file + '.tmp'
+	try:
+		with open(temp_file, mode) as outfile:
+			yield outfile
+	except BaseException:
+		#the output file is only replaced by a complete temporary file
+		if os.path.exists(temp_file):
+			os.remove(temp_file)
+		raise
+	#replace the output file with the complete temporary file in a single step
+	os.replace(temp_file, output_file)
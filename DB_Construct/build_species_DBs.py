@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+#!/bin/python
+"""
+
+Title: build_species_DBs.py
+Date: 2026-10-18
+Author: Virág Varga
+
+Description:
+	This program builds the species databases of all species at once, from the species
+		directories created by the link_data_files.py program (each containing the parsed
+		results files of 1 species), and then combines them into the large, flat Metamonad
+		database in the same run.
+	In each species directory, the parsed results files of the eggNOG_dn_PFam_Parser__v2.py,
+		eggNOG_dn_Parser__v2.py, deepLoc_Parser__v2.py, signalP_Parser__v2.py,
+		targetP_Parser__v2.py, iprScan_Parser.py, mitoFates_Parser__v2.py and yLoc_Parser__v2.py
+		programs are identified from their file name endings, and concatenated into the species
+		database with the functions of the combo_OG_results__v3.py program. The species
+		databases are built in parallel, in a pool of worker processes.
+	Each species database is written into its species directory (named [Species_ID]_predDB.txt,
+		where the species ID is the name of the species directory), and the species databases
+		are then concatenated into the combined database.
+
+List of functions:
+	find_parsed_files(species_path, species_list):
+		Identifies the parsed results files of each prediction program in a species directory.
+	build_species_db(species_path, species_list, db_format, columnar_dir):
+		Builds & writes out the species database of a species directory.
+
+List of standard and non-standard modules used:
+	sys
+	os
+	re
+	shutil
+	argparse
+	multiprocessing
+	concurrent.futures
+	combo_OG_results__v3.py
+	metamonad_db.py
+	atomic_output.py
+
+Procedure:
+	1. Loading required modules; defining inputs and outputs as command line arguments.
+	2. Identifying the species directories, and the parsed results files in each.
+	3. Building the species databases in parallel, and writing out each species database
+		(and optionally, its columnar database file) as it is finished.
+	4. Concatenating the species databases into the combined database.
+
+Known bugs and limitations:
+	- There is no quality-checking integrated into the code.
+	- The parsed results files are identified by the following file name endings:
+		_PFam.txt, _eggNOG.txt, _DeepLocP.txt, _SignalP.txt, _TargetP.txt, _IPRScan.txt,
+		_MFparsed.txt & _YLparsed.txt (each optionally followed by "_final", ex.
+		_IPRScan_final.txt). If more than 1 file of a program is found in a species directory,
+		files belonging to a species with a longer name (ex. GiardiaDB_GintestinalisBGS_B in
+		the directory of GiardiaDB_GintestinalisBGS) are ignored, and then files ending in
+		"_final" are used. If the file to use still can't be identified, or is missing, the
+		species database is not built, and the combined database is not written out.
+	- The columns of all species databases must be in the same order (as they are when
+		they are all built by this program).
+	- Parallel building of the species databases requires a system that supports forking;
+		otherwise, the species databases are built one after the other.
+	- The columnar database files of all species are written into the same directory, named
+		after the combined database (ex. Metamonada_predDB.txt gives Metamonada_predDB_parquet/).
+
+Usage
+	./build_species_DBs.py -i SPECIES_DIR -o OUTPUT_DB [-s SPECIES_FILE] [-f {parquet,feather}] [-t THREADS]
+	OR
+	python build_species_DBs.py -i SPECIES_DIR -o OUTPUT_DB [-s SPECIES_FILE] [-f {parquet,feather}] [-t THREADS]
+
+This script was written for Python 3.8.12, in Spyder 5.1.5.
+
+"""
+
+
+#Part 1: Import necessary modules, define functions, assign command-line arguments
+
+#import necessary modules
+import sys #allows the setting of the exit status
+import os #allows access to the files and directories of the computer/system
+import re #enables regex pattern matching
+import shutil #allows copying of the species databases into the combined database
+import argparse #allows parsing of named command line arguments
+import multiprocessing #allows the species databases to be built in worker processes
+from concurrent.futures import ProcessPoolExecutor, as_completed #allows the species databases to be built in parallel
+from combo_OG_results__v3 import combine_species_db #concatenation of the parsed results files of 1 species
+from metamonad_db import db_format_dict, columnar_db_path, write_columnar_db #columnar database format
+from atomic_output import atomic_output #writing of complete files only
+
+
+#the file name endings of the parsed results files, in the format:
+#parsed_file_dict[combine_species_db_argument] = file_name_ending
+parsed_file_dict = {
+	'PFam_EN_Parsed': '_PFam',
+	'EggNOG_Parsed': '_eggNOG',
+	'DeepLoc_Parsed': '_DeepLocP',
+	'SignalP_Parsed': '_SignalP',
+	'TargetP_Parsed': '_TargetP',
+	'IPRScan_Parsed': '_IPRScan',
+	'MitoFates_Parsed': '_MFparsed',
+	'YLoc_Parsed': '_YLparsed'
+	}
+
+
+def find_parsed_files(species_path, species_list):
+	#the species ID is the name of the species directory
+	species_id = os.path.basename(os.path.normpath(species_path))
+	#species with longer names containing this species ID (ex. GiardiaDB_GintestinalisBGS_B)
+	#may have had their files linked into this species directory as well
+	longer_species_list = [species for species in species_list if species != species_id and species_id in species]
+	file_list = sorted(os.listdir(species_path))
+
+	#create the dictionary in the format: species_file_dict[combine_species_db_argument] = file_path
+	species_file_dict = {}
+	for parsed_arg, file_ending in parsed_file_dict.items():
+		#iterate over the prediction programs
+		#and identify the files with the file name ending of each
+		file_pattern = re.compile(re.escape(file_ending) + r'(_final)?\.txt$')
+		candidate_list = [file_name for file_name in file_list if file_pattern.search(file_name)]
+		if len(candidate_list) > 1:
+			#ignore the files of species with longer names
+			candidate_list = [file_name for file_name in candidate_list
+							  if not any(species in file_name for species in longer_species_list)]
+		if len(candidate_list) > 1:
+			#use the final version of the file (ex. concatenated InterProScan results)
+			candidate_list = [file_name for file_name in candidate_list if '_final.txt' in file_name] or candidate_list
+		if len(candidate_list) != 1:
+			#the file to use could not be identified
+			raise ValueError("Could not identify the " + file_ending + " file in " + species_path + ": found " +
+							 (", ".join(candidate_list) if candidate_list else "no files"))
+		species_file_dict[parsed_arg] = os.path.join(species_path, candidate_list[0])
+	#define objects to return
+	return species_file_dict
+
+
+def build_species_db(species_path, species_list, db_format=None, columnar_dir=None):
+	#the species ID is the name of the species directory
+	species_id = os.path.basename(os.path.normpath(species_path))
+	#import the parsed data files & concatenate them into the species database
+	merged_df = combine_species_db(Species_ID=species_id, **find_parsed_files(species_path, species_list))
+
+	#write out results to tab-delimited text file
+	species_db = os.path.join(species_path, species_id + '_predDB.txt')
+	merged_df.to_csv(species_db, sep='\t', index=True)
+	#since the Query columns got shifted into indexes, need to use `index=True`
+	if db_format:
+		#write out the Parquet or Feather file of the species, for use with the metamonad_db.py loader
+		write_columnar_db(merged_df, columnar_dir, db_format)
+	#define objects to return
+	return species_db
+
+
+if __name__ == '__main__':
+	#when run as a stand-alone program, assign command line arguments
+	parser = argparse.ArgumentParser(description = "This program builds the species databases of all species from the species "
+									 "directories created by link_data_files.py, and combines them into the Metamonad database.")
+	parser.add_argument('-i', '--input', dest='species_dir', required=True,
+						help = "The directory containing the species directories (ex. Species_DBs).")
+	parser.add_argument('-o', '--output', dest='output_db', required=True,
+						help = "The name of the combined database file (ex. Metamonada_predDB.txt).")
+	parser.add_argument('-s', '--species', dest='species_file',
+						help = "A file with 1 species ID per line (ex. the species_file of link_data_files.py), "
+						"to build only the databases of these species (default: all species directories).")
+	parser.add_argument('-f', '--format', dest='db_format', choices=list(db_format_dict.keys()),
+						help = "Also write out a columnar database in this format.")
+	parser.add_argument('-t', '--threads', type=int, default=os.cpu_count() or 1,
+						help = "The number of species databases to build at the same time (default: the number of CPUs).")
+	args = parser.parse_args()
+
+
+	#Part 2: Identify the species directories
+
+	if args.species_file:
+		with open(args.species_file, "r") as infile:
+			#read the species IDs into a list, and remove end-line characters ("\n") & empty lines
+			species_list = [species for species in infile.read().splitlines() if species.strip()]
+	else:
+		#use all of the directories in the input directory
+		species_list = sorted(species for species in os.listdir(args.species_dir)
+							  if os.path.isdir(os.path.join(args.species_dir, species)))
+	species_path_list = [os.path.join(args.species_dir, species) for species in species_list]
+
+	#all species files of the columnar database are written into the same directory
+	columnar_dir = columnar_db_path(args.output_db, args.db_format) if args.db_format else None
+
+
+	#Part 3: Build the species databases in parallel
+
+	#create the dictionary in the format: species_db_dict[species_path] = species_db
+	species_db_dict = {}
+	#keep track of the species whose databases could not be built
+	failed_list = []
+
+	if len(species_path_list) > 1 and args.threads > 1 and 'fork' in multiprocessing.get_all_start_methods():
+		#build the species databases in a pool of worker processes
+		with ProcessPoolExecutor(max_workers=min(args.threads, len(species_path_list)),
+								 mp_context=multiprocessing.get_context('fork')) as executor:
+			future_dict = {executor.submit(build_species_db, species_path, species_list, args.db_format, columnar_dir): species_path
+						   for species_path in species_path_list}
+			for future in as_completed(future_dict):
+				#let the user know as each species database is finished
+				species_path = future_dict[future]
+				try:
+					species_db_dict[species_path] = future.result()
+					print("Species database written to: " + species_db_dict[species_path])
+				except Exception as err:
+					#a failed species does not stop the other species
+					print("Building the species database of " + species_path + " failed: " + repr(err), file=sys.stderr)
+					failed_list.append(species_path)
+	else:
+		#build the species databases one after the other
+		for species_path in species_path_list:
+			try:
+				species_db_dict[species_path] = build_species_db(species_path, species_list, args.db_format, columnar_dir)
+				print("Species database written to: " + species_db_dict[species_path])
+			except Exception as err:
+				#a failed species does not stop the other species
+				print("Building the species database of " + species_path + " failed: " + repr(err), file=sys.stderr)
+				failed_list.append(species_path)
+
+	if failed_list:
+		#the combined database would be incomplete
+		print("The combined database was not written out, since " + str(len(failed_list)) + " species database(s) failed.",
+			  file=sys.stderr)
+		sys.exit(1)
+
+
+	#Part 4: Concatenate the species databases into the combined database
+
+	with atomic_output(args.output_db) as outfile:
+		header_line = None
+		for species_path in species_path_list:
+			#iterate over the species databases, in the order of the species
+			with open(species_db_dict[species_path], 'r') as infile:
+				species_header_line = infile.readline()
+				if header_line is None:
+					#the column headers are written out once, at the top of the combined database
+					header_line = species_header_line
+					outfile.write(header_line)
+				elif species_header_line != header_line:
+					raise ValueError("The columns of " + species_db_dict[species_path] + " do not match those of the other species databases.")
+				#copy the rest of the species database into the combined database
+				shutil.copyfileobj(infile, outfile)
+	print("Combined database written to: " + args.output_db)
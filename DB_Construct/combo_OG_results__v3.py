@@ -14,20 +14,29 @@ Description:
 		into one large, flat database.
 
 List of functions:
-	No functions are defined in this script.
+	read_parsed_file(parsed_file, col_prefix):
+		Imports a parsed results file into a Pandas dataframe, with prefixed column names.
+	combine_species_db(PFam_EN_Parsed, EggNOG_Parsed, DeepLoc_Parsed, SignalP_Parsed, TargetP_Parsed,
+					   IPRScan_Parsed, MitoFates_Parsed, YLoc_Parsed, Species_ID):
+		Concatenates the parsed results files of 1 species into a species database dataframe.
 
 List of standard and non-standard modules used:
 	sys
 	pandas
-	numpy
+	metamonad_db.py
 
 Procedure:
 	1. Loading required modules; defining inputs and outputs as command line
 		arguments.
 	2. Using Pandas import the contents of the de novo PFam via EggNOG, de novo EggNOG
-		SignalP, TargetP, InterProScan, DeepLoc, Yloc and MitoFates results files.
+		SignalP, TargetP, InterProScan, DeepLoc, Yloc and MitoFates results files. Empty
+		cells are read in as NaN values while the files are parsed.
 	3. Cpncatenating the databases and filling NaN values with "-".
 	4. Writing out the results to a tab-delimited text file.
+	5. (Optional) Writing out the results to a columnar database (a Parquet or Feather file
+		for the species), which can be loaded column- & row-wise with the metamonad_db.py module.
+		This step can be called with the use of the string "parquet" or "feather" as the 11th
+		command-line argument.
 
 Known bugs and limitations:
 	- There is no quality-checking integrated into the code.
@@ -37,6 +46,15 @@ Known bugs and limitations:
 		and yLoc_Parser__v2.py.
 	- All input and output files are user-defined: This means the user must ensure that
 		the correct file names have been assigned to the program.
+	- The columnar database is written to a directory named after the output database file
+		(ex. BM_anaeromoeba_DB.txt gives BM_anaeromoeba_DB_parquet/[Species_ID].parquet). To
+		collect the columnar databases of all species in one directory, move the species files
+		into a shared directory.
+	- Empty cells, and cells containing only a single space, are treated as empty cells
+		(cells containing other whitespace are kept as they are).
+	- The species databases of all species can be built at once (in parallel) from the
+		species directories created by link_data_files.py with the build_species_DBs.py program,
+		which imports the functions of this program.
 
 Version:
 	This is version 3.0 of this program. A species ID column will now be added before the database
@@ -44,160 +62,118 @@ Version:
 
 Usage
 	./combo_OG_results__v3.py PFam_EN_Parsed EggNOG_Parsed DeepLoc_Parsed SignalP_Parsed
-		TargetP_Parsed IPRScan_Parsed MitoFates_Parsed YLoc_Parsed Species_ID Output_DB
+		TargetP_Parsed IPRScan_Parsed MitoFates_Parsed YLoc_Parsed Species_ID Output_DB [parquet/feather]
 	OR
 	python combo_OG_results__v3.py PFam_EN_Parsed EggNOG_Parsed DeepLoc_Parsed SignalP_Parsed
-		TargetP_Parsed IPRScan_Parsed MitoFates_Parsed YLoc_Parsed Species_ID Output_DB
+		TargetP_Parsed IPRScan_Parsed MitoFates_Parsed YLoc_Parsed Species_ID Output_DB [parquet/feather]
 
 This script was written for Python 3.8.12, in Spyder 5.1.5.
 
 """
 
 
-#Part 1: Import necessary modules, assign command-line arguments
+#Part 1: Import necessary modules, define functions
 
 #import necessary modules
 import sys #allows assignment of command line arguments
 import pandas as pd #facilitates manipulation of dataframes in Python
-import numpy as np #facilitates manipulation of arrays in Python
-
-
-#assign command line arguments: input & output files
-PFam_EN_Parsed = sys.argv[1]
-#PFam_EN_Parsed = "BM_anaeromoeba_EN_PFam.txt"
-EggNOG_Parsed = sys.argv[2]
-#EggNOG_Parsed = "BM_anaeromoeba_EN_eggNOG.txt"
-DeepLoc_Parsed = sys.argv[3]
-#DeepLoc_Parsed = "BM_anaeromoeba_DL_DeepLoc.txt"
-SignalP_Parsed = sys.argv[4]
-#SignalP_Parsed = "BM_anaeromoeba\BM_newprots_may21_SignalP.txt"
-TargetP_Parsed = sys.argv[5]
-IPRScan_Parsed = sys.argv[6]
-MitoFates_Parsed = sys.argv[7]
-YLoc_Parsed = sys.argv[8]
-Species_ID = sys.argv[9]
-Output_DB = sys.argv[10]
-#Output_DB = "BM_anaeromoeba_DB_TEST.txt"
-
-
-#Part 2: Importing parsed data file contents into Pandas dataframes
-
-#PFam results
-with open(PFam_EN_Parsed, "r") as pfam_infile:
-	#open the parsed PFam via eggNOG data file
-	pfam_df = pd.read_csv(pfam_infile, sep='\t', header = 0)
-	#read the file into a pandas dataframe
-	#specifying that the file is tab-separated with a header line
-	pfam_df = pfam_df.set_index('Query')
-	#set the first column (containing query sequence names) as an index
-	pfam_df = pfam_df.replace(r'^\s*$', np.NaN, regex=True)
-	#replace empty cells with 'NaN'
-	pfam_df = pfam_df.add_prefix('pfamEN_')
-	#add prefix to column names to prevent duplicates between the dataframes
+from metamonad_db import db_format_dict, columnar_db_path, write_columnar_db #columnar database format
 
-#eggNOG results
-with open(EggNOG_Parsed, "r") as eggnog_infile:
-	#open the parsed eggNOG data file
-	eggnog_df = pd.read_csv(eggnog_infile, sep='\t', header = 0)
-	#read the file into a pandas dataframe
-	#specifying that the file is tab-separated with a header line
-	eggnog_df = eggnog_df.set_index('Query')
-	#set the first column (containing query sequence names) as an index
-	eggnog_df = eggnog_df.replace(r'^\s*$', np.NaN, regex=True)
-	#replace empty cells with 'NaN'
-	eggnog_df = eggnog_df.add_prefix('EN_')
-	#add prefix to column names to prevent duplicates between the dataframes
 
-#DeepLoc results
-with open(DeepLoc_Parsed, "r") as deeploc_infile:
-	#open the parsed DeepLoc data file
-	deeploc_df = pd.read_csv(deeploc_infile, sep='\t', header = 0)
-	#read the file into a pandas dataframe
-	#specifying that the file is tab-separated with a header line
-	deeploc_df = deeploc_df.set_index('Query')
-	#set the first column (containing query sequence names) as an index
-	deeploc_df = deeploc_df.replace(r'^\s*$', np.NaN, regex=True)
-	#replace empty cells with 'NaN'
-	deeploc_df = deeploc_df.add_prefix('DeepL_')
-	#add prefix to column names to prevent duplicates between the dataframes
+#cell contents that are treated as empty cells, in addition to the default null values of Pandas
+#(ie. cells containing only a space)
+blank_value_list = [' ']
 
-#SignalP results
-with open(SignalP_Parsed, "r") as signalp_infile:
-	#open the parsed SignalP data file
-	signalp_df = pd.read_csv(signalp_infile, sep='\t', header = 0)
-	#read the file into a pandas dataframe
-	#specifying that the file is tab-separated with a header line
-	signalp_df = signalp_df.set_index('Query')
-	#set the first column (containing query sequence names) as an index
-	signalp_df = signalp_df.replace(r'^\s*$', np.NaN, regex=True)
-	#replace empty cells with 'NaN'
-	signalp_df = signalp_df.add_prefix('SigP_')
-	#add prefix to column names to prevent duplicates between the dataframes
+#the column name prefix of the results of each prediction program, in the column order of the database
+#in the format: parsed_prefix_dict[combine_species_db_argument] = column_prefix
+parsed_prefix_dict = {
+	'PFam_EN_Parsed': 'pfamEN_',
+	'EggNOG_Parsed': 'EN_',
+	'IPRScan_Parsed': 'iprS_',
+	'SignalP_Parsed': 'SigP_',
+	'TargetP_Parsed': 'TarP_',
+	'DeepLoc_Parsed': 'DeepL_',
+	'MitoFates_Parsed': 'MitoF_',
+	'YLoc_Parsed': 'YLoc_'
+	}
 
-#TargetP results
-with open(TargetP_Parsed, "r") as targetp_infile:
-	#open the parsed TargetP data file
-	targetp_df = pd.read_csv(targetp_infile, sep='\t', header = 0)
-	#read the file into a pandas dataframe
-	#specifying that the file is tab-separated with a header line
-	targetp_df = targetp_df.set_index('Query')
-	#set the first column (containing query sequence names) as an index
-	targetp_df = targetp_df.replace(r'^\s*$', np.NaN, regex=True)
-	#replace empty cells with 'NaN'
-	targetp_df = targetp_df.add_prefix('TarP_')
-	#add prefix to column names to prevent duplicates between the dataframes
-
-#InterProScan results
-with open(IPRScan_Parsed, "r") as iprscan_infile:
-	#open the parsed InterProScan data file
-	iprscan_df = pd.read_csv(iprscan_infile, sep='\t', header = 0)
-	#read the file into a pandas dataframe
-	#specifying that the file is tab-separated with a header line
-	iprscan_df = iprscan_df.set_index('Query')
-	#set the first column (containing query sequence names) as an index
-	iprscan_df = iprscan_df.replace(r'^\s*$', np.NaN, regex=True)
-	#replace empty cells with 'NaN'
-	iprscan_df = iprscan_df.add_prefix('iprS_')
-	#add prefix to column names to prevent duplicates between the dataframes
-
-#MitoFates results
-with open(MitoFates_Parsed, "r") as mitofates_infile:
-	#open the parsed MitoFates data file
-	mitofates_df = pd.read_csv(mitofates_infile, sep='\t', header = 0)
-	#read the file into a pandas dataframe
-	#specifying that the file is tab-separated with a header line
-	mitofates_df = mitofates_df.set_index('Query')
-	#set the first column (containing query sequence names) as an index
-	mitofates_df = mitofates_df.replace(r'^\s*$', np.NaN, regex=True)
-	#replace empty cells with 'NaN'
-	mitofates_df = mitofates_df.add_prefix('MitoF_')
-	#add prefix to column names to prevent duplicates between the dataframes
 
-#YLoc results
-with open(YLoc_Parsed, "r") as yloc_infile:
-	#open the parsed YLoc data file
-	yloc_df = pd.read_csv(yloc_infile, sep='\t', header = 0)
+def read_parsed_file(parsed_file, col_prefix):
 	#read the file into a pandas dataframe
 	#specifying that the file is tab-separated with a header line
-	yloc_df = yloc_df.set_index('Query')
 	#set the first column (containing query sequence names) as an index
-	yloc_df = yloc_df.replace(r'^\s*$', np.NaN, regex=True)
-	#replace empty cells with 'NaN'
-	yloc_df = yloc_df.add_prefix('YLoc_')
+	#empty cells are read in as 'NaN'
+	parsed_df = pd.read_csv(parsed_file, sep='\t', header=0, index_col='Query', na_values=blank_value_list)
 	#add prefix to column names to prevent duplicates between the dataframes
-
-
-#Part 3: Merge the dataframes and write out
-
-merged_df = pd.concat([pfam_df, eggnog_df, iprscan_df, signalp_df, targetp_df, deeploc_df, mitofates_df, yloc_df], axis=1)
-#concatenate the dataframes along the x axis, horizontally
-merged_df.fillna('-', inplace=True)
-
-
-#add in species ID column
-merged_df = pd.concat([pd.Series(Species_ID, index=merged_df.index, name='Species_Id'), merged_df], axis=1)
-
-
-#write out results to tab-delimited text file
-merged_df.to_csv(Output_DB, sep='\t', index=True)
-#since the Query columns got shifted into indexes, need to use `index=True`
+	#define objects to return
+	return parsed_df.add_prefix(col_prefix)
+
+
+def combine_species_db(PFam_EN_Parsed, EggNOG_Parsed, DeepLoc_Parsed, SignalP_Parsed, TargetP_Parsed,
+					   IPRScan_Parsed, MitoFates_Parsed, YLoc_Parsed, Species_ID):
+	#Part 2: Importing parsed data file contents into Pandas dataframes
+
+	parsed_file_dict = {'PFam_EN_Parsed': PFam_EN_Parsed, 'EggNOG_Parsed': EggNOG_Parsed, 'DeepLoc_Parsed': DeepLoc_Parsed,
+						'SignalP_Parsed': SignalP_Parsed, 'TargetP_Parsed': TargetP_Parsed, 'IPRScan_Parsed': IPRScan_Parsed,
+						'MitoFates_Parsed': MitoFates_Parsed, 'YLoc_Parsed': YLoc_Parsed}
+	#import the PFam, eggNOG, InterProScan, SignalP, TargetP, DeepLoc, MitoFates & YLoc results,
+	#in the column order of the database
+	parsed_df_list = [read_parsed_file(parsed_file_dict[parsed_arg], col_prefix) for parsed_arg, col_prefix in parsed_prefix_dict.items()]
+
+
+	#Part 3: Merge the dataframes
+
+	merged_df = pd.concat(parsed_df_list, axis=1)
+	#concatenate the dataframes along the x axis, horizontally
+	merged_df = merged_df.fillna('-')
+	#fill empty cells with '-' (not in place, so that numeric columns can take the text value)
+
+	#add in species ID column
+	merged_df = pd.concat([pd.Series(Species_ID, index=merged_df.index, name='Species_Id'), merged_df], axis=1)
+	#define objects to return
+	return merged_df
+
+
+if __name__ == '__main__':
+	#assign command line arguments: input & output files
+	PFam_EN_Parsed = sys.argv[1]
+	#PFam_EN_Parsed = "BM_anaeromoeba_EN_PFam.txt"
+	EggNOG_Parsed = sys.argv[2]
+	#EggNOG_Parsed = "BM_anaeromoeba_EN_eggNOG.txt"
+	DeepLoc_Parsed = sys.argv[3]
+	#DeepLoc_Parsed = "BM_anaeromoeba_DL_DeepLoc.txt"
+	SignalP_Parsed = sys.argv[4]
+	#SignalP_Parsed = "BM_anaeromoeba\BM_newprots_may21_SignalP.txt"
+	TargetP_Parsed = sys.argv[5]
+	IPRScan_Parsed = sys.argv[6]
+	MitoFates_Parsed = sys.argv[7]
+	YLoc_Parsed = sys.argv[8]
+	Species_ID = sys.argv[9]
+	Output_DB = sys.argv[10]
+	#Output_DB = "BM_anaeromoeba_DB_TEST.txt"
+
+	#optional columnar output format
+	if len(sys.argv) == 12:
+		#identify cases where the final, optional argument was used
+		DB_Format = sys.argv[11]
+		if DB_Format not in db_format_dict:
+			#check to ensure that the item in this position is a supported format
+			print("The columnar database format should be one of: " + ", ".join(db_format_dict.keys()))
+			sys.exit(1)
+	else:
+		DB_Format = None
+
+	#import the parsed data files & concatenate them into the species database
+	merged_df = combine_species_db(PFam_EN_Parsed, EggNOG_Parsed, DeepLoc_Parsed, SignalP_Parsed, TargetP_Parsed,
+								   IPRScan_Parsed, MitoFates_Parsed, YLoc_Parsed, Species_ID)
+
+	#write out results to tab-delimited text file
+	merged_df.to_csv(Output_DB, sep='\t', index=True)
+	#since the Query columns got shifted into indexes, need to use `index=True`
+
+
+	#Part 4 (Optional): Write out results to a columnar database
+
+	if DB_Format:
+		#write out the Parquet or Feather file of the species, for use with the metamonad_db.py loader
+		write_columnar_db(merged_df, columnar_db_path(Output_DB, DB_Format), DB_Format)
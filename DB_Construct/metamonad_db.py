@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+#!/bin/python
+"""
+
+Title: metamonad_db.py
+Date: 2026-10-18
+Author: Virág Varga
+
+Description:
+	This module contains the columnar on-disk format of the Metamonad database (the flat
+		databases created by combo_OG_results__v3.py and prot_DB_plus_OGs.py), and the
+		shared loader used by the scripts that read the database.
+	The columnar database is a directory containing one Apache Parquet or Feather (Arrow IPC)
+		file per species, in the format:
+			database_dir/[Species_Id].parquet (or .feather)
+		Each file contains all of the columns of the database, for the protein queries of one
+		species. Since each run of combo_OG_results__v3.py writes the file of one species, the
+		databases of all species can be written into the same directory.
+	The loader (load_db) reads only the requested columns, and only the rows matching the
+		requested values (ex. a list of OG IDs, or of species), so that scripts using a few
+		columns of the multi-GB database no longer need to read all of it into memory. The
+		loader also accepts the tab-separated text version of the database, so that the
+		scripts using it work with either format.
+	Columns that contain both numbers and text (ex. numeric columns in which missing values
+		were filled with "-") are stored as text, so that the data types of the loaded columns
+		are the same as when the text version of the database is read with Pandas.
+
+List of functions:
+	columnar_db_path(output_db, db_format):
+		Returns the path of the columnar database directory belonging to a text database file.
+	db_base_name(db_path):
+		Returns the path of a database without its file extension, for naming output files.
+	write_columnar_db(db_df, db_dir, db_format, partition_col):
+		Writes a database dataframe to a columnar database directory, with one file per species.
+	load_db(db_path, columns, row_filter_dict, partition_col):
+		Loads the selected columns & rows of a text or columnar database into a Pandas dataframe.
+
+List of standard and non-standard modules used:
+	os
+	pandas
+	pyarrow
+	atomic_output.py
+
+Procedure:
+	1. Loading required modules; defining the columnar database formats.
+	2. Defining the functions of the module.
+
+Known bugs and limitations:
+	- There is no quality-checking integrated into the code.
+	- Rows loaded from a columnar database are ordered by species (in the order of the species
+		file names), and then in the order of the original database.
+	- Species files are overwritten when the database of the same species is written again,
+		but files of other species already in the directory are not removed.
+	- Row filters select rows whose value in a column is one of a list of values. When the
+		text version of the database is used, the whole file is still read (though only the
+		requested columns are parsed).
+	- This is a module, not a stand-alone program. It should be located in the same directory
+		as the scripts importing it (ex. the Scripts/ directory that the scripts of the
+		DB_Construct/ and PathwaysFilt/ directories are run from in the workflow).
+
+Usage:
+	from metamonad_db import load_db, write_columnar_db
+
+This script was written for Python 3.8.12, in Spyder 5.1.5.
+
+"""
+
+
+# Part 1: Loading required modules; defining the columnar database formats.
+
+#import necessary modules
+import os #allow access to computer files
+import pandas as pd #facilitates manipulation of dataframes in Python
+import pyarrow as pa #facilitates conversion of dataframes to Arrow tables
+import pyarrow.dataset as ds #allows column & row projection when reading columnar files
+from pyarrow import feather, parquet #allows writing of Feather & Parquet files
+from atomic_output import atomic_output #writing of complete files only
+
+
+#the columnar formats, in the format: db_format_dict[db_format] = file_extension
+db_format_dict = {
+	'parquet': '.parquet',
+	'feather': '.feather'
+	}
+
+#the column the columnar database is partitioned on
+partition_col = 'Species_Id'
+
+
+# Part 2: Defining the functions of the module.
+
+def columnar_db_path(output_db, db_format):
+	#the columnar database directory is named after the text database file
+	#ex. Metamonada_pred_OG_DB.txt becomes Metamonada_pred_OG_DB_parquet
+	#define objects to return
+	return os.path.splitext(output_db)[0] + '_' + db_format
+
+
+def db_base_name(db_path):
+	#remove the file extension (or the trailing separator of a directory) from a database path
+	#define objects to return
+	return os.path.splitext(db_path.rstrip(os.sep))[0]
+
+
+def write_columnar_db(db_df, db_dir, db_format, partition_col=partition_col):
+	#the protein query IDs are stored as a column, rather than as the index
+	if db_df.index.name == 'Query':
+		db_df = db_df.reset_index()
+	#columns that contain both numbers and text are stored as text
+	#this matches the data types Pandas gives these columns when reading the text database
+	#missing values (ie. empty cells of the text database) are kept as missing values
+	object_col_list = list(db_df.columns[db_df.dtypes == object])
+	db_df = db_df.assign(**{object_col: db_df[object_col].where(db_df[object_col].isna(), db_df[object_col].astype(str))
+							for object_col in object_col_list})
+
+	os.makedirs(db_dir, exist_ok=True)
+	file_ext = db_format_dict[db_format]
+	for species_id, species_df in db_df.groupby(partition_col, sort=False):
+		#write one file per species, named after the species ID
+		species_file = os.path.join(db_dir, str(species_id).replace(os.sep, '_') + file_ext)
+		species_table = pa.Table.from_pandas(species_df, preserve_index=False)
+		#text columns without any values in a species are still stored as text columns
+		#so that the files of all species have the same columns & data types
+		species_table = species_table.cast(pa.schema([pa.field(table_field.name, pa.string()) if table_field.name in object_col_list
+													  else table_field for table_field in species_table.schema],
+													 metadata=species_table.schema.metadata))
+		with atomic_output(species_file, 'wb') as outfile:
+			if db_format == 'parquet':
+				parquet.write_table(species_table, outfile)
+			else:
+				feather.write_feather(species_table, outfile)
+	#define objects to return
+	return db_dir
+
+
+def load_db(db_path, columns=None, row_filter_dict=None, partition_col=partition_col):
+	#the row filters are in the format: row_filter_dict[column] = list_of_values_to_keep
+	row_filter_dict = row_filter_dict or {}
+
+	if not os.path.isdir(db_path):
+		#text version of the database
+		#only the requested columns (and the columns used to filter the rows) are parsed
+		usecols = None if columns is None else list(columns) + [filter_col for filter_col in row_filter_dict if filter_col not in columns]
+		db_df = pd.read_csv(db_path, sep = '\t', header = 0, usecols = usecols, low_memory = False)
+		for filter_col, filter_value_list in row_filter_dict.items():
+			#keep only the rows with the requested values
+			db_df = db_df[db_df[filter_col].isin(filter_value_list)]
+		if columns is not None:
+			#return only the requested columns, in the order of the database
+			db_df = db_df[[db_col for db_col in db_df.columns if db_col in columns]]
+		#define objects to return
+		return db_df.reset_index(drop=True)
+
+	#columnar version of the database
+	#identify the format from the extensions of the species files
+	db_file_list = sorted(os.listdir(db_path))
+	for db_format, file_ext in db_format_dict.items():
+		species_file_list = [os.path.join(db_path, db_file) for db_file in db_file_list if db_file.endswith(file_ext)]
+		if species_file_list:
+			break
+	else:
+		raise ValueError("No Parquet or Feather files were found in the database directory " + db_path)
+
+	if partition_col in row_filter_dict:
+		#only the files of the requested species need to be opened
+		species_name_set = {str(species_id).replace(os.sep, '_') + file_ext for species_id in row_filter_dict[partition_col]}
+		selected_file_list = [species_file for species_file in species_file_list if os.path.basename(species_file) in species_name_set]
+		#if none of the requested species are in the database, a single file is read,
+		#so that an empty dataframe with the columns of the database is returned by the row filter
+		species_file_list = selected_file_list or species_file_list[:1]
+
+	db_dataset = ds.dataset(species_file_list, format=db_format)
+	#build the row filter expression
+	row_filter = None
+	for filter_col, filter_value_list in row_filter_dict.items():
+		col_filter = ds.field(filter_col).isin(list(filter_value_list))
+		row_filter = col_filter if row_filter is None else (row_filter & col_filter)
+	if columns is not None:
+		#read only the requested columns, in the order of the database
+		columns = [db_col for db_col in db_dataset.schema.names if db_col in columns]
+	#define objects to return
+	return db_dataset.to_table(columns=columns, filter=row_filter).to_pandas()
@@ -13,20 +13,34 @@ Description:
 		The data in these parsed files is concatenated into one large, flat database.
 
 List of functions:
-	No functions are defined in this script.
+	read_og_file(og_file):
+		Imports the Query & OG columns of a parsed OG file into a Pandas dataframe.
+	can_align_og_columns(prot_df, og_df_list):
+		Checks whether the OG columns can be aligned to the protein database by position.
+	align_og_columns(prot_df, og_df_list):
+		Adds the OG columns to the protein database as new columns, aligned by integer position.
 
 List of standard and non-standard modules used:
 	sys
 	pandas
 	functools.reduce
+	metamonad_db.py
 
 Procedure:
 	1. Loading required modules; defining inputs and outputs as command line
 		arguments.
 	2. Using Pandas import the contents of the Broccoli, ProteinOrtho, OrthoFinder and
 		SonicParanoid parsed results files.
-	3. Cpncatenating the databases and filling NaN values with "-".
+	3. Cpncatenating the databases and filling NaN values with "-". The protein queries of
+		all dataframes are converted to the codes of a single categorical code space, and the
+		OG columns are aligned to the rows of the protein database by integer reindexing, and
+		added to it as new columns (so that the wide protein database is not copied at each
+		merge step).
 	4. Writing out the results to a tab-delimited text file.
+	5. (Optional) Writing out the results to a columnar database (Parquet or Feather files,
+		one per species), which can be loaded column- & row-wise with the metamonad_db.py module.
+		This step can be called with the use of the string "parquet" or "feather" as the 7th
+		command-line argument.
 
 Known bugs and limitations:
 	- There is no quality-checking integrated into the code.
@@ -35,105 +49,146 @@ Known bugs and limitations:
 		parser programs.
 	- All input and output files are user-defined: This means the user must ensure that
 		the correct file names have been assigned to the program.
+	- The columnar database is written to a directory named after the output database file
+		(ex. Metamonada_pred_OG_DB.txt gives Metamonada_pred_OG_DB_parquet). Protein queries
+		that are only found in the parsed OG files are written to the "-" species file.
+	- The rows of the output are in the order of the protein database, followed by the protein
+		queries found only in the parsed OG files (sorted), rather than all sorted by protein query
+		as in earlier versions of this program. Adding rows for these protein queries requires
+		a copy of the protein database.
+	- If a protein query occurs more than once in an input file (or a column name is used in
+		more than one file), the dataframes are instead merged with pairwise outer merges, which
+		create a row for every combination of the rows of the protein query, and need several
+		times as much memory.
 
 Usage
-	./prot_DB_plus_OGs.py Prot_DB Broccoli_Parsed ProteinOrtho_Parsed OrthoFinder_Parsed SonicParanoid_Parsed Output_DB
+	./prot_DB_plus_OGs.py Prot_DB Broccoli_Parsed ProteinOrtho_Parsed OrthoFinder_Parsed SonicParanoid_Parsed Output_DB [parquet/feather]
 	OR
-	python prot_DB_plus_OGs.py Prot_DB Broccoli_Parsed ProteinOrtho_Parsed OrthoFinder_Parsed SonicParanoid_Parsed Output_DB
+	python prot_DB_plus_OGs.py Prot_DB Broccoli_Parsed ProteinOrtho_Parsed OrthoFinder_Parsed SonicParanoid_Parsed Output_DB [parquet/feather]
 
 This script was written for Python 3.8.12, in Spyder 5.1.5.
 
 """
 
 
-#Part 1: Import necessary modules, assign command-line arguments
+#Part 1: Import necessary modules, define functions, assign command-line arguments
 
 #import necessary modules
 import sys #allows assignment of command line arguments
 import pandas as pd #facilitates manipulation of dataframes in Python
 from functools import reduce #allow same function to be applied iteratively
-
-
-#assign command line arguments: input & output files
-#input parsed OG files
-Prot_DB = sys.argv[1]
-Broccoli_Parsed = sys.argv[2]
-ProteinOrtho_Parsed = sys.argv[3]
-OrthoFinder_Parsed = sys.argv[4]
-SonicParanoid_Parsed = sys.argv[5]
-#output final database
-Output_DB = sys.argv[6]
-
-
-#Part 2: Importing parsed data file contents into Pandas dataframes
-
-#Large protein functional annotation database
-with open(Prot_DB, "r") as prot_infile:
-	#open the protein functional prediction data file
-	prot_df = pd.read_csv(prot_infile, sep='\t', header = 0, low_memory=False)
-	#read the file into a pandas dataframe
-	#specifying that the file is tab-separated with a header line
-	prot_df = prot_df.set_index('Query')
-	#set the first column (containing query sequence names) as an index
-
-#Broccoli results
-with open(Broccoli_Parsed, "r") as broccoli_infile:
-	#open the parsed Broccoli data file
-	broccoli_df = pd.read_csv(broccoli_infile, sep='\t', header = 0)
-	#read the file into a pandas dataframe
-	#specifying that the file is tab-separated with a header line
-	broccoli_df = broccoli_df.set_index('Query')
-	#set the first column (containing query sequence names) as an index
-
-#ProteinOrtho results
-with open(ProteinOrtho_Parsed, "r") as proteinortho_infile:
-	#open the parsed ProteinOrtho data file
-	proteinortho_df = pd.read_csv(proteinortho_infile, sep='\t', header = 0)
-	#read the file into a pandas dataframe
-	#specifying that the file is tab-separated with a header line
-	proteinortho_df.drop(proteinortho_df.columns[1], axis=1, inplace=True)
-	#drop the species column of the dataframe
-	proteinortho_df = proteinortho_df.set_index('Query')
-	#set the first column (containing query sequence names) as an index
-
-#OrthoFinder results
-with open(OrthoFinder_Parsed, "r") as orthofinder_infile:
-	#open the parsed OrthoFinder data file
-	orthofinder_df = pd.read_csv(orthofinder_infile, sep='\t', header = 0)
-	#read the file into a pandas dataframe
-	#specifying that the file is tab-separated with a header line
-	orthofinder_df.drop(orthofinder_df.columns[1], axis=1, inplace=True)
-	#drop the species column of the dataframe
-	orthofinder_df = orthofinder_df.set_index('Query')
-	#set the first column (containing query sequence names) as an index
-
-#SonicParanoid results
-with open(SonicParanoid_Parsed, "r") as sonicparanoid_infile:
-	#open the parsed SonicParanoid data file
-	sonicparanoid_df = pd.read_csv(sonicparanoid_infile, sep='\t', header = 0)
-	#read the file into a pandas dataframe
-	#specifying that the file is tab-separated with a header line
-	sonicparanoid_df.drop(sonicparanoid_df.columns[1], axis=1, inplace=True)
-	#drop the species column of the dataframe
-	sonicparanoid_df = sonicparanoid_df.set_index('Query')
-	#set the first column (containing query sequence names) as an index
-
-
-#Part 3: Merge the dataframes and write out
-
-#ref: https://stackoverflow.com/questions/44327999/python-pandas-merge-multiple-dataframes
-#save the dataframes to be merged into a list
-data_frames = [prot_df, broccoli_df, proteinortho_df, orthofinder_df, sonicparanoid_df]
-#merge the dataframes iteratively using reduce
-merged_df = reduce(lambda  left,right: pd.merge(left,right,on=['Query'], how='outer'), data_frames).fillna('-')
-
-
-#merged_df = pd.concat([prot_df, broccoli_df, proteinortho_df, orthofinder_df, sonicparanoid_df], axis=1).reset_index(inplace=True, drop=True)
-#concatenate the dataframes along the x axis, horizontally
-#merged_df.fillna('-', inplace=True)
-#fill empty cells with string "-"
-
-
-#write out results to tab-delimited text file
-merged_df.to_csv(Output_DB, sep='\t', index=True)
-#since the Query columns got shifted into indexes, need to use `index=True`
+from metamonad_db import db_format_dict, columnar_db_path, write_columnar_db #columnar database format
+
+
+def read_og_file(og_file):
+	#the OG column is the last column of the parsed OG files
+	#(the parsed ProteinOrtho, OrthoFinder and SonicParanoid files also contain a species column)
+	og_col = pd.read_csv(og_file, sep='\t', header = 0, nrows = 0).columns[-1]
+	#read the Query & OG columns of the file into a pandas dataframe
+	#and set the first column (containing query sequence names) as an index
+	og_df = pd.read_csv(og_file, sep='\t', header = 0, usecols = ['Query', og_col], index_col = 'Query')
+	#define objects to return
+	return og_df
+
+
+def can_align_og_columns(prot_df, og_df_list):
+	#the OG columns can only be aligned by position if each protein query occurs once in each dataframe,
+	#and the OG column names are not already used in the protein database
+	col_list = list(prot_df.columns) + [og_df.columns[0] for og_df in og_df_list]
+	#define objects to return
+	return (prot_df.index.is_unique and all(og_df.index.is_unique for og_df in og_df_list) and
+			len(set(col_list)) == len(col_list))
+
+
+def align_og_columns(prot_df, og_df_list):
+	#protein queries found only in the OG files are added after the rows of the protein database
+	og_only_index = prot_df.index[:0].append([og_df.index for og_df in og_df_list]).unique().difference(prot_df.index)
+	#create the categorical code space shared by all of the dataframes,
+	#in which the code of each protein query is its row number in the merged database
+	query_dtype = pd.CategoricalDtype(prot_df.index.append(og_only_index))
+	if len(og_only_index) > 0:
+		#the protein database only needs to be copied if rows have to be added to it
+		prot_df = prot_df.reindex(query_dtype.categories).rename_axis('Query')
+	row_index = pd.RangeIndex(len(prot_df))
+
+	for og_df in og_df_list:
+		#iterate over the OG dataframes
+		#and convert their protein queries to the codes of the shared code space
+		query_codes = pd.Categorical(og_df.index, dtype=query_dtype).codes
+		og_col = og_df.columns[0]
+		#align the OG column to the rows of the protein database by integer reindexing,
+		#and add it to the protein database as a new column
+		prot_df[og_col] = pd.Series(og_df[og_col].to_numpy(), index=query_codes).reindex(row_index).fillna('-').to_numpy()
+
+	#fill empty cells with string "-"
+	#column by column, so that only the columns containing empty cells are copied
+	for prot_col in prot_df.columns[prot_df.isna().any().to_numpy()]:
+		prot_df[prot_col] = prot_df[prot_col].fillna('-')
+	#define objects to return
+	return prot_df
+
+
+if __name__ == '__main__':
+	#when run as a stand-alone program, assign command line arguments: input & output files
+	#input parsed OG files
+	Prot_DB = sys.argv[1]
+	Broccoli_Parsed = sys.argv[2]
+	ProteinOrtho_Parsed = sys.argv[3]
+	OrthoFinder_Parsed = sys.argv[4]
+	SonicParanoid_Parsed = sys.argv[5]
+	#output final database
+	Output_DB = sys.argv[6]
+
+	#optional columnar output format
+	if len(sys.argv) == 8:
+		#identify cases where the final, optional argument was used
+		DB_Format = sys.argv[7]
+		if DB_Format not in db_format_dict:
+			#check to ensure that the item in this position is a supported format
+			print("The columnar database format should be one of: " + ", ".join(db_format_dict.keys()))
+			sys.exit(1)
+	else:
+		DB_Format = None
+
+
+	#Part 2: Importing parsed data file contents into Pandas dataframes
+
+	#Large protein functional annotation database
+	with open(Prot_DB, "r") as prot_infile:
+		#open the protein functional prediction data file
+		prot_df = pd.read_csv(prot_infile, sep='\t', header = 0, low_memory=False)
+		#read the file into a pandas dataframe
+		#specifying that the file is tab-separated with a header line
+		prot_df = prot_df.set_index('Query')
+		#set the first column (containing query sequence names) as an index
+
+	#Broccoli, ProteinOrtho, OrthoFinder and SonicParanoid results
+	#only the Query & OG columns are imported (ie. without the species column)
+	og_df_list = [read_og_file(og_file) for og_file in [Broccoli_Parsed, ProteinOrtho_Parsed, OrthoFinder_Parsed, SonicParanoid_Parsed]]
+
+
+	#Part 3: Merge the dataframes and write out
+
+	if can_align_og_columns(prot_df, og_df_list):
+		#align the OG columns to the rows of the protein database by integer position,
+		#and add them to the protein database as new columns
+		merged_df = align_og_columns(prot_df, og_df_list)
+	else:
+		#protein queries occuring more than once need the full outer merge,
+		#which creates a row for every combination of the rows of each protein query
+		print("Duplicate protein queries or column names found; using the pairwise outer merge of the dataframes.", file=sys.stderr)
+		#ref: https://stackoverflow.com/questions/44327999/python-pandas-merge-multiple-dataframes
+		#merge the dataframes iteratively using reduce
+		merged_df = reduce(lambda  left,right: pd.merge(left,right,on=['Query'], how='outer'), [prot_df] + og_df_list).fillna('-')
+
+
+	#write out results to tab-delimited text file
+	merged_df.to_csv(Output_DB, sep='\t', index=True)
+	#since the Query columns got shifted into indexes, need to use `index=True`
+
+
+	#Part 4 (Optional): Write out results to a columnar database
+
+	if DB_Format:
+		#write out one Parquet or Feather file per species, for use with the metamonad_db.py loader
+		write_columnar_db(merged_df, columnar_db_path(Output_DB, DB_Format), DB_Format)
@@ -0,0 +1,371 @@
+# -*- coding: utf-8 -*-
+#!/bin/python
+"""
+
+Title: update_metamonad_db.py
+Date: 2026-10-18
+Author: Virág Varga
+
+Description:
+	This program incrementally updates the columnar version of the Metamonad database (the
+		database created by combo_OG_results__v3.py, prot_DB_plus_OGs.py, the scoring scripts and
+		add_startAA.py), so that re-running a prediction program for one species, or adding a
+		new proteome, does not require the whole database to be rebuilt.
+	The database is a directory with one Parquet or Feather file per species (the format of
+		the metamonad_db.py module), in which each file contains the annotation columns
+		(created from the parsed results files with combo_OG_results__v3.py), the OG columns
+		(added as by prot_DB_plus_OGs.py), the Secretion_Score & Mitochondria_Score columns
+		(calculated with the pathway_scoring.py module) and the StartAA column (added as by
+		add_startAA.py) of the protein queries of that species.
+	A manifest file in the database directory records the content hashes of the inputs of each
+		species: the hash of each of the 8 parsed results files in the species directory created
+		by link_data_files.py, and the hashes of the rows of the parsed OG files and StartAA
+		files that belong to the protein queries of the species. When the program is run again,
+		only the species whose inputs have changed are updated, and within each of them only
+		the affected columns are recalculated:
+		- If a parsed results file has changed, the annotation columns are rebuilt
+		- The OG columns are only aligned again if the OG assignments of the species have changed
+			(or its protein queries have)
+		- The pathway scores are only recalculated if the results of one of the prediction
+			programs used to score the pathway have changed (ex. a new SignalP results file
+			affects the Secretion_Score, but not the Mitochondria_Score)
+		- The StartAA column is only recalculated if the StartAA data of the species has changed
+			(or its protein queries have)
+		Species whose inputs are unchanged are not rewritten (only the protein query IDs of
+			their database files are read).
+
+List of functions:
+	file_hash(input_file):
+		Calculates the content hash of a parsed results file.
+	hash_table(table_df):
+		Calculates the content hash of the rows of a dataframe.
+	write_manifest(manifest_dict, manifest_file):
+		Writes out the manifest of the content hashes of the inputs of each species.
+	pathway_tool_set(rule_list):
+		Identifies the parsed results files whose columns are used to score a pathway.
+	read_partition(partition_file, db_format, columns):
+		Imports the file of 1 species of the columnar database into a Pandas dataframe.
+	species_slice(data_df, query_index):
+		Selects the rows of the protein queries of 1 species from a dataframe.
+	update_species_partition(species_path, species_list, db_dir, db_format, old_hash_dict):
+		Updates the columns of 1 species whose inputs have changed, and writes out its
+		database file.
+
+List of standard and non-standard modules used:
+	sys
+	os
+	json
+	hashlib
+	argparse
+	multiprocessing
+	concurrent.futures
+	pandas
+	pyarrow
+	combo_OG_results__v3.py
+	build_species_DBs.py
+	prot_DB_plus_OGs.py
+	metamonad_db.py
+	atomic_output.py
+	pathway_scoring.py
+
+Procedure:
+	1. Loading required modules; defining inputs and outputs as command line arguments.
+	2. Importing the manifest of the database, the parsed OG files and the StartAA files.
+	3. For each species (in parallel), comparing the content hashes of its inputs to those in
+		the manifest, recalculating the columns affected by the changed inputs, and writing
+		out the database file of the species.
+	4. Writing out the updated manifest as each species is finished.
+
+Known bugs and limitations:
+	- There is no quality-checking integrated into the code.
+	- The parsed results files are identified in the species directories in the same way as
+		by build_species_DBs.py.
+	- Protein queries that are only found in the parsed OG files or StartAA files (ie. not in
+		the parsed results files of any species) are not included in the database.
+	- Each protein query may only occur once in each of the parsed OG files and StartAA files.
+	- The first run of the program on a new database directory builds the files of all species
+		(in parallel). Database directories created with the -f argument of
+		prot_DB_plus_OGs.py have no manifest, so all species files are rebuilt on the first run.
+	- Database files of species that are not in the species directory (or species file)
+		are not removed.
+	- Only the Secretion & Mitochondria pathways (with the built-in rules of pathway_scoring.py)
+		are scored. The scores are stored as numbers.
+	- Protein queries without StartAA data are given an empty value, as in the database
+		created by add_startAA.py.
+	- Parallel updating of the species requires a system that supports forking; otherwise,
+		the species are updated one after the other.
+	- The pathway_scoring.py module (in the PathwaysFilt/ directory of this repository) must be
+		located in the same directory as this program (ex. when all programs are copied into the
+		same Scripts/ directory, as in the README), or in a directory listed in the PYTHONPATH
+		environment variable (ex. PYTHONPATH=../PathwaysFilt).
+
+Usage
+	./update_metamonad_db.py -i SPECIES_DIR -og BROCCOLI PROTEINORTHO ORTHOFINDER SONICPARANOID
+		-a STARTAA_FILE [STARTAA_FILE ...] -o DB_DIR [-s SPECIES_FILE] [-f {parquet,feather}] [-t THREADS]
+	OR
+	python update_metamonad_db.py -i SPECIES_DIR -og BROCCOLI PROTEINORTHO ORTHOFINDER SONICPARANOID
+		-a STARTAA_FILE [STARTAA_FILE ...] -o DB_DIR [-s SPECIES_FILE] [-f {parquet,feather}] [-t THREADS]
+
+This script was written for Python 3.8.12, in Spyder 5.1.5.
+
+"""
+
+
+#Part 1: Import necessary modules, define functions, assign command-line arguments
+
+#import necessary modules
+import sys #allows the setting of the exit status
+import os #allows access to the files and directories of the computer/system
+import json #allows reading & writing of the manifest file
+import hashlib #allows calculation of content hashes
+import argparse #allows parsing of named command line arguments
+import multiprocessing #allows the species to be updated in worker processes
+from concurrent.futures import ProcessPoolExecutor, as_completed #allows the species to be updated in parallel
+import pandas as pd #facilitates manipulation of dataframes in Python
+from pyarrow import feather, parquet #allows reading of Feather & Parquet files
+from combo_OG_results__v3 import combine_species_db, parsed_prefix_dict #concatenation of the parsed results files of 1 species
+from build_species_DBs import find_parsed_files #identification of the parsed results files of 1 species
+from prot_DB_plus_OGs import read_og_file, align_og_columns #addition of the OG columns
+from metamonad_db import db_format_dict, write_columnar_db #columnar database format
+from atomic_output import atomic_output #writing of complete files only
+from pathway_scoring import pathway_rule_dict, rule_columns, score_pathway #vectorized pathway scoring engine
+
+
+#the file name of the manifest, in the database directory
+manifest_file_name = 'update_manifest.json'
+
+#the pathways scored in the database, in the order of their score columns
+#(ie. the order of the score_secretoryPathway.py & score_mitochondrialPathway.py runs of the workflow)
+scored_pathway_list = ['Secretion', 'Mitochondria']
+
+#the input data shared by the species, in the format: shared_data_dict[data_name] = data
+#it is filled in before the process pool is created, so that the forked worker processes
+#inherit it, rather than receiving a copy with each species
+shared_data_dict = {}
+
+
+def file_hash(input_file):
+	#calculate the content hash of the input file
+	input_hasher = hashlib.blake2b(digest_size=16)
+	with open(input_file, 'rb') as infile:
+		#the file is read in blocks, so that large files are not loaded into memory
+		for block in iter(lambda: infile.read(1 << 20), b''):
+			input_hasher.update(block)
+	#define objects to return
+	return input_hasher.hexdigest()
+
+
+def hash_table(table_df):
+	#calculate a content hash of the rows of the dataframe, in the order of the protein queries
+	#so that the same rows in a different order give the same hash
+	#define objects to return
+	return hashlib.blake2b(table_df.sort_index().to_csv(sep='\t').encode(), digest_size=16).hexdigest()
+
+
+def pathway_tool_set(rule_list):
+	#the parsed results files whose (prefixed) columns are used by the predictor rules of the pathway
+	#define objects to return
+	return {parsed_arg for parsed_arg, col_prefix in parsed_prefix_dict.items()
+			if any(rule_col.startswith(col_prefix) for rule_col in rule_columns(rule_list))}
+
+
+def read_partition(partition_file, db_format, columns=None):
+	#import the database file of the species (or only the selected columns), with the protein queries as the index
+	columns = None if columns is None else ['Query'] + list(columns)
+	if db_format == 'parquet':
+		partition_df = parquet.read_table(partition_file, columns=columns).to_pandas()
+	else:
+		partition_df = feather.read_table(partition_file, columns=columns).to_pandas()
+	#define objects to return
+	return partition_df.set_index('Query')
+
+
+def write_manifest(manifest_dict, manifest_file):
+	with atomic_output(manifest_file) as outfile:
+		json.dump(manifest_dict, outfile, indent=1, sort_keys=True)
+
+
+def species_slice(data_df, query_index):
+	#only the rows of the protein queries of the species are used
+	#define objects to return
+	return data_df[data_df.index.isin(query_index)]
+
+
+def update_species_partition(species_path, species_list, db_dir, db_format, old_hash_dict):
+	#the species ID is the name of the species directory
+	species_id = os.path.basename(os.path.normpath(species_path))
+	partition_file = os.path.join(db_dir, species_id.replace(os.sep, '_') + db_format_dict[db_format])
+	og_df_list = shared_data_dict['og_df_list']
+	startAA_df = shared_data_dict['startAA_df']
+	og_col_list = [og_df.columns[0] for og_df in og_df_list]
+	derived_col_list = [pathway + '_Score' for pathway in scored_pathway_list] + ['StartAA']
+
+	#calculate the content hash of each of the parsed results files of the species
+	species_file_dict = find_parsed_files(species_path, species_list)
+	hash_dict = {parsed_arg: file_hash(parsed_file) for parsed_arg, parsed_file in species_file_dict.items()}
+	#the earlier version of the species database can only be re-used if its inputs are known
+	has_partition = bool(old_hash_dict) and os.path.isfile(partition_file)
+	#identify the parsed results files that have changed since the earlier version
+	changed_set = {parsed_arg for parsed_arg in hash_dict if not has_partition or old_hash_dict.get(parsed_arg) != hash_dict[parsed_arg]}
+
+	old_df = None
+	if has_partition and not changed_set:
+		#the protein queries are unchanged, so the OG & StartAA data of the species can be checked
+		#by reading only the protein query IDs of the earlier version
+		query_index = read_partition(partition_file, db_format, columns=[]).index
+		hash_dict['OG'] = hash_table(pd.concat([species_slice(og_df, query_index) for og_df in og_df_list], axis=1))
+		hash_dict['StartAA'] = hash_table(species_slice(startAA_df, query_index))
+		if hash_dict['OG'] == old_hash_dict.get('OG') and hash_dict['StartAA'] == old_hash_dict.get('StartAA'):
+			#nothing has changed, so the species database is not read or written
+			return species_id, hash_dict, []
+	if has_partition:
+		#the earlier version of the species database contains the columns that are re-used
+		old_df = read_partition(partition_file, db_format)
+
+	#keep track of the columns that are recalculated
+	updated_list = []
+
+	#annotation columns
+	if changed_set:
+		#import the parsed data files & concatenate them into the species database
+		species_df = combine_species_db(Species_ID=species_id, **species_file_dict)
+		updated_list.append('annotations (' + ", ".join(sorted(changed_set)) + ')')
+	else:
+		#the annotation columns of the earlier version are used as they are
+		species_df = old_df[[db_col for db_col in old_df.columns if db_col not in og_col_list + derived_col_list]]
+	#check whether the protein queries of the species are the same as in the earlier version
+	same_queries = old_df is not None and species_df.index.equals(old_df.index)
+
+	#OG columns
+	species_og_df_list = [species_slice(og_df, species_df.index) for og_df in og_df_list]
+	hash_dict['OG'] = hash_table(pd.concat(species_og_df_list, axis=1))
+	if not same_queries or hash_dict['OG'] != old_hash_dict.get('OG'):
+		#align the OG columns to the rows of the species database
+		species_df = align_og_columns(species_df, species_og_df_list)
+		updated_list.append('OGs')
+	else:
+		for og_col in og_col_list:
+			species_df[og_col] = old_df[og_col]
+
+	#pathway score columns
+	for pathway in scored_pathway_list:
+		#the score only needs to be recalculated if the results of one of its predictors have changed
+		#(or if the protein queries of the species have changed)
+		if not same_queries or changed_set & pathway_tool_set(pathway_rule_dict[pathway]):
+			species_df[pathway + '_Score'] = score_pathway(species_df, pathway_rule_dict[pathway])
+			updated_list.append(pathway + '_Score')
+		else:
+			species_df[pathway + '_Score'] = old_df[pathway + '_Score']
+
+	#start amino acid column
+	species_startAA_df = species_slice(startAA_df, species_df.index)
+	hash_dict['StartAA'] = hash_table(species_startAA_df)
+	if not same_queries or hash_dict['StartAA'] != old_hash_dict.get('StartAA'):
+		species_df['StartAA'] = species_startAA_df['StartAA'].reindex(species_df.index)
+		updated_list.append('StartAA')
+	else:
+		species_df['StartAA'] = old_df['StartAA']
+
+	#write out the database file of the species
+	write_columnar_db(species_df, db_dir, db_format)
+	#define objects to return
+	return species_id, hash_dict, updated_list
+
+
+if __name__ == '__main__':
+	#when run as a stand-alone program, assign command line arguments
+	parser = argparse.ArgumentParser(description = "This program incrementally updates the columnar Metamonad database, "
+									 "recalculating only the species & columns whose inputs have changed.")
+	parser.add_argument('-i', '--input', dest='species_dir', required=True,
+						help = "The directory containing the species directories (ex. Species_DBs).")
+	parser.add_argument('-og', '--og_files', nargs=4, required=True,
+						metavar=('BROCCOLI', 'PROTEINORTHO', 'ORTHOFINDER', 'SONICPARANOID'),
+						help = "The parsed Broccoli, ProteinOrtho, OrthoFinder & SonicParanoid files, in this order.")
+	parser.add_argument('-a', '--startAA', dest='startAA_files', nargs='+', required=True,
+						help = "The StartAA file(s) created by assess_startAA.py (per species, or concatenated).")
+	parser.add_argument('-o', '--output', dest='db_dir', required=True,
+						help = "The columnar database directory (ex. Metamonada_pred_OG_DB_parquet).")
+	parser.add_argument('-s', '--species', dest='species_file',
+						help = "A file with 1 species ID per line (ex. the species_file of link_data_files.py), "
+						"to update only these species (default: all species directories).")
+	parser.add_argument('-f', '--format', dest='db_format', choices=list(db_format_dict.keys()), default='parquet',
+						help = "The format of the columnar database (default: parquet).")
+	parser.add_argument('-t', '--threads', type=int, default=os.cpu_count() or 1,
+						help = "The number of species updated at the same time (default: the number of CPUs).")
+	args = parser.parse_args()
+
+
+	#Part 2: Import the manifest, the parsed OG files and the StartAA files
+
+	if args.species_file:
+		with open(args.species_file, "r") as infile:
+			#read the species IDs into a list, and remove end-line characters ("\n") & empty lines
+			species_list = [species for species in infile.read().splitlines() if species.strip()]
+	else:
+		#use all of the directories in the input directory
+		species_list = sorted(species for species in os.listdir(args.species_dir)
+							  if os.path.isdir(os.path.join(args.species_dir, species)))
+
+	os.makedirs(args.db_dir, exist_ok=True)
+	manifest_file = os.path.join(args.db_dir, manifest_file_name)
+	if os.path.isfile(manifest_file):
+		#the manifest is in the format: manifest_dict[species_id][input_name] = content_hash
+		with open(manifest_file, "r") as infile:
+			manifest_dict = json.load(infile)
+	else:
+		manifest_dict = {}
+
+	#Broccoli, ProteinOrtho, OrthoFinder and SonicParanoid results
+	shared_data_dict['og_df_list'] = [read_og_file(og_file) for og_file in args.og_files]
+	#StartAA data of all species
+	shared_data_dict['startAA_df'] = pd.concat([pd.read_csv(startAA_file, sep='\t', header=0, index_col='Query')
+												for startAA_file in args.startAA_files])
+	for data_df, data_file in zip(shared_data_dict['og_df_list'] + [shared_data_dict['startAA_df']], args.og_files + ['StartAA']):
+		if not data_df.index.is_unique:
+			#the columns are aligned by protein query, which must be unique
+			parser.error("Protein queries occur more than once in the " + data_file + " data.")
+
+
+	#Part 3: Update the species in parallel
+
+	species_path_list = [os.path.join(args.species_dir, species) for species in species_list]
+	#keep track of the species that could not be updated
+	failed_list = []
+
+	if len(species_path_list) > 1 and args.threads > 1 and 'fork' in multiprocessing.get_all_start_methods():
+		#update the species in a pool of worker processes
+		with ProcessPoolExecutor(max_workers=min(args.threads, len(species_path_list)),
+								 mp_context=multiprocessing.get_context('fork')) as executor:
+			future_dict = {executor.submit(update_species_partition, species_path, species_list, args.db_dir, args.db_format,
+										   manifest_dict.get(os.path.basename(os.path.normpath(species_path)), {})): species_path
+						   for species_path in species_path_list}
+			for future in as_completed(future_dict):
+				#let the user know as each species is finished
+				try:
+					species_id, manifest_dict[species_id], updated_list = future.result()
+					#the manifest is written after each species, so that an interrupted run keeps the finished species
+					write_manifest(manifest_dict, manifest_file)
+					print(species_id + ": " + ("updated " + ", ".join(updated_list) if updated_list else "unchanged"))
+				except Exception as err:
+					#a failed species does not stop the other species
+					print("Updating the species " + future_dict[future] + " failed: " + repr(err), file=sys.stderr)
+					failed_list.append(future_dict[future])
+	else:
+		#update the species one after the other
+		for species_path in species_path_list:
+			try:
+				species_id, manifest_dict[species_id], updated_list = update_species_partition(
+					species_path, species_list, args.db_dir, args.db_format,
+					manifest_dict.get(os.path.basename(os.path.normpath(species_path)), {}))
+				#the manifest is written after each species, so that an interrupted run keeps the finished species
+				write_manifest(manifest_dict, manifest_file)
+				print(species_id + ": " + ("updated " + ", ".join(updated_list) if updated_list else "unchanged"))
+			except Exception as err:
+				#a failed species does not stop the other species
+				print("Updating the species " + species_path + " failed: " + repr(err), file=sys.stderr)
+				failed_list.append(species_path)
+
+	if failed_list:
+		#the species that failed keep their earlier database files & manifest entries
+		print(str(len(failed_list)) + " species could not be updated.", file=sys.stderr)
+		sys.exit(1)
@@ -23,6 +23,7 @@ List of standard and non-standard modules used:
 	sys
 	os
 	pandas
+	species_registry.py
 
 Procedure:
 	1. Loading required modules; assigning command-line arguments.
@@ -40,6 +41,13 @@ Known bugs and limitations:
 	- There is no quality-checking integrated into the code.
 	- The output file name is not user-defined, but is instead based on the input
 		file name.  
+	- The species_registry.py module (in the OG_Comparisons/ directory of this repository) must
+		be located in the same directory as this program (ex. when all programs are copied into
+		the same Scripts/ directory, as in the README), or in a directory listed in the
+		PYTHONPATH environment variable (ex. PYTHONPATH=../OG_Comparisons). The species
+		registry file (species_registry.tsv) is found next to the species_registry.py module,
+		or in a ReferenceFiles/ directory next to the directory of the module (as in this
+		repository), or can be given with the SPECIES_REGISTRY environment variable.
 
 Citation: 
 	This program is a based off of the ALE parsing programs used in the ALE-pipeline 
@@ -70,6 +78,7 @@ This script was written for Python 3.8.12, in Spyder 5.1.5.
 import sys #allows assignment of command line arguments
 import os #allow access to computer files
 import pandas as pd #facilitates manipulation of dataframes in Python
+from species_registry import load_registry, registry_map #species registry
 
 
 #assign command line arguments; load input and output files
@@ -136,38 +145,10 @@ count_df = count_df.astype({"Node": str})
 
 #create dictionary in format: {Node_Number: Previous_Node_Number}
 #this will be used to determine gains and losses of OGs across the tree
-phylo_dict = {"Anaeramoeba-lanta-160522": 49, 
-			  "BM-newprots-may21.anaeromoeba": 45, 
-			  "BS-newprots-may21.anaeromoeba": 32, 
-			  "Carpediemonas-membranifera.PRJNA719540": 33, 
-			  "Dientamoeba-fragilis.43352.aa": 47, 
-			  "EP00701-Giardia-intestinalis": 34, 
-			  "EP00703-Trepomonas-sp-PC1": 35, 
-			  "EP00708-Paratrimastix-pyriformis": 36, 
-			  "EP00764-Aduncisulcus-paluster": 58, 
-			  "EP00766-Chilomastix-caulleryi": 37, 
-			  "EP00767-Chilomastix-cuspidata": 37, 
-			  "EP00768-Dysnectes-brevis": 55, 
-			  "EP00769-Ergobibamus-cyprinoides": 33, 
-			  "EP00770-Monocercomonoides-exilis": 38, 
-			  "EP00771-Trimastix-marina": 36, 
-			  "EP00792-Barthelona-sp-PAP020": 60, 
-			  "Giardia-intestinalis.PRJNA1439": 34, 
-			  "Giardia-muris.PRJNA524057": 50, 
-			  "GiardiaDB-GintestinalisADH": 39, 
-			  "GiardiaDB-GintestinalisBGS": 40, 
-			  "GiardiaDB-GintestinalisBGS-B": 40, 
-			  "GiardiaDB-GintestinalisEP15": 41, 
-			  "Histomonas-meleagridis.135588.aa": 42, 
-			  "Histomonas-meleagridis.PRJNA594289": 42, 
-			  "Kipferlia-bialata.PRJDB5223": 56, 
-			  "Pentatrichomonas-hominis.5728.aa": 43, 
-			  "SC-newprots-may21.anaeromoeba": 32, 
-			  "Spironucleus-salmonicida.PRJNA60811": 35, 
-			  "Tetratrichomonas-gallinarum.5730.aa": 43, 
-			  "Trichomonas-vaginalis-GenBank.PRJNA16084": 44, 
-			  "Trichomonas-vaginalis-RefSeq.G3": 44, 
-			  "Tritrichomonas-foetus.PRJNA345179": 51, 
+#the parent nodes of the species (ie. the leaves of the species tree) are taken from the species registry
+phylo_dict = registry_map(load_registry(), 'Tree_Name', 'Parent_Node')
+#and the parent nodes of the internal nodes of the species tree are added to them
+phylo_dict.update({
 			  32: 45, 
 			  33: 59, 
 			  34: 39, 
@@ -202,7 +183,7 @@ phylo_dict = {"Anaeramoeba-lanta-160522": 49,
 			  #do not need to include node 62 as a key
 			  #since the origin will not be undergoing the same style of analysis 
 			  #as the other nodes in the tree
-			  }
+			  })
 
 #convert all elements of the dictionary to strings
 #ref: https://stackoverflow.com/questions/67600510/convert-all-the-values-in-a-dictionary-to-strings
@@ -225,28 +206,26 @@ for index, row in count_df.iterrows():
 			if row['Copies'] == 0: 
 				#if the number of copies = 0, 
 				#check to see if the OG was lost since the previous node
-				for phylo_key in phylo_dict: 
-					#iterate over the phylo_dict via its keys to obtain the parent node number
-					if phylo_key == row['Node']: 
-						#find the dictionary entry associated with the present node number
-						prev_node = phylo_dict[phylo_key]
-						#save the parent node number to the variable prev_node
-						OG_ID = row['Gene_Family']
-						#save the OG ID to a new variable
-						#ref: https://thispointer.com/python-pandas-select-rows-in-dataframe-by-conditions-on-multiple-columns/
-						filterinfDataframe = count_df[(count_df['Node'] == prev_node) & (count_df['Gene_Family'] == OG_ID) ]
-						#filter out the portion of the count_df containing the previous node ID for that OG
-						#and save that one line of the dataframe to a new "dataframe"
-						if filterinfDataframe.iloc[0]['Copies'] > 0:  
-							#if the parent node still had members of the OG
-							prev_count = filterinfDataframe['Copies']
-							#save the number of OG members at the parent node to a variable
-							#use .iloc to get the value of the specific cell, 
-							#since techinically this is still a dataframe
-							#ref: https://stackoverflow.com/questions/13842088/set-value-for-particular-cell-in-pandas-dataframe-using-index
-							#replace the value of losses at the search node 
-							#with the number of OG members that existed at the parent node
-							count_df.at[index, 'Losses'] = prev_count
+				if row['Node'] in phylo_dict: 
+					#look up the present node number in the phylo_dict to obtain the parent node number
+					prev_node = phylo_dict[row['Node']]
+					#save the parent node number to the variable prev_node
+					OG_ID = row['Gene_Family']
+					#save the OG ID to a new variable
+					#ref: https://thispointer.com/python-pandas-select-rows-in-dataframe-by-conditions-on-multiple-columns/
+					filterinfDataframe = count_df[(count_df['Node'] == prev_node) & (count_df['Gene_Family'] == OG_ID) ]
+					#filter out the portion of the count_df containing the previous node ID for that OG
+					#and save that one line of the dataframe to a new "dataframe"
+					if filterinfDataframe.iloc[0]['Copies'] > 0:  
+						#if the parent node still had members of the OG
+						prev_count = filterinfDataframe['Copies']
+						#save the number of OG members at the parent node to a variable
+						#use .iloc to get the value of the specific cell, 
+						#since techinically this is still a dataframe
+						#ref: https://stackoverflow.com/questions/13842088/set-value-for-particular-cell-in-pandas-dataframe-using-index
+						#replace the value of losses at the search node 
+						#with the number of OG members that existed at the parent node
+						count_df.at[index, 'Losses'] = prev_count
 			else: 
 				#if the number of copies > 0
 				#ref: https://stackoverflow.com/questions/13842088/set-value-for-particular-cell-in-pandas-dataframe-using-index
@@ -11,38 +11,47 @@ Description:
 		random code to the original FASTA header. A larger reference file is used
 		as input and then appended to in order to ensure that no alphanumeric header
 		is repeated.
+	Any number of FASTA files can be encoded in a single run. The existing alphanumeric
+		headers are loaded into a hash set once, and every newly generated header is added
+		to the same set, so that headers are also never repeated within a run (or between
+		the FASTA files of a run). The output files are written in batches.
 
 List of functions:
 	No functions are defined in this script.
 
 List of standard and non-standard modules used:
 	sys
-	re
 	random
 	string
-	pandas
+	header_ref.py
 
 Procedure:
 	1. Loading required modules & assigning command line argument.
-    2. Contents of the large reference database are loaded into a Pandas dataframe,
-		and existing alphanumeric headers are extracted to ensure no repitition.
-	3. Parsing the input FASTA file in order to extract headers and generate
+	2. The existing alphanumeric headers of the large reference database are loaded
+		into a set (with the header_ref.py module) to ensure no repitition.
+	3. Parsing each input FASTA file in order to extract headers and generate
 		random alphanumeric codes to replace them.
-	4. Writing out the new FASTA file with the alphanumeric code headers,
-		accompanied by the reference file.
+	4. Writing out the new FASTA files with the alphanumeric code headers,
+		accompanied by the reference files, and appending the new headers to the
+		large reference database.
 
 
 Known bugs and limitations:
 	- There is no quality-checking integrated into the code.
+	- The large reference database must be the last argument. If it does not exist yet,
+		it is created.
 
 Version: 2.0
 	The previous version of this script (assignFASTAheaders.py) did not include any
 		mechanism for ensuring that the alphanumeric headers were not repeated.
+	Later changes to version 2.0 replaced the list of existing headers with a set (which
+		also includes the headers generated during the run), and added the encoding of
+		multiple FASTA files in a single run.
 
 Usage
-	./assignFASTAheaders.py input_fasta ref_file
+	./assignFASTAheaders_v2.py input_fasta [input_fasta ...] ref_file
 	OR
-	python assignFASTAheaders.py input_fasta ref_file
+	python assignFASTAheaders_v2.py input_fasta [input_fasta ...] ref_file
 
 This script was written for Python 3.8.12, in Spyder 5.1.5.
 
@@ -50,50 +59,71 @@ This script was written for Python 3.8.12, in Spyder 5.1.5.
 
 #import necessary modules
 import sys #allows execution of script from command line
-import re #enables regex pattern matching
 import random #enables random number & variable generation
 import string #imports a collection of string constants
-import pandas as pd #allows manipulation of dataframes
+from header_ref import read_encoded_ids #loads the existing alphanumeric headers into a set
 
 
 #load input and output files
-input_fasta = sys.argv[1]
-ref_db_file = sys.argv[2]
+input_fasta_list = sys.argv[1:-1]
+#input_fasta_list = ["Extract__Carpediemonas_membranifera.PRJNA719540.fasta"]
+ref_db_file = sys.argv[-1]
 #ref_db_file = "Extract__encoding_summary_ref.txt"
-#input_fasta = "Extract__Carpediemonas_membranifera.PRJNA719540.fasta"
-output_fasta = ".".join(input_fasta.split('.')[:-1]) + '_edit.fasta'
-ref_doc = ".".join(input_fasta.split('.')[:-1]) + '_ref.txt'
+
+#the number of FASTA headers encoded before the outputs are written to the files
+batch_size = 10000
+
+#the characters used in the alphanumeric headers
+code_chars = string.ascii_letters + string.digits
+
+
+#start by importing the alphanumeric headers of the large reference database into a set
+#the set makes the check for repeated headers independent of the size of the reference database
+encoding_set = read_encoded_ids(ref_db_file)
 
 
 #write the program
-with open(input_fasta, "r") as infile, open(output_fasta, "w") as outfile, open(ref_doc, "w") as outref, open(ref_db_file, "r+") as ref_db:
-	#open the input and output files
-	#start by importing the large reference database into a Pandas dataframe
-	ref_df = pd.read_csv(ref_db, sep="\t", header=None)
-	encoding_list = ref_df[0].tolist()
-	#open the input and output files
-	for line in infile:
-		#iterate through the input file line by line
-		if line.startswith(">"):
-			#identify the header lines
-			header = line
-			#remove the ">" character at the start of the line
-			#this enables easier manipulation of the FASTA header
-			header = re.sub(">", "", header)
-			while True:
-				#generate a random 16-character alphanumeric string to replace the original header
-				assigned_header = ''.join(random.choices(string.ascii_letters + string.digits, k=16))
-				if len(encoding_list) > 0:
-					#check if the reference database-derived encoding list exists
-					#if it does, check that the same alphanumeric code hasn't already been used somewhere
-					if assigned_header not in encoding_list:
-						break
-			#now print the new header to the outfile
-			outfile.write(">" + assigned_header + "\n")
-			#and print the assigned reference to the outref file
-			outref.write(assigned_header + "\t" + header)
-			#add the header to the large reference dataframe
-			ref_db.write(assigned_header + "\t" + header)
-		else:
-			#sequence lines are copied to the outfile without changes
-			outfile.write(line)
+with open(ref_db_file, "a") as ref_db:
+	#open the large reference database, in order to append the new headers to it
+	for input_fasta in input_fasta_list:
+		#iterate over the input FASTA files
+		output_fasta = ".".join(input_fasta.split('.')[:-1]) + '_edit.fasta'
+		ref_doc = ".".join(input_fasta.split('.')[:-1]) + '_ref.txt'
+		with open(input_fasta, "r") as infile, open(output_fasta, "w") as outfile, open(ref_doc, "w") as outref:
+			#open the input and output files
+			#the lines of the outputs are collected in lists, and written out in batches
+			out_line_list = []
+			ref_line_list = []
+			for line in infile:
+				#iterate through the input file line by line
+				if line.startswith(">"):
+					#identify the header lines
+					#remove the ">" character at the start of the line
+					#this enables easier manipulation of the FASTA header
+					header = line.replace(">", "")
+					while True:
+						#generate a random 16-character alphanumeric string to replace the original header
+						assigned_header = ''.join(random.choices(code_chars, k=16))
+						#check that the same alphanumeric code hasn't already been used somewhere
+						#(either in the reference database, or earlier in this run)
+						if assigned_header not in encoding_set:
+							encoding_set.add(assigned_header)
+							break
+					#now add the new header to the outfile lines
+					out_line_list.append(">" + assigned_header + "\n")
+					#and add the assigned reference to the reference lines
+					ref_line_list.append(assigned_header + "\t" + header)
+					if len(ref_line_list) >= batch_size:
+						#write out the batch to the outfile, the outref file and the large reference database
+						outfile.writelines(out_line_list)
+						outref.writelines(ref_line_list)
+						ref_db.writelines(ref_line_list)
+						out_line_list = []
+						ref_line_list = []
+				else:
+					#sequence lines are copied to the outfile without changes
+					out_line_list.append(line)
+			#write out the final batch
+			outfile.writelines(out_line_list)
+			outref.writelines(ref_line_list)
+			ref_db.writelines(ref_line_list)
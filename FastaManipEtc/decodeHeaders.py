@@ -10,30 +10,42 @@ Description:
 		assignFASTAheaders.py program with the original FASTA headers, using the
 		reference file created by the other program as a guide. It is intended
 		for use on the *_OGall*.csv species & strain databases.
+	Any number of species & strain databases can be decoded against the same reference
+		file in a single run. The headers are looked up in the on-disk index of the reference
+		file (see header_ref.py), rather than loading the whole reference file, and the
+		databases are decoded in parallel worker processes.
 
 List of functions:
-	No functions are defined in this script.
+	decode_db(input_db):
+		Decodes the protein query IDs of a species database, and writes out the decoded database.
 
 List of standard and non-standard modules used:
 	sys
-	re
+	os
+	glob
+	multiprocessing
 	pandas
+	header_ref.py
 
 Procedure:
 	1. Loading required modules & assigning command line arguments.
-	2. Using Pandas to load the contents of the reference file into a dictionary.
-	3. Parsing the input database file in order to match the random headers to the
-		original headers via the reference file.
-	4. Writing out the new database file with the original FASTA headers.
+	2. Creating or updating the index of the reference file with the header_ref.py module.
+	3. Looking up the original headers of the random headers of each input database in
+		the index, and matching them with a single lookup over the whole protein query column.
+	4. Writing out the new database files with the original FASTA headers.
 
 Known bugs and limitations:
 	- There is no quality-checking integrated into the code.
 	- The user needs to check that the correct reference file is assigned.
+	- The reference file must be the last argument. Directories given as input are
+		searched for *_OGall*.csv files (other than the *__decode.csv outputs of this program).
+	- Parallel decoding of several databases requires a system that supports forking;
+		otherwise, the databases are decoded one after the other.
 
 Usage
-	./decodeHeaders.py input_db ref_doc
+	./decodeHeaders.py input_db [input_db ...] ref_doc
 	OR
-	python decodeHeaders.py input_db ref_doc
+	python decodeHeaders.py input_db [input_db ...] ref_doc
 
 This script was written for Python 3.8.10, in Spyder 5.0.5.
 
@@ -41,56 +53,67 @@ This script was written for Python 3.8.10, in Spyder 5.0.5.
 
 #import necessary modules
 import sys #allows execution of script from command line
-import re #enables regex pattern matching
+import os #allow access to computer files
+import glob #enables searching for the databases in a directory
+import multiprocessing #allows the databases to be decoded in parallel
 import pandas as pd #allow manipulation of data files
+from header_ref import open_header_index, connect_header_index, encoded_to_original, decode_ids #on-disk reference index & hash-map decoding
 
 
 #load input and output files
-input_db = sys.argv[1]
-#input_db = "BM_anaeromoeba_DB_OFall.csv"
-ref_doc = sys.argv[2]
+input_list = sys.argv[1:-1]
+#input_list = ["BM_anaeromoeba_DB_OFall.csv"]
+ref_doc = sys.argv[-1]
 #ref_doc = "encoding_summary_ref.txt"
-#output_db name is based on the input_fasta name
-output_db = ".".join(input_db.split('.')[:-1]) + '__decode.csv'
-
-
-#create and populate dictionary using the reference file
-with open(ref_doc, "r") as inref:
-	REF = pd.read_csv(inref, sep="\t", header=None)
-	REF = REF.set_index(0)
-	ref_dict = REF.T.to_dict('list')
-	#note that this manner of conversion makes the dictionary value a list
-
-#reading in the input database into a Pandas dataframe
-species_df = pd.read_csv(input_db, header=0)
-#set the first column (containing the protein query ids) as an index
-species_df.set_index('Query')
-
-
-#replace the spaces (' ') in the FASTA headers with underscores ('_')
-for key, value in ref_dict.items():
-	#iterate through the ref_dict dictionary
-	if ' ' in value[0]:
-		#identify values which contain spaces (' ')
-		value[0] = re.sub(' ', '_', value[0])
-		#replace spaces in the values with underscores ('_')
-
-
-#iterate through the species_df dataframe
-#where the protein query id matches a key in the ref_dict dictionary, fill in the empty cell (value)
-#in the final column with the corresponding dictionary value (ie. original FASTA header)
-for id_num, prot_id in enumerate(species_df['Query']):
-	#iterate over the contents of the first column of the species_df dataframe (header/column name  = 'Query')
-	#prot_id contains the value in the cell; id_num contains the index of that value
-	for ref_key in ref_dict:
-		#iterate through the og_dict dictionary using its keys
-		if prot_id == ref_key:
-			#if the protein id in the species_df dataframe matches the key in the og_dict dictionary
-			#extract the associated value from dictionary og_dict (ie. orthologous group assignment)
-			#and place it in the appropriately indexed cell
-			species_df.iat[id_num, 0] = ref_dict[ref_key][0]
-			#indexing the ref_dict value (FASTA header) makes the contents print as a string instead of a list
-
-
-#write out the results to a new .csv file
-species_df.to_csv(output_db, index=False)
+
+#directories are searched for the species & strain databases
+input_db_list = []
+for input_path in input_list:
+	#iterate over the input arguments
+	if os.path.isdir(input_path):
+		#databases that have already been decoded are skipped
+		input_db_list.extend([input_db for input_db in sorted(glob.glob(os.path.join(input_path, '*_OGall*.csv')))
+							  if not input_db.endswith('__decode.csv')])
+	else:
+		input_db_list.append(input_path)
+
+
+#create or update the index of the reference file before the worker processes are started
+#each worker then opens the index for reading only
+open_header_index(ref_doc).close()
+
+
+def decode_db(input_db):
+	#output_db name is based on the input_db name
+	output_db = ".".join(input_db.split('.')[:-1]) + '__decode.csv'
+
+	#reading in the input database into a Pandas dataframe
+	species_df = pd.read_csv(input_db, header=0)
+
+	#look up the original headers of the protein query ids in the reference index
+	index_conn = connect_header_index(ref_doc)
+	ref_series = pd.Series(encoded_to_original(index_conn, species_df['Query'].unique()), dtype=object)
+	index_conn.close()
+	#replace the spaces (' ') in the FASTA headers with underscores ('_')
+	ref_series = ref_series.str.replace(' ', '_', regex=False)
+
+	#where the protein query id matches a key in the reference, replace it with the corresponding
+	#value (ie. original FASTA header); protein query ids not in the reference are kept as they are
+	species_df['Query'] = decode_ids(species_df['Query'], ref_series)
+
+	#write out the results to a new .csv file
+	species_df.to_csv(output_db, index=False)
+	#define objects to return
+	return output_db
+
+
+if len(input_db_list) > 1 and 'fork' in multiprocessing.get_all_start_methods():
+	#decode the databases in a pool of worker processes
+	with multiprocessing.get_context('fork').Pool(processes=min(os.cpu_count() or 1, len(input_db_list))) as pool:
+		for output_db in pool.imap_unordered(decode_db, input_db_list):
+			#let the user know as each database is finished
+			print("Decoded database written to: " + output_db)
+else:
+	#decode the databases one after the other
+	for input_db in input_db_list:
+		decode_db(input_db)
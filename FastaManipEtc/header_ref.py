@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+#!/bin/python
+"""
+
+Title: header_ref.py
+Date: 2026-10-18
+Author: Virág Varga
+
+Description:
+	This module contains the shared encoded <-> original protein ID index of the header
+		encoding reference files created by the assignFASTAheaders_v2.py program
+		(ex. encoding_summary_ref.txt), which is used by the decodeHeaders.py,
+		reverseHeaders.py, remakeHeaders.py, query_prot_ids.py and query_prot_ids__v2.py
+		programs instead of loading the full reference file with Pandas on every run.
+	The reference file is a tab-separated text file without a header, in the format:
+		encoded_header\toriginal_header
+	The index is an SQLite database file written next to the reference file (named
+		[ref_doc].index.sqlite), containing the encoded & original headers in the order of
+		the reference file, with an index on each of the 2 columns. The index is created the
+		first time a reference file is used. Since the reference file is only ever appended to
+		by assignFASTAheaders_v2.py, only the new lines are added to the index on later runs.
+		The content hash of the whole indexed portion of the reference file is stored in the
+		index, and checked whenever the size, modification time or inode of the reference file
+		has changed, so that if the indexed portion has changed in any way other than being
+		appended to, the index is rebuilt.
+	The index supports bulk lookups of original headers from encoded headers (and vice versa),
+		as well as substring & prefix searches of either column. The length of the longest
+		header of each column is stored in the index, so that substring searches for queries
+		at least this long (ex. the 16-character encoded headers) use the index of the column.
+		All of the other queries are searched for in a single pass over the column, with one
+		regular expression containing all of the queries.
+
+List of functions:
+	read_header_ref(ref_file):
+		Imports the lines of a header encoding reference file into a Pandas dataframe.
+	open_header_index(ref_doc, index_file):
+		Opens the index of a reference file, after creating or updating it if necessary.
+	connect_header_index(ref_doc, index_file):
+		Opens an existing index for reading only (ex. in worker processes).
+	encoded_to_original(index_conn, encoded_list):
+		Returns a dictionary of the original headers of a list of encoded headers.
+	original_to_encoded(index_conn, original_list):
+		Returns a dictionary of the encoded headers of a list of original headers.
+	search_headers(index_conn, query_list, column, prefix):
+		Returns the reference rows whose header contains (or starts with) any of the queries.
+	decode_ids(id_series, ref_series):
+		Replaces the encoded protein query IDs in a Pandas Series with the original headers.
+	read_encoded_ids(ref_doc):
+		Imports the encoded headers of a reference file into a set, for collision checks.
+
+List of standard and non-standard modules used:
+	os
+	re
+	sqlite3
+	hashlib
+	pandas
+
+Procedure:
+	1. Loading required modules; defining the index format.
+	2. Defining the functions of the module.
+
+Known bugs and limitations:
+	- There is no quality-checking integrated into the code.
+	- If an encoded header occurs more than once in the reference file, its last occurrence
+		is used (as in the dictionaries previously created from the reference file). If an
+		original header occurs more than once, its first encoded header is used.
+	- Only the first 2 columns of the reference file are used.
+	- Substring & prefix searches match the queries literally (they are not regular
+		expressions), and empty queries are ignored.
+	- The index file must be writable by the first program that uses a new or changed
+		reference file.
+	- A reference file whose size, modification time & inode are the same as when it was
+		last indexed is assumed to be unchanged. Otherwise, the indexed portion of the reference
+		file is read & hashed in full (which is faster than parsing it, but still reads the file).
+	- This is a module, not a stand-alone program. It should be imported by scripts
+		located in the same directory.
+
+Usage:
+	from header_ref import open_header_index, encoded_to_original, search_headers
+
+This script was written for Python 3.8.12, in Spyder 5.1.5.
+
+"""
+
+
+# Part 1: Loading required modules; defining the index format.
+
+#import necessary modules
+import os #allow access to computer files
+import re #allows searching for many substrings at once
+import sqlite3 #allows creation & querying of the on-disk index
+import hashlib #allows calculation of content hashes
+import pandas as pd #facilitates manipulation of dataframes in Python
+
+
+#the column names given to the columns of the reference file
+ref_col_list = ['Encoded', 'Original']
+
+#the file extension added to the reference file name to name its index
+header_index_ext = '.index.sqlite'
+
+#the version of the index format, which is stored in the index
+#so that indexes written by earlier versions of this module are rebuilt
+header_index_version = 'header_ref_3'
+
+#the number of values given to a single SQL query
+query_batch_size = 500
+
+
+# Part 2: Defining the functions of the module.
+
+def read_header_ref(ref_file):
+	#import the reference file (or the rest of an open reference file) into a Pandas dataframe
+	#the headers are read as text, so that headers like "NA" or "1234" are kept as they are
+	ref_df = pd.read_csv(ref_file, sep = '\t', header = None, usecols = [0, 1], names = ref_col_list,
+						 dtype = str, keep_default_na = False)
+	#lines without an original header get an empty string
+	#define objects to return
+	return ref_df.fillna('')
+
+
+def prefix_hash(ref_doc, indexed_size):
+	#calculate the content hash of the whole indexed portion of the reference file
+	prefix_hasher = hashlib.blake2b(digest_size=16)
+	with open(ref_doc, 'rb') as inref:
+		#the file is read in blocks, so that large reference files are not loaded into memory
+		remaining_size = indexed_size
+		while remaining_size > 0:
+			block = inref.read(min(remaining_size, 1 << 20))
+			if not block:
+				break
+			prefix_hasher.update(block)
+			remaining_size -= len(block)
+	#define objects to return
+	return prefix_hasher.hexdigest()
+
+
+def file_stamp(ref_doc):
+	#the size, modification time & inode of the reference file, which change when it is edited or replaced
+	ref_stat = os.stat(ref_doc)
+	#define objects to return
+	return str(ref_stat.st_size) + ':' + str(ref_stat.st_mtime_ns) + ':' + str(ref_stat.st_ino)
+
+
+def open_header_index(ref_doc, index_file=None):
+	#the index is written next to the reference file, unless another location is given
+	index_file = index_file or ref_doc + header_index_ext
+	index_conn = sqlite3.connect(index_file)
+	with index_conn:
+		#create the tables & indexes of a new index file
+		#the row IDs of the header_ref table follow the order of the reference file
+		index_conn.execute('CREATE TABLE IF NOT EXISTS header_ref (Encoded TEXT NOT NULL, Original TEXT NOT NULL)')
+		index_conn.execute('CREATE INDEX IF NOT EXISTS header_ref_encoded ON header_ref (Encoded)')
+		index_conn.execute('CREATE INDEX IF NOT EXISTS header_ref_original ON header_ref (Original)')
+		index_conn.execute('CREATE TABLE IF NOT EXISTS index_meta (Key TEXT PRIMARY KEY, Value TEXT NOT NULL)')
+		meta_dict = dict(index_conn.execute('SELECT Key, Value FROM index_meta'))
+
+		#identify the portion of the reference file that has already been indexed
+		ref_size = os.path.getsize(ref_doc)
+		ref_stamp = file_stamp(ref_doc)
+		indexed_size = int(meta_dict.get('indexed_size', 0))
+		if indexed_size > 0 and (meta_dict.get('version') != header_index_version or indexed_size > ref_size or
+				(meta_dict.get('file_stamp') != ref_stamp and meta_dict.get('prefix_hash') != prefix_hash(ref_doc, indexed_size)) or
+				(indexed_size < ref_size and meta_dict.get('ends_line') == 'False')):
+			#the indexed portion has changed (or the index was written by an earlier version
+			#of this module, or the last indexed line was incomplete), so the index is rebuilt
+			index_conn.execute('DELETE FROM header_ref')
+			indexed_size = 0
+
+		if indexed_size < ref_size:
+			#add the lines appended to the reference file since it was last indexed
+			with open(ref_doc, 'rb') as inref:
+				inref.seek(indexed_size)
+				try:
+					new_ref_df = read_header_ref(inref)
+				except pd.errors.EmptyDataError:
+					#the appended portion only contains empty lines
+					new_ref_df = pd.DataFrame(columns=ref_col_list)
+				#check whether the reference file ends with a complete line
+				inref.seek(ref_size - 1)
+				ends_line = inref.read(1) == b'\n'
+			index_conn.executemany('INSERT INTO header_ref (Encoded, Original) VALUES (?, ?)',
+								   zip(new_ref_df['Encoded'], new_ref_df['Original']))
+			#the length of the longest header of each column, including the lines indexed earlier
+			max_length_list = []
+			for ref_col in ref_col_list:
+				#iterate over the columns
+				max_length = int(meta_dict.get('max_length_' + ref_col, 0)) if indexed_size > 0 else 0
+				if not new_ref_df.empty:
+					max_length = max(max_length, int(new_ref_df[ref_col].str.len().max()))
+				max_length_list.append(('max_length_' + ref_col, str(max_length)))
+			index_conn.executemany('INSERT OR REPLACE INTO index_meta (Key, Value) VALUES (?, ?)',
+								   [('version', header_index_version), ('indexed_size', str(ref_size)),
+									('prefix_hash', prefix_hash(ref_doc, ref_size)), ('file_stamp', ref_stamp),
+									('ends_line', str(ends_line))] + max_length_list)
+		elif indexed_size == 0:
+			#an empty reference file has nothing to index
+			index_conn.execute('DELETE FROM index_meta')
+		elif meta_dict.get('file_stamp') != ref_stamp:
+			#the reference file was touched or copied without changing its contents
+			#so the new file stamp is saved, to avoid hashing the reference file again on later runs
+			index_conn.execute('INSERT OR REPLACE INTO index_meta (Key, Value) VALUES (?, ?)', ('file_stamp', ref_stamp))
+	#define objects to return
+	return index_conn
+
+
+def connect_header_index(ref_doc, index_file=None):
+	#open an index created by open_header_index() without modifying it
+	index_file = index_file or ref_doc + header_index_ext
+	#define objects to return
+	return sqlite3.connect('file:' + index_file + '?mode=ro', uri=True)
+
+
+def batched_rows(index_conn, sql_query, value_list):
+	#run a query with an "IN" list on batches of the values, returning the rows in reference file order
+	row_list = []
+	value_list = list(value_list)
+	for batch_start in range(0, len(value_list), query_batch_size):
+		#iterate over the batches of values
+		value_batch = value_list[batch_start:batch_start + query_batch_size]
+		row_list.extend(index_conn.execute(sql_query.format(', '.join('?' * len(value_batch))), value_batch))
+	#define objects to return
+	return sorted(row_list)
+
+
+def encoded_to_original(index_conn, encoded_list):
+	#find the rows of the encoded headers, in the order of the reference file
+	row_list = batched_rows(index_conn, 'SELECT rowid, Encoded, Original FROM header_ref WHERE Encoded IN ({})',
+							{str(encoded) for encoded in encoded_list})
+	#create the dictionary in the format: ref_dict[encoded_header] = original_header
+	#later occurrences of an encoded header overwrite earlier ones
+	#define objects to return
+	return {encoded: original for rowid, encoded, original in row_list}
+
+
+def original_to_encoded(index_conn, original_list):
+	#find the rows of the original headers, in the order of the reference file
+	row_list = batched_rows(index_conn, 'SELECT rowid, Original, Encoded FROM header_ref WHERE Original IN ({})',
+							{str(original) for original in original_list})
+	#create the dictionary in the format: ref_dict[original_header] = encoded_header
+	ref_dict = {}
+	for rowid, original, encoded in row_list:
+		#the first occurrence of an original header is used
+		ref_dict.setdefault(original, encoded)
+	#define objects to return
+	return ref_dict
+
+
+def query_pattern(query_list):
+	#merge the queries into a prefix tree, in the format: query_trie[character] = {next_character: {...}}
+	#where the end of a query is marked with an empty string key
+	query_trie = {}
+	for query in query_list:
+		#iterate over the queries
+		query_node = query_trie
+		for query_char in query:
+			query_node = query_node.setdefault(query_char, {})
+		query_node[''] = {}
+
+	def node_pattern(query_node):
+		#a header containing a query also contains all of the longer queries starting with it,
+		#so the rest of the tree below the end of a query is not needed
+		if '' in query_node:
+			return ''
+		branch_list = [re.escape(query_char) + node_pattern(next_node) for query_char, next_node in sorted(query_node.items())]
+		#define objects to return
+		return branch_list[0] if len(branch_list) == 1 else '(?:' + '|'.join(branch_list) + ')'
+
+	#the queries are matched literally, and each position of a header is compared to them
+	#one character at a time, instead of to each of the queries in turn
+	#define objects to return
+	return re.compile(node_pattern(query_trie))
+
+
+def search_headers(index_conn, query_list, column='Original', prefix=False):
+	#empty queries would match every row, so they are ignored
+	query_list = sorted({str(query) for query in query_list if str(query) != ''})
+	if column not in ref_col_list:
+		raise ValueError("The column searched must be one of: " + ", ".join(ref_col_list))
+	row_list = []
+	if prefix:
+		for query in query_list:
+			#iterate over the queries
+			#prefix searches use the index of the column, as a range of values
+			row_list.extend(index_conn.execute('SELECT rowid, Encoded, Original FROM header_ref WHERE ' +
+											   column + ' >= ? AND ' + column + ' < ?', (query, query + '\U0010ffff')))
+	else:
+		#a query at least as long as the longest header of the column can only be found as a whole header,
+		#so these queries are looked up in the index of the column
+		meta_dict = dict(index_conn.execute('SELECT Key, Value FROM index_meta'))
+		max_length = int(meta_dict.get('max_length_' + column, 0))
+		row_list.extend(batched_rows(index_conn, 'SELECT rowid, Encoded, Original FROM header_ref WHERE ' + column + ' IN ({})',
+									 [query for query in query_list if len(query) >= max_length]))
+		substring_list = [query for query in query_list if len(query) < max_length]
+		if substring_list:
+			#the other queries are all searched for in a single pass over the column
+			query_regex = query_pattern(substring_list)
+			index_conn.create_function('contains_query', 1, lambda header: query_regex.search(header) is not None)
+			row_list.extend(index_conn.execute('SELECT rowid, Encoded, Original FROM header_ref WHERE contains_query(' +
+											   column + ')'))
+	#rows matching more than 1 query are only included once, in the order of the reference file
+	row_list = sorted(set(row_list))
+	#define objects to return
+	return pd.DataFrame([row[1:] for row in row_list], columns=ref_col_list)
+
+
+def decode_ids(id_series, ref_series):
+	#look up all of the protein query IDs in the reference at once
+	decoded_series = id_series.astype(str).map(ref_series)
+	#protein query IDs that are not in the reference are kept as they are
+	#define objects to return
+	return decoded_series.where(decoded_series.notna(), id_series)
+
+
+def read_encoded_ids(ref_doc):
+	#a missing or empty reference file does not contain any encoded headers yet
+	if not os.path.isfile(ref_doc) or os.path.getsize(ref_doc) == 0:
+		return set()
+	#only the column of encoded headers is parsed
+	encoded_df = pd.read_csv(ref_doc, sep = '\t', header = None, usecols = [0], dtype = str,
+							 keep_default_na = False)
+	#define objects to return
+	return set(encoded_df[0])
@@ -18,18 +18,22 @@ List of functions:
 List of standard and non-standard modules used:
 	sys
 	re
-	pandas
+	header_ref.py
 
 Procedure:
 	1. Loading required modules & assigning command line arguments.
-	2. Using Pandas to load the contents of the reference file into a dictionary.
-	3. Parsing the input FASTA file in order to match the random headers to the
-		original headers via the reference file.
+	2. Parsing the input FASTA file in order to collect its headers, and looking up
+		the random headers of the original headers in the on-disk index of the reference file
+		(created or updated with the header_ref.py module).
+	3. Parsing the input FASTA file again in order to match the headers via the reference.
 	4. Writing out the new FASTA file with the original FASTA headers.
 
 Known bugs and limitations:
 	- There is no quality-checking integrated into the code.
 	- The user needs to check that the correct reference file is assigned.
+	- Headers that are not found in the reference file are not written to the output file.
+	- If an original header occurs more than once in the reference file, the first
+		alphanumeric header assigned to it is used.
 
 Usage
 	./remakeHeaders.py input_fasta ref_doc
@@ -43,7 +47,7 @@ This script was written for Python 3.8.12, in Spyder 5.1.5.
 #import necessary modules
 import sys #allows execution of script from command line
 import re #enables regex pattern matching
-import pandas as pd #allow manipulation of data files
+from header_ref import open_header_index, original_to_encoded #on-disk index of the reference file
 
 
 #load input and output files
@@ -56,12 +60,16 @@ ref_doc = sys.argv[2]
 output_fasta = ".".join(input_fasta.split('.')[:-1]) + '_edit.fasta'
 
 
-#create and populate dictionary using the reference file
-with open(ref_doc, "r") as inref:
-	REF = pd.read_csv(inref, sep="\t", header=None)
-	REF = REF.set_index(0)
-	ref_dict = REF.T.to_dict('list')
-	#note that this manner of conversion makes the dictionary value a list
+#collect the headers of the input fasta file
+with open(input_fasta, "r") as infile:
+	#remove the ">" character at the start of the line
+	header_list = [re.sub(">", "", line.strip()) for line in infile if line.startswith(">")]
+
+#create and populate dictionary using the index of the reference file
+#dictionary format: ref_dict[original_header] = encoded_header
+index_conn = open_header_index(ref_doc)
+ref_dict = original_to_encoded(index_conn, header_list)
+index_conn.close()
 
 
 #write the program
@@ -75,16 +83,10 @@ with open(input_fasta, "r") as infile, open(output_fasta, "w") as outfile:
 			#remove the ">" character at the start of the line
 			#this enables easier manipulation of the FASTA header
 			header = re.sub(">", "", header)
-			#iterate through the reference dictionary keys
-			for k in ref_dict.keys():
-				#save the original header to a variable
-				og_header = ref_dict[k]
-				#the original header will be in list form, so need to convert to string
-				og_header = ' '.join([str(item) for item in og_header])
-				if header == og_header:
-					#match the original headers in the FASTA & reference files
-					#now print the new header to the outfile
-					outfile.write(">" + k + "\n")
+			if header in ref_dict:
+				#match the original headers in the FASTA & reference files
+				#now print the new header to the outfile
+				outfile.write(">" + ref_dict[header] + "\n")
 		else:
 			#sequence lines are copied to the outfile without changes
 			outfile.write(line)
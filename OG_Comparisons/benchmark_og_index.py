@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+#!/bin/python
+"""
+
+Title: benchmark_og_index.py
+Date: 2026-10-18
+Author: Virág Varga
+
+Description:
+	This program benchmarks the hash-indexed protein query ID to OG lookup engine in the
+		og_index.py module, which is used by og_membership_test.py to create the protein
+		query ID to list of assigned OGs dictionary (prot_dict).
+	Synthetic parsed OG dataframes (Broccoli, OrthoFinder, ProteinOrtho, SonicParanoid)
+		are generated for increasing numbers of protein queries, and the time needed to
+		build the program indexes and the prot_dict dictionary is reported, together with
+		the time per protein query. Roughly constant time per protein query across the
+		dataset sizes indicates linear scaling.
+
+List of functions:
+	simulate_og_df(prot_list, og_col, cluster_fraction, mean_og_size, rng):
+		Creates a synthetic parsed OG dataframe for one clustering program.
+	time_prot_dict(n_prots, rng):
+		Times the creation of prot_dict for a given number of protein queries.
+
+List of standard and non-standard modules used:
+	sys
+	time
+	numpy
+	pandas
+	og_index.py
+
+Procedure:
+	1. Loading required modules; defining the dataset sizes to be benchmarked.
+	2. Generating synthetic parsed OG dataframes and timing the creation of the program
+		indexes and the prot_dict dictionary for each dataset size.
+	3. Printing the results to the console.
+
+Known bugs and limitations:
+	- There is no quality-checking integrated into the code.
+	- The synthetic datasets only approximate the OG size distributions of real results.
+	- The og_index.py module must be located in the same directory as this program.
+
+Usage:
+	./benchmark_og_index.py [n_prots_1 n_prots_2 ...]
+	OR
+	python benchmark_og_index.py [n_prots_1 n_prots_2 ...]
+
+	* Where the default dataset sizes are 10 000, 100 000 and 1 000 000 protein queries.
+
+This script was written for Python 3.8.12, in Spyder 5.1.5.
+
+"""
+
+
+# Part 1: Loading required modules; defining the dataset sizes to be benchmarked.
+
+#import necessary modules
+import sys #allows assignment of command line arguments
+import time #allows timing of code execution
+import numpy as np #allows generation of random data
+import pandas as pd #facilitates manipulation of dataframes in Python
+from og_index import og_col_list, build_program_indexes, index_prot_dict #hash-indexed protein query to OG lookup
+
+
+if len(sys.argv) > 1:
+	#if the user gave dataset sizes, use those
+	n_prots_list = [int(arg) for arg in sys.argv[1:]]
+else:
+	#otherwise, benchmark from 10k to 1M protein queries
+	n_prots_list = [10000, 100000, 1000000]
+
+
+# Part 2: Generating synthetic parsed OG dataframes and timing the creation of the program
+# indexes and the prot_dict dictionary for each dataset size.
+
+def simulate_og_df(prot_list, og_col, cluster_fraction, mean_og_size, rng):
+	#select the subset of protein queries that the program clusters
+	clustered_prots = prot_list[rng.random(len(prot_list)) < cluster_fraction]
+	#shuffle them, so that OG members are not sorted by query ID
+	clustered_prots = rng.permutation(clustered_prots)
+	#assign each clustered protein query to an OG of roughly the mean OG size
+	n_ogs = max(1, len(clustered_prots) // mean_og_size)
+	og_ids = rng.integers(0, n_ogs, size=len(clustered_prots))
+	og_df = pd.DataFrame({'Query': clustered_prots,
+						  og_col: np.char.add(og_col[:2] + "_OG", og_ids.astype(str))})
+	#define objects to return
+	return og_df
+
+
+def time_prot_dict(n_prots, rng):
+	#create the protein query IDs
+	prot_list = np.char.add("Prot_", np.arange(n_prots).astype(str))
+	#create one parsed OG dataframe per clustering program
+	#each program clusters a different subset of the protein queries
+	og_df_list = [simulate_og_df(prot_list, og_col, 0.8, 8, rng) for og_col in og_col_list]
+
+	start_time = time.perf_counter()
+	#time the creation of the program indexes and the prot_dict dictionary
+	og_index_list = build_program_indexes(*og_df_list)
+	prot_dict = index_prot_dict(og_index_list)
+	elapsed_time = time.perf_counter() - start_time
+	#define objects to return
+	return elapsed_time, len(prot_dict)
+
+
+# Part 3: Printing the results to the console.
+
+rng = np.random.default_rng(42)
+#seed the random number generator, so that results are reproducible
+
+print("n_prots\tprot_dict_size\tseconds\tmicroseconds_per_prot")
+for n_prots in n_prots_list:
+	#iterate over the dataset sizes
+	elapsed_time, prot_dict_size = time_prot_dict(n_prots, rng)
+	#and print out the timing results
+	print(str(n_prots) + "\t" + str(prot_dict_size) + "\t" + "{:.3f}".format(elapsed_time) + "\t" +
+		  "{:.3f}".format(elapsed_time / n_prots * 1e6))
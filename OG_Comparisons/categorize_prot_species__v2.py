@@ -17,20 +17,25 @@ List of functions:
 List of standard and non-standard modules used:
 	sys
 	pandas
+	species_registry.py
 
 Procedure:
 	1. Loading required modules; defining inputs and outputs as command line
 		arguments.
 	2. Using Pandas to import the contents of the query protein and species information-containing
 		file into a dataframe.
-	3. Creating species category and phylum information dictionaries.
-	4. Adding the species category and phylum information into the dataframe.
+	3. Creating species category and phylum information dictionaries from the species registry.
+	4. Adding the species category and phylum information into the dataframe, by mapping
+		the distinct species IDs & species categories of the categorical columns.
 	5. Writing out the dataframe to a tab-separated text file.
 
 Known bugs and limitations:
 	- There is no quality-checking integrated into the code.
 	- This program requires the input of a file with query IDs in the first column,
 		and the species/strain IDs (derived from proteome file names) in the second column.
+	- The output file is compressed if its name ends in a compression file extension
+		(ex. prots_species_phyla_db.txt.gz). Note that the downstream scripts expect an
+		uncompressed file unless they read it with Pandas.
 
 Version: 
 	This is version 2 of this program, which accomadates the integration of Anaeramoeba lanta
@@ -51,6 +56,7 @@ This script was written for Python 3.8.12, in Spyder 5.1.5.
 #import necessary modules
 import sys #allows assignment of command line arguments
 import pandas as pd #facilitates manipulation of dataframes in Python
+from species_registry import load_registry, registry_map #species registry
 
 #assign command line arguments; load input and output files
 input_db = sys.argv[1]
@@ -69,76 +75,26 @@ prot_df = pd.read_csv(input_db, sep = '\t', names=colnames, header=None)
 
 #Part 3: Create species categorization and phylum dictionaries
 
+#the species categories and phyla are taken from the species registry
+registry_df = load_registry()
 #create dictionary connecting species designations to species categories
-category_dict = {'Anaeramoeba_lanta': 'Anaeramoeba_lanta_160522', 
-				 'BM_anaeromoeba': 'BM_newprots_may21.anaeromoeba',
-				 'BS_anaeromoeba': 'BS_newprots_may21.anaeromoeba',
-				 'Carpediemonas_membranifera': 'Carpediemonas_membranifera.PRJNA719540',
-				 'Dientamoeba_fragilis': 'Dientamoeba_fragilis.43352.aa',
-				 'Trepomonas_sp_PC1': 'EP00703_Trepomonas_sp_PC1',
-				 'Paratrimastix_pyriformis': 'EP00708_Paratrimastix_pyriformis',
-				 'Aduncisulcus_paluster': 'EP00764_Aduncisulcus_paluster',
-				 'Chilomastix_caulleryi': 'EP00766_Chilomastix_caulleryi',
-				 'Chilomastix_cuspidata': 'EP00767_Chilomastix_cuspidata',
-				 'Dysnectes_brevis': 'EP00768_Dysnectes_brevis',
-				 'Ergobibamus_cyprinoides': 'EP00769_Ergobibamus_cyprinoides',
-				 'Monocercomonoides_exilis': 'EP00770_Monocercomonoides_exilis',
-				 'Trimastix_marina': 'EP00771_Trimastix_marina',
-				 'Barthelona_sp_PAP020': 'EP00792_Barthelona_sp_PAP020',
-				 'Giardia_intestinalis_A': ['EP00701_Giardia_intestinalis', 'Giardia_intestinalis.PRJNA1439', 'GiardiaDB_GintestinalisADH'],
-				 'Giardia_intestinalis_B': ['GiardiaDB_GintestinalisBGS_B', 'GiardiaDB_GintestinalisBGS'],
-				 'Giardia_intestinalis_E': 'GiardiaDB_GintestinalisEP15',
-				 'Giardia_muris': 'Giardia_muris.PRJNA524057',
-				 'Histomonas_meleagridis': ['Histomonas_meleagridis.135588.aa', 'Histomonas_meleagridis.PRJNA594289'],
-				 'Kipferlia_bialata': 'Kipferlia_bialata.PRJDB5223',
-				 'Pentatrichomonas_hominis': 'Pentatrichomonas_hominis.5728.aa',
-				 'SC_anaeromoeba': 'SC_newprots_may21.anaeromoeba',
-				 'Spironucleus_salmonicida': 'Spironucleus_salmonicida.PRJNA60811',
-				 'Tetratrichomonas_gallinarum': 'Tetratrichomonas_gallinarum.5730.aa',
-				 'Tritrichomonas_foetus': 'Trichomonas_foetus.PRJNA345179',
-				 'Trichomonas_vaginalis': ['Trichomonas_vaginalis_GenBank.PRJNA16084', 'Trichomonas_vaginalis_RefSeq.G3']}
-
-
-#create a dictionary connecting phylum information to species categories
-phylum_dict = {'Anaeramoebidae': ['Anaeramoeba_lanta', 'BM_anaeromoeba', 'BS_anaeromoeba', 'SC_anaeromoeba'],
-			   'Parabasalia': ['Dientamoeba_fragilis', 'Histomonas_meleagridis', 'Pentatrichomonas_hominis',
-					  'Tetratrichomonas_gallinarum', 'Tritrichomonas_foetus', 'Trichomonas_vaginalis'],
-			   'Fornicata': ['Carpediemonas_membranifera', 'Trepomonas_sp_PC1', 'Aduncisulcus_paluster',
-					'Chilomastix_caulleryi', 'Chilomastix_cuspidata', 'Dysnectes_brevis', 'Ergobibamus_cyprinoides',
-					'Giardia_intestinalis_A', 'Giardia_intestinalis_B', 'Giardia_intestinalis_E', 'Giardia_muris',
-					'Kipferlia_bialata', 'Spironucleus_salmonicida'],
-			   'Preaxostyla': ['Paratrimastix_pyriformis', 'Monocercomonoides_exilis', 'Trimastix_marina'],
-			   'Other': 'Barthelona_sp_PAP020'}
+#dictionary format: category_dict[species_ID] = species_category
+category_dict = registry_map(registry_df, 'Species_Id', 'Species_Category')
+#create a dictionary connecting species categories to phylum information
+#dictionary format: phylum_dict[species_category] = phylum
+phylum_dict = registry_map(registry_df, 'Species_Category', 'Phylum')
 
 
 #Part 4: Add the species categories and phyla into the dataframe
 
-#create empty column for species category information
-prot_df['Species_Category'] = "-"
-
-for index, row in prot_df.iterrows():
-	#iterate through the dataframe row by row
-	for key in category_dict.keys():
-		#iterate over the dictionary via its keys
-		if row['Species_ID'] in category_dict[key]:
-			#if the species ID associated with a particular query protein
-			#is in the value (string or list) associated with a particular key in the category_dict
-			#then copy the dictionary key into the Species_Category column of that row
-			prot_df.at[index, 'Species_Category'] = key
-
-
-#create empty column for phylum information
-prot_df['Phylum'] = "-"
-
-for index, row in prot_df.iterrows():
-	#iterate through the dataframe row by row
-	for key in phylum_dict.keys():
-		#iterate over the dictionary via its keys
-		if row['Species_Category'] in phylum_dict[key]:
-			#if the species category associated with a particular query protein
-			#is in the value (string or list) associated with a particular key in the phylum_dict
-			#then copy the dictionary key into the Phylum column of that row
-			prot_df.at[index, 'Phylum'] = key
+#the species IDs are converted to a categorical column, so that each lookup is only done
+#once per distinct species ID (rather than once per protein), and applied to all rows at once
+#species IDs that are not in the registry get the "-" placeholder
+prot_df['Species_Category'] = prot_df['Species_ID'].astype('category').map(category_dict).astype(object).fillna("-")
+
+#in the same way, look up the phylum of each distinct species category
+#and apply it to all rows at once
+prot_df['Phylum'] = prot_df['Species_Category'].astype('category').map(phylum_dict).astype(object).fillna("-")
 
 
 #Part 5: Write out resulting dataframe to a tab-separated text file
@@ -18,19 +18,20 @@ List of standard and non-standard modules used:
 	argparse
 	pandas
 	os
+	og_presence.py
 
 Procedure:
 	1. Assignment of command-line arguments with argparse.
 	2. Importing modules and parsing arguments. Running code specific to individual
 		arguments for import into a Pandas dataframe.
 	3. Main program code:
-		- Setting up outfile, importing data into Pandas & variables
-		- Setting up data types (dataframe for ref file, dictionary for infile) that will be used
-		- Creating dictionary of species represented in each OG
+		- Importing data into Pandas & loading the OG x species category presence matrix
+			(og_presence.py)
 		- Identifying OGs that meet the species percentage representation threshold
 	4. Writing out dataframe of minimum species membership threshold-matching OGs to a
 		tab-separated text file.
 	5. Writing out summary text file. 
+	Steps 3 (the threshold filtering) to 5 are repeated for each threshold value given.
 
 Known bugs and limitations:
 	- There is no quality-checking integrated into the code.
@@ -40,16 +41,25 @@ Known bugs and limitations:
 		used by the parsers used previously in this workflow.
 	- The program cannot accept multiple input parsed OG files, nor can it determine the type
 		of input file it was given (ie. which program's results file was used as input).
+	- The og_presence.py module must be located in the same directory as this program. The
+		atomic_output.py module it imports (in the DB_Construct/ directory of this repository)
+		must be located there as well, or in a directory listed in the PYTHONPATH environment
+		variable (ex. PYTHONPATH=../DB_Construct).
 
 Version: 
 	This is version 2.0 of this script. There is now a summary text file produced at the end listing
 		the number of OGs that have the threshold minimum percent species represented, as well as 
 		the OG IDs of these OGs. 
+	The species category lookups were later vectorized: the OG x species category presence
+		matrix of the og_presence.py module is used to identify the threshold-meeting OGs. The
+		matrix is cached on disk, and shared with the other representation filters in this
+		directory. Multiple threshold values can now be given (as a comma-separated list,
+		ex. --threshold_minimum 40,50,80,100), and are all filtered from a single data import.
 
 Usage:
-	./filter_OG_speciesRep__v2.py [-h] [--threshold_minimum THRESHOLD_MINIMUM] [-br] [-of] [-po] [-sp] [-v] INPUT_FILE REFERENCE_FILE
+	./filter_OG_speciesRep__v2.py [-h] [--threshold_minimum THRESHOLD_MINIMUM[,THRESHOLD_MINIMUM,...]] [-br] [-of] [-po] [-sp] [-v] INPUT_FILE REFERENCE_FILE
 	OR
-	python filter_OG_speciesRep__v2.py [-h] [--threshold_minimum THRESHOLD_MINIMUM] [-br] [-of] [-po] [-sp] [-v] INPUT_FILE REFERENCE_FILE
+	python filter_OG_speciesRep__v2.py [-h] [--threshold_minimum THRESHOLD_MINIMUM[,THRESHOLD_MINIMUM,...]] [-br] [-of] [-po] [-sp] [-v] INPUT_FILE REFERENCE_FILE
 
 This script was written for Python 3.8.12, in Spyder 5.1.5.
 """
@@ -96,11 +106,15 @@ parser.add_argument(
 	#the '-sp' flag will import the input file in the manner appropriate for the parsed SonicParanoid results
 parser.add_argument(
 	"--threshold_minimum",
-	type=int,
-	default=85,
-	help = "Integer value of minimum percent of species that should be represented in OGs. (Default = 85)"
+	type=str,
+	default='85',
+	help = "Integer value of minimum percent of species that should be represented in OGs. (Default = 85) \
+		Multiple values can be given as a comma-separated list (ex. 40,50,80), in which case a set of \
+		output files is written for each of them."
 	)
-	#the `type=int` argument allows argparse to accept the input as an integer
+	#the comma-separated values are converted to integers after the arguments are parsed
+	#a comma-separated list allows a sweep of threshold values to be filtered from a single data import
+	#while a single value (ex. `--threshold_minimum 80`) works as in earlier versions of this program
 	#the `default=3` gives a default minimum membership filtration value
 	#ref: https://stackoverflow.com/questions/44011031/how-to-pass-a-string-as-an-argument-in-python-without-namespace
 	#ref: https://stackoverflow.com/questions/14117415/in-python-using-argparse-allow-only-positive-integers
@@ -141,14 +155,19 @@ args = parser.parse_args()
 #import necessary modules
 import pandas as pd #allows manipulation of dataframes in Python
 import os #allow access to computer files
+from og_presence import load_presence, filter_min_species #OG x species & phylum presence matrices
 
 
 #designate input file name as variable
 infile = args.input_file.name
 #designate reference file name as variable
 ref_db = args.ref_file.name
-#designate mimium OG membership threshold value as variable
-threshold_value = args.threshold_minimum
+#designate mimium OG membership threshold value(s) as variable
+#multiple threshold values are given as a comma-separated list
+try:
+	threshold_value_list = [int(threshold) for threshold in args.threshold_minimum.split(',')]
+except ValueError:
+	parser.error("argument --threshold_minimum: invalid int value(s): " + repr(args.threshold_minimum))
 
 
 #parse arguments
@@ -180,15 +199,11 @@ if args.SonicParanoid:
 #################################   Main Program   ######################################
 
 
-#Part 1: Set up outfile, import data into Pandas & variables
+#Part 1: Import data into Pandas & load the OG x species category presence matrix
 
-#define the output files based on the input file name
+#define the base of the output file names based on the input file name
 base = os.path.basename(infile)
 out_full = os.path.splitext(base)[0]
-#parsed OG output file
-output_file = out_full + "_OGsMembership" + str(threshold_value) + ".txt"
-#summary output file
-output_summary_file = out_full + "_OGsMembership" + str(threshold_value) + "__SUMMARY.txt"
 
 #import input file into pandas dataframe
 ortho_df = pd.read_csv(infile, sep = '\t', header = 0)
@@ -202,115 +217,77 @@ if col_num == 3:
 	#remove middle column with species information
 	ortho_df.drop(ortho_df.columns[1], axis=1, inplace=True)
 
+#identify OG column name (for use later)
+og_col = ortho_df.columns[1]
 
-#import reference file into Pandas dataframe
-ref_df = pd.read_csv(ref_db, sep = '\t', header = 0)
+#load the OG x species category presence matrix of the input file
+#the matrix is built from the input file and the reference file by the og_presence module,
+#or loaded from its cache if the same input files have been used before
+presence_dict = load_presence(infile, ref_db, ortho_df)
 
+#get number of species represented
+total_species_num = len(presence_dict['species_ids'])
+#for the original Thesis project workflow, this should be 26
 
-#convert membership percentage to a decimal
-membership_decimal = float(threshold_value)/100
+#calculate number of OGs included in the original dataframe
+original_og_num = len(ortho_df[og_col].unique())
 
 
-#Part 2: Set up data types (dataframe for ref file, dictionary for infile) that will be used
+for threshold_value in threshold_value_list:
+	#iterate over the threshold values
+	#each threshold is a vectorized reduction over the same presence matrix
 
-#identify OG column name (for use later)
-og_col = ortho_df.columns[1]
+	#Part 2: Identify OGs that meet the species percentage representation threshold
 
-#create a dictionary in the format: og_dict[og_id] = list_of_proteins
-#this will allow easier analysis
-grouped_ortho_df = ortho_df.groupby(og_col)['Query'].apply(list).reset_index(name="OG_members")
-#the proteins in the 'Query' column are grouped into lists according to the OG they belong to
-#the new column of lists is named 'OG_members'
-ortho_dict = grouped_ortho_df.set_index(og_col).to_dict()['OG_members']
-#the new dataframe is converted into a dictionary,
-#where the OG IDs are the keys, and the lists of protein members of the OGs are the values
-
-
-#Part 3: Create dictionary of species represented in each OG
-
-#create empty dictionary for species information
-species_OG_dict = {}
-
-for key in ortho_dict.keys():
-	#iterate over the dictionary via its keys
-	species_list = []
-	#create empty list that will be populated with species information
-	og_prot_list = ortho_dict[key]
-	#save list of protein query IDs associated with the given OG
-	for prot in og_prot_list:
-		#iterate over the list of protein query IDs
-		prot_species = ref_df.loc[ref_df['Query'] == prot, 'Species_Category'].iloc[0]
-		#with .loc, find the location where the protein query ID is found in the 'Query' column
-		#then extract the contents of that cell, as well as the cell in the same row that is in the 'Species_Category' column
-		#use slicing and .iloc to extract the contents of the 'Species_Category' column
-		#and save the species category to variable prot_species
-		#append the species category to the species_list
-		species_list.append(prot_species)
-	species_set = set(species_list)
-	#turn the species_list into a set to eliminate duplicates
-	#and save the species_set as the value in the OG to species dictionary
-	species_OG_dict[key] = species_set
-
-
-#Part 4: Identify OGs that meet the species percentage representation threshold
+	#parsed OG output file
+	output_file = out_full + "_OGsMembership" + str(threshold_value) + ".txt"
+	#summary output file
+	output_summary_file = out_full + "_OGsMembership" + str(threshold_value) + "__SUMMARY.txt"
 
-#get number of species represented
-total_species = ref_df.Species_Category.unique()
-#save list of species categories to a variable
-total_species_num = len(total_species)
-#count the number of elements of the species category list
-#for the original Thesis project workflow, this should be 26
+	#convert membership percentage to a decimal
+	membership_decimal = float(threshold_value)/100
 
-threshold_species_num = round(total_species_num*membership_decimal)
-#get the minimum number of species needed to hit the species membership threshold
-#round the number to the nearest integer (up or down)
+	threshold_species_num = round(total_species_num*membership_decimal)
+	#get the minimum number of species needed to hit the species membership threshold
+	#round the number to the nearest integer (up or down)
 
+	#identify the OGs that meet the minimum species inclusion threshold number
+	threshold_og_list = filter_min_species(presence_dict, threshold_species_num)
+	#the number of species categories per OG is the row sum of the presence matrix
 
-#create new dictionary for data that meets the threshold
-threshold_og_list = []
 
-for key in species_OG_dict.keys():
-	#iterate over the dictionary via its keys
-	if len(species_OG_dict[key]) >= threshold_species_num:
-		#identify the OGs that meet the minimum species inclusion threshold number
-		#and save the OG to the list of threshold_og_list
-		threshold_og_list.append(key)
+	#Part 3: Copy threshold-meeting OG information into a new dataframe & write out
 
+	#create new dataframe with threshold-meeting OGs
+	threshold_df = ortho_df[ortho_df[og_col].isin(threshold_og_list)].copy()
+	#use `.isin()` to iterate over entire list of threshold-meeting OGs
+	#use `.copy()` to ensure the dataframe is seperate from the ortho_df
 
-#Part 5: Copy threshold-meeting OG information into a new dataframe & write out
+	#Writing out the results to a tab-separated text file
+	threshold_df.to_csv(output_file, sep='\t', index=False)
 
-#create new dataframe with non-paralog OGs
-threshold_df = ortho_df[ortho_df[og_col].isin(threshold_og_list)].copy()
-#use `.isin()` to iterate over entire list of non-paralog OGs
-#use `.copy()` to ensure the dataframe is seperate from the ortho_df
 
-#Writing out the results to a tab-separated text file
-threshold_df.to_csv(output_file, sep='\t', index=False)
+	#Part 4: Create summary data text file
 
+	#compute statistics to include in the summary file
+	threshold_og_num = len(threshold_df[og_col].unique())
+	#calculate number of OGs included in the filtered dataframe
+	percent_ogs_remaining = (threshold_og_num/original_og_num)*100
+	#calculate percent of OGs remaining
+	rounded_percent = round(percent_ogs_remaining, 3)
+	#round the percentage to 3 decimal places
 
-#Part 6: Create summary data text file
+	#get list of "good" OGs for summary file
+	good_OG_list = threshold_df[og_col].unique()
 
-#compute statistics to include in the summary file
-threshold_og_num = len(threshold_df[og_col].unique())
-#calculate number of OGs included in the filtered dataframe
-original_og_num = len(ortho_df[og_col].unique())
-#calculate number of OGs included in the original dataframe
-percent_ogs_remaining = (threshold_og_num/original_og_num)*100
-#calculate percent of OGs remaining
-rounded_percent = round(percent_ogs_remaining, 3)
-#round the percentage to 3 decimal places
-
-#get list of "good" OGs for summary file
-good_OG_list = threshold_df[og_col].unique()
-
-
-with open(output_summary_file, "w") as outfile: 
-	#open the summary file for writing
-	outfile.write("The number of orthologous clusters created by the " + prog_id + " program that meet " + "\n" + 
-			   "the desired threshold value of " + str(threshold_value) + "% is " + str(threshold_og_num) + "." + "\n\n")
-	outfile.write("In contrast, the total number of orthologous clusters created by this program was " + str(original_og_num) + ", " + "\n" + 
-			   "which means that " + str(rounded_percent) + "% of the clusters met the desired threshold value." + "\n\n")
-	outfile.write("The OGs that met the threshold percent are: " + "\n")
-	for element in good_OG_list:
-		#iterate through the list of good OGs and write them out to the file
-		outfile.write(element + "\n")
+
+	with open(output_summary_file, "w") as outfile: 
+		#open the summary file for writing
+		outfile.write("The number of orthologous clusters created by the " + prog_id + " program that meet " + "\n" + 
+				   "the desired threshold value of " + str(threshold_value) + "% is " + str(threshold_og_num) + "." + "\n\n")
+		outfile.write("In contrast, the total number of orthologous clusters created by this program was " + str(original_og_num) + ", " + "\n" + 
+				   "which means that " + str(rounded_percent) + "% of the clusters met the desired threshold value." + "\n\n")
+		outfile.write("The OGs that met the threshold percent are: " + "\n")
+		for element in good_OG_list:
+			#iterate through the list of good OGs and write them out to the file
+			outfile.write(element + "\n")
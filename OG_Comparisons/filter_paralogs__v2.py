@@ -18,14 +18,14 @@ List of standard and non-standard modules used:
 	argparse
 	pandas
 	os
+	og_presence.py
 
 Procedure:
 	1. Assignment of command-line arguments with argparse.
 	2. Importing modules and parsing arguments. Running code specific to individual
 		arguments for import into a Pandas dataframe.
 	3. Main program code:
-		- Importing reference file into Pandas dataframe
-		- Importing OG data into dictionary with format ortho_dict[OG_ID] = list_of_queries
+		- Loading the OG x species category presence matrix (og_presence.py)
 		- Identifying OGs that are paralogs, and creating a list of non-paralog OGs
 		- Creating a Pandas dataframe containing only the non-paralog OGs
 	4. Writing out dataframe of non-paralog OGs to a tab-separated text file.
@@ -38,6 +38,10 @@ Known bugs and limitations:
 		used by the parsers used previously in this workflow.
 	- The program cannot accept multiple input parsed OG files, nor can it determine the type
 		of input file it was given (ie. which program's results file was used as input).
+	- The og_presence.py module must be located in the same directory as this program. The
+		atomic_output.py module it imports (in the DB_Construct/ directory of this repository)
+		must be located there as well, or in a directory listed in the PYTHONPATH environment
+		variable (ex. PYTHONPATH=../DB_Construct).
 
 Version: 
 	This is version 2.0 of the program. The following changes were make to the script, 
@@ -45,6 +49,9 @@ Version:
 		- Made the script more flexible re: number of columns. Now filtered parsed data
 			can still be processed, even if the formatting does not match the original
 			parsed OG data file. 
+	The species category lookups were later vectorized: the OG x species category presence
+		matrix of the og_presence.py module is used to identify the paralogs. The matrix
+		is cached on disk, and shared with the other representation filters in this directory.
 
 Usage:
 	./filter_paralogs.py [-h] [-br] [-of] [-po] [-sp] [-v] INPUT_FILE REFERENCE_FILE
@@ -131,6 +138,7 @@ args = parser.parse_args()
 #import necessary modules
 import pandas as pd #allows manipulation of dataframes in Python
 import os #allow access to computer files
+from og_presence import load_presence, filter_min_species #OG x species & phylum presence matrices
 
 
 #designate input file name as variable
@@ -192,7 +200,7 @@ if args.SonicParanoid:
 #################################   Main Program   ######################################
 
 
-#Part 1: Set up data types (dataframe for ref file, dictionary for infile) that will be used
+#Part 1: Set up the OG dataframe and the OG x species category presence matrix
 
 #remove 3rd column from Pandas dataframe if necessary 
 #needed for original parsed results of OrthoFinder, ProteinOrtho & SonicParanoid
@@ -204,49 +212,20 @@ if col_num == 3:
 	ortho_df.drop(ortho_df.columns[1], axis=1, inplace=True)
 
 
-#import reference file into Pandas dataframe
-ref_df = pd.read_csv(ref_db, sep = '\t', header = 0)
-
-
 #identify OG column name (for use later)
 og_col = ortho_df.columns[1]
 
-#create a dictionary in the format: og_dict[og_id] = list_of_proteins
-#this will allow easier analysis
-grouped_ortho_df = ortho_df.groupby(og_col)['Query'].apply(list).reset_index(name="OG_members")
-#the proteins in the 'Query' column are grouped into lists according to the OG they belong to
-#the new column of lists is named 'OG_members'
-ortho_dict = grouped_ortho_df.set_index(og_col).to_dict()['OG_members']
-#the new dataframe is converted into a dictionary,
-#where the OG IDs are the keys, and the lists of protein members of the OGs are the values
+#load the OG x species category presence matrix of the input file
+#the matrix is built from the input file and the reference file by the og_presence module,
+#or loaded from its cache if the same input files have been used before
+presence_dict = load_presence(infile, ref_db, ortho_df)
 
 
 #Part 2: Identify the non-paralog OGs
 
-#create empty list for non-paralog OGs
-non_paralog_OG_list = []
-
-for key in ortho_dict.keys():
-	#iterate through the dictionary via its keys
-	species_list = []
-	#create an empty list to hold the species categories of the protein queries
-	OG_prot_list = ortho_dict[key]
-	#create list containing the protein queries in the OG, for ease of use
-	for prot in OG_prot_list:
-		#iterate through the protein queries in the list
-		prot_idx = ref_df.index[ref_df['Query'] == prot][0]
-		#get the index of the protein query in the reference dataframe
-		prot_species = ref_df.iloc[prot_idx]['Species_Category']
-		#get the species category assigned to that particular protein query
-		#and append it to the species list
-		species_list.append(prot_species)
-	species_set = set(species_list)
-	#convert the species list into a set to remove duplicates
-	if len(species_set) > 1:
-		#if the length of the species set is greater than 1,
-		#then more than 1 species category is represented in the OG
-		#if this is the case, save the OG ID to the non_paralog_OG_list
-		non_paralog_OG_list.append(key)
+#if more than 1 species category is represented in an OG, it is not a paralog
+non_paralog_OG_list = filter_min_species(presence_dict, 2)
+#the number of species categories per OG is the row sum of the presence matrix
 
 
 #Part 3: Copy non-paralog OG information into a new dataframe & write out
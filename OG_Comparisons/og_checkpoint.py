@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+#!/bin/python
+"""
+
+Title: og_checkpoint.py
+Date: 2026-10-18
+Author: Virág Varga
+
+Description:
+	This module contains the binary checkpoint store used by the og_membership_test.py and
+		og_overlap_percent.py programs, replacing the JSON checkpoint files that were
+		previously written to the working directory under fixed names.
+	Checkpoints are written to run-scoped directories, in the format:
+		run_root/input_hash/checkpoint_name[__parameters].arrow
+		Where the input_hash is a content hash of the input files of the run. Re-running the
+		program on unchanged input files therefore finds the checkpoints of the earlier run,
+		and they are re-used automatically; while changed input files get a new directory, so
+		earlier results are never overwritten. Checkpoints that depend on parameters (ex. the
+		similarity metric) include these in the file name.
+	The checkpoints are stored as uncompressed Apache Arrow IPC (Feather v2) tables, which
+		are compact, typed, and can be memory-mapped. The OG dictionaries, of which the programs
+		only look up the OGs of the protein queries they compare, are loaded lazily: only the
+		OG IDs are read when the checkpoint is loaded, and the members of an OG are read from the
+		memory-mapped table when the OG is looked up. The other checkpoints are used in full by
+		the programs, so their tables are converted back into dictionaries or lists when loaded.
+	The dictionaries are stored as the following tables:
+		- OG dictionaries (broccoli_dict, etc.): OG\tQuery (one row per OG member)
+		- Protein query dictionaries (prot_dict, filt_prot_dict):
+			Query\tBroccoli_OG\tOrthoFinder_OG\tProteinOrtho_OG\tSonicParanoid_OG
+		- Comparison & average score dictionaries (compare_OG_dict, og_score_dict): Comparison\tScore
+		- Score lists (compare_OG_[comparison]): Score
+
+List of functions:
+	hash_inputs(input_list, param_list):
+		Calculates the content hash of a list of input files and parameters.
+	checkpoint_dir(run_root, input_list):
+		Creates (if needed) and returns the run-scoped checkpoint directory of a set of input files.
+	checkpoint_path(store_dir, name, param_list):
+		Returns the path to a checkpoint file.
+	has_checkpoint(store_dir, name, param_list):
+		Checks whether a checkpoint exists.
+	save_checkpoint(store_dir, name, data, param_list):
+		Converts a dictionary or list into a table, and writes it to a checkpoint file.
+	checkpoint_kind(name):
+		Identifies the table format of a checkpoint from its name.
+	load_table(path):
+		Memory-maps a checkpoint file as an Arrow table.
+	OGTableDict(data_table):
+		A read-only OG dictionary backed by a memory-mapped OG dictionary table, which reads
+		the members of an OG from the table when the OG is looked up.
+	table_to_data(data_table, kind):
+		Converts a checkpoint table back into a dictionary or list (or an OGTableDict, for
+		OG dictionaries).
+	load_checkpoint(store_dir, name, param_list):
+		Loads a checkpoint file and converts it back into a dictionary or list.
+	load_checkpoint_file(path):
+		Loads a checkpoint file given by its path, which can also be a JSON checkpoint
+		file from earlier versions of the programs.
+
+List of standard and non-standard modules used:
+	os
+	json
+	hashlib
+	collections.abc
+	numpy
+	pandas
+	pyarrow
+	atomic_output.py
+
+Procedure:
+	1. Loading required modules; defining the checkpoint table formats.
+	2. Defining the functions of the module.
+
+Known bugs and limitations:
+	- There is no quality-checking integrated into the code.
+	- The content hash is calculated from the contents of the input files, not their names
+		or locations, so identical files at different paths share a checkpoint directory.
+	- OG IDs are stored as strings.
+	- The OG dictionaries loaded from checkpoints are read-only. Iterating over their items()
+		reads all of the OG members at once.
+	- Old checkpoint directories are not removed automatically.
+	- This is a module, not a stand-alone program. It should be imported by scripts
+		located in the same directory.
+	- The atomic_output.py module (in the DB_Construct/ directory of this repository) must be
+		located in the same directory as this module (ex. when all programs are copied into the
+		same Scripts/ directory, as in the README), or in a directory listed in the PYTHONPATH
+		environment variable (ex. PYTHONPATH=../DB_Construct).
+
+Usage:
+	from og_checkpoint import checkpoint_dir, has_checkpoint, save_checkpoint, load_checkpoint
+
+This script was written for Python 3.8.12, in Spyder 5.1.5.
+
+"""
+
+
+# Part 1: Loading required modules; defining the checkpoint table formats.
+
+#import necessary modules
+import os #allow access to computer files
+import json #allows import of checkpoints from earlier versions of the programs in JSON format
+import hashlib #allows calculation of content hashes
+from collections.abc import Mapping #allows creation of read-only dictionary-like objects
+import numpy as np #facilitates manipulation of arrays in Python
+import pandas as pd #facilitates manipulation of dataframes in Python
+from pyarrow import feather #allows reading, writing & memory-mapping of Arrow IPC (Feather v2) files
+from atomic_output import atomic_output #writing of complete files only
+
+
+#the column names of the protein query dictionary tables
+prot_col_list = ['Broccoli_OG', 'OrthoFinder_OG', 'ProteinOrtho_OG', 'SonicParanoid_OG']
+
+#the table format of each checkpoint, in the format: checkpoint_kind_dict[checkpoint_name] = table_kind
+checkpoint_kind_dict = {
+	'broccoli_dict': 'og_dict',
+	'orthofinder_dict': 'og_dict',
+	'proteinortho_dict': 'og_dict',
+	'sonicparanoid_dict': 'og_dict',
+	'prot_dict': 'prot_dict',
+	'filt_prot_dict': 'prot_dict',
+	'compare_OG_dict': 'comparison_dict',
+	'og_score_dict': 'score_dict'
+	}
+
+#the file extension of the checkpoint files
+checkpoint_ext = '.arrow'
+
+
+# Part 2: Defining the functions of the module.
+
+def hash_inputs(input_list, param_list=()):
+	#calculate a content hash of the input files, so that unchanged inputs give the same key
+	input_hash = hashlib.blake2b(digest_size=16)
+	for input_file in input_list:
+		#iterate over the input files
+		with open(input_file, 'rb') as infile:
+			#and read each of them in blocks, so that large files are not loaded into memory
+			for block in iter(lambda: infile.read(1 << 20), b''):
+				input_hash.update(block)
+		#mark the end of each file, so that the same data split differently gives a different hash
+		input_hash.update(b'\0')
+	for param in param_list:
+		#add the parameters to the hash
+		input_hash.update(str(param).encode() + b'\0')
+	#define objects to return
+	return input_hash.hexdigest()
+
+
+def checkpoint_dir(run_root, input_list):
+	#the checkpoint directory of a run is named after the content hash of its input files
+	store_dir = os.path.join(run_root, hash_inputs(input_list))
+	os.makedirs(store_dir, exist_ok=True)
+	#define objects to return
+	return store_dir
+
+
+def checkpoint_path(store_dir, name, param_list=()):
+	#parameters that the checkpoint depends on are included in the file name
+	file_name = '__'.join([name] + [str(param) for param in param_list]) + checkpoint_ext
+	#define objects to return
+	return os.path.join(store_dir, file_name)
+
+
+def has_checkpoint(store_dir, name, param_list=()):
+	#check whether the checkpoint has already been written
+	return os.path.isfile(checkpoint_path(store_dir, name, param_list))
+
+
+def checkpoint_kind(name):
+	#the per-comparison score lists are named compare_OG_[comparison]
+	if name not in checkpoint_kind_dict and name.startswith('compare_OG_'):
+		return 'score_list'
+	#define objects to return
+	return checkpoint_kind_dict[name]
+
+
+def save_checkpoint(store_dir, name, data, param_list=()):
+	#convert the dictionary or list into a dataframe, according to the checkpoint kind
+	kind = checkpoint_kind(name)
+	if kind == 'og_dict':
+		#og_dict[og_id] = list_of_proteins becomes one row per OG member
+		data_df = pd.DataFrame({'OG': [str(og_id) for og_id, og_members in data.items() for _ in og_members],
+						  'Query': [prot for og_members in data.values() for prot in og_members]})
+	elif kind == 'prot_dict':
+		#prot_dict[query_id] = [br_og, of_og, po_og, sp_og] becomes one row per protein query
+		data_df = pd.DataFrame([[str(og_id) for og_id in og_list] for og_list in data.values()],
+						 columns=prot_col_list)
+		data_df.insert(0, 'Query', list(data.keys()))
+	elif kind == 'comparison_dict':
+		#comparison_dict[prog_vs_prog] = list_of_scores becomes one row per score
+		#comparisons without any scores are kept as a single empty (NaN) row
+		score_lists = [scores if len(scores) > 0 else [float('nan')] for scores in data.values()]
+		data_df = pd.DataFrame({'Comparison': [key for key, scores in zip(data.keys(), score_lists) for _ in scores],
+						  'Score': pd.Series([score for scores in score_lists for score in scores], dtype='float64')})
+	elif kind == 'score_dict':
+		#og_score_dict[prog_vs_prog] = average_score becomes one row per comparison
+		data_df = pd.DataFrame({'Comparison': list(data.keys()),
+						  'Score': pd.Series(list(data.values()), dtype='float64')})
+	else:
+		#score lists are stored as a single column
+		data_df = pd.DataFrame({'Score': pd.Series(data, dtype='float64')})
+
+	path = checkpoint_path(store_dir, name, param_list)
+	with atomic_output(path, 'wb') as outfile:
+		#uncompressed files can be memory-mapped when they are loaded
+		feather.write_feather(data_df, outfile, compression='uncompressed')
+	#define objects to return
+	return path
+
+
+def load_table(path):
+	#memory-map the checkpoint file, so that its contents are only read from disk when they are used
+	#define objects to return
+	return feather.read_table(path, memory_map=True)
+
+
+class OGTableDict(Mapping):
+	#a read-only dictionary in the format: og_dict[og_id] = list_of_proteins
+	#backed by an OG dictionary table, in which the members of each OG are in consecutive rows
+	def __init__(self, data_table):
+		#only the OG column is read, as integer codes for the OG IDs
+		og_array = data_table.column('OG').combine_chunks().dictionary_encode()
+		og_code_array = og_array.indices.to_numpy(zero_copy_only=False)
+		#identify the first row of each OG, and add the end of the table
+		self.offset_array = np.append(np.flatnonzero(np.diff(og_code_array, prepend=-1)), len(og_code_array))
+		#the OG IDs are listed in the order of the table
+		og_id_list = og_array.dictionary.to_pylist()
+		if len(og_id_list) != len(self.offset_array) - 1:
+			#an OG whose members are not in consecutive rows cannot be looked up as a single slice
+			raise ValueError("The members of each OG must be in consecutive rows of the OG dictionary table.")
+		#create the dictionary in the format: og_index_dict[og_id] = index_of_OG_in_offset_array
+		self.og_index_dict = dict(zip(og_id_list, range(len(og_id_list))))
+		self.query_column = data_table.column('Query')
+
+	def __getitem__(self, og_id):
+		#read the members of the OG from the table
+		og_index = self.og_index_dict[og_id]
+		og_start = int(self.offset_array[og_index])
+		#define objects to return
+		return self.query_column.slice(og_start, int(self.offset_array[og_index + 1]) - og_start).to_pylist()
+
+	def __iter__(self):
+		return iter(self.og_index_dict)
+
+	def __len__(self):
+		return len(self.og_index_dict)
+
+	def items(self):
+		#when all of the OGs are used, the members of all of the OGs are read at once
+		query_list = self.query_column.to_pylist()
+		#define objects to return
+		return [(og_id, query_list[og_start:og_end]) for og_id, og_start, og_end in
+				zip(self.og_index_dict, self.offset_array[:-1].tolist(), self.offset_array[1:].tolist())]
+
+
+def table_to_data(data_table, kind):
+	#convert the Arrow table back into the dictionary or list format used by the programs
+	if kind == 'og_dict':
+		#the OG dictionaries are only looked up by OG ID, so their members stay in the memory-mapped table
+		return OGTableDict(data_table)
+	if kind == 'prot_dict':
+		query_list = data_table.column('Query').to_pylist()
+		og_lists = zip(*[data_table.column(col).to_pylist() for col in prot_col_list])
+		return dict(zip(query_list, [list(og_list) for og_list in og_lists]))
+	if kind == 'comparison_dict':
+		data_df = data_table.to_pandas()
+		#the empty (NaN) rows of comparisons without any scores are dropped again
+		return data_df.groupby('Comparison', sort=False)['Score'].apply(lambda scores: scores.dropna().tolist()).to_dict()
+	if kind == 'score_dict':
+		return dict(zip(data_table.column('Comparison').to_pylist(), data_table.column('Score').to_pylist()))
+	#score lists
+	return data_table.column('Score').to_pylist()
+
+
+def load_checkpoint(store_dir, name, param_list=()):
+	#load the checkpoint and convert it back into a dictionary or list
+	data_table = load_table(checkpoint_path(store_dir, name, param_list))
+	#define objects to return
+	return table_to_data(data_table, checkpoint_kind(name))
+
+
+def load_checkpoint_file(path):
+	#JSON checkpoint files from earlier versions of the programs can still be loaded
+	if path.endswith('.json'):
+		with open(path) as json_file:
+			return json.load(json_file)
+	#otherwise, identify the checkpoint kind from the file name
+	#parameters are separated from the checkpoint name by '__'
+	name = os.path.basename(path)[:-len(checkpoint_ext)].split('__')[0]
+	#define objects to return
+	return table_to_data(load_table(path), checkpoint_kind(name))
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+#!/bin/python
+"""
+
+Title: og_contingency.py
+Date: 2026-10-18
+Author: Virág Varga
+
+Description:
+	This module contains the sparse contingency matrix engine used by the contingency mode
+		of the og_membership_test.py program, to compare the complete clusterings created by
+		Broccoli, OrthoFinder, ProteinOrtho and SonicParanoid.
+	For each program, a sparse protein x OG indicator matrix is built once, with the protein
+		query IDs and the OG IDs of the program converted to integer codes. For each pair of
+		programs, the product of the two indicator matrices gives the OG x OG contingency
+		matrix, in which each cell contains the number of proteins shared by the two OGs.
+		From this matrix, the following are derived in one pass:
+		- The similarity scores of all pairs of OGs that share at least 1 protein
+		- The best-matching OG of each OG in the other program
+		- The global agreement indices of the two clusterings: the Adjusted Rand Index (ARI),
+			the Normalized Mutual Information (NMI; arithmetic mean normalization),
+			homogeneity, completeness and V-measure
+		- The average similarity score per protein query, which is the value computed by the
+			per-protein membership test of og_membership_test.py
+	The global agreement indices are computed on the proteins clustered by both programs.
+
+List of functions:
+	build_indicator_matrix(og_df, og_col, prot_index):
+		Creates the sparse protein x OG indicator matrix of one clustering program.
+	build_program_matrices(og_df_list):
+		Creates the indicator matrices and OG sizes of all of the clustering programs.
+	score_overlaps(shared_counts, size_a, size_b, metric):
+		Calculates the similarity scores of OG pairs from their sizes and the number of
+		proteins they share.
+	overlap_table(contingency, og_ids_a, og_ids_b, size_a, size_b, prog_a, prog_b, metric):
+		Creates the dataframe of all OG pairs that share proteins, with their similarity
+		scores and best-match flags.
+	agreement_indices(contingency):
+		Calculates the global agreement indices of two clusterings from their contingency
+		matrix.
+
+List of standard and non-standard modules used:
+	numpy
+	pandas
+	scipy.sparse
+	og_index.py
+
+Procedure:
+	1. Loading required modules.
+	2. Defining the functions of the module.
+
+Known bugs and limitations:
+	- There is no quality-checking integrated into the code.
+	- This module is intended for use with parsed Broccoli results from which duplicates have
+		already been removed. If a protein is assigned to more than 1 OG by a program, the
+		OG overlaps are still correct, but the global agreement indices and the average
+		score per protein will count that protein more than once.
+	- The difflib metric is order-dependent, and so cannot be computed from the contingency
+		matrix. Only the set-based metrics of og_scoring.py (dice, jaccard, overlap) are supported.
+	- This is a module, not a stand-alone program. It should be imported by scripts
+		located in the same directory.
+
+Usage:
+	from og_contingency import build_program_matrices, overlap_table, agreement_indices
+
+This script was written for Python 3.8.12, in Spyder 5.1.5.
+
+"""
+
+
+# Part 1: Loading required modules.
+
+#import necessary modules
+import numpy as np #allows vectorized manipulation of numerical arrays
+import pandas as pd #facilitates manipulation of dataframes in Python
+from scipy import sparse #allows creation & multiplication of sparse matrices
+from og_index import og_col_list #the OG ID column names of the parsed OG files
+
+
+# Part 2: Defining the functions of the module.
+
+def build_indicator_matrix(og_df, og_col, prot_index):
+	#each protein query to OG assignment should only be counted once
+	og_df = og_df[['Query', og_col]].drop_duplicates()
+	#convert the protein query IDs into integer codes, using the index shared by all programs
+	prot_codes = prot_index.get_indexer(og_df['Query'])
+	#convert the OG IDs of this program into integer codes
+	og_codes, og_ids = pd.factorize(og_df[og_col])
+	#create the sparse protein x OG indicator matrix, with a 1 for every protein query to OG assignment
+	indicator_matrix = sparse.csr_matrix((np.ones(len(og_codes), dtype=np.int32), (prot_codes, og_codes)),
+									  shape=(len(prot_index), len(og_ids)))
+	#the number of proteins in each OG is the column sum of the indicator matrix
+	og_sizes = np.bincount(og_codes, minlength=len(og_ids))
+	#define objects to return
+	return indicator_matrix, og_ids, og_sizes
+
+
+def build_program_matrices(og_df_list):
+	#create the protein query ID index shared by all of the programs
+	#the integer code of a protein query is its position in this index
+	prot_index = pd.Index(pd.concat([og_df['Query'] for og_df in og_df_list], ignore_index=True).unique())
+	#create the indicator matrix for each program, in the order of og_col_list
+	#in the format: matrix_list[prog_index] = (indicator_matrix, og_ids, og_sizes)
+	matrix_list = [build_indicator_matrix(og_df, og_col, prot_index) for og_df, og_col in zip(og_df_list, og_col_list)]
+	#define objects to return
+	return matrix_list
+
+
+def score_overlaps(shared_counts, size_a, size_b, metric):
+	#calculate the similarity scores of OG pairs as NumPy arrays
+	#the metrics match the set-based metrics in og_scoring.py
+	if metric == 'jaccard':
+		#number of shared proteins divided by the size of the union of the OGs
+		return shared_counts / (size_a + size_b - shared_counts)
+	if metric == 'overlap':
+		#number of shared proteins divided by the size of the smaller OG
+		return shared_counts / np.minimum(size_a, size_b)
+	if metric == 'dice':
+		#twice the number of shared proteins divided by the summed size of the OGs
+		return 2.0 * shared_counts / (size_a + size_b)
+	#the difflib metric depends on the order of the OG members, and so cannot be used here
+	raise ValueError("The " + str(metric) + " metric cannot be computed from a contingency matrix. " +
+				  "Please select one of: dice, jaccard, overlap")
+
+
+def overlap_table(contingency, og_ids_a, og_ids_b, size_a, size_b, prog_a, prog_b, metric):
+	#extract the OG pairs that share at least 1 protein from the sparse contingency matrix
+	contingency = contingency.tocoo()
+	shared_counts = contingency.data.astype(np.int64)
+	#and score each of them once, using the selected metric
+	og_size_a = size_a[contingency.row]
+	og_size_b = size_b[contingency.col]
+	og_scores = score_overlaps(shared_counts, og_size_a, og_size_b, metric)
+	#create the dataframe of OG pairs
+	overlap_df = pd.DataFrame({
+		prog_a + '_OG': og_ids_a[contingency.row],
+		prog_b + '_OG': og_ids_b[contingency.col],
+		'Shared_Proteins': shared_counts,
+		prog_a + '_Size': og_size_a,
+		prog_b + '_Size': og_size_b,
+		'Score': og_scores
+		})
+	#flag the best-matching OG of each OG in the other program (ties are resolved by the first OG pair)
+	overlap_df[prog_a + '_Best_Match'] = False
+	overlap_df.loc[overlap_df.groupby(prog_a + '_OG', sort=False)['Score'].idxmax(), prog_a + '_Best_Match'] = True
+	#a True value indicates that the second program's OG is the best match of the first program's OG
+	overlap_df[prog_b + '_Best_Match'] = False
+	overlap_df.loc[overlap_df.groupby(prog_b + '_OG', sort=False)['Score'].idxmax(), prog_b + '_Best_Match'] = True
+	#a True value indicates that the first program's OG is the best match of the second program's OG
+	#define objects to return
+	return overlap_df
+
+
+def agreement_indices(contingency):
+	#the global agreement indices are computed on the proteins clustered by both programs
+	#which are exactly the proteins counted in the contingency matrix
+	contingency = contingency.tocoo()
+	cell_counts = contingency.data.astype(np.float64)
+	#number of shared proteins in each OG of each program
+	row_sums = np.asarray(contingency.sum(axis=1), dtype=np.float64).ravel()
+	col_sums = np.asarray(contingency.sum(axis=0), dtype=np.float64).ravel()
+	#OGs that share no proteins with the other program are not part of the comparison
+	row_counts = row_sums[row_sums > 0]
+	col_counts = col_sums[col_sums > 0]
+	n_prots = cell_counts.sum()
+
+	#Adjusted Rand Index, from the pair counts of the contingency matrix
+	pairs_cells = (cell_counts * (cell_counts - 1) / 2).sum()
+	pairs_rows = (row_counts * (row_counts - 1) / 2).sum()
+	pairs_cols = (col_counts * (col_counts - 1) / 2).sum()
+	pairs_total = n_prots * (n_prots - 1) / 2
+	expected_index = pairs_rows * pairs_cols / pairs_total if pairs_total > 0 else 0.0
+	max_index = (pairs_rows + pairs_cols) / 2
+	if max_index == expected_index:
+		#identical (or trivial) clusterings are in perfect agreement
+		ari = 1.0
+	else:
+		ari = (pairs_cells - expected_index) / (max_index - expected_index)
+
+	#entropies of the two clusterings and their mutual information
+	entropy_a = -np.sum(row_counts / n_prots * np.log(row_counts / n_prots))
+	entropy_b = -np.sum(col_counts / n_prots * np.log(col_counts / n_prots))
+	outer_counts = row_sums[contingency.row] * col_sums[contingency.col]
+	mutual_info = np.sum(cell_counts / n_prots * np.log(cell_counts * n_prots / outer_counts))
+	mutual_info = max(mutual_info, 0.0)
+	#rounding errors can otherwise give very small negative values
+
+	#the normalized scores are 1.0 when both clusterings put all proteins into a single OG
+	homogeneity = mutual_info / entropy_a if entropy_a > 0 else 1.0
+	completeness = mutual_info / entropy_b if entropy_b > 0 else 1.0
+	if homogeneity + completeness == 0:
+		v_measure = 0.0
+	else:
+		v_measure = 2 * homogeneity * completeness / (homogeneity + completeness)
+	if entropy_a == 0 and entropy_b == 0:
+		nmi = 1.0
+	else:
+		nmi = mutual_info / ((entropy_a + entropy_b) / 2)
+
+	#save the indices in the format: agreement_dict[index_name] = value
+	agreement_dict = {
+		'Shared_Proteins': int(n_prots),
+		'ARI': float(ari),
+		'NMI': float(nmi),
+		'Homogeneity': float(homogeneity),
+		'Completeness': float(completeness),
+		'V_measure': float(v_measure)
+		}
+	#define objects to return
+	return agreement_dict
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+#!/bin/python
+"""
+
+Title: og_index.py
+Date: 2026-10-18
+Author: Virág Varga
+
+Description:
+	This module contains the protein query ID to OG lookup engine used by the
+		og_membership_test.py program (and any other script that needs to map protein
+		queries to the OGs assigned to them by Broccoli, OrthoFinder, ProteinOrtho and
+		SonicParanoid).
+	Rather than scanning the parsed OG dataframes once per protein query (which scales
+		quadratically with the number of proteins), a hash-indexed Pandas Series is built
+		once per clustering program, and the protein query ID to list of assigned OGs
+		dictionary is then created with a single outer join on these indexes.
+
+List of functions:
+	build_og_index(og_df, og_col):
+		Creates the protein query ID to OG index for one clustering program.
+	build_program_indexes(broccoli_df, orthofinder_df, proteinortho_df, sonicparanoid_df):
+		Creates the protein query ID to OG indexes for all 4 clustering programs.
+	index_prot_dict(og_index_list):
+		Creates the protein query ID to list of assigned OGs dictionary from the
+		program indexes, in a single vectorized join.
+
+List of standard and non-standard modules used:
+	pandas
+
+Procedure:
+	1. Loading required modules; defining the column names of the parsed OG files.
+	2. Defining the functions of the module.
+
+Known bugs and limitations:
+	- There is no quality-checking integrated into the code.
+	- If a protein query ID occurs more than once in a parsed OG dataframe, only the
+		first OG it is assigned to is kept (this matches the behaviour of the original
+		create_prot_dict() function in og_membership_test.py). Parsed Broccoli results
+		should therefore have duplicates removed before use.
+	- This is a module, not a stand-alone program. It should be imported by scripts
+		located in the same directory.
+
+Usage:
+	from og_index import build_program_indexes, index_prot_dict
+
+This script was written for Python 3.8.12, in Spyder 5.1.5.
+
+"""
+
+
+# Part 1: Loading required modules; defining the column names of the parsed OG files.
+
+#import necessary modules
+import pandas as pd #facilitates manipulation of dataframes in Python
+
+
+#the OG ID column names used in the parsed results files of each program
+#the order of this list is the order of the OGs in the prot_dict value lists
+og_col_list = ['Broccoli_OG', 'OrthoFinder_OG', 'ProteinOrtho_OG', 'SonicParanoid_OG']
+
+
+# Part 2: Defining the functions of the module.
+
+def build_og_index(og_df, og_col):
+	#create a hash-indexed Series in the format: og_index[query_id] = og_id
+	og_index = og_df.drop_duplicates(subset='Query', keep='first').set_index('Query')[og_col]
+	#only the first OG assigned to a protein query is kept, as in the original .iloc[0] lookup
+	#the Series index is a hash table, so lookups & joins on it no longer scan the whole dataframe
+	og_index = og_index.astype(object)
+	#the OG IDs are stored as Python objects, so that missing values introduced by the join
+	#do not convert integer OG IDs into floats
+	#define objects to return
+	return og_index
+
+
+def build_program_indexes(broccoli_df, orthofinder_df, proteinortho_df, sonicparanoid_df):
+	#create the protein query ID to OG index for each of the clustering programs
+	og_index_list = []
+	#create an empty list to populate with the indexes, in the same order as og_col_list
+	for og_df, og_col in zip([broccoli_df, orthofinder_df, proteinortho_df, sonicparanoid_df], og_col_list):
+		#iterate over the parsed dataframes and the names of their OG columns
+		og_index_list.append(build_og_index(og_df, og_col))
+	#define objects to return
+	return og_index_list
+
+
+def index_prot_dict(og_index_list):
+	#join the program indexes on the protein query IDs
+	#an outer join keeps protein queries that were only clustered by some of the programs
+	prot_df = pd.concat(og_index_list, axis=1, join='outer', sort=False)
+	#protein queries that were not clustered by a program are marked with "-"
+	prot_df = prot_df.fillna("-")
+	#create the dictionary in the format: prot_dict[query_id] = [br_og, of_og, po_og, sp_og]
+	prot_dict = dict(zip(prot_df.index, prot_df.values.tolist()))
+	#define objects to return
+	return prot_dict
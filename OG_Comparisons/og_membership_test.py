@@ -14,46 +14,69 @@ Description:
 		should not be reported. Default is 50%.
 
 List of functions:
+	load_program_dicts(store_dir, file_ext):
+		Loads the clustering program OG dictionaries from a checkpoint directory.
 	data_2_pandas(broccoli_db, orthofinder_db, proteinortho_db, sonicparanoid_db):
 		Loads input parsed OG databases into Pandas dataframes and dictionaries. 
 	create_prot_dict(broccoli_df, orthofinder_df, proteinortho_df, sonicparanoid_df):
-		Creates the protein query ID to list of assigned OGs dictionary.
+		Creates the protein query ID to list of assigned OGs dictionary, using the
+		hash-indexed lookup engine in the og_index.py module.
 	filter_prot_dict(broccoli_df, orthofinder_df, proteinortho_df, sonicparanoid_df):
 		Filter the contents of the protein query ID to list of assigned OGs
 		dictinary to only include those OGs as keys that were clustered by more than 1
 		clustering program.
-	membership_test()
+	pair_membership_scores(filt_prot_dict, member_dict_list, pair_key, metric, og_cache):
+		Scores the similarity of the OGs each protein query is assigned to, for one
+		pairwise program comparison.
+	pair_membership_worker(pair_key):
+		Scores one pairwise program comparison in a worker process, and writes the
+		scores out to the checkpoint store.
+	membership_test(filt_prot_dict, broccoli_dict, orthofinder_dict, proteinortho_dict, sonicparanoid_dict, metric, workers):
+		Scores the similarity of the OGs each protein query is assigned to, for all 6
+		pairwise program comparisons. Each distinct OG pair is only scored once, using the
+		memoized scoring engine in the og_scoring.py module. The comparisons can be run
+		in parallel worker processes.
+	contingency_test(broccoli_df, orthofinder_df, proteinortho_df, sonicparanoid_df, metric):
+		Compares the complete clusterings of each pair of programs with sparse contingency
+		matrices (contingency mode), using the og_contingency.py module.
 	avg_membership_scores()
 	threshold_test()
 
 List of standard and non-standard modules used:
 	sys
+	argparse
+	multiprocessing
+	os
 	pandas
-	json
-	difflib
 	statistics
+	og_index.py
+	og_scoring.py
+	og_contingency.py (scipy.sparse, numpy)
+	og_checkpoint.py (pyarrow)
 
 Procedure:
 	1. Loading required modules, setting the threshold value to be used in the
 		comparison filtration and the corresponding output file name.
 	2. Determining input files as command-line arguments, and importing the contents
 		of these databases into Pandas dataframes and dictionaries. Dictionaries
-		are exported in JSON format. Checkpoint 1 is reached at the completion of
+		are exported to the checkpoint store. Checkpoint 1 is reached at the completion of
 		this step.
 	3. Creation of the protein query ID to OG cluster assignments list dictionary.
 		Checkpoint 2 is reached at the conclusion of this step, when this dictionary
-		is exported in JSON format.
+		is exported to the checkpoint store.
 	4. Filtration of the protein query ID to OG assignment list dictionary to exclude
 		protein queries that were only clustered by one program. Checkpoint 3 is reached
-		at the conclusion of this step, when the new dictionary is exported in JSON
-		format.
+		at the conclusion of this step, when the new dictionary is exported to the
+		checkpoint store.
 	5. The all-vs-all OG membership tests are completed, and a dictionary is created
 		containing the similarity scores of the clusters created by the programs.
 		Checkpoint 4 is reached at the conclusion of this step, when this comparison
-		dictionary is exported in JSON format.
+		dictionary is exported to the checkpoint store.
 	6. The scores inside of the comparison dictionary are averaged. Checkpoint 4.5 is
 		reached at the conclusion of this step, when this smaller dictionary is exported
-		in JSON format.
+		to the checkpoint store.
+	Steps 2-6 are skipped if the checkpoint store already contains their results from
+		an earlier run on the same input files.
 	7. The threshold membership percentage value is used to filter the programs with
 		the most similar clusters, and a new dictionary is created to containing only
 		this data. Checkpoint 5 is reached at the conclusion of this step.
@@ -62,9 +85,9 @@ Procedure:
 
 Known bugs and limitations:
 	- There is no quality-checking integrated into the code.
-	- The names of the JSON files created at the checkpoints are not user-defined. This
-		means that running the program multiple times in the same directory will
-		overwrite existing files from a previous run.
+	- The checkpoints are written to a sub-directory of the checkpoint directory named after
+		the content hash of the input files, so runs on different input files do not
+		overwrite each other's checkpoints. Runs on identical input files re-use them.
 	- The final results file is similarly pre-determined, though the threshold percentage
 		value is integrated into the file name, so the program will not overwrite the
 		results file if a different threshold value is used.
@@ -72,6 +95,14 @@ Known bugs and limitations:
 		decimal percentage.
 	- This program is intended for use with parsed Broccoli results from which duplicates have 
 		already been removed. 
+	- The og_index.py, og_scoring.py, og_contingency.py and og_checkpoint.py modules must be
+		located in the same directory as this program. The atomic_output.py module imported by
+		og_checkpoint.py (in the DB_Construct/ directory of this repository) must be located
+		there as well, or in a directory listed in the PYTHONPATH environment variable
+		(ex. PYTHONPATH=../DB_Construct).
+	- The contingency mode does not support the difflib metric.
+	- Parallel worker processes (-w/--workers) require a system that supports forking
+		(ie. Linux or macOS). On other systems, the comparisons are run serially.
 
 Usage:
 	The full program can be run with:
@@ -81,30 +112,70 @@ Usage:
 
 		* Where the membership_percent threshold value should be given as an integer percentage value.
 
-	Alternatively, the program can be run from a checkpoint, using a JSON file produced
-		during the earlier stages of the analysis. In such a case, the program should
-		be run like so:
-			./og_membership_test.py [JSON_file] [membership_percent]
+	The OG similarity metric can be selected with the optional -m/--metric argument:
+		./og_membership_test.py [-m {dice,jaccard,overlap,difflib}] broccoli_db orthofinder_db proteinortho_db sonicparanoid_db [membership_percent]
+
+		* Where the default metric is difflib (the difflib.SequenceMatcher ratio used in earlier
+			versions of this program). The dice (2 * shared proteins / summed OG sizes), jaccard and
+			overlap metrics are set-based, much faster on large OGs, and do not depend on the order
+			of the OG members, but give different scores from the difflib ratio. In contingency
+			mode (-c), the default metric is dice, since the difflib ratio can't be computed there.
+
+	The 6 pairwise program comparisons of the membership test can be run in parallel with the
+		optional -w/--workers argument:
+		./og_membership_test.py -w 6 broccoli_db orthofinder_db proteinortho_db sonicparanoid_db [membership_percent]
+
+		* Where each worker process writes out the scores of its comparison to the checkpoint store
+			as soon as it is finished (compare_OG_[comparison]__[metric].arrow), before the complete
+			comparison dictionary is written out at Checkpoint 4. At most 6 worker processes are used.
+
+	The complete clusterings can instead be compared in contingency mode, with the -c/--contingency flag:
+		./og_membership_test.py -c [-m {dice,jaccard,overlap}] broccoli_db orthofinder_db proteinortho_db sonicparanoid_db [membership_percent]
+
+		* In contingency mode, one sparse OG x OG contingency matrix is created per pairwise program
+			comparison, and Parts 3-6 of the procedure are replaced by the following outputs:
+			- OG_contingency_[comparison].txt: All OG pairs sharing at least 1 protein, with the number
+				of shared proteins, the OG sizes, the similarity score, and flags marking the
+				best-matching OG of each OG in the other program. These tables contain all of the
+				pairwise OG overlaps searched for by the og_overlap_percent.py program.
+			- OG_contingency_agreement.txt: The global agreement indices of each pair of clusterings
+				(ARI, NMI, homogeneity, completeness, V-measure), and the average score per protein.
+			- og_score_dict__[metric]__contingency.arrow: The average scores dictionary (Checkpoint 4.5),
+				in the checkpoint store.
+
+	Checkpoints are written to a binary checkpoint store (see og_checkpoint.py), in the directory:
+		og_membership_checkpoints/[input_hash]/
+		Where the input_hash is the content hash of the 4 input files. The location of the
+		og_membership_checkpoints/ directory can be changed with the optional -d/--checkpoint_dir
+		argument. When the program is run again on unchanged input files, the checkpoints of the
+		earlier run are found and re-used automatically.
+
+	Alternatively, the program can be run from a checkpoint file produced during the earlier
+		stages of the analysis. In such a case, the program should be run like so:
+			./og_membership_test.py [checkpoint_file] [membership_percent]
 			OR
-			python og_membership_test.py [JSON_file] [membership_percent]
+			python og_membership_test.py [checkpoint_file] [membership_percent]
 
-		* Where the acceptable input JSON files include:
-			- prot_dict.json: This will start the program after Checkpoint 2, by providing a
+		* Where the acceptable input checkpoint files include:
+			- prot_dict.arrow: This will start the program after Checkpoint 2, by providing a
 				complete version of the prot_dict protein query to OG list dictionary.
-			- filt_prot_dict.json: This will start the program after Checkpoint 3, by providing
+			- filt_prot_dict.arrow: This will start the program after Checkpoint 3, by providing
 				a complete version of the filt_prot_dict filtered protein query to OG list,
 				from which queries only predicted to cluster by one program have been removed.
-			- compare_OG_dict.json: This will start the program after Checkpoint 4, by
+			- compare_OG_dict__[metric].arrow: This will start the program after Checkpoint 4, by
 				providing a version of the compare_dict clustering program to cluster score list
 				dictionary.
-			- og_score_dict.json: This will start the program after Checkpoint 4.5, by providing
-				a version of the OG scoring dictionary in which the average scores have already
-				been calculated.
+			- og_score_dict__[metric].arrow: This will start the program after Checkpoint 4.5, by
+				providing a version of the OG scoring dictionary in which the average scores have
+				already been calculated.
+		* The JSON checkpoint files produced by earlier versions of this program (ex. prot_dict.json)
+			are also accepted.
 		* Note! The membership testing, which occurs after Checkpoint 3, requires the input of
 			dictionaries created from the orthologous clustering dataframes. These are produced
-			during the Pandas dataframe imports, and are printed out to JSON files. While they should
-			not be added as command-line arguments, they should be in the directory from which this
-			program is run.
+			during the Pandas dataframe imports, and are exported to the checkpoint store. While they
+			should not be added as command-line arguments, they should be in the same directory as
+			the checkpoint file given (ex. broccoli_dict.arrow, or broccoli_dict.json for JSON
+			checkpoint files).
 
 This script was written for Python 3.8.12, in Spyder 5.1.5.
 
@@ -116,10 +187,15 @@ This script was written for Python 3.8.12, in Spyder 5.1.5.
 
 #import necessary modules
 import sys #allows assignment of command line arguments
+import argparse #allows parsing of optional command line arguments
+import multiprocessing #allows the program comparisons to run in parallel
 import pandas as pd #facilitates manipulation of dataframes in Python
-import json #allows import and export of data in JSON format
-import difflib #compare and calculate differences between datasets
+import os #allow access to computer files
 import statistics #simplify computation of basic statistics in Python
+from og_index import build_program_indexes, index_prot_dict #hash-indexed protein query to OG lookup
+from og_scoring import program_name_list, program_pair_dict, metric_list, prepare_og_members, cached_og_score #memoized OG similarity scoring
+from og_contingency import build_program_matrices, overlap_table, agreement_indices #sparse contingency matrix comparison
+from og_checkpoint import checkpoint_ext, checkpoint_dir, has_checkpoint, save_checkpoint, load_checkpoint, load_checkpoint_file #binary checkpoint store
 
 
 ###
@@ -127,10 +203,21 @@ import statistics #simplify computation of basic statistics in Python
 ###
 
 
+#the names of the clustering program OG dictionary checkpoints
+og_dict_name_list = ['broccoli_dict', 'orthofinder_dict', 'proteinortho_dict', 'sonicparanoid_dict']
+
+
+def load_program_dicts(store_dir, file_ext):
+	#load the clustering program OG dictionaries from the checkpoint directory
+	#the file extension determines whether binary checkpoints or JSON files from earlier versions are loaded
+	#define objects to return
+	return [load_checkpoint_file(os.path.join(store_dir, name + file_ext)) for name in og_dict_name_list]
+
+
 def data_2_pandas(broccoli_db, orthofinder_db, proteinortho_db, sonicparanoid_db):
 	# Part 2: Determining input files as command-line arguments, and importing the contents
 	# of these databases into Pandas dataframes and dictionaries. Dictionaries
-	# are exported in JSON format. Checkpoint 1 is reached at the completion of this step.
+	# are exported to the checkpoint store. Checkpoint 1 is reached at the completion of this step.
 
 	#import Broccoli database into a Pandas dataframe
 	broccoli_df = pd.read_csv(broccoli_db, sep = '\t', header = 0)
@@ -141,11 +228,8 @@ def data_2_pandas(broccoli_db, orthofinder_db, proteinortho_db, sonicparanoid_db
 	broccoli_dict = grouped_broccoli_df.set_index('Broccoli_OG').to_dict()['OG_members']
 	#the new dataframe is converted into a dictionary,
 	#where the OG IDs are the keys, and the lists of protein members of the OGs are the values
-	#write out the filtered protein query database
-	with open('broccoli_dict.json', 'w') as broccoli_out:
-		#open the JSON outfile for writing
-		#and write out the contents of the broccoli_dict dictionary
-		json.dump(broccoli_dict, broccoli_out)
+	#write out the dictionary to the checkpoint store
+	save_checkpoint(store_dir, 'broccoli_dict', broccoli_dict)
 
 	#import OrthoFinder database into a Pandas dataframe
 	orthofinder_df = pd.read_csv(orthofinder_db, sep = '\t', header = 0)
@@ -158,11 +242,8 @@ def data_2_pandas(broccoli_db, orthofinder_db, proteinortho_db, sonicparanoid_db
 	orthofinder_dict = grouped_orthofinder_df.set_index('OrthoFinder_OG').to_dict()['OG_members']
 	#the new dataframe is converted into a dictionary,
 	#where the OG IDs are the keys, and the lists of protein members of the OGs are the values
-	#write out the filtered protein query database
-	with open('orthofinder_dict.json', 'w') as orthofinder_out:
-		#open the JSON outfile for writing
-		#and write out the contents of the orthofinder_dict dictionary
-		json.dump(orthofinder_dict, orthofinder_out)
+	#write out the dictionary to the checkpoint store
+	save_checkpoint(store_dir, 'orthofinder_dict', orthofinder_dict)
 
 	#import ProteinOrtho database into a Pandas dataframe
 	proteinortho_df = pd.read_csv(proteinortho_db, sep = '\t', header = 0)
@@ -175,11 +256,8 @@ def data_2_pandas(broccoli_db, orthofinder_db, proteinortho_db, sonicparanoid_db
 	proteinortho_dict = grouped_proteinortho_df.set_index('ProteinOrtho_OG').to_dict()['OG_members']
 	#the new dataframe is converted into a dictionary,
 	#where the OG IDs are the keys, and the lists of protein members of the OGs are the values
-	#write out the filtered protein query database
-	with open('proteinortho_dict.json', 'w') as proteinortho_out:
-		#open the JSON outfile for writing
-		#and write out the contents of the proteinortho_dict dictionary
-		json.dump(proteinortho_dict, proteinortho_out)
+	#write out the dictionary to the checkpoint store
+	save_checkpoint(store_dir, 'proteinortho_dict', proteinortho_dict)
 
 	#import SonicParanoid database into a Pandas dataframe
 	sonicparanoid_df = pd.read_csv(sonicparanoid_db, sep = '\t', header = 0)
@@ -192,11 +270,8 @@ def data_2_pandas(broccoli_db, orthofinder_db, proteinortho_db, sonicparanoid_db
 	sonicparanoid_dict = grouped_sonicparanoid_df.set_index('SonicParanoid_OG').to_dict()['OG_members']
 	#the new dataframe is converted into a dictionary,
 	#where the OG IDs are the keys, and the lists of protein members of the OGs are the values
-	#write out the filtered protein query database
-	with open('sonicparanoid_dict.json', 'w') as sonicparanoid_out:
-		#open the JSON outfile for writing
-		#and write out the contents of the filt_sonicparanoid_dict dictionary
-		json.dump(sonicparanoid_dict, sonicparanoid_out)
+	#write out the dictionary to the checkpoint store
+	save_checkpoint(store_dir, 'sonicparanoid_dict', sonicparanoid_dict)
 
 
 	#Checkpoint 1 - let the user know program progress
@@ -209,76 +284,24 @@ def data_2_pandas(broccoli_db, orthofinder_db, proteinortho_db, sonicparanoid_db
 
 def create_prot_dict(broccoli_df, orthofinder_df, proteinortho_df, sonicparanoid_df):
 	# Part 3: Creation of the protein query ID to OG cluster assignments list dictionary.
-	# Checkpoint 2 is reached at the conclusion of this step, when this dictionary is exported in JSON format.
-
-	#get lists of query proteins from the imported dataframes
-	#Broccoli
-	broccoli_queries = broccoli_df['Query'].to_list()
-	#OrthoFinder
-	orthofinder_queries = orthofinder_df['Query'].to_list()
-	#ProteinOrtho
-	proteinortho_queries = proteinortho_df['Query'].to_list()
-	#SonicParanoid
-	sonicparanoid_queries = sonicparanoid_df['Query'].to_list()
-
-	#concatenate the lists of queries
-	prot_queries = broccoli_queries + orthofinder_queries + proteinortho_queries + sonicparanoid_queries
-	#turn the list of queries into a set to eliminate duplicates
-	prot_queries = set(prot_queries)
-
-
-	#create an empty dictionary to populate
-	prot_dict = {}
-
-	for prot in prot_queries:
-		#iterate through the protein query IDs
-		#initially, set the variables for all og categories as "-"
-		#these will be overwritten in loops if the protein query was used in the given dataframe
-		broccoli_og = "-"
-		orthofinder_og = "-"
-		proteinortho_og = "-"
-		sonicparanoid_og = "-"
-		if prot in broccoli_queries:
-			#see if protein query ID is in the Broccoli dataframe
-			broccoli_og = broccoli_df.loc[broccoli_df['Query'] == prot, 'Broccoli_OG'].iloc[0]
-			#with .loc, dind the location where the protein query ID is found in the 'Query' column
-			#then extract the contents of that cell, as well as the cell in the same row that is in the 'Broccoli_OG' column
-			#use slicing and .iloc to extract the contents of the 'Broccoli_OG' column
-			#and replace the contents of variable broccoli_og ("-") with the OG ID
-		if prot in orthofinder_queries:
-			#see if protein query ID is in the OrthoFinder dataframe
-			orthofinder_og = orthofinder_df.loc[orthofinder_df['Query'] == prot, 'OrthoFinder_OG'].iloc[0]
-			#with .loc, dind the location where the protein query ID is found in the 'Query' column
-			#then extract the contents of that cell, as well as the cell in the same row that is in the 'OrthoFinder_OG' column
-			#use slicing and .iloc to extract the contents of the 'OrthoFinder_OG' column
-			#and replace the contents of variable orthofinder_og ("-") with the OG ID
-		if prot in proteinortho_queries:
-			#see if protein query ID is in the ProteinOrtho dataframe
-			proteinortho_og = proteinortho_df.loc[proteinortho_df['Query'] == prot, 'ProteinOrtho_OG'].iloc[0]
-			#with .loc, dind the location where the protein query ID is found in the 'Query' column
-			#then extract the contents of that cell, as well as the cell in the same row that is in the 'ProteinOrtho_OG' column
-			#use slicing and .iloc to extract the contents of the 'ProteinOrtho_OG' column
-			#and replace the contents of variable proteinortho_og ("-") with the OG ID
-		if prot in sonicparanoid_queries:
-			#see if protein query ID is in the SonicParanoid dataframe
-			sonicparanoid_og = sonicparanoid_df.loc[sonicparanoid_df['Query'] == prot, 'SonicParanoid_OG'].iloc[0]
-			#with .loc, dind the location where the protein query ID is found in the 'Query' column
-			#then extract the contents of that cell, as well as the cell in the same row that is in the 'SonicParanoid_OG' column
-			#use slicing and .iloc to extract the contents of the 'SonicParanoid_OG' column
-			#and replace the contents of variable sonicparanoid_og ("-") with the OG ID
-		prot_dict[prot] = [broccoli_og, orthofinder_og, proteinortho_og, sonicparanoid_og]
-		#populate the prot_dict dictionary with the protein query IDs as the keys
-		#and a list of the Broccoli, OrthoFinder, ProteinOrtho & SonicParanoid OGs assigned to that protein query as the values
+	# Checkpoint 2 is reached at the conclusion of this step, when this dictionary is exported to the checkpoint store.
+
+	#build the hash-indexed protein query ID to OG lookup for each program
+	#each index is built once, instead of scanning the full dataframes for every protein query
+	og_index_list = build_program_indexes(broccoli_df, orthofinder_df, proteinortho_df, sonicparanoid_df)
+
+	#join the program indexes on the protein query IDs to create the dictionary
+	#in the format: prot_dict[query_id] = [broccoli_og, orthofinder_og, proteinortho_og, sonicparanoid_og]
+	#protein queries not clustered by a given program have "-" in place of that program's OG ID
+	prot_dict = index_prot_dict(og_index_list)
 
 
 	#Checkpoint 2 - let the user know program progress
 	print("2nd Checkpoint: Protein query to OG match list dictionary has been successfully created. \
 		  Printing dicitonary to file.")
 
-	with open('prot_dict.json', 'w') as temp_file:
-		#open the JSON outfile for writing
-		#and write out the contents of the filt_prot_dict dictionary
-		json.dump(prot_dict, temp_file)
+	#write out the prot_dict dictionary to the checkpoint store
+	save_checkpoint(store_dir, 'prot_dict', prot_dict)
 
 
 	#define objects to return
@@ -288,7 +311,7 @@ def create_prot_dict(broccoli_df, orthofinder_df, proteinortho_df, sonicparanoid
 def filter_prot_dict(prot_dict):
 	# Part 4: Filtration of the protein query ID to OG assignment list dictionary to exclude
 	# protein queries that were only clustered by one program. Checkpoint 3 is reached
-	# at the conclusion of this step, when the new dictionary is exported in JSON format.
+	# at the conclusion of this step, when the new dictionary is exported to the checkpoint store.
 
 	#remove from the dictionary proteins that only occur in 1 program
 	remove_list = []
@@ -320,132 +343,89 @@ def filter_prot_dict(prot_dict):
 		  from the protein query to OG list dictionary. Printing dictionary to file.")
 
 	#write out the filtered protein query database
-	with open('filt_prot_dict.json', 'w') as temp_file:
-		#open the JSON outfile for writing
-		#and write out the contents of the filt_prot_dict dictionary
-		json.dump(filt_prot_dict, temp_file)
+	save_checkpoint(store_dir, 'filt_prot_dict', filt_prot_dict)
 
 
 	#define objects to return
 	return filt_prot_dict
 
 
-def membership_test(filt_prot_dict, broccoli_dict, orthofinder_dict, proteinortho_dict, sonicparanoid_dict):
+#the data shared with the membership test worker processes
+#it is filled in before the process pool is created, so that the forked worker processes
+#inherit it copy-on-write, instead of it being pickled and sent to them for every task
+worker_data = {}
+
+
+def pair_membership_scores(filt_prot_dict, member_dict_list, pair_key, metric, og_cache):
+	#score the OGs of the protein queries for a single pairwise program comparison
+	prog_idx_a, prog_idx_b = program_pair_dict[pair_key]
+	#identify the positions of the two programs in the filt_prot_dict value lists
+	score_list = []
+	#create an empty list for the similarity scores of the comparison
+	for prot_og_list in filt_prot_dict.values():
+		#iterate through the lists of OGs that the protein queries belong to
+		#only calculate comparisons in places where both of the compared programs have results for that protein
+		if prot_og_list[prog_idx_a] != "-" and prot_og_list[prog_idx_b] != "-":
+			#score the similarity of the two OGs the protein query belongs to
+			#and append the similarity score to the list of scores
+			score_list.append(cached_og_score(og_cache, member_dict_list, prog_idx_a, prot_og_list[prog_idx_a],
+									 prog_idx_b, prot_og_list[prog_idx_b], metric))
+	#define objects to return
+	return score_list
+
+
+def pair_membership_worker(pair_key):
+	#score one pairwise program comparison in a worker process
+	#the input data is taken from the worker_data dictionary inherited from the parent process
+	score_list = pair_membership_scores(worker_data['filt_prot_dict'], worker_data['member_dict_list'],
+									 pair_key, worker_data['metric'], {})
+	#stream the scores of this comparison to the checkpoint store as soon as it is finished
+	save_checkpoint(worker_data['store_dir'], 'compare_OG_' + pair_key, score_list, [worker_data['metric']])
+	#only the comparison key is sent back to the parent process
+	return pair_key
+
+
+def membership_test(filt_prot_dict, broccoli_dict, orthofinder_dict, proteinortho_dict, sonicparanoid_dict, metric='difflib', workers=1):
 	# Part 5: The all-vs-all OG membership tests are completed, and a dictionary is created
 	# containing the similarity scores of the clusters created by the programs.
-	# Checkpoint 4 is reached at the conclusion of this step, when this comparison dictionary is exported in JSON format.
+	# Checkpoint 4 is reached at the conclusion of this step, when this comparison dictionary is exported to the checkpoint store.
+
+	#convert the OG member lists of each program into the format used by the selected metric
+	#the order of this list matches the order of the OGs in the filt_prot_dict value lists
+	member_dict_list = [prepare_og_members(og_dict, metric) for og_dict in
+					 [broccoli_dict, orthofinder_dict, proteinortho_dict, sonicparanoid_dict]]
 
 	#create empty dictionary for comparison data
 	#dictionary format: comparison_dict[og_vs_pair] = list_of_protein_group_comparison_values
-	comparison_dict = {}
-	#define the keys of the dictionary with empty lists as associated values
-	comparison_dict['Br_vs_OF'] = [] #Broccoli vs OrthoFinder
-	comparison_dict['Br_vs_PO'] = [] #Broccoli vs ProteinOrtho
-	comparison_dict['Br_vs_SP'] = [] #Broccoli vs SonicParanoid
-	comparison_dict['OF_vs_PO'] = [] #OrthoFinder vs ProteinOrtho
-	comparison_dict['OF_vs_SP'] = [] #OrthoFinder vs SonicParanoid
-	comparison_dict['PO_vs_SP'] = [] #ProteinOrtho vs SonicParanoid
-
-
-	for key in filt_prot_dict.keys():
-		#iterate through the prot_dict dictionary using both keys and values
-		#only calculate comparisons in places where both of the compared programs have results for that protein
-		if filt_prot_dict[key][0] != "-" and filt_prot_dict[key][1] != "-":
-			#comparing OGs where a protein query ID is found in both Broccoli and OrthoFinder
-			Br_OG = filt_prot_dict[key][0]
-			#extract the OG that the protein query belongs to within the Broccoli results
-			Br_OG_compare = broccoli_dict[Br_OG]
-			#use the extracted OG ID to query the Broccoli OG dictionary, to get the list of proteins in that OG
-			OF_OG = filt_prot_dict[key][1]
-			#extract the OG that the protein query belongs to within the OrthoFinder results
-			OF_OG_compare = orthofinder_dict[OF_OG]
-			#use the extracted OG ID to query the OrthoFinder OG dictionary, to get the list of proteins in that OG
-			sm=difflib.SequenceMatcher(None,Br_OG_compare,OF_OG_compare)
-			#compare the similarity of the two protein lists
-			#and compute a numerical ratio of that similarity
-			br_vs_of = sm.ratio()
-			#append the similarity ratio to the list associated with the 'Br_vs_OF' key in the comparison dictionary
-			comparison_dict['Br_vs_OF'].append(br_vs_of)
-		if filt_prot_dict[key][0] != "-" and filt_prot_dict[key][2] != "-":
-			#comparing OGs where a protein query ID is found in both Broccoli and ProteinOrtho
-			Br_OG = filt_prot_dict[key][0]
-			#extract the OG that the protein query belongs to within the Broccoli results
-			Br_OG_compare = broccoli_dict[Br_OG]
-			#use the extracted OG ID to query the Broccoli OG dictionary, to get the list of proteins in that OG
-			PO_OG = filt_prot_dict[key][2]
-			#extract the OG that the protein query belongs to within the ProteinOrtho results
-			PO_OG_compare = proteinortho_dict[PO_OG]
-			#use the extracted OG ID to query the ProteinOrtho OG dictionary, to get the list of proteins in that OG
-			sm=difflib.SequenceMatcher(None,Br_OG_compare,PO_OG_compare)
-			#compare the similarity of the two protein lists
-			#and compute a numerical ratio of that similarity
-			br_vs_po = sm.ratio()
-			#append the similarity ratio to the list associated with the 'Br_vs_PO' key in the comparison dictionary
-			comparison_dict['Br_vs_PO'].append(br_vs_po)
-		if filt_prot_dict[key][0] != "-" and filt_prot_dict[key][3] != "-":
-			#comparing OGs where a protein query ID is found in both Broccoli and SonicParanoid
-			Br_OG = filt_prot_dict[key][0]
-			#extract the OG that the protein query belongs to within the Broccoli results
-			Br_OG_compare = broccoli_dict[Br_OG]
-			#use the extracted OG ID to query the Broccoli OG dictionary, to get the list of proteins in that OG
-			SP_OG = filt_prot_dict[key][3]
-			#extract the OG that the protein query belongs to within the SonicParanoid results
-			SP_OG_compare = sonicparanoid_dict[SP_OG]
-			#use the extracted OG ID to query the SonicParanoid OG dictionary, to get the list of proteins in that OG
-			sm=difflib.SequenceMatcher(None,Br_OG_compare,SP_OG_compare)
-			#compare the similarity of the two protein lists
-			#and compute a numerical ratio of that similarity
-			br_vs_sp = sm.ratio()
-			#append the similarity ratio to the list associated with the 'Br_vs_SP' key in the comparison dictionary
-			comparison_dict['Br_vs_SP'].append(br_vs_sp)
-		if filt_prot_dict[key][1] != "-" and filt_prot_dict[key][2] != "-":
-			#comparing OGs where a protein query ID is found in both OrthoFinder and ProteinOrtho
-			PO_OG = filt_prot_dict[key][2]
-			#extract the OG that the protein query belongs to within the ProteinOrtho results
-			PO_OG_compare = proteinortho_dict[PO_OG]
-			#use the extracted OG ID to query the ProteinOrtho OG dictionary, to get the list of proteins in that OG
-			OF_OG = filt_prot_dict[key][1]
-			#extract the OG that the protein query belongs to within the OrthoFinder results
-			OF_OG_compare = orthofinder_dict[OF_OG]
-			#use the extracted OG ID to query the OrthoFinder OG dictionary, to get the list of proteins in that OG
-			sm=difflib.SequenceMatcher(None,PO_OG_compare,OF_OG_compare)
-			#compare the similarity of the two protein lists
-			#and compute a numerical ratio of that similarity
-			of_vs_po = sm.ratio()
-			#append the similarity ratio to the list associated with the 'PO_vs_OF' key in the comparison dictionary
-			comparison_dict['OF_vs_PO'].append(of_vs_po)
-		if filt_prot_dict[key][1] != "-" and filt_prot_dict[key][3] != "-":
-			#comparing OGs where a protein query ID is found in both OrthoFinder and SonicParanoid
-			SP_OG = filt_prot_dict[key][3]
-			#extract the OG that the protein query belongs to within the SonicParanoid results
-			SP_OG_compare = sonicparanoid_dict[SP_OG]
-			#use the extracted OG ID to query the SonicParanoid OG dictionary, to get the list of proteins in that OG
-			OF_OG = filt_prot_dict[key][1]
-			#extract the OG that the protein query belongs to within the OrthoFinder results
-			OF_OG_compare = orthofinder_dict[OF_OG]
-			#use the extracted OG ID to query the OrthoFinder OG dictionary, to get the list of proteins in that OG
-			sm=difflib.SequenceMatcher(None,SP_OG_compare,OF_OG_compare)
-			#compare the similarity of the two protein lists
-			#and compute a numerical ratio of that similarity
-			of_vs_sp = sm.ratio()
-			#append the similarity ratio to the list associated with the 'SP_vs_OF' key in the comparison dictionary
-			comparison_dict['OF_vs_SP'].append(of_vs_sp)
-		if filt_prot_dict[key][2] != "-" and filt_prot_dict[key][3] != "-":
-			#comparing OGs where a protein query ID is found in both ProteinOrtho and SonicParanoid
-			PO_OG = filt_prot_dict[key][2]
-			#extract the OG that the protein query belongs to within the ProteinOrtho results
-			PO_OG_compare = proteinortho_dict[PO_OG]
-			#use the extracted OG ID to query the Broccoli OG dictionary, to get the list of proteins in that OG
-			SP_OG = filt_prot_dict[key][3]
-			#extract the OG that the protein query belongs to within the SonicParanoid results
-			SP_OG_compare = sonicparanoid_dict[SP_OG]
-			#use the extracted OG ID to query the SonicParanoid OG dictionary, to get the list of proteins in that OG
-			sm=difflib.SequenceMatcher(None,PO_OG_compare,SP_OG_compare)
-			#compare the similarity of the two protein lists
-			#and compute a numerical ratio of that similarity
-			po_vs_sp = sm.ratio()
-			#append the similarity ratio to the list associated with the 'PO_vs_OF' key in the comparison dictionary
-			comparison_dict['PO_vs_SP'].append(po_vs_sp)
+	#the keys are the pairwise program comparisons: Br_vs_OF, Br_vs_PO, Br_vs_SP, OF_vs_PO, OF_vs_SP, PO_vs_SP
+	comparison_dict = {pair_key: [] for pair_key in program_pair_dict.keys()}
+
+	if workers > 1 and 'fork' not in multiprocessing.get_all_start_methods():
+		#worker processes can only inherit the input data on systems that support forking
+		print("Forked worker processes are not supported on this system. Running the comparisons serially.")
+		workers = 1
+
+	if workers > 1:
+		#run the 6 independent program comparisons in a pool of worker processes
+		#the input data is placed in the worker_data dictionary before the pool is created
+		#so that the forked workers share it copy-on-write
+		worker_data['filt_prot_dict'] = filt_prot_dict
+		worker_data['member_dict_list'] = member_dict_list
+		worker_data['metric'] = metric
+		worker_data['store_dir'] = store_dir
+		with multiprocessing.get_context('fork').Pool(processes=min(workers, len(comparison_dict))) as pool:
+			for pair_key in pool.imap_unordered(pair_membership_worker, comparison_dict.keys()):
+				#as each comparison finishes, load its scores from the file written by the worker
+				comparison_dict[pair_key] = load_checkpoint(store_dir, 'compare_OG_' + pair_key, [metric])
+				print("The " + pair_key + " comparison has been completed.")
+		worker_data.clear()
+	else:
+		#create the cache dictionary for the OG pair scores, keyed on the programs & OGs of each pair
+		#this way, each distinct pair of OGs is only scored once, no matter how many proteins they contain
+		og_cache = {}
+		for pair_key in comparison_dict.keys():
+			#iterate over the pairwise program comparisons
+			comparison_dict[pair_key] = pair_membership_scores(filt_prot_dict, member_dict_list, pair_key, metric, og_cache)
 
 	'''
 	Some references for the list comparisons:
@@ -462,6 +442,11 @@ def membership_test(filt_prot_dict, broccoli_dict, orthofinder_dict, proteinorth
 	Both of these methods yeild similar results, within 0.02 (compared two lists with different similarities).
 	I chose to use difflib because of its far simpler implementation.
 
+	The difflib comparison is quadratic in OG size and depends on the order of the OG members, so
+	the set-based Dice coefficient (the "dice" metric in og_scoring.py), as well as the Jaccard index
+	and overlap coefficient, can be selected with the --metric argument instead. These give different
+	scores from the difflib ratio, which remains the default.
+
 	'''
 
 	'''
@@ -481,19 +466,69 @@ def membership_test(filt_prot_dict, broccoli_dict, orthofinder_dict, proteinorth
 	#Checkpoint 4 - let the user know program progress
 	print("4th Checkpoint: OG scoring dictionary has been successfully created. Printing dictionary to file.")
 
-	with open('compare_OG_dict.json', 'w') as temp_file:
-		#open the JSON outfile for writing
-		#and write out the contents of the filt_prot_dict dictionary
-		json.dump(comparison_dict, temp_file)
+	#the comparison dictionary depends on the similarity metric used
+	save_checkpoint(store_dir, 'compare_OG_dict', comparison_dict, [metric])
 
 
 	#define objects to return
 	return comparison_dict
 
 
+def contingency_test(broccoli_df, orthofinder_df, proteinortho_df, sonicparanoid_df, metric='dice'):
+	# Part 5 (contingency mode): The complete clusterings of the programs are compared using one
+	# sparse contingency matrix per pairwise program comparison. The OG overlap tables and global
+	# agreement indices are written out, and the average scores dictionary is created directly
+	# from the contingency matrices. Checkpoint 4.5 is reached at the conclusion of this step,
+	# when the average scores dictionary is exported to the checkpoint store.
+
+	#create the sparse protein x OG indicator matrix of each program once
+	#in the format: matrix_list[prog_index] = (indicator_matrix, og_ids, og_sizes)
+	matrix_list = build_program_matrices([broccoli_df, orthofinder_df, proteinortho_df, sonicparanoid_df])
+
+	#create empty dictionaries for the average scores and the global agreement indices
+	og_score_dict = {}
+	agreement_dict = {}
+
+	for pair_key, (prog_idx_a, prog_idx_b) in program_pair_dict.items():
+		#iterate over the pairwise program comparisons
+		indicator_a, og_ids_a, og_sizes_a = matrix_list[prog_idx_a]
+		indicator_b, og_ids_b, og_sizes_b = matrix_list[prog_idx_b]
+		#the contingency matrix is the product of the two indicator matrices
+		#each cell contains the number of proteins shared by an OG of each program
+		contingency = (indicator_a.T @ indicator_b).tocsr()
+		#score all OG pairs that share proteins, and identify the best-matching OGs
+		overlap_df = overlap_table(contingency, og_ids_a, og_ids_b, og_sizes_a, og_sizes_b,
+							 program_name_list[prog_idx_a], program_name_list[prog_idx_b], metric)
+		#and write out the OG overlap table to a tab-separated text file
+		overlap_df.to_csv("OG_contingency_" + pair_key + ".txt", sep='\t', index=False)
+		#calculate the global agreement indices of the two clusterings
+		agreement_dict[pair_key] = agreement_indices(contingency)
+		#the average score per protein query weighs each OG pair by the number of proteins it shares
+		#this is the same value that the per-protein membership test would compute
+		og_score_dict[pair_key] = float((overlap_df['Shared_Proteins'] * overlap_df['Score']).sum() / overlap_df['Shared_Proteins'].sum())
+
+	#write out the global agreement indices to a tab-separated text file
+	agreement_df = pd.DataFrame.from_dict(agreement_dict, orient='index')
+	agreement_df['Mean_Score'] = pd.Series(og_score_dict)
+	agreement_df.index.name = 'Comparison'
+	agreement_df.to_csv("OG_contingency_agreement.txt", sep='\t', index=True)
+
+
+	#Checkpoint 4.5 - let the user know program progress
+	print("4.5th Checkpoint: OG comparison scores have been successfully created from the contingency matrices. \
+		  Printing dictionary to file.")
+
+	#the average scores of the contingency mode are stored separately from those of the membership test
+	save_checkpoint(store_dir, 'og_score_dict', og_score_dict, [metric, 'contingency'])
+
+
+	#define objects to return
+	return og_score_dict
+
+
 def avg_membership_scores(comparison_dict):
 	# Part 6: The scores inside of the comparison dictionary are averaged. Checkpoint 4.5 is
-	# reached at the conclusion of this step, when this smaller dictionary is exported in JSON format.
+	# reached at the conclusion of this step, when this smaller dictionary is exported to the checkpoint store.
 	#create a new empty dictionary to hold the average scores
 	og_score_dict = {}
 
@@ -508,10 +543,7 @@ def avg_membership_scores(comparison_dict):
 	#Checkpoint 4.5 - let the user know program progress
 	print("4.5th Checkpoint: OG comparison scores have been successfully created. Printing dictionary to file.")
 
-	with open('og_score_dict.json', 'w') as temp_file:
-		#open the JSON outfile for writing
-		#and write out the contents of the filt_prot_dict dictionary
-		json.dump(og_score_dict, temp_file)
+	save_checkpoint(store_dir, 'og_score_dict', og_score_dict, [metric])
 
 
 	#define objects to return
@@ -551,15 +583,70 @@ def threshold_test(og_score_dict):
 ###
 
 
+#parse the command-line arguments
+parser = argparse.ArgumentParser(description =
+								 'This program compares the parsed results files from Broccoli, OrthoFinder, \
+									ProteinOrtho and SonicParanoid, in order the score the similarity of the \
+									orthologous clusters created by these programs.')
+parser.add_argument(
+	dest='input_list',
+	metavar='INPUT',
+	nargs='+',
+	help = 'The 4 parsed OG databases and optional membership percent; or a checkpoint file \
+		and optional membership percent.'
+	)
+	#the positional arguments are interpreted in the same way as in earlier versions of the program
+parser.add_argument(
+	'-m', '--metric',
+	choices=metric_list,
+	help = 'The OG similarity metric to use (default: difflib, as in earlier versions of this program; \
+		dice in contingency mode).'
+	)
+	#the metric is only used in the membership test step
+parser.add_argument(
+	'-c', '--contingency',
+	action='store_true',
+	help = 'Compare the complete clusterings with sparse contingency matrices, instead of scoring \
+		each protein query. Only used with the 4 parsed OG databases as input.'
+	)
+	#the contingency mode replaces Parts 3-6 of the program
+parser.add_argument(
+	'-w', '--workers',
+	type=int,
+	default=1,
+	help = 'The number of worker processes used to run the 6 pairwise program comparisons of the \
+		membership test in parallel (default: 1).'
+	)
+	#at most 6 worker processes are used, one per pairwise program comparison
+parser.add_argument(
+	'-d', '--checkpoint_dir',
+	default='og_membership_checkpoints',
+	help = 'The directory in which the run-scoped checkpoint directories are created \
+		(default: og_membership_checkpoints).'
+	)
+	#each run on a different set of input files gets its own sub-directory, named after the content hash of the files
+
+args = parser.parse_args()
+if args.contingency and args.metric == 'difflib':
+	#the difflib ratio depends on the order of the OG members, so it cannot be computed from a contingency matrix
+	parser.error("The difflib metric cannot be used in contingency mode.")
+if args.metric is None:
+	#the difflib ratio is used by default, except in contingency mode, where it can't be computed
+	args.metric = 'dice' if args.contingency else 'difflib'
+#save the positional arguments in the same layout as sys.argv
+argv_list = [sys.argv[0]] + args.input_list
+metric = args.metric
+
+
 #first, set the membership percentage
-if len(sys.argv) == 6: #if the primary method of running the program is used
+if len(argv_list) == 6: #if the primary method of running the program is used
 	#check if the user gave a threshold value for filtering average cluster similarity
 	#if so, import the selected membership test threshold as the fifth command-line argument
-	membership_percent = sys.argv[5]
-if len(sys.argv) == 3: #if the program is run from a later checkpoint
+	membership_percent = argv_list[5]
+elif len(argv_list) == 3: #if the program is run from a later checkpoint
 	#check if the user gave a threshold value for filtering average cluster similarity
 	#if so, import the selected membership test threshold as the fifth command-line argument
-	membership_percent = sys.argv[2]
+	membership_percent = argv_list[2]
 else:
 	#if no threshold value is given by the user, use the default value of 50
 	membership_percent = 50
@@ -569,114 +656,112 @@ membership_results = "OG_membership_results_" + str(membership_percent) + ".txt"
 
 
 #next, set the dataframe command-line arguments for primary program usage method
-if len(sys.argv) >= 5:
+if len(argv_list) >= 5:
 	#assign command line arguments; load input and output files
 	#import the parsed Broccoli results as the first command-line argument
-	broccoli_db = sys.argv[1]
+	broccoli_db = argv_list[1]
 	#broccoli_db = "Broccoli_OGs_parsed.txt"
 	#import the parsed OrthoFinder results as the second command-line argument
-	orthofinder_db = sys.argv[2]
+	orthofinder_db = argv_list[2]
 	#orthofinder_db = "OF_OGs_parsed.txt"
 	#import the parsed ProteinOrtho results as the third command-line argument
-	proteinortho_db = sys.argv[3]
+	proteinortho_db = argv_list[3]
 	#proteinortho_db = "PO_OGs_parsed.txt"
 	#import the parsed SonicParanoid results as the fourth command-line argument
-	sonicparanoid_db = sys.argv[4]
+	sonicparanoid_db = argv_list[4]
 	#sonicparanoid_db = "SP_OGs_parsed.txt"
 
-	#now, use appropriate functions - in this case, all
-	broccoli_df, broccoli_dict, orthofinder_df, orthofinder_dict, proteinortho_df, proteinortho_dict, sonicparanoid_df, sonicparanoid_dict = data_2_pandas(broccoli_db, orthofinder_db, proteinortho_db, sonicparanoid_db)
-	prot_dict = create_prot_dict(broccoli_df, orthofinder_df, proteinortho_df, sonicparanoid_df)
-	filt_prot_dict = filter_prot_dict(prot_dict)
-	comparison_dict = membership_test(filt_prot_dict, broccoli_dict, orthofinder_dict, proteinortho_dict, sonicparanoid_dict)
-	og_score_dict = avg_membership_scores(comparison_dict)
+	#the checkpoints of this run are stored in a directory named after the content hash of the input files
+	#so that checkpoints from an earlier run on the same input files are re-used automatically
+	store_dir = checkpoint_dir(args.checkpoint_dir, [broccoli_db, orthofinder_db, proteinortho_db, sonicparanoid_db])
+	print("Checkpoint directory for this run: " + store_dir)
+
+	if args.contingency and has_checkpoint(store_dir, 'og_score_dict', [metric, 'contingency']):
+		#re-use the average scores of an earlier contingency mode run
+		print("Re-using Checkpoint 4.5 from an earlier run on the same input files.")
+		og_score_dict = load_checkpoint(store_dir, 'og_score_dict', [metric, 'contingency'])
+	elif args.contingency:
+		#in contingency mode, compare the complete clusterings with sparse contingency matrices
+		broccoli_df, broccoli_dict, orthofinder_df, orthofinder_dict, proteinortho_df, proteinortho_dict, sonicparanoid_df, sonicparanoid_dict = data_2_pandas(broccoli_db, orthofinder_db, proteinortho_db, sonicparanoid_db)
+		og_score_dict = contingency_test(broccoli_df, orthofinder_df, proteinortho_df, sonicparanoid_df, metric)
+	elif has_checkpoint(store_dir, 'og_score_dict', [metric]):
+		#re-use the average scores of an earlier run
+		print("Re-using Checkpoint 4.5 from an earlier run on the same input files.")
+		og_score_dict = load_checkpoint(store_dir, 'og_score_dict', [metric])
+	elif has_checkpoint(store_dir, 'compare_OG_dict', [metric]):
+		#re-use the comparison dictionary of an earlier run
+		print("Re-using Checkpoint 4 from an earlier run on the same input files.")
+		comparison_dict = load_checkpoint(store_dir, 'compare_OG_dict', [metric])
+		og_score_dict = avg_membership_scores(comparison_dict)
+	else:
+		if has_checkpoint(store_dir, 'filt_prot_dict') and all(has_checkpoint(store_dir, name) for name in og_dict_name_list):
+			#re-use the filtered protein query dictionary and OG dictionaries of an earlier run
+			print("Re-using Checkpoint 3 from an earlier run on the same input files.")
+			filt_prot_dict = load_checkpoint(store_dir, 'filt_prot_dict')
+			broccoli_dict, orthofinder_dict, proteinortho_dict, sonicparanoid_dict = load_program_dicts(store_dir, checkpoint_ext)
+		else:
+			#now, use appropriate functions - in this case, all
+			broccoli_df, broccoli_dict, orthofinder_df, orthofinder_dict, proteinortho_df, proteinortho_dict, sonicparanoid_df, sonicparanoid_dict = data_2_pandas(broccoli_db, orthofinder_db, proteinortho_db, sonicparanoid_db)
+			prot_dict = create_prot_dict(broccoli_df, orthofinder_df, proteinortho_df, sonicparanoid_df)
+			filt_prot_dict = filter_prot_dict(prot_dict)
+		comparison_dict = membership_test(filt_prot_dict, broccoli_dict, orthofinder_dict, proteinortho_dict, sonicparanoid_dict, metric, args.workers)
+		og_score_dict = avg_membership_scores(comparison_dict)
 	threshold_dict = threshold_test(og_score_dict)
 
 
-#for secondary usage method, loading prot_dict:
-if sys.argv[1] == 'prot_dict.json':
-	#open the primary JSON input file
-	with open('prot_dict.json') as json_file:
-		#open the JSON file containing the filt_prot_dict data
-		#and load it as a dictionary
-		prot_dict = json.load(json_file)
-	#open the clustering program dictionaries
-	with open('broccoli_dict.json') as broccoli_in:
-		#open the JSON file containing the filt_prot_dict data
-		#and load it as a dictionary
-		broccoli_dict = json.load(broccoli_in)
-	with open('orthofinder_dict.json') as orthofinder_in:
-		#open the JSON file containing the orthofinder_dict data
-		#and load it as a dictionary
-		orthofinder_dict = json.load(orthofinder_in)
-	with open('proteinortho_dict.json') as proteinortho_in:
-		#open the JSON file containing the proteinortho_dict data
-		#and load it as a dictionary
-		proteinortho_dict = json.load(proteinortho_in)
-	with open('sonicparanoid_dict.json') as sonicparanoid_in:
-		#open the JSON file containing the sonicparanoid_dict data
-		#and load it as a dictionary
-		sonicparanoid_dict = json.load(sonicparanoid_in)
-
-	#now, use appropriate functions - in this case, from filtration on
-	filt_prot_dict = filter_prot_dict(prot_dict)
-	comparison_dict = membership_test(filt_prot_dict, broccoli_dict, orthofinder_dict, proteinortho_dict, sonicparanoid_dict)
-	og_score_dict = avg_membership_scores(comparison_dict)
-	threshold_dict = threshold_test(og_score_dict)
-
-
-#for secondary usage method, loading filt_prot_dict:
-if sys.argv[1] == 'filt_prot_dict.json':
-	#open the primary JSON intermediate results file
-	with open('filt_prot_dict.json') as json_file:
-		#open the JSON file containing the filt_prot_dict data
-		#and load it as a dictionary
-		filt_prot_dict = json.load(json_file)
-	#open the clustering program dictionaries
-	with open('broccoli_dict.json') as broccoli_in:
-		#open the JSON file containing the filt_prot_dict data
-		#and load it as a dictionary
-		broccoli_dict = json.load(broccoli_in)
-	with open('orthofinder_dict.json') as orthofinder_in:
-		#open the JSON file containing the orthofinder_dict data
-		#and load it as a dictionary
-		orthofinder_dict = json.load(orthofinder_in)
-	with open('proteinortho_dict.json') as proteinortho_in:
-		#open the JSON file containing the proteinortho_dict data
-		#and load it as a dictionary
-		proteinortho_dict = json.load(proteinortho_in)
-	with open('sonicparanoid_dict.json') as sonicparanoid_in:
-		#open the JSON file containing the sonicparanoid_dict data
-		#and load it as a dictionary
-		sonicparanoid_dict = json.load(sonicparanoid_in)
-
-	#now, use approtpriate functions - in this case, from membership test on
-	comparison_dict = membership_test(filt_prot_dict, broccoli_dict, orthofinder_dict, proteinortho_dict, sonicparanoid_dict)
-	og_score_dict = avg_membership_scores(comparison_dict)
-	threshold_dict = threshold_test(og_score_dict)
-
-
-#for secondary usage method, loading comparison_dict:
-if sys.argv[1] == 'comparison_dict.json':
-	with open('compare_OG_dict.json') as json_file:
-		#open the JSON file containing the filt_prot_dict data
-		#and load it as a dictionary
-		comparison_dict = json.load(json_file)
-
-	#now, use appropriate functions - in this case, from avergaing the membership scores on
-	og_score_dict = avg_membership_scores(comparison_dict)
-	threshold_dict = threshold_test(og_score_dict)
-
-
-#for secondary usage method, loading og_score_dict:
-if sys.argv[1] == 'og_score_dict.json':
-	with open('og_score_dict.json') as json_file:
-		#open the JSON file containing the filt_prot_dict data
-		#and load it as a dictionary
-		og_score_dict = json.load(json_file)
-
-	#now, use appropriate functions - in this case, only the threshold dictionary creation
-	threshold_dict = threshold_test(og_score_dict)
+else:
+	#for the secondary usage method, the program is started from a checkpoint file
+	#this can be a checkpoint file from the checkpoint store, or a JSON checkpoint file from earlier versions of this program
+	checkpoint_file = argv_list[1]
+	#the other checkpoints of the run are found in the same directory as the given checkpoint file
+	#and new checkpoints are written to that directory
+	store_dir = os.path.dirname(checkpoint_file)
+	checkpoint_file_ext = os.path.splitext(checkpoint_file)[1]
+	#the checkpoint name is the file name without the extension and parameters (ex. 'filt_prot_dict')
+	checkpoint_name = os.path.splitext(os.path.basename(checkpoint_file))[0].split('__')[0]
+	checkpoint_params = os.path.splitext(os.path.basename(checkpoint_file))[0].split('__')[1:]
+	if checkpoint_params:
+		#checkpoints computed with a specific similarity metric are continued with that metric
+		#so that the checkpoints written from here on are labelled correctly
+		metric = checkpoint_params[0]
+
+	#for secondary usage method, loading prot_dict:
+	if checkpoint_name == 'prot_dict':
+		#load the protein query dictionary and the clustering program dictionaries
+		prot_dict = load_checkpoint_file(checkpoint_file)
+		broccoli_dict, orthofinder_dict, proteinortho_dict, sonicparanoid_dict = load_program_dicts(store_dir, checkpoint_file_ext)
+
+		#now, use appropriate functions - in this case, from filtration on
+		filt_prot_dict = filter_prot_dict(prot_dict)
+		comparison_dict = membership_test(filt_prot_dict, broccoli_dict, orthofinder_dict, proteinortho_dict, sonicparanoid_dict, metric, args.workers)
+		og_score_dict = avg_membership_scores(comparison_dict)
+		threshold_dict = threshold_test(og_score_dict)
+
+	#for secondary usage method, loading filt_prot_dict:
+	if checkpoint_name == 'filt_prot_dict':
+		#load the filtered protein query dictionary and the clustering program dictionaries
+		filt_prot_dict = load_checkpoint_file(checkpoint_file)
+		broccoli_dict, orthofinder_dict, proteinortho_dict, sonicparanoid_dict = load_program_dicts(store_dir, checkpoint_file_ext)
+
+		#now, use approtpriate functions - in this case, from membership test on
+		comparison_dict = membership_test(filt_prot_dict, broccoli_dict, orthofinder_dict, proteinortho_dict, sonicparanoid_dict, metric, args.workers)
+		og_score_dict = avg_membership_scores(comparison_dict)
+		threshold_dict = threshold_test(og_score_dict)
+
+	#for secondary usage method, loading comparison_dict:
+	if checkpoint_name == 'compare_OG_dict':
+		comparison_dict = load_checkpoint_file(checkpoint_file)
+
+		#now, use appropriate functions - in this case, from avergaing the membership scores on
+		og_score_dict = avg_membership_scores(comparison_dict)
+		threshold_dict = threshold_test(og_score_dict)
+
+	#for secondary usage method, loading og_score_dict:
+	if checkpoint_name == 'og_score_dict':
+		og_score_dict = load_checkpoint_file(checkpoint_file)
+
+		#now, use appropriate functions - in this case, only the threshold dictionary creation
+		threshold_dict = threshold_test(og_score_dict)
 
 
 ###
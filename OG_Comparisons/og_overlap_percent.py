@@ -7,7 +7,7 @@ Date: 2022-03-21
 Author: Virág Varga
 
 Description:
-	This program imports the JSON dictionary output by the og_membership_test.py program
+	This program imports the checkpoint dictionary output by the og_membership_test.py program
 		containing information on the OGs associated with a protein query ID from the 4 analysis
 		programs used in this workflow (Broccoli, OrthoFinder, ProteinOrtho, SonicParanoid),
 		and performs all-vs-all comparisons to identify the OGs with the greatest similarity.
@@ -29,15 +29,20 @@ List of functions:
 		Source: https://stackoverflow.com/a/5419576/18382033
 
 List of standard and non-standard modules used:
-	sys
+	argparse
 	json
-	difflib
 	pandas
 	itertools.chain
+	os
+	og_scoring.py
+	og_checkpoint.py (pyarrow)
 
 Procedure:
 	1. Importing necessary modules, assigning command-line arguments.
-	2. Opening data files and importing into best data types for manipulation.
+	2. Opening data files and importing into best data types for manipulation. The binary
+		checkpoint files are memory-mapped: the protein query dictionary is converted into a
+		dictionary, while the members of the OGs of the clustering program dictionaries are
+		only read from the checkpoint files when they are used.
 	3. Finding orthologous groups that meet the threshold similarity using all-vs-all membership tests,
 		before filtering out protein queries that have no matching OG pairs that meet the similarity 
 		threshold value. 
@@ -49,19 +54,37 @@ Procedure:
 Known bugs and limitations:
 	- There is no quality-checking integrated into the code.
 	- The names of the output files are not user-defined.
-	- The input file used for the program must be either the prot_dict.json file or
-		filt_prot_dict.json file produced by the og_membership_test.py script.
-	- This program must be run from the directory containing the input .json file. It will
-		automatically search in that directory for the following files: broccoli_dict.json,
-		orthofinder_dict.json, proteinortho_dict.json, and sonicparanoid_dict.json. These
-		files are all also produced by the og_membership_test.py program.
+	- The input file used for the program must be either the prot_dict or filt_prot_dict
+		checkpoint file produced by the og_membership_test.py script. These can be binary
+		checkpoint files (ex. og_membership_checkpoints/[input_hash]/filt_prot_dict.arrow),
+		or the JSON files produced by earlier versions of og_membership_test.py.
+	- The program will automatically search in the directory of the input file for the clustering
+		program dictionaries, in the same file format: broccoli_dict, orthofinder_dict,
+		proteinortho_dict, and sonicparanoid_dict (ex. broccoli_dict.arrow). These files are
+		all also produced by the og_membership_test.py program.
 	- This program is intended for use with parsed Broccoli results from which duplicates have 
 		already been removed. 
+	- The og_scoring.py and og_checkpoint.py modules must be located in the same directory as
+		this program. The atomic_output.py module imported by og_checkpoint.py (in the
+		DB_Construct/ directory of this repository) must be located there as well, or in a
+		directory listed in the PYTHONPATH environment variable (ex. PYTHONPATH=../DB_Construct).
+	- This program still compares the OGs of each protein query one at a time (with each distinct
+		OG pair scored only once, using og_scoring.py), since its outputs are per protein query,
+		and the default difflib metric cannot be computed from a contingency matrix. The sparse
+		contingency matrix comparison of og_contingency.py is available in the contingency mode
+		of og_membership_test.py (-c), whose OG_contingency_[comparison].txt tables list all of
+		the OG pairs sharing proteins, with their scores (for the dice, jaccard & overlap metrics).
 
 Usage:
-	./og_overlap_percent.py prot_to_OG_db output_base [membership_threshold]
+	./og_overlap_percent.py [-m {dice,jaccard,overlap,difflib}] prot_to_OG_db output_base [membership_threshold]
 	OR
-	python og_overlap_percent.py prot_to_OG_db output_base [membership_threshold]
+	python og_overlap_percent.py [-m {dice,jaccard,overlap,difflib}] prot_to_OG_db output_base [membership_threshold]
+
+	* Where the default similarity metric is difflib (the difflib.SequenceMatcher ratio used in
+		earlier versions of this program). The dice (2 * shared proteins / summed OG sizes), jaccard
+		and overlap metrics are set-based, much faster on large OGs, and do not depend on the order
+		of the OG members, but give different scores from the difflib ratio.
+		Each distinct OG pair is only scored once per program comparison, using the og_scoring.py module.
 
 This script was written for Python 3.8.12, in Spyder 5.1.5.
 """
@@ -70,11 +93,13 @@ This script was written for Python 3.8.12, in Spyder 5.1.5.
 #Part 1: Import necessary modules, assign command-line arguments
 
 #import necessary modules
-import sys #allows assignment of command line arguments
+import argparse #allows assignment of command line arguments
+import os #allow access to computer files
 import json #allows transfer of data into and out of JSON files
-import difflib #compare and calculate differences between datasets
 import pandas as pd #allows manipulation of dataframes in Python
 from itertools import chain #allows manipulation of nested lists
+from og_scoring import program_name_list, program_pair_dict, metric_list, prepare_og_members, cached_og_score #memoized OG similarity scoring
+from og_checkpoint import load_checkpoint_file #binary checkpoint store
 
 
 #define function to identify indexes of recorring element in list
@@ -104,23 +129,47 @@ def list_duplicates_of(seq, item):
 
 
 #assign and interpret inputs
-prot_to_OG_db = sys.argv[1]
+parser = argparse.ArgumentParser(description =
+								 'This program performs all-vs-all comparisons of the OGs associated with each \
+									protein query ID, to identify the OGs with the greatest similarity.')
+parser.add_argument(
+	dest='prot_to_OG_db',
+	metavar='PROT_TO_OG_DB',
+	help = 'The prot_dict or filt_prot_dict checkpoint file produced by og_membership_test.py.'
+	)
+parser.add_argument(
+	dest='output_base',
+	metavar='OUTPUT_BASE',
+	help = 'The base name of the output files.'
+	)
+parser.add_argument(
+	dest='membership_threshold',
+	metavar='MEMBERSHIP_THRESHOLD',
+	nargs='?',
+	default=80,
+	help = 'The membership threshold, as an integer percentage value (default: 80).'
+	)
+	#if no membership threshold is given by the user, then 80% should be used as the default
+parser.add_argument(
+	'-m', '--metric',
+	choices=metric_list,
+	default='difflib',
+	help = 'The OG similarity metric to use (default: difflib, as in earlier versions of this program).'
+	)
+
+args = parser.parse_args()
+
+prot_to_OG_db = args.prot_to_OG_db
 #prot_to_OG_db = "filt_prot_dict.json"
-
-if len(sys.argv) == 3:
-	#if no membership threshold is given by the user,
-	#then 80% should be used as the default
-	membership_threshold = 80
-if len(sys.argv) == 4:
-	#if the user gives a membership threshold, save the percent value to a variable
-	membership_threshold = sys.argv[3]
+membership_threshold = args.membership_threshold
+metric = args.metric
 
 #convert membership percentage to a decimal
 membership_decimal = float(membership_threshold)/100
 
 
 #define output files based on input
-output_base = sys.argv[2]
+output_base = args.output_base
 #output_base = "OG_membership_overlap"
 
 #output files (non-JSON)
@@ -141,28 +190,17 @@ outfile_summary = output_base + "__SUMMARY_" + str(membership_threshold) + ".txt
 #Part 2: Opening data files and importing into best data types for manipulation
 
 #the filtered protein ID to list of assigned OGs dictionary
-with open(prot_to_OG_db) as json_file:
-	#open the JSON file containing the filt_prot_dict data
-	#and load it as a dictionary
-	filt_prot_dict = json.load(json_file)
+#this can be a checkpoint file from the og_membership_test.py checkpoint store (.arrow),
+#or a JSON checkpoint file from earlier versions of og_membership_test.py
+filt_prot_dict = load_checkpoint_file(prot_to_OG_db)
 
 #open the clustering program dictionaries
-with open('broccoli_dict.json') as broccoli_in:
-	#open the JSON file containing the filt_prot_dict data
-	#and load it as a dictionary
-	broccoli_dict = json.load(broccoli_in)
-with open('orthofinder_dict.json') as orthofinder_in:
-	#open the JSON file containing the orthofinder_dict data
-	#and load it as a dictionary
-	orthofinder_dict = json.load(orthofinder_in)
-with open('proteinortho_dict.json') as proteinortho_in:
-	#open the JSON file containing the proteinortho_dict data
-	#and load it as a dictionary
-	proteinortho_dict = json.load(proteinortho_in)
-with open('sonicparanoid_dict.json') as sonicparanoid_in:
-	#open the JSON file containing the sonicparanoid_dict data
-	#and load it as a dictionary
-	sonicparanoid_dict = json.load(sonicparanoid_in)
+#these are found in the same directory as the input file, in the same file format
+store_dir = os.path.dirname(prot_to_OG_db)
+store_ext = os.path.splitext(prot_to_OG_db)[1]
+broccoli_dict, orthofinder_dict, proteinortho_dict, sonicparanoid_dict = [
+	load_checkpoint_file(os.path.join(store_dir, name + store_ext)) for name in
+	['broccoli_dict', 'orthofinder_dict', 'proteinortho_dict', 'sonicparanoid_dict']]
 
 
 #Part 3: Finding orthologous groups that meet the threshold similarity using all-vs-all membership tests
@@ -174,177 +212,44 @@ with open('sonicparanoid_dict.json') as sonicparanoid_in:
 prot_comparison_dict = {}
 #dictionary format: comparison_dict[prog_vs_prog] = [[prog1_OG1, prog1_OG2, etc.], [prog2_OG2, prog2_OG2]]
 #values from comparisons should only be saved to the dictionary if they meet the threshold similarity value
-comparison_dict = {}
-#define the keys of the dictionary with empty lists as associated values
-comparison_dict['Br_vs_OF'] = [[], []] #Broccoli vs OrthoFinder
-comparison_dict['Br_vs_PO'] = [[], []] #Broccoli vs ProteinOrtho
-comparison_dict['Br_vs_SP'] = [[], []] #Broccoli vs SonicParanoid
-comparison_dict['OF_vs_PO'] = [[], []] #OrthoFinder vs ProteinOrtho
-comparison_dict['OF_vs_SP'] = [[], []] #OrthoFinder vs SonicParanoid
-comparison_dict['PO_vs_SP'] = [[], []] #ProteinOrtho vs SonicParanoid
+#the keys are the pairwise program comparisons: Br_vs_OF, Br_vs_PO, Br_vs_SP, OF_vs_PO, OF_vs_SP, PO_vs_SP
+comparison_dict = {pair_key: [[], []] for pair_key in program_pair_dict.keys()}
+
+
+#convert the OG member lists of each program into the format used by the selected metric
+#the order of this list matches the order of the OGs in the filt_prot_dict value lists
+member_dict_list = [prepare_og_members(og_dict, metric) for og_dict in
+					[broccoli_dict, orthofinder_dict, proteinortho_dict, sonicparanoid_dict]]
+#create the cache dictionary for the OG pair scores, keyed on the programs & OGs of each pair
+#this way, each distinct pair of OGs is only scored once per program comparison, no matter how many proteins they contain
+og_cache = {}
 
 
 for key in filt_prot_dict.keys():
 	#iterate through the prot_dict dictionary using its keys
 	prot_comparison_list = []
 	#initialize an empty list that will contain the program matching information for the protein query
-	#only calculate comparisons in places where both of the compared programs have results for that protein
-	if filt_prot_dict[key][0] != "-" and filt_prot_dict[key][1] != "-":
-		#comparing OGs where a protein query ID is found in both Broccoli and OrthoFinder
-		Br_OG = filt_prot_dict[key][0]
-		#extract the OG that the protein query belongs to within the Broccoli results
-		Br_OG_compare = broccoli_dict[Br_OG]
-		#use the extracted OG ID to query the Broccoli OG dictionary, to get the list of proteins in that OG
-		OF_OG = filt_prot_dict[key][1]
-		#extract the OG that the protein query belongs to within the OrthoFinder results
-		OF_OG_compare = orthofinder_dict[OF_OG]
-		#use the extracted OG ID to query the OrthoFinder OG dictionary, to get the list of proteins in that OG
-		sm=difflib.SequenceMatcher(None,Br_OG_compare,OF_OG_compare)
-		#compare the similarity of the two protein lists
-		#and compute a numerical ratio of that similarity, which is saved to a variable
-		br_vs_of = sm.ratio()
-		if br_vs_of >= membership_decimal:
-			#check whether the score meets the threshold requirement
-			br_vs_of_comp_list = ["Broccoli", Br_OG, "OrthoFinder", OF_OG, br_vs_of]
-			#create list of information to append to entry for protein query dictionary
-			#and append the information to the data comparison list of lists
-			prot_comparison_list.append(br_vs_of_comp_list)
-			#append the OG IDs for Broccoli and OrthoFinder to the value list matching the
-			#'Br_vs_OF' key in the comparison dictionary
-			#first save the Broccoli OG to the first list in the list
-			comparison_dict['Br_vs_OF'][0].append(Br_OG)
-			#then save the OrthoFinder OG to the second list in the list
-			comparison_dict['Br_vs_OF'][1].append(OF_OG)
-	if filt_prot_dict[key][0] != "-" and filt_prot_dict[key][2] != "-":
-		#comparing OGs where a protein query ID is found in both Broccoli and ProteinOrtho
-		Br_OG = filt_prot_dict[key][0]
-		#extract the OG that the protein query belongs to within the Broccoli results
-		Br_OG_compare = broccoli_dict[Br_OG]
-		#use the extracted OG ID to query the Broccoli OG dictionary, to get the list of proteins in that OG
-		PO_OG = filt_prot_dict[key][2]
-		#extract the OG that the protein query belongs to within the ProteinOrtho results
-		PO_OG_compare = proteinortho_dict[PO_OG]
-		#use the extracted OG ID to query the ProteinOrtho OG dictionary, to get the list of proteins in that OG
-		sm=difflib.SequenceMatcher(None,Br_OG_compare,PO_OG_compare)
-		#compare the similarity of the two protein lists
-		#and compute a numerical ratio of that similarity
-		br_vs_po = sm.ratio()
-		if br_vs_po >= membership_decimal:
-			#check whether the score meets the threshold requirement
-			br_vs_po_comp_list = ["Broccoli", Br_OG, "ProteinOrtho", PO_OG, br_vs_po]
-			#create list of information to append to entry for protein query dictionary
-			#and append the information to the data comparison list of lists
-			prot_comparison_list.append(br_vs_po_comp_list)
-			#append the OG IDs for Broccoli and ProteinOrtho to the value list matching the
-			#'Br_vs_PO' key in the comparison dictionary
-			#first save the Broccoli OG to the first list in the list
-			comparison_dict['Br_vs_PO'][0].append(Br_OG)
-			#then save the ProteinOrtho OG to the second list in the list
-			comparison_dict['Br_vs_PO'][1].append(PO_OG)
-	if filt_prot_dict[key][0] != "-" and filt_prot_dict[key][3] != "-":
-		#comparing OGs where a protein query ID is found in both Broccoli and SonicParanoid
-		Br_OG = filt_prot_dict[key][0]
-		#extract the OG that the protein query belongs to within the Broccoli results
-		Br_OG_compare = broccoli_dict[Br_OG]
-		#use the extracted OG ID to query the Broccoli OG dictionary, to get the list of proteins in that OG
-		SP_OG = filt_prot_dict[key][3]
-		#extract the OG that the protein query belongs to within the SonicParanoid results
-		SP_OG_compare = sonicparanoid_dict[SP_OG]
-		#use the extracted OG ID to query the SonicParanoid OG dictionary, to get the list of proteins in that OG
-		sm=difflib.SequenceMatcher(None,Br_OG_compare,SP_OG_compare)
-		#compare the similarity of the two protein lists
-		#and compute a numerical ratio of that similarity
-		br_vs_sp = sm.ratio()
-		if br_vs_sp >= membership_decimal:
-			#check whether the score meets the threshold requirement
-			br_vs_sp_comp_list = ["Broccoli", Br_OG, "SonicParanoid", SP_OG, br_vs_sp]
-			#create list of information to append to entry for protein query dictionary
-			#and append the information to the data comparison list of lists
-			prot_comparison_list.append(br_vs_sp_comp_list)
-			#append the OG IDs for Broccoli and SonicParanoid to the value list matching the
-			#'Br_vs_SP' key in the comparison dictionary
-			#first save the Broccoli OG to the first list in the list
-			comparison_dict['Br_vs_SP'][0].append(Br_OG)
-			#then save the SonicParanoid OG to the second list in the list
-			comparison_dict['Br_vs_SP'][1].append(SP_OG)
-	if filt_prot_dict[key][1] != "-" and filt_prot_dict[key][2] != "-":
-		#comparing OGs where a protein query ID is found in both OrthoFinder and ProteinOrtho
-		PO_OG = filt_prot_dict[key][2]
-		#extract the OG that the protein query belongs to within the ProteinOrtho results
-		PO_OG_compare = proteinortho_dict[PO_OG]
-		#use the extracted OG ID to query the ProteinOrtho OG dictionary, to get the list of proteins in that OG
-		OF_OG = filt_prot_dict[key][1]
-		#extract the OG that the protein query belongs to within the OrthoFinder results
-		OF_OG_compare = orthofinder_dict[OF_OG]
-		#use the extracted OG ID to query the OrthoFinder OG dictionary, to get the list of proteins in that OG
-		sm=difflib.SequenceMatcher(None,PO_OG_compare,OF_OG_compare)
-		#compare the similarity of the two protein lists
-		#and compute a numerical ratio of that similarity
-		of_vs_po = sm.ratio()
-		if of_vs_po >= membership_decimal:
-			#check whether the score meets the threshold requirement
-			of_vs_po_comp_list = ["OrthoFinder", OF_OG, "ProteinOrtho", PO_OG, of_vs_po]
-			#create list of information to append to entry for protein query dictionary
-			#and append the information to the data comparison list of lists
-			prot_comparison_list.append(of_vs_po_comp_list)
-			#append the OG IDs for OrthoFinder and ProteinOrtho to the value list matching the
-			#'OF_vs_PO' key in the comparison dictionary
-			#first save the OrthoFinder OG to the first list in the list
-			comparison_dict['OF_vs_PO'][0].append(OF_OG)
-			#then save the ProteinOrtho OG to the second list in the list
-			comparison_dict['OF_vs_PO'][1].append(PO_OG)
-	if filt_prot_dict[key][1] != "-" and filt_prot_dict[key][3] != "-":
-		#comparing OGs where a protein query ID is found in both OrthoFinder and SonicParanoid
-		SP_OG = filt_prot_dict[key][3]
-		#extract the OG that the protein query belongs to within the SonicParanoid results
-		SP_OG_compare = sonicparanoid_dict[SP_OG]
-		#use the extracted OG ID to query the SonicParanoid OG dictionary, to get the list of proteins in that OG
-		OF_OG = filt_prot_dict[key][1]
-		#extract the OG that the protein query belongs to within the OrthoFinder results
-		OF_OG_compare = orthofinder_dict[OF_OG]
-		#use the extracted OG ID to query the OrthoFinder OG dictionary, to get the list of proteins in that OG
-		sm=difflib.SequenceMatcher(None,SP_OG_compare,OF_OG_compare)
-		#compare the similarity of the two protein lists
-		#and compute a numerical ratio of that similarity
-		of_vs_sp = sm.ratio()
-		if of_vs_sp >= membership_decimal:
-			#check whether the score meets the threshold requirement
-			of_vs_sp_comp_list = ["OrthoFinder", OF_OG, "SonicParanoid", SP_OG, of_vs_sp]
-			#create list of information to append to entry for protein query dictionary
-			#and append the information to the data comparison list of lists
-			prot_comparison_list.append(of_vs_sp_comp_list)
-			#append the OG IDs for OrthoFinder and SonicParanoid to the value list matching the
-			#'OF_vs_SP' key in the comparison dictionary
-			#first save the OrthoFinder OG to the first list in the list
-			comparison_dict['OF_vs_SP'][0].append(OF_OG)
-			#then save the SonicParanoid OG to the second list in the list
-			comparison_dict['OF_vs_SP'][1].append(SP_OG)
-	if filt_prot_dict[key][2] != "-" and filt_prot_dict[key][3] != "-":
-		#comparing OGs where a protein query ID is found in both ProteinOrtho and SonicParanoid
-		PO_OG = filt_prot_dict[key][2]
-		#extract the OG that the protein query belongs to within the ProteinOrtho results
-		PO_OG_compare = proteinortho_dict[PO_OG]
-		#use the extracted OG ID to query the Broccoli OG dictionary, to get the list of proteins in that OG
-		SP_OG = filt_prot_dict[key][3]
-		#extract the OG that the protein query belongs to within the SonicParanoid results
-		SP_OG_compare = sonicparanoid_dict[SP_OG]
-		#use the extracted OG ID to query the SonicParanoid OG dictionary, to get the list of proteins in that OG
-		sm=difflib.SequenceMatcher(None,PO_OG_compare,SP_OG_compare)
-		#compare the similarity of the two protein lists
-		#and compute a numerical ratio of that similarity
-		po_vs_sp = sm.ratio()
-		if po_vs_sp >= membership_decimal:
-			#check whether the score meets the threshold requirement
-			po_vs_sp_comp_list = ["ProteinOrtho", PO_OG, "SonicParanoid", SP_OG, po_vs_sp]
-			#create list of information to append to entry for protein query dictionary
-			#and append the information to the data comparison list of lists
-			prot_comparison_list.append(po_vs_sp_comp_list)
-			#append the OG IDs for Broccoli and OrthoFinder to the value list matching the
-			#'PO_vs_SP' key in the comparison dictionary
-			#first save the ProteinOrtho OG to the first list in the list
-			comparison_dict['PO_vs_SP'][0].append(PO_OG)
-			#then save the SonicParanoid OG to the second list in the list
-			comparison_dict['PO_vs_SP'][1].append(SP_OG)
+	prot_og_list = filt_prot_dict[key]
+	#extract the list of OGs that the protein query belongs to
+	for pair_key, (prog_idx_a, prog_idx_b) in program_pair_dict.items():
+		#iterate over the pairwise program comparisons
+		#only calculate comparisons in places where both of the compared programs have results for that protein
+		if prot_og_list[prog_idx_a] != "-" and prot_og_list[prog_idx_b] != "-":
+			og_a = prot_og_list[prog_idx_a]
+			og_b = prot_og_list[prog_idx_b]
+			#extract the OGs that the protein query belongs to within the results of the 2 programs
+			og_score = cached_og_score(og_cache, member_dict_list, prog_idx_a, og_a, prog_idx_b, og_b, metric)
+			#score the similarity of the two OGs, re-using the score if the OG pair has been scored before
+			if og_score >= membership_decimal:
+				#check whether the score meets the threshold requirement
+				#create list of information to append to entry for protein query dictionary
+				#and append the information to the data comparison list of lists
+				prot_comparison_list.append([program_name_list[prog_idx_a], og_a, program_name_list[prog_idx_b], og_b, og_score])
+				#append the OG IDs for both programs to the value list matching the comparison key in the comparison dictionary
+				#first save the first program's OG to the first list in the list
+				comparison_dict[pair_key][0].append(og_a)
+				#then save the second program's OG to the second list in the list
+				comparison_dict[pair_key][1].append(og_b)
 	#finally, adding the protein comparison data to the dictionary
 	prot_comparison_dict[key] = prot_comparison_list
 	#assign the list of lists contianing comparison data as the value to the protein query key
@@ -365,6 +270,11 @@ https://en.wikipedia.org/wiki/Cosine_similarity
 Both of these methods yeild similar results, within 0.02 (compared two lists with different similarities).
 I chose to use difflib because of its far simpler implementation.
 
+The difflib comparison is quadratic in OG size and depends on the order of the OG members, so
+the set-based Dice coefficient (the "dice" metric in og_scoring.py), as well as the Jaccard index
+and overlap coefficient, can be selected with the --metric argument instead. These give different
+scores from the difflib ratio, which remains the default.
+
 '''
 
 '''
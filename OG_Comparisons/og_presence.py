@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+#!/bin/python
+"""
+
+Title: og_presence.py
+Date: 2026-10-18
+Author: Virág Varga
+
+Description:
+	This module contains the OG x species and OG x phylum presence matrices used by the
+		representation filters of the OG_Comparisons directory (filter_OG_speciesRep__v2.py,
+		filter_paralogs__v2.py, rep_4_phyla.py and og_db_plusSpeciesRep__v2.py).
+	Instead of looking up the species category & phylum of every protein query in the reference
+		dataframe, the parsed OG file is merged with the reference file once, and the OG IDs,
+		species categories and phyla are converted into categorical integer codes. These are
+		used to build compact count matrices (NumPy uint16 arrays), in which each cell contains
+		the number of proteins of a species category (or phylum) in an OG. The presence matrices
+		are simply the boolean (count > 0) versions of these.
+	The matrices are cached on disk, in a NumPy .npz file named after the content hash of the
+		parsed OG file and the reference file. Re-running a filter on unchanged input files
+		(ex. with a different threshold) therefore only loads the cached matrices, and all of
+		the filters are vectorized reductions over the matrices.
+	The matrices are stored in a dictionary (presence_dict) with the following keys:
+		- og_ids: the OG IDs, in sorted order (the rows of the matrices)
+		- species_ids: the species categories, in the order they occur in the reference file
+		- phylum_ids: the phyla, in the order they occur in the reference file
+		- species_counts: the OG x species category count matrix
+		- phylum_counts: the OG x phylum count matrix
+
+List of functions:
+	read_og_file(infile):
+		Imports a parsed OG file into a Pandas dataframe with the columns Query & OG ID.
+	build_count_matrix(og_codes, category_codes, n_ogs, n_categories):
+		Creates an OG x category count matrix from the integer codes of the OG members.
+	build_presence(ortho_df, ref_df):
+		Creates the OG x species category and OG x phylum count matrices.
+	load_presence(infile, ref_db, ortho_df, cache_dir):
+		Loads the count matrices of a parsed OG file from the cache, or creates and caches them.
+	species_presence(presence_dict) / phylum_presence(presence_dict):
+		Returns the boolean OG x species category (or phylum) presence matrix.
+	species_counts(presence_dict) / phylum_counts(presence_dict):
+		Returns the number of species categories (or phyla) represented in each OG.
+	filter_min_species(presence_dict, min_species):
+		Returns the OG IDs of the OGs with at least min_species species categories.
+	filter_phyla_sets(presence_dict, phyla_set_list):
+		Returns the OG IDs of the OGs whose set of phyla is exactly equal to one of the given sets.
+	represented_names(presence_matrix, name_ids):
+		Creates the comma-separated list of species categories (or phyla) represented in each OG.
+
+List of standard and non-standard modules used:
+	os
+	numpy
+	pandas
+	og_checkpoint.py
+	atomic_output.py
+
+Procedure:
+	1. Loading required modules; defining the cache file format.
+	2. Defining the functions of the module.
+
+Known bugs and limitations:
+	- There is no quality-checking integrated into the code.
+	- Only the first occurrence of a protein query ID in the reference file is used.
+	- Protein queries that are not found in the reference file are not counted.
+	- Counts above 65535 proteins of one species category in a single OG are capped at 65535.
+	- Old cache files are not removed automatically.
+	- This is a module, not a stand-alone program. It should be imported by scripts
+		located in the same directory.
+	- The atomic_output.py module (in the DB_Construct/ directory of this repository) must be
+		located in the same directory as this module (ex. when all programs are copied into the
+		same Scripts/ directory, as in the README), or in a directory listed in the PYTHONPATH
+		environment variable (ex. PYTHONPATH=../DB_Construct).
+
+Usage:
+	from og_presence import load_presence, species_counts, filter_min_species
+
+This script was written for Python 3.8.12, in Spyder 5.1.5.
+
+"""
+
+
+# Part 1: Loading required modules; defining the cache file format.
+
+#import necessary modules
+import os #allow access to computer files
+import numpy as np #allows vectorized manipulation of numerical arrays
+import pandas as pd #facilitates manipulation of dataframes in Python
+from og_checkpoint import hash_inputs #content hash of the input files
+from atomic_output import atomic_output #writing of complete files only
+
+
+#the default directory in which the cache files are written
+presence_cache_dir = 'og_presence_cache'
+
+#the version of the cache file format, which is included in the content hash
+#so that cache files written by earlier versions of this module are not re-used
+presence_cache_version = 'og_presence_1'
+
+#the arrays stored in the cache files
+presence_key_list = ['og_ids', 'species_ids', 'phylum_ids', 'species_counts', 'phylum_counts']
+
+#the largest count that can be stored in the count matrices
+max_count = np.iinfo(np.uint16).max
+
+
+# Part 2: Defining the functions of the module.
+
+def read_og_file(infile):
+	#import input file into pandas dataframe
+	ortho_df = pd.read_csv(infile, sep = '\t', header = 0)
+	#remove 3rd column from Pandas dataframe if necessary
+	#needed for original parsed results of OrthoFinder, ProteinOrtho & SonicParanoid
+	if len(ortho_df.columns) == 3:
+		#remove middle column with species information
+		ortho_df.drop(ortho_df.columns[1], axis=1, inplace=True)
+	#define objects to return
+	return ortho_df
+
+
+def build_count_matrix(og_codes, category_codes, n_ogs, n_categories):
+	#count the proteins of each OG x category combination in a single pass,
+	#by converting each (OG, category) pair into a position in the flattened matrix
+	flat_counts = np.bincount(og_codes * n_categories + category_codes, minlength=n_ogs * n_categories)
+	#cap the counts at the largest value that can be stored in the matrix
+	count_matrix = np.minimum(flat_counts, max_count).astype(np.uint16).reshape(n_ogs, n_categories)
+	#define objects to return
+	return count_matrix
+
+
+def build_presence(ortho_df, ref_df):
+	#identify OG column name
+	og_col = ortho_df.columns[1]
+	#the species categories & phyla are taken from the full reference file,
+	#so that the total numbers of species categories & phyla match the reference
+	species_ids = pd.Index(ref_df['Species_Category'].dropna().unique())
+	phylum_ids = pd.Index(ref_df['Phylum'].dropna().unique())
+
+	#only the first occurrence of a protein query ID in the reference file is used
+	first_ref_df = ref_df.drop_duplicates(subset='Query', keep='first')
+	#add the species category and phylum of each protein query to the OG dataframe in a single join
+	og_ref_df = ortho_df[['Query', og_col]].merge(first_ref_df[['Query', 'Species_Category', 'Phylum']],
+											   on='Query', how='left', sort=False)
+
+	#convert the OG IDs into integer codes, in sorted OG ID order
+	og_codes, og_ids = pd.factorize(og_ref_df[og_col], sort=True)
+	#convert the species categories and phyla into integer codes
+	species_codes = species_ids.get_indexer(og_ref_df['Species_Category'])
+	phylum_codes = phylum_ids.get_indexer(og_ref_df['Phylum'])
+
+	#protein queries that are not in the reference file have a code of -1, and are not counted
+	species_mask = (og_codes >= 0) & (species_codes >= 0)
+	phylum_mask = (og_codes >= 0) & (phylum_codes >= 0)
+
+	#OG IDs stored as Python objects (ie. strings) are converted to NumPy strings,
+	#so that the cache file can be loaded without pickling
+	og_ids = og_ids.to_numpy()
+	if og_ids.dtype == object:
+		og_ids = og_ids.astype(str)
+
+	#save the matrices in the format: presence_dict[key] = array
+	presence_dict = {
+		'og_ids': og_ids,
+		'species_ids': species_ids.to_numpy().astype(str),
+		'phylum_ids': phylum_ids.to_numpy().astype(str),
+		'species_counts': build_count_matrix(og_codes[species_mask], species_codes[species_mask],
+									   len(og_ids), len(species_ids)),
+		'phylum_counts': build_count_matrix(og_codes[phylum_mask], phylum_codes[phylum_mask],
+									  len(og_ids), len(phylum_ids))
+		}
+	#define objects to return
+	return presence_dict
+
+
+def load_presence(infile, ref_db, ortho_df=None, cache_dir=presence_cache_dir):
+	#the cache file is named after the content hash of the input files
+	os.makedirs(cache_dir, exist_ok=True)
+	cache_file = os.path.join(cache_dir, hash_inputs([infile, ref_db], [presence_cache_version]) + '.npz')
+	if os.path.isfile(cache_file):
+		#if the input files have already been processed, load the cached matrices
+		with np.load(cache_file) as cache_data:
+			return {key: cache_data[key] for key in presence_key_list}
+
+	#otherwise, import the data and build the matrices
+	if ortho_df is None:
+		ortho_df = read_og_file(infile)
+	ref_df = pd.read_csv(ref_db, sep = '\t', header = 0)
+	presence_dict = build_presence(ortho_df, ref_df)
+
+	with atomic_output(cache_file, 'wb') as outfile:
+		np.savez(outfile, **presence_dict)
+	#define objects to return
+	return presence_dict
+
+
+def species_presence(presence_dict):
+	#an OG includes a species category if it has at least 1 protein from it
+	return presence_dict['species_counts'] > 0
+
+
+def phylum_presence(presence_dict):
+	#an OG includes a phylum if it has at least 1 protein from it
+	return presence_dict['phylum_counts'] > 0
+
+
+def species_counts(presence_dict):
+	#number of species categories represented in each OG
+	return np.count_nonzero(presence_dict['species_counts'], axis=1)
+
+
+def phylum_counts(presence_dict):
+	#number of phyla represented in each OG
+	return np.count_nonzero(presence_dict['phylum_counts'], axis=1)
+
+
+def filter_min_species(presence_dict, min_species):
+	#identify the OGs that have members from at least min_species species categories
+	#define objects to return
+	return presence_dict['og_ids'][species_counts(presence_dict) >= min_species]
+
+
+def filter_phyla_sets(presence_dict, phyla_set_list):
+	#identify the OGs whose set of phyla is exactly equal to one of the sets in phyla_set_list
+	phylum_matrix = phylum_presence(presence_dict)
+	phylum_ids = presence_dict['phylum_ids']
+	og_mask = np.zeros(len(presence_dict['og_ids']), dtype=bool)
+	for phyla_set in phyla_set_list:
+		#iterate over the sets of phyla
+		if not set(phyla_set).issubset(phylum_ids):
+			#a set including phyla that are not in the reference file cannot be matched
+			continue
+		#the row of the presence matrix must be identical to the presence pattern of the set
+		set_pattern = np.isin(phylum_ids, list(phyla_set))
+		og_mask |= (phylum_matrix == set_pattern).all(axis=1)
+	#define objects to return
+	return presence_dict['og_ids'][og_mask]
+
+
+def represented_names(presence_matrix, name_ids):
+	#get the (OG, category) positions of all of the True values of the presence matrix
+	#these are in row order, and within each row in the order of the categories
+	og_rows, name_cols = np.nonzero(presence_matrix)
+	#join the names of the categories of each OG into a comma-separated string
+	name_series = pd.Series(name_ids[name_cols]).groupby(og_rows, sort=True).agg(', '.join)
+	#OGs without any categories get an empty string
+	#define objects to return
+	return name_series.reindex(range(presence_matrix.shape[0]), fill_value='').to_numpy()
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+#!/bin/python
+"""
+
+Title: og_scoring.py
+Date: 2026-10-18
+Author: Virág Varga
+
+Description:
+	This module contains the OG similarity scoring engine used by the og_membership_test.py
+		and og_overlap_percent.py programs to compare the OGs created by Broccoli,
+		OrthoFinder, ProteinOrtho and SonicParanoid.
+	OG member lists are converted to frozensets when an OG is first scored, and each distinct
+		(OG_a, OG_b) pair of a pairwise program comparison is only scored once: the scores
+		are memoized in a cache dictionary, keyed on the programs & OG IDs of the pair.
+		Proteins belonging to the same pair of OGs therefore re-use the cached score, instead
+		of re-running the comparison for every protein in the OG. (Scores are not shared
+		between different program comparisons, since their OGs come from different programs.)
+	The following similarity metrics are available:
+		- jaccard: |A & B| / |A | B|
+		- overlap: |A & B| / min(|A|, |B|) (the overlap coefficient)
+		- dice: 2 * |A & B| / (|A| + |B|)
+			This has the same form as the difflib.SequenceMatcher ratio (2 * matches / total
+			length), but counts all shared proteins regardless of their order in the OGs, so
+			its scores differ from those of the difflib metric. It runs in linear time.
+		- difflib: the difflib.SequenceMatcher ratio, as computed by earlier versions of
+			the OG comparison programs (the default of those programs). The ratio depends on
+			the order of the two OGs compared, so the OGs of each program comparison are
+			compared in the same order as in earlier versions (see difflib_swap_set). This mode
+			is quadratic in OG size (though still only computed once per OG pair).
+
+List of functions:
+	prepare_og_members(og_dict, metric):
+		Converts an OG ID to list of members dictionary to the member format used by the
+		selected metric.
+	MemberSetDict(og_dict):
+		A dictionary of the OG member frozensets of an OG dictionary, which converts the
+		members of an OG when the OG is first looked up.
+	score_og_pair(members_a, members_b, metric):
+		Calculates the similarity score of two OGs.
+	cached_og_score(og_cache, member_dict_list, prog_idx_a, og_a, prog_idx_b, og_b, metric):
+		Calculates the similarity score of two OGs, re-using the cached score if the OG
+		pair has already been scored.
+
+List of standard and non-standard modules used:
+	difflib
+
+Procedure:
+	1. Loading required modules; defining the program comparisons and metrics.
+	2. Defining the functions of the module.
+
+Known bugs and limitations:
+	- There is no quality-checking integrated into the code.
+	- The difflib and dice metrics give different scores, so results obtained with one
+		metric should not be compared to thresholds chosen with the other.
+	- This is a module, not a stand-alone program. It should be imported by scripts
+		located in the same directory.
+
+Usage:
+	from og_scoring import program_pair_dict, prepare_og_members, cached_og_score
+
+This script was written for Python 3.8.12, in Spyder 5.1.5.
+
+"""
+
+
+# Part 1: Loading required modules; defining the program comparisons and metrics.
+
+#import necessary modules
+import difflib #compare and calculate differences between datasets
+
+
+#the names of the clustering programs, in the order used in the prot_dict value lists
+program_name_list = ['Broccoli', 'OrthoFinder', 'ProteinOrtho', 'SonicParanoid']
+
+#the pairwise program comparisons, in the format:
+#program_pair_dict[prog_vs_prog] = (prog1_index, prog2_index)
+#where the indexes refer to the positions of the programs in the prot_dict value lists
+program_pair_dict = {
+	'Br_vs_OF': (0, 1), #Broccoli vs OrthoFinder
+	'Br_vs_PO': (0, 2), #Broccoli vs ProteinOrtho
+	'Br_vs_SP': (0, 3), #Broccoli vs SonicParanoid
+	'OF_vs_PO': (1, 2), #OrthoFinder vs ProteinOrtho
+	'OF_vs_SP': (1, 3), #OrthoFinder vs SonicParanoid
+	'PO_vs_SP': (2, 3) #ProteinOrtho vs SonicParanoid
+	}
+
+#the program comparisons in which earlier versions passed the OGs to difflib in reverse order
+#(ie. SequenceMatcher(None, ProteinOrtho_OG, OrthoFinder_OG) for OF_vs_PO), in the format:
+#(prog1_index, prog2_index) of the program_pair_dict
+#the difflib ratio depends on the argument order, so the same order is kept to reproduce earlier results
+difflib_swap_set = {(1, 2), (1, 3)}
+
+#the similarity metrics that can be selected
+metric_list = ['dice', 'jaccard', 'overlap', 'difflib']
+
+
+# Part 2: Defining the functions of the module.
+
+class MemberSetDict(dict):
+	#a dictionary in the format: member_dict[og_id] = frozenset_of_proteins
+	#where only the OGs that are scored are converted (and read from the OG dictionary)
+	def __init__(self, og_dict):
+		super().__init__()
+		self.og_dict = og_dict
+
+	def __missing__(self, og_id):
+		#convert the member list of an OG the first time it is looked up
+		members = self[og_id] = frozenset(self.og_dict[og_id])
+		#define objects to return
+		return members
+
+
+def prepare_og_members(og_dict, metric):
+	#the difflib metric is order-dependent, so the member lists are kept as they are
+	if metric == 'difflib':
+		return og_dict
+	#all other metrics are set-based, so the member lists are converted to frozensets once per OG
+	#define objects to return
+	return MemberSetDict(og_dict)
+
+
+def score_og_pair(members_a, members_b, metric):
+	#compare the similarity of two OGs, using the selected metric
+	if metric == 'difflib':
+		#compute the difflib.SequenceMatcher ratio of the two protein lists
+		return difflib.SequenceMatcher(None, members_a, members_b).ratio()
+	#the set-based metrics all rely on the number of shared proteins
+	shared_count = len(members_a & members_b)
+	if metric == 'jaccard':
+		#number of shared proteins divided by the size of the union of the OGs
+		return shared_count / (len(members_a) + len(members_b) - shared_count)
+	if metric == 'overlap':
+		#number of shared proteins divided by the size of the smaller OG
+		return shared_count / min(len(members_a), len(members_b))
+	if metric == 'dice':
+		#twice the number of shared proteins divided by the summed size of the OGs
+		return 2.0 * shared_count / (len(members_a) + len(members_b))
+	#an unknown metric should not fail silently
+	raise ValueError("Unknown similarity metric: " + str(metric) + ". Please select one of: " + ", ".join(metric_list))
+
+
+def cached_og_score(og_cache, member_dict_list, prog_idx_a, og_a, prog_idx_b, og_b, metric):
+	#the cache dictionary is in the format: og_cache[(prog1_index, prog1_OG, prog2_index, prog2_OG)] = similarity_score
+	#so the scores are re-used by all proteins of the same OG pair in a pairwise program comparison
+	cache_key = (prog_idx_a, og_a, prog_idx_b, og_b)
+	og_score = og_cache.get(cache_key)
+	if og_score is None:
+		#if this OG pair has not been scored yet, score it and save the score to the cache
+		members_a, members_b = member_dict_list[prog_idx_a][og_a], member_dict_list[prog_idx_b][og_b]
+		if metric == 'difflib' and (prog_idx_a, prog_idx_b) in difflib_swap_set:
+			#compare the OGs in the same order as earlier versions of the OG comparison programs
+			members_a, members_b = members_b, members_a
+		og_score = score_og_pair(members_a, members_b, metric)
+		og_cache[cache_key] = og_score
+	#define objects to return
+	return og_score
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+#!/bin/python
+"""
+
+Title: species_registry.py
+Date: 2026-10-18
+Author: Virág Varga
+
+Description:
+	This module contains the loader of the species registry (species_registry.tsv), the single
+		reference file describing the proteomes included in the Metamonad database. It replaces
+		the species dictionaries that were previously written into the categorize_prot_species__v2.py,
+		extract_OG_MSA.py, ale_tree_spp_names.py, parse_ALE_Nodes_GFam.py and
+		parse_ALE_Nodes_GFam_Annot.py programs, so that proteomes can be added to (or removed from)
+		the analysis by editing the registry only.
+	The registry is a tab-separated text file with a header line, and 1 row per proteome,
+		with the following columns:
+		- Species_Id: the species/strain designation (derived from the proteome file name;
+			ex. Anaeramoeba_lanta_160522, with the FASTA file Anaeramoeba_lanta_160522_edit.fasta)
+		- Short_Name: the shortened species designation used in FASTA headers & gene trees
+			(ex. A_lanta)
+		- Species_Category: the categorized species/strain/assemblage designation
+			(ex. Anaeramoeba_lanta)
+		- Phylum: the phylum that the species belongs to (ex. Anaeramoebidae)
+		- Tree_Name: the species designation used in the species tree & ALE results
+			(ex. Anaeramoeba-lanta-160522)
+		- Parent_Node: the number of the parent node of the species in the species tree
+			used with ALE (ex. 49)
+	The lookup tables used by the programs (ex. Species_Id -> Species_Category) are created
+		from the registry as dictionaries, so that each lookup is a single hash-map access.
+
+List of functions:
+	find_registry_file():
+		Returns the path of the default species registry file.
+	load_registry(registry_file):
+		Imports the species registry into a Pandas dataframe.
+	registry_map(registry_df, key_col, value_col):
+		Creates a lookup dictionary from 2 columns of the species registry.
+
+List of standard and non-standard modules used:
+	os
+	pandas
+
+Procedure:
+	1. Loading required modules; defining the registry file format.
+	2. Defining the functions of the module.
+
+Known bugs and limitations:
+	- There is no quality-checking integrated into the code.
+	- The registry file used is (in order of priority): the file given in the SPECIES_REGISTRY
+		environment variable; species_registry.tsv in the same directory as this module; or
+		species_registry.tsv in the ReferenceFiles/ directory next to the directory of this module.
+	- The parent nodes of the internal nodes of the species tree are not part of the registry.
+	- This is a module, not a stand-alone program. It should be imported by scripts
+		located in the same directory.
+
+Usage:
+	from species_registry import load_registry, registry_map
+
+This script was written for Python 3.8.12, in Spyder 5.1.5.
+
+"""
+
+
+# Part 1: Loading required modules; defining the registry file format.
+
+#import necessary modules
+import os #allow access to computer files
+import pandas as pd #facilitates manipulation of dataframes in Python
+
+
+#the columns of the species registry file
+registry_col_list = ['Species_Id', 'Short_Name', 'Species_Category', 'Phylum', 'Tree_Name', 'Parent_Node']
+
+#the file name of the species registry
+registry_file_name = 'species_registry.tsv'
+
+#the environment variable that can be used to select a different registry file
+registry_env_var = 'SPECIES_REGISTRY'
+
+
+# Part 2: Defining the functions of the module.
+
+def find_registry_file():
+	#a registry file selected by the user takes priority
+	if os.environ.get(registry_env_var):
+		return os.environ[registry_env_var]
+	module_dir = os.path.dirname(os.path.abspath(__file__))
+	#otherwise, look next to this module (ex. in the Scripts/ directory of the workflow),
+	#and then in the ReferenceFiles/ directory of the repository
+	for registry_file in [os.path.join(module_dir, registry_file_name),
+						  os.path.join(os.path.dirname(module_dir), 'ReferenceFiles', registry_file_name)]:
+		if os.path.isfile(registry_file):
+			return registry_file
+	#the workflow cannot run without the registry
+	raise FileNotFoundError("The species registry file " + registry_file_name + " could not be found. " +
+							"Please place it next to the scripts, or set the " + registry_env_var + " environment variable.")
+
+
+def load_registry(registry_file=None):
+	#import the registry into a Pandas dataframe
+	#all columns are read as text, so that the parent node numbers are kept as they are written
+	registry_df = pd.read_csv(registry_file or find_registry_file(), sep = '\t', header = 0, dtype = str,
+							  keep_default_na = False)
+	missing_col_list = [registry_col for registry_col in registry_col_list if registry_col not in registry_df.columns]
+	if missing_col_list:
+		#a registry without all of the columns should not fail silently
+		raise ValueError("The species registry is missing the column(s): " + ", ".join(missing_col_list))
+	#define objects to return
+	return registry_df
+
+
+def registry_map(registry_df, key_col, value_col):
+	#create the lookup dictionary in the format: lookup_dict[key_col_value] = value_col_value
+	#if a key occurs more than once (ex. a species category with several proteomes), its first value is used
+	lookup_df = registry_df.drop_duplicates(subset=key_col, keep='first')
+	#define objects to return
+	return dict(zip(lookup_df[key_col], lookup_df[value_col]))
@@ -11,21 +11,24 @@ Description:
 		- or a filtered version of the same, with the same column structure - in order to
 		extract only those rows that contain protein queries predicted to be part of a
 		list of OGs that the user specifies via command-line input.
+		The database can be either the tab-separated text version or the columnar version
+		(see metamonad_db.py); from the columnar version, only the rows of the selected OGs
+		are loaded.
 
 List of functions:
 	No functions are defined in this script.
 
 List of standard and non-standard modules used:
 	sys
-	pandas
 	os.path
+	metamonad_db.py
 
 Procedure:
 	1. Loading required modules; defining inputs and outputs as command line
 		arguments.
-	2. Using Pandas to import the contents of the input database.
-	3. Filtering the dataframe based on list of OG IDs & writing out the results to a
-		tab-separated text file.
+	2. Loading the rows of the input database that contain the OGs in the list of OG IDs
+		into a Pandas dataframe (metamonad_db.py).
+	3. Writing out the results to a tab-separated text file.
 
 Known bugs and limitations:
 	- There is only very limited quality-checking integrated into the code - only the
@@ -38,6 +41,10 @@ Known bugs and limitations:
 		extension. If no extension is given, the default output file name will be the
 		base of the input file name with an extension in the format:
 			"'__' + OG_program + 'OG-selection.txt'"
+	- The metamonad_db.py module (in the DB_Construct/ directory of this repository) must be
+		located in the same directory as this program (ex. when all programs are copied into
+		the same Scripts/ directory, as in the README), or in a directory listed in the
+		PYTHONPATH environment variable (ex. PYTHONPATH=../DB_Construct).
 
 Usage
 	./extract_OG_prots.py input_db OG_program input_OGs [output_extension]
@@ -69,8 +76,8 @@ This script was written for Python 3.8.12, in Spyder 5.1.5.
 
 #import necessary modules
 import sys #allows assignment of command line arguments
-import pandas as pd #facilitates manipulation of dataframes in Python
 import os.path #helps return path information for files
+from metamonad_db import load_db, db_base_name #column- & row-wise loading of the Metamonad database
 
 
 #assign command line arguments; load input and output files
@@ -145,27 +152,23 @@ if len(sys.argv) == 5:
 	output_extension = sys.argv[4]
 	#output_extension = "filt_OG0000000andOG0003024"
 	#create output file name based on input file name and user-defined extension
-	output_db = ".".join(input_db.split('.')[:-1]) + '__' + output_extension + '.txt'
+	output_db = db_base_name(input_db) + '__' + output_extension + '.txt'
 else:
 	#if the user does not provide an extension name
 	#create output file name based on input file name
-	output_db = ".".join(input_db.split('.')[:-1]) + '__' + OG_program + 'OG-selection.txt'
+	output_db = db_base_name(input_db) + '__' + OG_program + 'OG-selection.txt'
 
 
-#Part 2: Create Pandas dataframe from input data
+#Part 2: Load the rows of the selected OGs from the input data
 
-#read in the input OG database file, assigning the first row as a header row
-ortho_df = pd.read_csv(input_db, sep = '\t', header=0, low_memory=False)
-# sys:1: DtypeWarning: Columns (6,7,27,31) have mixed types.Specify dtype option on import or set low_memory=False.
-
-
-#Part 3: Filter dataframe based on list of OG IDs & write out
-
-#filter the dataframe
-filt_og_df = ortho_df[ortho_df[og_id_col].isin(og_list)].copy()
+#read in the rows of the input OG database that contain the OGs in the og_list
+filt_og_df = load_db(input_db, row_filter_dict={og_id_col: og_list})
 #only search the values in the og_id_col for matches
 #check to see whether the rows contain the values found in the og_list
-#copy the rows that match these conditions to a new dataframe
+#for the columnar database, only the matching rows are read
+
+
+#Part 3: Write out the filtered dataframe
 
 
 #write out the filtered dataframe to a tab-separated text file
@@ -11,22 +11,33 @@ Description:
 		of the same) based on a user-provided threshold score for either the Mitochondrial
 		or Secretory pathway, as well as a user-provided minimum percent of proteins in an
 		OG for a selected program that should meet that score.
+		The database can be either the tab-separated text version or the columnar version
+		(see metamonad_db.py). The scores are evaluated on the query, score and OG columns
+		only, and the full rows are only loaded for the OGs that pass the filter.
+	More than 1 pair of thresholds can be given, in which case the database is loaded once,
+		and a filtered database is written out for each pair. Each value can also be a
+		comma-separated list (ex. 3,4 for the score_min), in which case all combinations of
+		the values are used (ex. the score_min values 3,4 and percent_inclusion values 80,90
+		give 4 filtered databases).
 
 List of functions:
 	No functions are defined in this script.
 
 List of standard and non-standard modules used:
 	sys
+	itertools
 	pandas
+	metamonad_db.py
 
 Procedure:
 	1. Loading required modules; defining inputs and outputs as command line
 		arguments.
-	2. Creating Pandas dataframe & OG dictionary from input data.
-	3. Creating dictionary of scores in each OG.
-	4. Evaluating OG quality based on scores.
+	2. Creating Pandas dataframe from the query, OG & score columns of the input data.
+	3. Calculating the number of proteins meeting each score threshold in each OG,
+		with a single groupby over the OG column.
+	4. Evaluating OG quality based on scores, for each pair of thresholds.
 	5. Filtering the dataframe based on the good quality OGs and writing out results
-		to a tab-separated text file.
+		to a tab-separated text file, for each pair of thresholds.
 
 Known bugs and limitations:
 	- There is no quality-checking integrated into the code.
@@ -39,17 +50,26 @@ Known bugs and limitations:
 	- The score threshold should be a value between 0-4, and the inclusion percentage
 		should be a percentage value (ex. 80 for 80% matching the minimum threshold
 		score).
+	- The full rows of the OGs passing any of the threshold pairs are held in memory
+		together, so very lenient thresholds on a very large database need more memory
+		than running the threshold pairs one at a time.
+	- The metamonad_db.py module (in the DB_Construct/ directory of this repository) must be
+		located in the same directory as this program (ex. when all programs are copied into
+		the same Scripts/ directory, as in the README), or in a directory listed in the
+		PYTHONPATH environment variable (ex. PYTHONPATH=../DB_Construct).
 
 Usage
-	./filter_scored_OGs.py input_db score_col og_col score_min percent_inclusion
+	./filter_scored_OGs.py input_db score_col og_col score_min percent_inclusion [score_min percent_inclusion ...]
 	OR
-	python filter_scored_OGs.py input_db score_col og_col score_min percent_inclusion
+	python filter_scored_OGs.py input_db score_col og_col score_min percent_inclusion [score_min percent_inclusion ...]
 
 	Where the user should give the column name of the scores column being filtered as
 		input for the score_col variable; the column name of the OG program being
 		filtered on as the input for the score_col variable; a value between 0-4 for the
 		score_min variable; and a numeric percentage value for the percent_inclusion
-		variable (ex. 80 for 80% inclusion).
+		variable (ex. 80 for 80% inclusion). Additional pairs of score_min and
+		percent_inclusion values can be given after the first, and each value can be a
+		comma-separated list of values (ex. 3,4 80,90,100).
 
 This script was written for Python 3.8.12, in Spyder 5.1.5.
 
@@ -60,7 +80,9 @@ This script was written for Python 3.8.12, in Spyder 5.1.5.
 
 #import necessary modules
 import sys #allows assignment of command line arguments
+from itertools import product #allows all combinations of the threshold values to be made
 import pandas as pd #facilitates manipulation of dataframes in Python
+from metamonad_db import load_db, db_base_name #column- & row-wise loading of the Metamonad database
 
 
 #assign command line arguments; load input and output files
@@ -88,109 +110,86 @@ else:
 og_col = sys.argv[3]
 #og_col = "SonicParanoid_OG"
 
-#determine score threshold to use
-score_min = sys.argv[4]
-#score_min = 4
+#determine the score thresholds to use, and the % of proteins matching the score threshold that make an OG "good"
+#these are given in pairs of score_min & percent_inclusion
+threshold_arg_list = sys.argv[4:]
+#threshold_arg_list = [4, 85]
+if not threshold_arg_list or len(threshold_arg_list) % 2 != 0:
+	#the thresholds can't be assigned without both values of each pair
+	sys.exit("The score_min and percent_inclusion values should be given in pairs, ex.: 4 85 3,4 80,90")
 
-#determine the % of proteins matching the score threshold that make an OG "good"
-percent_inclusion = sys.argv[5]
-#percent_inclusion = 85
+#create a list of the threshold pairs, in the format: [(score_min, percent_inclusion), ...]
+#where comma-separated lists of values are expanded into all of their combinations
+threshold_list = []
+for score_min_arg, percent_inclusion_arg in zip(threshold_arg_list[0::2], threshold_arg_list[1::2]):
+	for threshold_pair in product(score_min_arg.split(','), percent_inclusion_arg.split(',')):
+		if threshold_pair not in threshold_list:
+			threshold_list.append(threshold_pair)
 
 
-#output_db name is based on the input_db name, filtration type & score
-output_db = ".".join(input_db.split('.')[:-1]) + '__filt-' + score_type + str(percent_inclusion) + "-" + str(score_min) + '.txt'
+#output_db names are based on the input_db name, filtration type & score
+output_db_dict = {(score_min, percent_inclusion): db_base_name(input_db) + '__filt-' + score_type + str(percent_inclusion) + "-" + str(score_min) + '.txt'
+				  for score_min, percent_inclusion in threshold_list}
 
 
-#Part 2: Create Pandas dataframe & OG dictionary from input data
+#Part 2: Create Pandas dataframe from input data
 
-#read in the input OG database file, assigning the first row as a header row
-ortho_df = pd.read_csv(input_db, sep = '\t', header=0, low_memory=False)
+#read in the columns of the input OG database used for scoring
+ortho_df = load_db(input_db, columns=['Query', og_col, score_col])
 
-#create a dictionary in the format: og_dict[og_id] = list_of_proteins
-#this will allow easier analysis
-grouped_ortho_df = ortho_df.groupby(og_col)['Query'].apply(list).reset_index(name="OG_members")
-#the proteins in the 'Query' column are grouped into lists according to the OG they belong to
-#the new column of lists is named 'OG_members'
-ortho_dict = grouped_ortho_df.set_index(og_col).to_dict()['OG_members']
-#the new dataframe is converted into a dictionary,
-#where the OG IDs are the keys, and the lists of protein members of the OGs are the values
-del ortho_dict['-']
 #there will likely be proteins that do not have OG assignments, and so are "assigned" to OG '-'
-#remove these from teh dicitonary before proceeding
+#remove these before proceeding
+ortho_df = ortho_df[ortho_df[og_col] != '-']
 
 
-#Part 3: Create dictionary of scores in each OG
+#Part 3: Count the proteins meeting each score threshold in each OG
 
-#create empty dictionary for score information
-score_dict = {}
+#create a dataframe with 1 column per score threshold, in the format: pass_df[score_min] = (score >= score_min)
+#need to float() to ensure the input won't be read as a string
+score_min_list = sorted({float(score_min) for score_min, percent_inclusion in threshold_list})
+pass_df = pd.DataFrame({score_min: ortho_df[score_col] >= score_min for score_min in score_min_list})
+#and a column counting every protein, so that the size of each OG is summed along with the good scores
+pass_df['OG_length'] = True
 
-for key in ortho_dict.keys():
-	#iterate over the dictionary via its keys
-	score_list = []
-	#create empty list that will be populated with score information
-	og_prot_list = ortho_dict[key]
-	#save list of protein query IDs associated with the given OG
-	for prot in og_prot_list:
-		#iterate over the list of protein query IDs
-		prot_score = ortho_df.loc[ortho_df['Query'] == prot, score_col].iloc[0]
-		#with .loc, find the location where the protein query ID is found in the 'Query' column
-		#then extract the contents of that cell, as well as the cell in the same row that is in the applicable score column
-		#use slicing and .iloc to extract the contents of the applicable score column
-		#and save the score to variable prot_score
-		#append the score to the score_list
-		score_list.append(prot_score)
-	#save the list of scores as the value in the OG to scores dictionary
-	score_dict[key] = score_list
+#the fraction of good proteins in an OG is mean(score >= score_min), so the good proteins
+#for all of the score thresholds (and the sizes of the OGs) are summed in a single groupby over the OG column
+og_count_df = pass_df.groupby(ortho_df[og_col].values).sum()
 
 
 #Part 4: Evaluate OG quality based on scores
 
-#convert the score thresholds into usable values
-#need to float() to ensure the input won't be read as a string
-score_min = float(score_min)
-#first the minimum score
-#and then the threshold score, rounded to 3 decimal places
-threshold_decimal = round(float(percent_inclusion)/100, 3)
-
-#create empty list for good OGs
-good_OG_list = []
-
-
-for key in score_dict.keys():
-	#iterate over the score dictionary via its keys
-	og_score_list = score_dict[key]
-	#save the list of scores to a list independent of the dictionary for ease of manipulation
-	og_length = len(og_score_list)
-	#determine the size of the og based on its length
-	good_og_length = og_length*threshold_decimal
-	#save the minimum number of good scores needed to mark the OG as good to a variable
-	good_count = 0
-	#set up a counter for the good scores
-	for item in og_score_list:
-		#iterate over the list of scores
-		if item >= score_min:
-			#if the value of the score is >= the minimum score value given
-			#increase the counter by one
-			good_count +=1
-	#now compare the number of good scores to the length of the OG (ie. number of protein members)
-	if good_count >= good_og_length:
-		#if the number of good proteins is >= the minimum number of good proteins to deem the OG good
-		#then save the OG ID to the good OG list
-		good_OG_list.append(key)
+#create the dictionary in the format: good_og_dict[(score_min, percent_inclusion)] = set_of_good_OGs
+good_og_dict = {}
+for score_min, percent_inclusion in threshold_list:
+	#iterate over the threshold pairs
+	#convert the threshold into a usable value, rounded to 3 decimal places
+	threshold_decimal = round(float(percent_inclusion)/100, 3)
+	#compare the number of good scores to the minimum number of good scores needed to mark the OG as good
+	#(ie. mean(score >= score_min) >= threshold_decimal, compared as counts so that OGs at the boundary
+	#are treated the same way as by earlier versions of this program)
+	good_og_series = og_count_df[float(score_min)] >= og_count_df['OG_length']*threshold_decimal
+	good_og_dict[(score_min, percent_inclusion)] = set(good_og_series.index[good_og_series])
 
 
 #Part 5: Filter the dataframe based on the scores, and write out results
 
 #create new filtered datafarme based on the scores
-filt_ortho_df = ortho_df[ortho_df[og_col].isin(good_OG_list)]
-#only rows containing OGs that have been deemed good will be kept
-
-
-if filt_ortho_df.empty:
-	#let the user know if no protein queries met the scoring threshold used
-	print("No protein queries met the desired score thresholds!")
-else:
-	#if the dataframe exists
-	#write the scored dataframe out to the assigned result file
-	filt_ortho_df.to_csv(output_db, sep = '\t', index=False)
-	#results will be written out to a tab-separated text file
+#only rows containing OGs that have been deemed good by any threshold pair will be loaded, with all of their columns
+#so that the full rows are loaded only once for all threshold pairs
+good_og_list = sorted(set().union(*good_og_dict.values()))
+filt_ortho_df = load_db(input_db, row_filter_dict={og_col: good_og_list})
+
+
+for threshold_pair, output_db in output_db_dict.items():
+	#iterate over the threshold pairs
+	#and select the rows of the OGs deemed good with those thresholds
+	pair_ortho_df = filt_ortho_df[filt_ortho_df[og_col].isin(good_og_dict[threshold_pair])]
+	if pair_ortho_df.empty:
+		#let the user know if no protein queries met the scoring threshold used
+		print("No protein queries met the desired score thresholds! (score_min " + str(threshold_pair[0]) +
+			  ", percent_inclusion " + str(threshold_pair[1]) + ")")
+	else:
+		#if the dataframe exists
+		#write the scored dataframe out to the assigned result file
+		pair_ortho_df.to_csv(output_db, sep = '\t', index=False)
+		#results will be written out to a tab-separated text file
@@ -11,6 +11,8 @@ Description:
 		all PFam and desired OG information to create a table linking all OGs to their
 		associated PFam domains.
 		The PFam colum used is: pfamEN_hit
+		The database can be either the tab-separated text version or the columnar version
+		(see metamonad_db.py); only the PFam and OG columns are loaded.
 
 List of functions:
 	concat (Source: IPRpivot.py, Courtney Stairs)
@@ -19,6 +21,7 @@ List of standard and non-standard modules used:
 	sys
 	pandas
 	os
+	metamonad_db.py
 	collections.Counter
 
 Procedure:
@@ -35,6 +38,10 @@ Known bugs and limitations:
 		includes both PFam and OG assignments. The PFam column used by this program
 		is pfamEN_hit.
 	- The output file names are not user-defined.
+	- The metamonad_db.py module (in the DB_Construct/ directory of this repository) must be
+		located in the same directory as this program (ex. when all programs are copied into
+		the same Scripts/ directory, as in the README), or in a directory listed in the
+		PYTHONPATH environment variable (ex. PYTHONPATH=../DB_Construct).
 
 Version:
 	This program can be considered Version 2.0 of the og2PFam_pivot.py program.
@@ -61,6 +68,7 @@ import sys #allow execution of code from the command line
 import pandas as pd #facilitates manipulation of dataframes in Python
 import os #allow access to computer files
 from collections import Counter #enables easy counting of elements
+from metamonad_db import load_db #column-wise loading of the Metamonad database
 
 
 #make function for joining strings with ','
@@ -88,9 +96,9 @@ output_counts = "OGs2PFams_" + og_col + "_Counts.txt"
 
 #Part 2: Import database into Pandas, extract relevant columns
 
-#read in the input OG database file, assigning the first row as a header row
-input_df = pd.read_csv(input_db, sep = '\t', header=0, low_memory=False)
-# sys:1: DtypeWarning: Columns (6,7,27,31) have mixed types.Specify dtype option on import or set low_memory=False.
+#read in the columns of the input OG database that will be used
+input_df = load_db(input_db, columns=['pfamEN_hit', og_col])
+#only these columns are parsed (or read, for the columnar database), instead of the whole database
 
 
 #select the columns that will be used to create the pivot table
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+#!/bin/python
+"""
+
+Title: pathway_scoring.py
+Date: 2026-10-18
+Author: Virág Varga
+
+Description:
+	This module contains the vectorized pathway scoring engine used by the
+		score_mitochondrialPathway.py, score_secretoryPathway.py and score_pathways.py programs,
+		to score the predictions present in the species database generated by prot_DB_plus_OGs.py
+		(Metamonada_pred_OG_DB.txt) - or a filtered version of the same, with the same
+		column structure.
+	The predictors used to score each pathway are declared as data, in the pathway_rule_dict
+		dictionary. Each predictor rule consists of the predictor name, the column containing
+		its predictions, the list of prediction labels that target the protein to the pathway,
+		and the column containing the probability of the prediction. Each predictor adds the
+		following to the score of a protein query:
+		- 1 point, if the prediction is one of the target labels and the probability is >= 0.5
+		- 0.5 points, if the prediction is one of the target labels and the probability is < 0.5
+			(or missing)
+		- 0 points, otherwise
+		The rules are evaluated column-wise as NumPy masks over the whole dataframe, and summed.
+		New predictors can be added to a pathway by adding a rule to its rule list.
+	A target label can also be given in the format column=label, in which case the label is
+		matched in that column instead of the prediction column of the rule. This is used by
+		the Secretion YLoc rule, which (like the original score_secretoryPathway.py program)
+		gives the YLoc points to proteins that YLoc predicts to be in the 'extracellular space',
+		or that DeepLoc predicts to be in the 'plasma membrane'.
+	The rules can also be read from a tab-separated rule table file, with the columns:
+		Pathway\tPredictor\tPrediction_Column\tTarget_Labels\tProbability_Column
+		Where the Target_Labels column contains the list of target prediction labels of the
+		predictor, separated by "|" characters (ex. Extracellular|Cell_membrane). Each row of
+		the file is one predictor rule, and any number of pathways can be defined in a file.
+
+List of functions:
+	load_rule_table(rule_file):
+		Imports the predictor rules of one or more pathways from a rule table file.
+	label_columns(prediction_col, target_label_list):
+		Groups the target labels of a predictor rule by the column they are matched in.
+	rule_columns(rule_list):
+		Returns the list of database columns used by the predictor rules of a pathway.
+	predictor_score(ortho_df, prediction_col, target_label_list, probability_col):
+		Calculates the score of one predictor for all of the protein queries in a dataframe.
+	score_pathway(ortho_df, rule_list):
+		Calculates the pathway score of all of the protein queries in a dataframe, as the
+		sum of the scores of the predictors in the rule list.
+
+List of standard and non-standard modules used:
+	numpy
+	pandas
+
+Procedure:
+	1. Loading required modules; defining the pathway rule tables.
+	2. Defining the functions of the module.
+
+Known bugs and limitations:
+	- There is no quality-checking integrated into the code.
+	- Probability values that cannot be read as numbers are treated as missing (ie. a
+		matching prediction without a valid probability adds 0.5 points to the score).
+	- Target labels containing the "=" character are read as column=label pairs.
+	- This is a module, not a stand-alone program. It should be imported by scripts
+		located in the same directory.
+
+Usage:
+	from pathway_scoring import pathway_rule_dict, score_pathway
+
+This script was written for Python 3.8.12, in Spyder 5.1.5.
+
+"""
+
+
+# Part 1: Loading required modules; defining the pathway rule tables.
+
+#import necessary modules
+import numpy as np #facilitates manipulation of arrays in Python
+import pandas as pd #facilitates manipulation of dataframes in Python
+
+
+#the minimum probability for a prediction to be given a full point
+probability_threshold = 0.5
+
+#the predictor rules of each pathway, in the format:
+#pathway_rule_dict[pathway] = [(predictor, prediction_col, target_label_list, probability_col), ...]
+pathway_rule_dict = {
+	'Mitochondria': [
+		('DeepLoc', 'DeepL_Location', ['Mitochondrion'], 'DeepL_Probability'),
+		('TargetP', 'TarP_Prediction', ['mTP'], 'TarP_Probability'),
+		('MitoFates', 'MitoF_Prediction', ['Possessing mitochondrial presequence'], 'MitoF_Probability_of_presequence'),
+		('YLoc', 'YLoc_Prediction', ['mitochondrion'], 'YLoc_Probability')
+		],
+	'Secretion': [
+		('DeepLoc', 'DeepL_Location', ['Extracellular', 'Cell_membrane'], 'DeepL_Probability'),
+		('TargetP', 'TarP_Prediction', ['SP'], 'TarP_Probability'),
+		('SignalP', 'SigP_Prediction', ['SP(Sec/SPI)'], 'SigP_SP_Probability'),
+		('YLoc', 'YLoc_Prediction', ['extracellular space', 'DeepL_Location=plasma membrane'], 'YLoc_Probability')
+		]
+	}
+
+
+#the columns of the rule table files
+rule_table_col_list = ['Pathway', 'Predictor', 'Prediction_Column', 'Target_Labels', 'Probability_Column']
+
+#the separator of the prediction labels in the Target_Labels column of the rule table files
+label_sep = '|'
+
+#the separator of the column & label of target labels matched in another column (ex. DeepL_Location=plasma membrane)
+label_col_sep = '='
+
+
+# Part 2: Defining the functions of the module.
+
+def load_rule_table(rule_file):
+	#import the rule table into a Pandas dataframe
+	#the cells are read as text, so that empty cells are empty strings (not NaN)
+	rule_df = pd.read_csv(rule_file, sep = '\t', header = 0, dtype = str, keep_default_na = False)
+	missing_col_list = [rule_col for rule_col in rule_table_col_list if rule_col not in rule_df.columns]
+	if missing_col_list:
+		#a rule table without all of the rule columns should not fail silently
+		raise ValueError("The rule table " + rule_file + " is missing the column(s): " + ", ".join(missing_col_list))
+	empty_col_list = [rule_col for rule_col in rule_table_col_list if (rule_df[rule_col].str.strip() == '').any()]
+	if empty_col_list:
+		#neither should a rule table with empty cells in the rule columns
+		raise ValueError("The rule table " + rule_file + " has empty cells in the column(s): " + ", ".join(empty_col_list))
+	#create the dictionary in the format:
+	#rule_dict[pathway] = [(predictor, prediction_col, target_label_list, probability_col), ...]
+	rule_dict = {}
+	for pathway, predictor, prediction_col, target_labels, probability_col in zip(*[rule_df[rule_col] for rule_col in rule_table_col_list]):
+		#iterate over the rules, keeping the pathways & predictors in the order of the file
+		rule_dict.setdefault(pathway, []).append((predictor, prediction_col, target_labels.split(label_sep), probability_col))
+	#define objects to return
+	return rule_dict
+
+
+def label_columns(prediction_col, target_label_list):
+	#create the dictionary in the format: label_col_dict[column] = [target_label, ...]
+	label_col_dict = {prediction_col: []}
+	for target_label in target_label_list:
+		#iterate over the target labels
+		if label_col_sep in target_label:
+			#the label is matched in the column given before the separator
+			label_col, target_label = target_label.split(label_col_sep, 1)
+		else:
+			#the label is matched in the prediction column of the rule
+			label_col = prediction_col
+		label_col_dict.setdefault(label_col, []).append(target_label)
+	#define objects to return
+	return label_col_dict
+
+
+def rule_columns(rule_list):
+	#list the prediction & probability columns used by the rules, without duplicates
+	rule_col_list = []
+	for predictor, prediction_col, target_label_list, probability_col in rule_list:
+		#iterate over the predictor rules
+		for rule_col in [*label_columns(prediction_col, target_label_list), probability_col]:
+			if rule_col not in rule_col_list:
+				rule_col_list.append(rule_col)
+	#define objects to return
+	return rule_col_list
+
+
+def predictor_score(ortho_df, prediction_col, target_label_list, probability_col):
+	#identify the protein queries that the predictor targets to the pathway
+	#ie. the protein queries with a target label in any of the columns the labels are matched in
+	target_mask = np.zeros(len(ortho_df), dtype=bool)
+	for label_col, label_list in label_columns(prediction_col, target_label_list).items():
+		target_mask |= ortho_df[label_col].isin(label_list).to_numpy()
+	#convert the whole probability column to numbers at once
+	#values that are not numeric become NaN, which fail the probability comparison below
+	probability_array = pd.to_numeric(ortho_df[probability_col], errors='coerce').to_numpy(dtype=float)
+	#1 point for a target prediction with a probability >= 0.5, otherwise 0.5 points
+	#protein queries not targeted to the pathway by the predictor get 0 points
+	#define objects to return
+	return np.where(target_mask, np.where(probability_array >= probability_threshold, 1.0, 0.5), 0.0)
+
+
+def score_pathway(ortho_df, rule_list):
+	#sum the scores of all of the predictors in the rule list
+	pathway_score = np.zeros(len(ortho_df))
+	for predictor, prediction_col, target_label_list, probability_col in rule_list:
+		#iterate over the predictor rules
+		pathway_score += predictor_score(ortho_df, prediction_col, target_label_list, probability_col)
+	#define objects to return
+	return pathway_score
@@ -22,12 +22,14 @@ List of standard and non-standard modules used:
 	datetime.datetime
 	numpy
 	itertools.chain
+	header_ref.py
 
 Procedure:
 	Begin by parsing arguments. Then:
 		1. Importing necessary modules, assigning command-line arguments.
-		2. Importing data into Pandas dataframe.
-		3. Querying the reference dataframe for the desired data & writing out
+		2. Opening the on-disk index of the reference file (created or updated with the
+			header_ref.py module).
+		3. Querying the reference index for the desired data & writing out
 			results to a tab-separated text file.
 
 Known bugs and limitations:
@@ -35,6 +37,12 @@ Known bugs and limitations:
 		command-line inputs.
 	- The default name of the output file is based on query time.
 	- The reference file must be in the format: encoded_prot_ID\toriginal_prot_ID
+	- The query IDs (or their T. vaginalis aliases) are searched for in the reference file
+		as literal substrings of the protein IDs (they are not regular expressions).
+	- The header_ref.py module (in the FastaManipEtc/ directory of this repository) must be
+		located in the same directory as this program (ex. when all programs are copied into
+		the same Scripts/ directory, as in the README), or in a directory listed in the
+		PYTHONPATH environment variable (ex. PYTHONPATH=../FastaManipEtc).
 
 Version:
 	This is Version 2.0 of this program, which takes into account the fact that a
@@ -141,6 +149,7 @@ import os #allow access to computer files
 from datetime import datetime #access data from system regarding date & time
 import numpy as np #allows manipulation of arrays in Python
 from itertools import chain #treats consecutive sequences as single sequence
+from header_ref import open_header_index, search_headers #on-disk index of the reference file
 
 
 #designate input file name as variable
@@ -159,7 +168,7 @@ if query_type == "encoded":
 elif query_type == "unencoded":
 	#if the input query type is an unencoded protein ID
 	#designate the query column as the unencoded dta column
-	query_col = "Unencoded"
+	query_col = "Original"
 	print("Query type: unencoded")
 else:
 	#if the user does not determine the input query type as encoded or unencoded
@@ -210,19 +219,14 @@ else:
 	output_db = out_full + "__QUERY_" + time_now + ".txt"
 
 
-#Part 2: Import data into Pandas dataframes
+#Part 2: Open the index of the reference file
 
-#create list of column names to use for dataframe upon import into Pandas
-column_names=["Encoded", "Unencoded"]
+#the index is created the first time the reference file is queried,
+#and updated with the new lines when the reference file is appended to
+index_conn = open_header_index(input_db)
 
-#import input file into pandas dataframe
-ref_df = pd.read_csv(input_db, sep = '\t', header = None, names = column_names)
-#use `header = None, names = column_names`
-#because the reference file has no header line
-#and the column names need to be manually determined based on the list created
 
-
-#Part 3: Query the reference dataframe for the desired data & write out
+#Part 3: Query the reference index for the desired data & write out
 
 if args.tvag_ref:
 	#if the user provides the T. vaginalis protein aliases file
@@ -265,23 +269,22 @@ if args.tvag_ref:
 	alias_setlist = list(set(clean_alias_list))
 	#if there are duplicates, remove them
 
-	#search the appropriate column for all to extract the rows of the dataframe where the IDs are found
-	filt_ref_df = ref_df[ref_df[query_col].str.contains('|'.join(alias_setlist))].copy()
-	#need to use the str.contains() method
+	#search the appropriate column for all to extract the rows of the reference where the IDs are found
+	filt_ref_df = search_headers(index_conn, alias_setlist, query_col)
+	#a substring search is used
 	#because the names of the proteins are sometimes part of a longer name
 
-
-	filt_ref_df.to_csv(output_db, sep = '\t', index=False)
-	#results will be written out to a tab-separated text file
-
 else:
 	#in a case where the T. vaginalis reference file isn't being used
 
-	#search the appropriate column for all to extract the rows of the dataframe where the IDs are found
-	filt_ref_df = ref_df[ref_df[query_col].str.contains('|'.join(query_list))].copy()
-	#need to use the str.contains() method
+	#search the appropriate column for all to extract the rows of the reference where the IDs are found
+	filt_ref_df = search_headers(index_conn, query_list, query_col)
+	#a substring search is used
 	#because the names of the proteins are sometimes part of a longer name
 
+index_conn.close()
 
-	filt_ref_df.to_csv(output_db, sep = '\t', index=False)
-	#results will be written out to a tab-separated text file
+#the original protein names are written out in the "Unencoded" column
+filt_ref_df.columns = ["Encoded", "Unencoded"]
+filt_ref_df.to_csv(output_db, sep = '\t', index=False)
+#results will be written out to a tab-separated text file
@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+#!/bin/python
+"""
+
+Title: score_pathways.py
+Date: 2026-10-18
+Author: Virág Varga
+
+Description:
+	This program scores the predictions generated for the protein queries present
+		in the species database generated by prot_DB_plus_OGs.py (Metamonada_pred_OG_DB.txt)
+		- or a filtered version of the same, with the same column structure - for any number
+		of pathways in a single pass over the database. It replaces running the
+		score_mitochondrialPathway.py and score_secretoryPathway.py programs one after the
+		other, each of which reads and writes the full database.
+	The predictor rules of the pathways are either the built-in rules of the pathway_scoring.py
+		module (Mitochondria & Secretion), or are read from a tab-separated rule table file,
+		so that new pathways (ex. hydrogenosomal or peroxisomal targeting) can be scored
+		without writing new scripts.
+	The database is read in chunks, and the score columns of all of the pathways are added
+		to each chunk. Each chunk is then written to the scored database, and the protein
+		queries meeting the score threshold of each pathway are written to the filtered
+		database of that pathway.
+
+List of functions:
+	No functions are defined in this script.
+
+List of standard and non-standard modules used:
+	argparse
+	os
+	pandas
+	pathway_scoring.py
+
+Procedure:
+	1. Assignment of command-line arguments with argparse.
+	2. Importing modules, loading the predictor rules of the selected pathways, and
+		defining the output files.
+	3. Reading the input database in chunks, and for each chunk:
+		- Scoring the predictions of each pathway with the pathway_scoring.py module, and
+			adding the scores to the chunk as new columns
+		- Writing out the scored chunk to the scored database
+		- Filtering the chunk based on the scores of each pathway, and writing out the
+			protein queries that meet the threshold to the filtered database of the pathway
+	4. Informing the user of pathways for which no protein queries met the threshold.
+
+Known bugs and limitations:
+	- There is no quality-checking integrated into the code.
+	- This program requires the input of a flat database created by prot_DB_plus_OGs.py
+		(named Metamonada_pred_OG_DB.txt in the original workflow), or a filtered version
+		of the same, with the same column structure maintained.
+	- The naming of the output files is based on the input file name, and follows the naming
+		of the score_mitochondrialPathway.py and score_secretoryPathway.py outputs. For
+		example, scoring the Secretion & Mitochondria pathways of Metamonada_pred_OG_DB.txt
+		gives the following outputs:
+		- Metamonada_pred_OG_DB__scoreSecretion__scoreMitochondria.txt
+		- Metamonada_pred_OG_DB__scoreSecretionGood_4.txt
+		- Metamonada_pred_OG_DB__scoreMitochondriaGood_4.txt
+		The filtered databases contain the score columns of all of the scored pathways.
+	- The contents of the input database are written out as they were read (as text); only
+		the score columns are added. The score column of each pathway is named [pathway]_Score.
+	- The same score threshold is used for all of the pathways.
+
+Usage:
+	./score_pathways.py [-h] INPUT_DB [-r RULE_FILE] [-p PATHWAYS [PATHWAYS ...]] [-t SCORE_THRESHOLD]
+		[-c CHUNKSIZE] [-v]
+	OR
+	python score_pathways.py [-h] INPUT_DB [-r RULE_FILE] [-p PATHWAYS [PATHWAYS ...]] [-t SCORE_THRESHOLD]
+		[-c CHUNKSIZE] [-v]
+
+	* Since any number of pathways can be given to the -p flag, the input database should be
+		given before it (or the pathway list ended with --).
+
+This script was written for Python 3.8.12, in Spyder 5.1.5.
+
+"""
+
+#################################   ARGPARSE   #######################################
+
+import argparse
+#the argparse module allows for a single program script to be able to carry out a variety of specified functions
+#this can be done with the specification of unique flags for each command
+
+
+parser = argparse.ArgumentParser(description =
+								 'This program scores the predictions of the protein queries in the \
+								 Metamonad database for any number of pathways (default: Secretion & \
+								 Mitochondria) in a single pass over the database, and writes out the \
+								 scored database plus a filtered database for each pathway.')
+#The most general description of what this program can do is defined here
+
+
+#adding the arguments that the program can use
+parser.add_argument(
+	'-r', '--rule_file',
+	metavar='RULE_FILE',
+	help = 'Tab-separated rule table file, with the columns: \
+		Pathway, Predictor, Prediction_Column, Target_Labels, Probability_Column. \
+		(Default: the built-in Mitochondria & Secretion rules of pathway_scoring.py)'
+	)
+	#if no rule table is given, the built-in rules are used
+parser.add_argument(
+	'-p', '--pathways',
+	nargs='+',
+	help = 'The pathways to score, in the order their score columns should be added. \
+		(Default: all of the pathways in the rules)'
+	)
+	#the `nargs='+'` argument allows any number of pathways to be selected
+parser.add_argument(
+	'-t', '--score_threshold',
+	type=float,
+	default=4.0,
+	help = 'The minimum score for a protein query to be included in the filtered databases. (Default = 4)'
+	)
+	#the default threshold of 4 matches the default of the single-pathway scoring scripts
+parser.add_argument(
+	'-c', '--chunksize',
+	type=int,
+	default=500000,
+	help = 'The number of rows of the database read into memory at once. (Default = 500000)'
+	)
+	#larger chunks are faster, but use more memory
+parser.add_argument(
+	#'-i', '--input',
+	#the above line of code is left in as further clarification of this argument
+	dest='input_db',
+	metavar='INPUT_DB',
+	help = 'The input database created by prot_DB_plus_OGs.py (or a filtered version of the same).'
+	)
+	#this portion of code specifies that the program requires an input file
+parser.add_argument(
+	'-v', '--version',
+	action='version',
+	version='%(prog)s 1.0'
+	)
+	#This portion of the code specifies the version of the program; currently 1.0
+	#The user can call this flag ('-v') without specifying input and output files
+
+
+args = parser.parse_args()
+#this command allows the program to execute the arguments in the flags specified above
+
+
+#################################   Parse Arguments   ######################################
+
+
+#import necessary modules
+import os #allow access to computer files
+import pandas as pd #facilitates manipulation of dataframes in Python
+from pathway_scoring import pathway_rule_dict, load_rule_table, rule_columns, score_pathway #vectorized pathway scoring engine
+
+
+#designate input file name as variable
+input_db = args.input_db
+#designate score threshold as variable
+score_threshold = args.score_threshold
+#format the threshold like the single-pathway scoring scripts (ex. 4 rather than 4.0)
+threshold_str = str(int(score_threshold)) if score_threshold.is_integer() else str(score_threshold)
+
+
+#load the predictor rules
+if args.rule_file:
+	#if the user provided a rule table, import the rules from it
+	rule_dict = load_rule_table(args.rule_file)
+else:
+	#otherwise, use the built-in rules
+	rule_dict = pathway_rule_dict
+
+#select the pathways to score
+if args.pathways:
+	#if the user selected pathways, check that rules exist for all of them
+	for pathway in args.pathways:
+		if pathway not in rule_dict:
+			parser.error("No predictor rules were found for the pathway: " + pathway +
+				". Please select from: " + ", ".join(rule_dict.keys()))
+	pathway_list = args.pathways
+else:
+	#otherwise, score all of the pathways in the rules
+	pathway_list = list(rule_dict.keys())
+
+
+#check that the input database contains all of the columns used by the rules
+db_col_list = pd.read_csv(input_db, sep = '\t', header = 0, nrows = 0).columns.tolist()
+for pathway in pathway_list:
+	#iterate over the pathways
+	missing_col_list = [rule_col for rule_col in rule_columns(rule_dict[pathway]) if rule_col not in db_col_list]
+	if missing_col_list:
+		parser.error("The input database is missing the column(s) used to score the " + pathway +
+			" pathway: " + ", ".join(missing_col_list))
+
+
+#define the output files based on the input file name
+out_full = os.path.splitext(input_db)[0]
+#output_db will contain a copy of the original database, plus the scores of all pathways
+output_db = out_full + "".join(["__score" + pathway for pathway in pathway_list]) + '.txt'
+#the filtered databases will contain the protein queries meeting the threshold for each pathway
+filtered_db_dict = {pathway: out_full + '__score' + pathway + 'Good_' + threshold_str + '.txt' for pathway in pathway_list}
+
+
+#################################   Main Program   ######################################
+
+
+#Part 1: Score the database in chunks, and write out results
+
+#keep track of the number of protein queries meeting the threshold for each pathway
+filtered_count_dict = {pathway: 0 for pathway in pathway_list}
+
+#the database is read as text, so that its contents are written out exactly as they were read
+db_reader = pd.read_csv(input_db, sep = '\t', header = 0, dtype = str, keep_default_na = False,
+						chunksize = args.chunksize)
+
+with open(output_db, "w") as outfile:
+	#open the scored database for writing
+	filtered_file_dict = {}
+	#the filtered databases are only opened once they have at least 1 protein query to write
+	try:
+		for chunk_num, ortho_chunk in enumerate(db_reader):
+			#iterate over the chunks of the database
+			#set the first column (containing the protein query ids) as an index
+			ortho_chunk.set_index('Query', inplace=True)
+
+			for pathway in pathway_list:
+				#score each protein query in the chunk for each pathway
+				ortho_chunk[pathway + '_Score'] = score_pathway(ortho_chunk, rule_dict[pathway])
+
+			#write out the scored chunk, with the header only for the first chunk
+			ortho_chunk.to_csv(outfile, sep = '\t', index=True, header=(chunk_num == 0))
+
+			for pathway in pathway_list:
+				#filter the chunk based on the scores of each pathway
+				filt_chunk = ortho_chunk[ortho_chunk[pathway + '_Score'] >= score_threshold]
+				#only scores >= the threshold score will be kept
+				if filt_chunk.empty:
+					continue
+				if pathway not in filtered_file_dict:
+					#open the filtered database of the pathway, and write the header
+					filtered_file_dict[pathway] = open(filtered_db_dict[pathway], "w")
+					filt_chunk.to_csv(filtered_file_dict[pathway], sep = '\t', index=True)
+				else:
+					filt_chunk.to_csv(filtered_file_dict[pathway], sep = '\t', index=True, header=False)
+				filtered_count_dict[pathway] += len(filt_chunk)
+	finally:
+		#close the filtered databases
+		for filtered_file in filtered_file_dict.values():
+			filtered_file.close()
+
+
+#Part 2: Inform the user of pathways without any protein queries meeting the threshold
+
+for pathway in pathway_list:
+	#iterate over the pathways
+	if filtered_count_dict[pathway] == 0:
+		#let the user know if no protein queries met the scoring threshold used
+		print("No protein queries met the desired " + pathway + " score threshold of " + threshold_str + "!")
@@ -21,15 +21,15 @@ List of functions:
 List of standard and non-standard modules used:
 	sys
 	pandas
-	numpy
+	pathway_scoring.py
 
 Procedure:
 	1. Loading required modules; defining inputs and outputs as command line
 		arguments.
-	2. Using Pandas to import the contents of the input database, and creating a
-		new column in the dataframe for the results of the scoring.
-	3. Scoring the predictions generated for each protein query sequence in the file,
-		and adding the results to the dataframe.
+	2. Using Pandas to import the contents of the input database.
+	3. Scoring the predictions generated for all of the protein query sequences in the
+		file with the pathway_scoring.py module, and adding the results to the dataframe
+		as a new column.
 	4. Filtering the dataframe based on the scores, and writing out results to two
 		tab-separated text files: one containing all of the protein queries with their
 		associated scores, and one containing only the contents of the filtered dataframe.
@@ -51,6 +51,9 @@ Version:
 		program is a part.
 	This script uses data from a greater number of programs as input, and both the script
 		structure and scoring mechanism have been changed accordingly to reflect this.
+	The scoring was later vectorized: the predictor rules are declared as data in the
+		pathway_scoring.py module, and evaluated on whole columns of the dataframe at once,
+		instead of row by row.
 
 Usage
 	./score_secretoryPathway.py input_db [score_threshold]
@@ -67,7 +70,7 @@ This script was written for Python 3.8.12, in Spyder 5.1.5.
 #import necessary modules
 import sys #allows assignment of command line arguments
 import pandas as pd #facilitates manipulation of dataframes in Python
-import numpy as np #facilitates manipulation of arrays in Python
+from pathway_scoring import pathway_rule_dict, score_pathway #vectorized pathway scoring engine
 
 
 #determine threshold value for "good" score
@@ -99,85 +102,13 @@ ortho_df = pd.read_csv(input_db, sep = '\t', header=0, low_memory=False)
 #set the first column (containing the protein query ids) as an index
 ortho_df.set_index('Query', inplace=True)
 
-#add new column to the database, for the scoring
-ortho_df['Secretion_Score'] = np.nan
-#using 'NaN' here instead of 'None' because 'NaN' is numeric
-
 
 #Part 3: Perform scoring of predictions for protein secretion
 
-#now iterate through the ortho_df dataframe, and score each protein based on the DeepLoc & SignalP results
-for index, row in ortho_df.iterrows():
-	#iterate through the dataframe row by row
-	score = 0
-	#create a counter for the score
-	#this will be rewritten to 0 with every iteration of the loop
-	dl_pred = row['DeepL_Location']
-	#save the DeepLoc prediction to variable dl_pred
-	sp_pred = row['SigP_Prediction']
-	#save the SignalP prediction to variable sp_pred
-	tp_pred = row['TarP_Prediction']
-	#save the TargetP prediction to variable tp_pred
-	yl_pred = row['YLoc_Prediction']
-	#save the YLoc prediction to variable yl_pre
-	if dl_pred == 'Extracellular' or dl_pred == 'Cell_membrane':
-		#identify proteins DeepLoc predicts to be extracellular or targeted to the cell membrane
-		dl_prob = row['DeepL_Probability']
-		#save the probability of the prediction to variable dl_prob
-		dl_prob = pd.to_numeric(dl_prob)
-		#ensure that the value is read as numeric
-		if dl_prob >= 0.5:
-			#if dl_prob is greater than or equal to 0.5 (>=0.5),
-			#add 1 point to the score
-			score += 1
-		else:
-			#if dl_prob is less than 0.5,
-			#add 0.5 to the score
-			score += 0.5
-	if tp_pred == 'SP':
-		#identify proteins TargetP predicts to be targeted for secretion
-		tp_prob = row['TarP_Probability']
-		#save the probability that the protein is targeted for secretion tp_prob
-		tp_prob = pd.to_numeric(tp_prob)
-		#ensure that the value is read as numeric
-		if tp_prob >= 0.5:
-			#if tp_prob is greater than or equal to 0.5 (>=0.5),
-			#add 1 point to the score
-			score += 1
-		else:
-			#if tp_cm_prob is less than 0.5,
-			#add 0.5 to the score
-			score += 0.5
-	if sp_pred == 'SP(Sec/SPI)':
-		#identify proteins SignalP identifies to be secreted
-		sp_prob = row['SigP_SP_Probability']
-		#save te probability that the protein will be secreted to variable sp_prob
-		sp_prob = pd.to_numeric(sp_prob)
-		#ensure that the value is read as numeric
-		if sp_prob >= 0.5:
-			#if sp_prob is greater than or equal to 0.5 (>=0.5),
-			#add 1 point to the score
-			score +=1
-		else:
-			#if sp_prob is less than 0.5,
-			#add 0.5 to the score
-			score += 0.5
-	if yl_pred == 'extracellular space' or dl_pred == 'plasma membrane':
-		#identify proteins YLoc predicts to be extracellular or targeted to the cell membrane
-		yl_prob = row['YLoc_Probability']
-		#save the probability of the prediction to variable yl_prob
-		yl_prob = pd.to_numeric(yl_prob)
-		#ensure that the value is read as numeric
-		if yl_prob >= 0.5:
-			#if yl_prob is greater than or equal to 0.5 (>=0.5),
-			#add 1 point to the score
-			score += 1
-		else:
-			#if yl_prob is less than 0.5,
-			#add 0.5 to the score
-			score += 0.5
-	#fill in the calculated score for the protein in the appropriate location in the dataframe
-	ortho_df.at[index, 'Secretion_Score'] = score
+#score each protein based on the DeepLoc, TargetP, SignalP & YLoc results
+ortho_df['Secretion_Score'] = score_pathway(ortho_df, pathway_rule_dict['Secretion'])
+#the predictor rules are declared in the pathway_rule_dict of the pathway_scoring module
+#each rule is evaluated on the whole dataframe at once, and the scores of the predictors are summed
 
 
 #Part 4: Filter the dataframe based on the scores, and write out results
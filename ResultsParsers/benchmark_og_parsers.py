@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+#!/bin/python
+"""
+
+Title: benchmark_og_parsers.py
+Date: 2026-10-18
+Author: Virág Varga
+
+Description:
+	This program compares the run time & peak memory use of the streaming pivot of the
+		og_table_pivot.py module (used by orthoFinder_Parser.py, broccoli_Parser.py,
+		proteinOrtho_Parser.py and sonicParanoid_Parser.py) to those of the earlier Pandas
+		version of the parsers, which split every cell with applymap() and created the rows
+		with itertools.product().
+	A synthetic OrthoFinder Orthogroups.tsv file is created (or an existing results file can be
+		used), and each version is run on it in a separate Python process, so that the peak
+		memory use of each can be measured. The outputs of the 2 versions are also compared.
+
+List of functions:
+	make_orthogroups(orthogroups_file, og_count, species_count, max_members):
+		Writes out a synthetic Orthogroups.tsv file.
+	legacy_pivot(input_db, output_db):
+		Pivots an Orthogroups.tsv file with the earlier Pandas version of orthoFinder_Parser.py.
+	run_version(version, input_db, output_db):
+		Runs one version of the parser in a new Python process, and returns its run time & peak memory use.
+
+List of standard and non-standard modules used:
+	sys
+	os
+	time
+	random
+	resource
+	subprocess
+	filecmp
+	argparse
+	itertools
+	pandas
+	og_table_pivot.py
+
+Procedure:
+	1. Loading required modules; defining inputs and outputs as command line arguments.
+	2. Creating the synthetic Orthogroups.tsv file (if no results file was given).
+	3. Running both versions of the parser, each in its own Python process.
+	4. Printing the run times & peak memory use of both versions, and whether their
+		outputs are identical.
+
+Known bugs and limitations:
+	- There is no quality-checking integrated into the code.
+	- Peak memory use is measured with the resource module, which is not available on Windows.
+	- The earlier Pandas version can use a large amount of memory on large inputs, so the
+		synthetic file should be sized to fit in the memory of the computer used.
+
+Usage
+	./benchmark_og_parsers.py [-i INPUT_DB] [-og OG_COUNT] [-sp SPECIES_COUNT] [-max MAX_MEMBERS] [-o OUT_DIR]
+	OR
+	python benchmark_og_parsers.py [-i INPUT_DB] [-og OG_COUNT] [-sp SPECIES_COUNT] [-max MAX_MEMBERS] [-o OUT_DIR]
+
+This script was written for Python 3.8.12, in Spyder 5.1.5.
+
+"""
+
+
+#Part 1: Import necessary modules; define functions
+
+#import necessary modules
+import sys #allows assignment of command line arguments
+import os #allow access to computer files
+import time #allows timing of the parsers
+import random #allows creation of the synthetic OG table
+import resource #allows measurement of the peak memory use
+import subprocess #allows each version to be run in its own process
+import filecmp #allows comparison of the output files
+import argparse #allows parsing of named command line arguments
+from itertools import product #used by the earlier Pandas version of the parser
+
+
+def make_orthogroups(orthogroups_file, og_count, species_count, max_members):
+	#create a reproducible synthetic OrthoFinder results table
+	random.seed(1)
+	species_list = ['Species_' + str(species_num) for species_num in range(species_count)]
+	with open(orthogroups_file, 'w') as outfile:
+		outfile.write('\t'.join(['Orthogroup'] + species_list) + '\n')
+		for og_num in range(og_count):
+			#iterate over the OGs, and give each species 0 or more proteins
+			#about half of the cells are empty, as in real results files
+			cell_list = []
+			for species in species_list:
+				member_count = random.randint(0, max_members) if random.random() < 0.5 else 0
+				cell_list.append(', '.join(species + '_prot_' + str(og_num) + '_' + str(member_num)
+										   for member_num in range(member_count)))
+			outfile.write('OG' + str(og_num).zfill(7) + '\t' + '\t'.join(cell_list) + '\n')
+
+
+def legacy_pivot(input_db, output_db):
+	#the earlier version of orthoFinder_Parser.py, kept here for comparison
+	import pandas as pd #facilitates manipulation of dataframes in Python
+	ortho_df = pd.read_csv(input_db, sep = '\t', header = 0)
+	ortho_df.rename(columns={'Orthogroup': 'OrthoFinder_OG'}, inplace=True)
+	ortho_df = ortho_df.melt(id_vars="OrthoFinder_OG", var_name="Species", value_name="Query")
+	#DataFrame.applymap() was renamed to DataFrame.map() in Pandas 2.1
+	df_map = ortho_df.map if hasattr(ortho_df, 'map') else ortho_df.applymap
+	df1 = df_map(lambda x: x.split(', ') if isinstance (x, str) else [x])
+	df2 = pd.DataFrame([j for i in df1.values for j in product(*i)], columns=ortho_df.columns)
+	df3 = df2.iloc[:, ::-1]
+	final_df = df3[df3['Query'].notna()]
+	final_df.to_csv(output_db, sep='\t', index=False)
+
+
+def run_version(version, input_db, output_db):
+	#run the parser in a new Python process, which reports its own run time & peak memory use
+	result = subprocess.run([sys.executable, os.path.abspath(__file__), '--run-version', version, input_db, output_db],
+							capture_output=True, text=True, check=True)
+	run_time, peak_mem = result.stdout.split()
+	#define objects to return
+	return float(run_time), int(peak_mem)
+
+
+if len(sys.argv) == 5 and sys.argv[1] == '--run-version':
+	#this is the process running a single version of the parser
+	version, input_db, output_db = sys.argv[2:]
+	start_time = time.perf_counter()
+	if version == 'pandas':
+		legacy_pivot(input_db, output_db)
+	else:
+		sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+		from og_table_pivot import pivot_og_table #streaming pivot of the OG results table
+		pivot_og_table(input_db, output_db, 'OrthoFinder_OG', ', ', og_col='Orthogroup')
+	#report the run time & the peak memory use (in kB on Linux)
+	print(time.perf_counter() - start_time, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+	sys.exit(0)
+
+
+#assign command line arguments
+parser = argparse.ArgumentParser(description = "Compares the streaming OG results parser to the earlier Pandas version.")
+parser.add_argument('-i', '--input', dest='input_db', metavar='INPUT_DB',
+					help = "An Orthogroups.tsv file to use (default: create a synthetic file).")
+parser.add_argument('-og', '--og_count', type=int, default=100000,
+					help = "The number of OGs in the synthetic file (default: 100000).")
+parser.add_argument('-sp', '--species_count', type=int, default=32,
+					help = "The number of species in the synthetic file (default: 32).")
+parser.add_argument('-max', '--max_members', type=int, default=4,
+					help = "The maximum number of proteins per species per OG in the synthetic file (default: 4).")
+parser.add_argument('-o', '--out_dir', default='.',
+					help = "The directory the benchmark files are written to (default: the current directory).")
+args = parser.parse_args()
+
+
+#Part 2: Create the synthetic Orthogroups.tsv file
+
+os.makedirs(args.out_dir, exist_ok=True)
+if args.input_db:
+	input_db = args.input_db
+else:
+	input_db = os.path.join(args.out_dir, 'benchmark_Orthogroups.tsv')
+	make_orthogroups(input_db, args.og_count, args.species_count, args.max_members)
+	print("Synthetic Orthogroups.tsv file written to: " + input_db)
+
+
+#Part 3: Run both versions of the parser
+
+result_dict = {}
+for version in ['pandas', 'streaming']:
+	#iterate over the versions of the parser
+	output_db = os.path.join(args.out_dir, 'benchmark_OF_OGs_parsed__' + version + '.txt')
+	result_dict[version] = run_version(version, input_db, output_db)
+
+
+#Part 4: Print out the results
+
+for version, (run_time, peak_mem) in result_dict.items():
+	print(version + ": " + format(run_time, '.2f') + " s, peak memory " + format(peak_mem / 1024, '.1f') + " MB")
+print("Outputs identical: " + str(filecmp.cmp(os.path.join(args.out_dir, 'benchmark_OF_OGs_parsed__pandas.txt'),
+											  os.path.join(args.out_dir, 'benchmark_OF_OGs_parsed__streaming.txt'),
+											  shallow=False)))
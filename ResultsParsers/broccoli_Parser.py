@@ -15,16 +15,15 @@ List of functions:
 
 List of standard and non-standard modules used:
 	sys
-	pandas
-	itertools
+	og_table_pivot.py
 
 Procedure:
 	1. Loading required modules; defining inputs and outputs as command line
 		arguments.
-	2. Using Pandas to import the contents of the orthologou_groups.txt file into a
-		dataframe.
-	3. Reorganizing the dataframe so that each protein query is in its own row.
-	4. Writing out the results to a tab-separated text file.
+	2. Reading the orthologous_groups.txt file line by line with the
+		og_table_pivot.py module, separating out the protein ids into unique rows (instead
+		of separated strings in each cell), with the query protein IDs in the first column.
+	3. Writing out each row to a tab-separated text file as it is created.
 
 Known bugs and limitations:
 	- There is no quality-checking integrated into the code.
@@ -43,8 +42,7 @@ This script was written for Python 3.8.12, in Spyder 5.1.5.
 
 #import necessary modules
 import sys #allows assignment of command line arguments
-import pandas as pd #facilitates manipulation of dataframes in Python
-from  itertools import product
+from og_table_pivot import pivot_og_table #streaming pivot of the OG results table
 
 
 #assign command line arguments; load input and output files
@@ -54,24 +52,10 @@ output_db = sys.argv[2]
 #output_db = "Broccoli_OGs_parsed.txt"
 
 
-#import input database into a Pandas dataframe
-ortho_df = pd.read_csv(input_db, sep = '\t', header = 0)
-#rename the first column header for ease of manipulation in Python
-ortho_df.rename(columns={'#OG_name': 'Broccoli_OG', 'protein_names': 'Query'}, inplace=True)
-
-
-#pull apart the parts of the database that are space-separated
-#ie. flatten the database: each protein gets its own cell
-#ref: https://stackoverflow.com/questions/50789834/parse-a-dataframe-column-by-comma-and-pivot-python
-df1 = ortho_df.applymap(lambda x: x.split(' ') if isinstance (x, str) else [x])
-#split apart the comma-separated lists of protein ids in each cell
-df2 = pd.DataFrame([j for i in df1.values for j in product(*i)], columns=ortho_df.columns)
-#give each protein ID its own cell, while still associated with the species ID and OG
-
-
-#flip the column order, putting the proteins in the first column
-final_df = df2.iloc[:, ::-1]
-
-
-#now write out the results to a tab-separated text file
-final_df.to_csv(output_db, sep='\t', index=False)
+#pivot the OG results table line by line, so that each protein gets its own row
+#while still associated with the species ID and OG, with the query protein IDs in the first column
+#the rows are written directly to the output file, rather than collected in a dataframe
+#the OG IDs are taken from the #OG_name column, which is renamed to Broccoli_OG
+#the protein IDs in the protein_names column are space-separated
+#Broccoli doesn't list the proteins by species, so no species column is written out
+pivot_og_table(input_db, output_db, 'Broccoli_OG', ' ', og_col='#OG_name', species_name=None)
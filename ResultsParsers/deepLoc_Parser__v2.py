@@ -9,7 +9,9 @@ Description:
 		text file containing selected categories of information	for each query sequence.
 
 List of functions:
-	No functions are defined in this script.
+	parse_deeploc(input_file):
+		Parses a DeepLoc results file, writes out the parsed results, and returns
+		the name of the output file.
 
 List of standard and non-standard modules used:
 	sys
@@ -57,44 +59,53 @@ import os #allow access to computer files
 import pandas as pd #allows manipulation of dataframes
 import numpy as np #allows numerical manipulations, empty dataframe columns
 
-#assign command line argument
-input_file = sys.argv[1]
-#input_file = "ParserTestData/EP00771_Trimastix_marina_DL.txt"
-base = os.path.basename(input_file)
-out_full = os.path.splitext(base)[0]
-output_file = out_full + "_DeepLocP.txt"
-#output_file = "ParserTestData/EP00771_Trimastix_marina_DeepLocP.txt"
 
+def parse_deeploc(input_file):
+	#the output file is named after the input file, and written to the current directory
+	base = os.path.basename(input_file)
+	out_full = os.path.splitext(base)[0]
+	output_file = out_full + "_DeepLocP.txt"
+	#output_file = "ParserTestData/EP00771_Trimastix_marina_DeepLocP.txt"
 
-#Part 2: Import the data into a Pandas dataframe
 
-#read in the input text file, assigning the first row as a header row
-#this means using Pythonic index 0
-deeploc_df = pd.read_csv(input_file, sep='\t', header=0)
-#rename the first column to 'Query' to match the other files
-deeploc_df.rename(columns={'ID': 'Query'}, inplace=True)
-#set the column containing the query IDs as the index
-#deeploc_df.set_index('Query')
+	#Part 2: Import the data into a Pandas dataframe
 
-#create a list of columns
-pred_list = list(deeploc_df)
-#filter the list down to only the prediction category headers
-pred_list = pred_list[2:]
+	#read in the input text file, assigning the first row as a header row
+	#this means using Pythonic index 0
+	deeploc_df = pd.read_csv(input_file, sep='\t', header=0)
+	#rename the first column to 'Query' to match the other files
+	deeploc_df.rename(columns={'ID': 'Query'}, inplace=True)
+	#set the column containing the query IDs as the index
+	#deeploc_df.set_index('Query')
 
+	#create a list of columns
+	pred_list = list(deeploc_df)
+	#filter the list down to only the prediction category headers
+	pred_list = pred_list[2:]
 
-#Part 3: Create output with prediction probabilities
 
-#create an empty column at the end filled with NaN
-deeploc_df['Probability'] = np.nan
+	#Part 3: Create output with prediction probabilities
 
-for pred in pred_list:
-	#iterate over the list of possible prediction locations
-	deeploc_df.loc[deeploc_df['Location']==pred, 'Probability'] = deeploc_df[pred]
-	#when the predicted location of the protein query matches a protein location in the list
-	#copy the prediction probability for that location from the appropriate column
-	#into the Probability column at the end
+	#create an empty column at the end filled with NaN
+	deeploc_df['Probability'] = np.nan
 
-#create a new dataframe containing only the desired columns
-final_deeploc_df = deeploc_df[['Query', 'Location', 'Probability']].copy()
-#write out the results to a tab-separated file
-final_deeploc_df.to_csv(output_file, sep='\t', index=False)
+	for pred in pred_list:
+		#iterate over the list of possible prediction locations
+		deeploc_df.loc[deeploc_df['Location']==pred, 'Probability'] = deeploc_df[pred]
+		#when the predicted location of the protein query matches a protein location in the list
+		#copy the prediction probability for that location from the appropriate column
+		#into the Probability column at the end
+
+	#create a new dataframe containing only the desired columns
+	final_deeploc_df = deeploc_df[['Query', 'Location', 'Probability']].copy()
+	#write out the results to a tab-separated file
+	final_deeploc_df.to_csv(output_file, sep='\t', index=False)
+	#define objects to return
+	return output_file
+
+
+if __name__ == '__main__':
+	#when run as a stand-alone program, assign command line argument
+	input_file = sys.argv[1]
+	#input_file = "ParserTestData/EP00771_Trimastix_marina_DL.txt"
+	parse_deeploc(input_file)
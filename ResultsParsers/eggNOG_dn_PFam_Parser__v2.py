@@ -10,7 +10,9 @@ Description:
 		for each query sequence.
 
 List of functions:
-	No functions are defined in this script.
+	parse_pfam_eggnog(input_file):
+		Parses an eggNOG PFam results file, writes out the parsed results, and returns
+		the name of the output file.
 
 List of standard and non-standard modules used:
 	sys
@@ -52,40 +54,49 @@ import sys #allow assignment of files from the command line
 import os #allow access to computer files
 import pandas as pd #allows the easy manipulation of dataframes in Python
 
-#assign command line argument
-input_file = sys.argv[1]
-#input_file = "ParserTestData/BS_newprots_may21.anaeromoeba_edit.emap.emapper.pfam"
-base = os.path.basename(input_file)
-out_full = os.path.splitext(base)[0]
-output_file = out_full + "_PFam.txt"
-#output_file = "ParserTestData/EP00771_Trimastix_marina_edit.emap.emapper_PFam.txt"
 
+def parse_pfam_eggnog(input_file):
+	#the output file is named after the input file, and written to the current directory
+	base = os.path.basename(input_file)
+	out_full = os.path.splitext(base)[0]
+	output_file = out_full + "_PFam.txt"
+	#output_file = "ParserTestData/EP00771_Trimastix_marina_edit.emap.emapper_PFam.txt"
 
-#Part 2: Importing the dataframe into Pandas
 
-#read in the input text file, assigning the first row as a header row
-pfam_df = pd.read_csv(input_file, sep='\t', header=4, index_col=(False), skipfooter=3, engine='python')
-#the header is in row 5 (pythonic index 4)
-#the `skipfooter=3` argument is included because the last 3 rows are informational/summary lines
-#the `engine='python'` is needed because otherwise `skipfooter` raises an error
-#rename the first column header to 'Query' in order to match other files
-pfam_df.rename(columns={'# query_name': 'Query'}, inplace=True)
+	#Part 2: Importing the dataframe into Pandas
 
+	#read in the input text file, assigning the first row as a header row
+	pfam_df = pd.read_csv(input_file, sep='\t', header=4, index_col=(False), skipfooter=3, engine='python')
+	#the header is in row 5 (pythonic index 4)
+	#the `skipfooter=3` argument is included because the last 3 rows are informational/summary lines
+	#the `engine='python'` is needed because otherwise `skipfooter` raises an error
+	#rename the first column header to 'Query' in order to match other files
+	pfam_df.rename(columns={'# query_name': 'Query'}, inplace=True)
 
-#Part 3: Filter the database to include only desired columns
 
-#select the relevant columns and copy them to a new dataframe
-filt_pfam_df = pfam_df[['Query', 'hit', 'evalue', 'sum_score']].copy()
+	#Part 3: Filter the database to include only desired columns
 
-#group the results into 1 row per protein
-filt_pfam_df = filt_pfam_df.groupby('Query')[['hit', 'evalue', 'sum_score']].agg(list).reset_index()
-#the above creates lists in the columns, so need to remove the brackets by converting to strings
-filt_pfam_df['hit'] = filt_pfam_df['hit'].apply(lambda x: ', '.join(map(str, x)))
-filt_pfam_df['evalue'] = filt_pfam_df['evalue'].apply(lambda x: ', '.join(map(str, x)))
-filt_pfam_df['sum_score'] = filt_pfam_df['sum_score'].apply(lambda x: ', '.join(map(str, x)))
+	#select the relevant columns and copy them to a new dataframe
+	filt_pfam_df = pfam_df[['Query', 'hit', 'evalue', 'sum_score']].copy()
 
+	#group the results into 1 row per protein
+	filt_pfam_df = filt_pfam_df.groupby('Query')[['hit', 'evalue', 'sum_score']].agg(list).reset_index()
+	#the above creates lists in the columns, so need to remove the brackets by converting to strings
+	filt_pfam_df['hit'] = filt_pfam_df['hit'].apply(lambda x: ', '.join(map(str, x)))
+	filt_pfam_df['evalue'] = filt_pfam_df['evalue'].apply(lambda x: ', '.join(map(str, x)))
+	filt_pfam_df['sum_score'] = filt_pfam_df['sum_score'].apply(lambda x: ', '.join(map(str, x)))
 
-#Part 4: Write out the results to a file
 
-#write out the results to a tab-separated text file
-filt_pfam_df.to_csv(output_file, sep='\t', index=False)
+	#Part 4: Write out the results to a file
+
+	#write out the results to a tab-separated text file
+	filt_pfam_df.to_csv(output_file, sep='\t', index=False)
+	#define objects to return
+	return output_file
+
+
+if __name__ == '__main__':
+	#when run as a stand-alone program, assign command line argument
+	input_file = sys.argv[1]
+	#input_file = "ParserTestData/BS_newprots_may21.anaeromoeba_edit.emap.emapper.pfam"
+	parse_pfam_eggnog(input_file)
@@ -10,7 +10,9 @@ Description:
 		selected categories of information for each query sequence.
 
 List of functions:
-	No functions are defined in this script.
+	parse_eggnog(input_file):
+		Parses an eggNOG annotations results file, writes out the parsed results, and returns
+		the name of the output file.
 
 List of standard and non-standard modules used:
 	sys
@@ -51,29 +53,38 @@ import sys #allow assignment of files from the command line
 import os #allow access to computer files
 import pandas as pd #allows the easy manipulation of dataframes in Python
 
-#assign command line argument
-input_file = sys.argv[1]
-#input_file = "ParserTestData/EP00771_Trimastix_marina_edit.emap.emapper.annotations"
-base = os.path.basename(input_file)
-out_full = os.path.splitext(base)[0]
-output_file = out_full + "_eggNOG.txt"
-#output_file = "ParserTestData/EP00771_Trimastix_marina_edit.emap.emapper_eggNOG.txt"
 
+def parse_eggnog(input_file):
+	#the output file is named after the input file, and written to the current directory
+	base = os.path.basename(input_file)
+	out_full = os.path.splitext(base)[0]
+	output_file = out_full + "_eggNOG.txt"
+	#output_file = "ParserTestData/EP00771_Trimastix_marina_edit.emap.emapper_eggNOG.txt"
 
-#Part 2: Importing the dataframe into Pandas
 
-#read in the input text file, assigning the first row as a header row
-eggNOG_df = pd.read_csv(input_file, sep='\t', header=4, index_col=(False), skipfooter=3, engine='python')
-#the header is in row 5 (pythonic index 4)
-#the `skipfooter=3` argument is included because the last 3 rows are informational/summary lines
-#the `engine='python'` is needed because otherwise `skipfooter` raises an error
-#rename the first column header to 'Query' in order to match other files
-eggNOG_df.rename(columns={'#query': 'Query'}, inplace=True)
+	#Part 2: Importing the dataframe into Pandas
 
+	#read in the input text file, assigning the first row as a header row
+	eggNOG_df = pd.read_csv(input_file, sep='\t', header=4, index_col=(False), skipfooter=3, engine='python')
+	#the header is in row 5 (pythonic index 4)
+	#the `skipfooter=3` argument is included because the last 3 rows are informational/summary lines
+	#the `engine='python'` is needed because otherwise `skipfooter` raises an error
+	#rename the first column header to 'Query' in order to match other files
+	eggNOG_df.rename(columns={'#query': 'Query'}, inplace=True)
 
-#Part 3: Filter the database to include only desired columns, then write out results file
 
-#select the relevant columns and copy them to a new dataframe
-filt_eggNOG_df = eggNOG_df[['Query', 'seed_ortholog', 'evalue', 'score', 'eggNOG_OGs', 'Preferred_name', 'GOs', 'KEGG_ko', 'KEGG_Pathway', 'KEGG_Reaction', 'PFAMs']].copy()
-#write out the results to a tab-separated text file
-filt_eggNOG_df.to_csv(output_file, sep='\t', index=False)
+	#Part 3: Filter the database to include only desired columns, then write out results file
+
+	#select the relevant columns and copy them to a new dataframe
+	filt_eggNOG_df = eggNOG_df[['Query', 'seed_ortholog', 'evalue', 'score', 'eggNOG_OGs', 'Preferred_name', 'GOs', 'KEGG_ko', 'KEGG_Pathway', 'KEGG_Reaction', 'PFAMs']].copy()
+	#write out the results to a tab-separated text file
+	filt_eggNOG_df.to_csv(output_file, sep='\t', index=False)
+	#define objects to return
+	return output_file
+
+
+if __name__ == '__main__':
+	#when run as a stand-alone program, assign command line argument
+	input_file = sys.argv[1]
+	#input_file = "ParserTestData/EP00771_Trimastix_marina_edit.emap.emapper.annotations"
+	parse_eggnog(input_file)
@@ -10,27 +10,35 @@ Description:
 			`--goterms --iprlookup --pathways`
 		and creates an output tab-separated text file containing selected categories
 		of information for each query sequence.
+	The results file is read line by line, and the hits of each protein query are combined
+		and written out as soon as the next protein query is reached, so that only the hits of
+		a single protein are held in memory at a time. This allows results files of any size
+		(including gzip-compressed results files) to be parsed.
 
 List of functions:
-	drop_nan_groupby
-		(Based on: https://stackoverflow.com/questions/47376077/how-to-drop-nan-elements-in-a-groupby-on-a-pandas-dataframe)
+	parse_iprscan(input_file):
+		Parses an InterProScan results file, writes out the parsed results, and returns
+		the name of the output file.
+	open_ipr_file(input_file):
+		Opens a plain-text or gzip-compressed InterProScan results file for reading.
+	merge_ipr_column(value_list):
+		Combines the values of 1 column from all hits of a protein query into a single cell.
 
 List of standard and non-standard modules used:
 	sys
 	os
-	pandas
+	csv
+	gzip
+	itertools
 
 Procedure:
 	1. Assigning command line arguments and output file name, loading modules,
-		defining function used in script.
-	2. Importing the dataframe into Pandas.
-	3. Filtering the database to include only desired columns, and removing rows
-		containing unique queries.
-	4. Grouping the contents of the table based on the protein query IDs, then
-		performing necessary edits to clean up the formatting of cell contents
-		in the dataframe.
-	5. Adding the unique query rows back in, and writing out the results to a
-		tab-separated text file.
+		defining functions used in script.
+	2. Reading the results file line by line, keeping only the desired columns.
+	3. Grouping the consecutive lines of each protein query, and combining the
+		hits of queries with more than 1 hit into a single row, cleaning up the
+		formatting of the cell contents.
+	4. Writing out each row to a tab-separated text file as it is created.
 
 Known bugs and limitations:
 	- This InterProScan results parser is made specifically to suit the formatting
@@ -39,6 +47,14 @@ Known bugs and limitations:
 			`--goterms --iprlookup --pathways`
 	- There is no quality-checking integrated into the code.
 	- The name of the output file is not user-defined.
+	- The lines of each protein query must be consecutive in the results file (as they are
+		in the files written by InterProScan). Results files that are not can be sorted first
+		(ex. with `sort -t$'\t' -k1,1`); otherwise, an error is raised.
+	- The protein queries are written out in the order of the results file. Queries with
+		only 1 hit are written out as they are in the results file (as in earlier versions
+		of this program), with empty cells for columns missing from the line.
+	- Gzip-compressed results files are recognized from their contents; the .gz extension
+		is removed from the file name before naming the output file.
 
 Usage
 	./iprScan_Parser.py input_file
@@ -54,30 +70,10 @@ This script was written for Python 3.8.12, in Spyder 5.1.5.
 #import necessary modules
 import sys #allow assignment of files from the command line
 import os #allow access to computer files
-import pandas as pd #allows the easy manipulation of dataframes in Python
-
-#function to drop null values during grouping
-#based on: https://stackoverflow.com/questions/47376077/how-to-drop-nan-elements-in-a-groupby-on-a-pandas-dataframe
-def drop_nan_groupby(x):
-	#drop the null (nan) values from the input
-    y = x.dropna()
-	#if the cells are empty return "-", otherwise return y
-    return ["-"] if y.empty else y
-
-#assign command line argument
-input_file = sys.argv[1]
-#input_file = "ParserTestData/EP00771_Trimastix_marina_edit_StandardAA.fasta.tsv"
-base = os.path.basename(input_file)
-out_full = os.path.splitext(base)[0]
-#remove the ".fasta" at the end of the file name - this gives a list
-out_list = out_full.split(".")[:-1]
-#concatenate the list back into a string
-outname = '.'.join(out_list)
-output_file = outname + "_IPRScan.txt"
-#output_file = "ParserTestData/EP00771_Trimastix_marina_edit_StandardAA.fasta.txt"
-
-
-#Part 2: Importing the dataframe into Pandas
+import csv #allows writing of the tab-separated output file
+import gzip #allows reading of gzip-compressed results files
+from itertools import groupby #allows grouping of the consecutive lines of each protein query
+
 
 #from the documentation, can find the column meanings
 #ref: https://interproscan-docs.readthedocs.io/en/latest/OutputFormats.html
@@ -87,71 +83,90 @@ ipr_columns = ['Query', 'Sequence_MD5_digest', 'Sequence_length', 'Analysis-Pfam
 			   'Score', 'Status_of_match', 'Run_date', 'InterPro_annotations-accession',
 			   'InterPro_annotations-description', 'GO_annotations', 'Pathways_annotations']
 
-#read in the input text file, assigning the first row as a header row
-iprScan_df = pd.read_csv(input_file, sep='\t', names=ipr_columns, index_col=(False))
-#there is no header, which means column "names" will be numeric indices
-#instead of the usual `header=None`, set the column names immediately
-#this helped prevent a pandas error I was having where pandas was expecting 13 columns instead of 15
-#the error in question: 
-# pandas.errors.ParserError: Error tokenizing data. C error: Expected 13 fields in line 2, saw 15
-#ref: https://stackoverflow.com/questions/18039057/python-pandas-error-tokenizing-data/54098017#54098017
-
-
-#Part 3: Filter the database to include only desired columns
-
-#select the relevant columns and copy them to a new dataframe
-filt_iprScan_df = iprScan_df[['Query', 'Signature_accession', 'Signature_description', 'Score',
-							  'InterPro_annotations-accession', 'InterPro_annotations-description',
-							  'GO_annotations', 'Pathways_annotations']].copy()
-
-#protein queries that occur only once in the dataframe don't do well with the .agg(list)
-#so extract them into a small dataframe now, prior to grouping
-#and add them back in at the end
-non_duplicate_df = filt_iprScan_df.drop_duplicates(subset='Query', keep=False).copy()
-#set the 'Query' column as index to match the grouped database that will be built after this
-non_duplicate_df.set_index('Query', inplace=True)
-
-#then drop those unique IDs from the primary filtered database
-filt_iprScan_df = filt_iprScan_df[filt_iprScan_df.duplicated(subset=['Query'], keep=False)]
-
-
-#Part 4: Group the contents of the table based on the protein query IDs, then perform necessary edits
-
-#group the results into 1 row per protein
-filt_iprScan_df = filt_iprScan_df.groupby('Query', dropna=True)[['Signature_accession', 'Signature_description',
-																 'Score', 'InterPro_annotations-accession',
-																 'InterPro_annotations-description', 'GO_annotations',
-																 'Pathways_annotations']].agg(drop_nan_groupby).agg(list)
-#the drop_nan_groupby function drops nan cells and inserts "-" characters into empty cells
-#the .agg(list) groups the contents of the columns into lists on the basis of the query ID
-#groupby automatically sets the Query columns as a new index
-
-#convert lists currently in columns into strings
-for column in filt_iprScan_df:
-	#iterate through the dataframe row by row
-	#join all lists into comma- and space-separated strings
-	filt_iprScan_df[column] = filt_iprScan_df[column].apply(lambda x: ', '.join(map(str, x)))
-
-#this process leaves a lot of extraneous, useless characters, so now need to remove those
-for column in filt_iprScan_df:
-	#iterate through the dataframe row by row
-	#in the following rows, replace unnecessary characters, including blanks in the form of "-" characters
-	filt_iprScan_df[column] = filt_iprScan_df[column].str.replace(" -,", "")
-	filt_iprScan_df[column] = filt_iprScan_df[column].str.replace(", -", "")
-	filt_iprScan_df[column] = filt_iprScan_df[column].str.replace("\|", ", ", regex=True)
-	# FutureWarning: The default value of regex will change from True to False in a future version.
-	# In addition, single character regular expressions will *not* be treated as literal strings when regex=True.
-	# filt_iprScan_df[column] = filt_iprScan_df[column].str.replace("|", ", ")
-	#use backslash "\" to break out of special character, and allow regex=True to deal with the error above
-	filt_iprScan_df[column] = filt_iprScan_df[column].str.replace("-, ", "")
-
-
-#Part 5: Recombine the dataframes and write out results file
-
-#concatenating the two dataframes
-filt_iprScan_df = pd.concat([filt_iprScan_df, non_duplicate_df], axis=0)
-#use `axis=0` to concatenate based on index - this adds one dataframe below the other
-
-#write out the results to a tab-separated text file
-filt_iprScan_df.to_csv(output_file, sep='\t', index=True)
-#since the query IDs are now in the index, need to write out the index, too
+#the relevant columns, which are written out to the results file
+output_columns = ['Query', 'Signature_accession', 'Signature_description', 'Score',
+				  'InterPro_annotations-accession', 'InterPro_annotations-description',
+				  'GO_annotations', 'Pathways_annotations']
+#and their positions in the lines of the InterProScan results file
+output_index_list = [ipr_columns.index(output_col) for output_col in output_columns]
+
+
+def open_ipr_file(input_file):
+	#gzip-compressed files are recognized by the first 2 bytes of the file
+	with open(input_file, 'rb') as infile:
+		is_gzip = infile.read(2) == b'\x1f\x8b'
+	#define objects to return
+	return gzip.open(input_file, 'rt') if is_gzip else open(input_file, 'r')
+
+
+def merge_ipr_column(value_list):
+	#drop the empty cells; if all of the cells are empty, use "-"
+	value_list = [value for value in value_list if value != ''] or ["-"]
+	#join the values into a comma- and space-separated string
+	merged_value = ', '.join(value_list)
+	#this process leaves a lot of extraneous, useless characters, so now need to remove those
+	#replace unnecessary characters, including blanks in the form of "-" characters
+	merged_value = merged_value.replace(" -,", "")
+	merged_value = merged_value.replace(", -", "")
+	merged_value = merged_value.replace("|", ", ")
+	merged_value = merged_value.replace("-, ", "")
+	#define objects to return
+	return merged_value
+
+
+def parse_iprscan(input_file):
+	#the output file is named after the input file, and written to the current directory
+	base = os.path.basename(input_file)
+	if base.endswith('.gz'):
+		#remove the ".gz" at the end of the name of compressed files
+		base = base[:-3]
+	out_full = os.path.splitext(base)[0]
+	#remove the ".fasta" at the end of the file name - this gives a list
+	out_list = out_full.split(".")[:-1]
+	#concatenate the list back into a string
+	outname = '.'.join(out_list)
+	output_file = outname + "_IPRScan.txt"
+	#output_file = "ParserTestData/EP00771_Trimastix_marina_edit_StandardAA.fasta.txt"
+
+
+	#Part 2: Read the results file line by line, keeping only the desired columns
+
+	#keep track of the protein queries that have already been written out
+	#so that protein queries whose lines are not consecutive are noticed
+	finished_query_set = set()
+
+	with open_ipr_file(input_file) as infile, open(output_file, 'w', newline='') as outfile:
+		#the results file has no header line
+		#lines with fewer columns (ie. without GO or pathway annotations) get empty cells
+		row_iter = (line.rstrip('\r\n').split('\t') for line in infile if line.strip() != '')
+		row_iter = ([row[col_index] if col_index < len(row) else '' for col_index in output_index_list] for row in row_iter)
+		#the output is written in the same format as by Pandas
+		writer = csv.writer(outfile, delimiter='\t', lineterminator='\n')
+		writer.writerow(output_columns)
+
+
+		#Part 3: Group the lines of each protein query, then perform necessary edits
+
+		for query, query_rows in groupby(row_iter, key=lambda row: row[0]):
+			#iterate over the protein queries, with all of the lines of each query
+			if query in finished_query_set:
+				raise ValueError("The lines of protein query " + query + " are not consecutive in " + input_file +
+								 ". Please sort the results file by protein query first.")
+			finished_query_set.add(query)
+			query_rows = list(query_rows)
+			if len(query_rows) == 1:
+				#protein queries that occur only once are written out as they are
+				writer.writerow(query_rows[0])
+			else:
+				#group the results into 1 row per protein
+				#by combining the values of each column into a single cell
+				writer.writerow([query] + [merge_ipr_column(value_list) for value_list in list(zip(*query_rows))[1:]])
+	#define objects to return
+	return output_file
+
+
+if __name__ == '__main__':
+	#when run as a stand-alone program, assign command line argument
+	input_file = sys.argv[1]
+	#input_file = "ParserTestData/EP00771_Trimastix_marina_edit_StandardAA.fasta.tsv"
+	parse_iprscan(input_file)
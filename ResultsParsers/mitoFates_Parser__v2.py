@@ -9,7 +9,9 @@ Description:
 		text file containing selected categories of information	for each query sequence.
 
 List of functions:
-	No functions are defined in this script.
+	parse_mitofates(input_file):
+		Parses a MitoFates results file, writes out the parsed results, and returns
+		the name of the output file.
 
 List of standard and non-standard modules used:
 	sys
@@ -51,36 +53,45 @@ import sys #allow assignment of files from the command line
 import os #allow access to computer files
 import pandas as pd #allows the easy manipulation of dataframes in Python
 
-#assign command line argument
-input_file = sys.argv[1]
-#input_file = "ParserTestData/EP00771_Trimastix_marina_edit_StandardAA_nonM_MFresults.txt"
-base = os.path.basename(input_file)
-out_full = os.path.splitext(base)[0]
-output_file = out_full + "_MFparsed.txt"
-#output_file = "ParserTestData/EP00771_Trimastix_marina_edit_StandardAA_nonM_MFresults_MFparsed.txt"
 
+def parse_mitofates(input_file):
+	#the output file is named after the input file, and written to the current directory
+	base = os.path.basename(input_file)
+	out_full = os.path.splitext(base)[0]
+	output_file = out_full + "_MFparsed.txt"
+	#output_file = "ParserTestData/EP00771_Trimastix_marina_edit_StandardAA_nonM_MFresults_MFparsed.txt"
 
-#Part 2: Importing the dataframe into Pandas
 
-#read in the input text file, assigning the first row as a header row
-mito_df = pd.read_csv(input_file, sep='\t', header=0, index_col=(False))
-#replace spaces (' ') in column headers with underscores ('_')
-mito_df.columns = mito_df.columns.str.replace(' ', '_')
-#rename the first column header to 'Query' in order to match other files
-mito_df.rename(columns={'Sequence_ID': 'Query'}, inplace=True)
+	#Part 2: Importing the dataframe into Pandas
 
+	#read in the input text file, assigning the first row as a header row
+	mito_df = pd.read_csv(input_file, sep='\t', header=0, index_col=(False))
+	#replace spaces (' ') in column headers with underscores ('_')
+	mito_df.columns = mito_df.columns.str.replace(' ', '_')
+	#rename the first column header to 'Query' in order to match other files
+	mito_df.rename(columns={'Sequence_ID': 'Query'}, inplace=True)
 
-#Part 3: Filter the database to include only desired rows and columns, reformatted
 
-#filter out the results without a mitochondrial presequence
-filt_mito_df = mito_df[mito_df.Prediction != "No mitochondrial presequence"].copy()
-#remove all but first 3 columns
-filt_mito_df  = filt_mito_df.iloc[: , :3]
-#reorder columns
-filt_mito_df = filt_mito_df[['Query', 'Prediction', 'Probability_of_presequence']]
+	#Part 3: Filter the database to include only desired rows and columns, reformatted
 
+	#filter out the results without a mitochondrial presequence
+	filt_mito_df = mito_df[mito_df.Prediction != "No mitochondrial presequence"].copy()
+	#remove all but first 3 columns
+	filt_mito_df  = filt_mito_df.iloc[: , :3]
+	#reorder columns
+	filt_mito_df = filt_mito_df[['Query', 'Prediction', 'Probability_of_presequence']]
 
-#Part 4: Write out the results to a tab-separated file
 
-#write out the results to a tab-separated text file
-filt_mito_df.to_csv(output_file, sep='\t', index=False)
+	#Part 4: Write out the results to a tab-separated file
+
+	#write out the results to a tab-separated text file
+	filt_mito_df.to_csv(output_file, sep='\t', index=False)
+	#define objects to return
+	return output_file
+
+
+if __name__ == '__main__':
+	#when run as a stand-alone program, assign command line argument
+	input_file = sys.argv[1]
+	#input_file = "ParserTestData/EP00771_Trimastix_marina_edit_StandardAA_nonM_MFresults.txt"
+	parse_mitofates(input_file)
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+#!/bin/python
+"""
+
+Title: og_table_pivot.py
+Date: 2026-10-18
+Author: Virág Varga
+
+Description:
+	This module contains the streaming pivot shared by the parsers of the orthologous clustering
+		results (broccoli_Parser.py, orthoFinder_Parser.py, proteinOrtho_Parser.py and
+		sonicParanoid_Parser.py). It converts a tab-separated table with 1 row per OG, in which
+		the proteins of each species are listed in a single cell (ex. "prot1, prot2, prot3"),
+		into a table with 1 row per protein, in the format:
+			Query\tSpecies\tOG_column
+		The input file is read line by line, and each protein is written out as soon as its
+		cell has been split, so that memory use does not grow with the size of the results file
+		(rather than creating a Python list of the proteins of every cell, and a tuple for every
+		protein, before writing out the results).
+		The rows of the output are in the same order as those written by the earlier Pandas
+		versions of the parsers (ie. species by species, in the column order of the input file,
+		and then in the order of the OGs). To achieve this in a single pass through the input
+		file, the rows of each species are first written to a temporary file, and the temporary
+		files are then copied into the output file one after the other.
+
+List of functions:
+	pivot_og_table(input_db, output_db, og_name, member_sep, og_col, og_format, skip_col_list,
+				   null_member, species_name):
+		Writes out 1 row per protein of an OG results table, and returns the number of rows written.
+
+List of standard and non-standard modules used:
+	csv
+	shutil
+	tempfile
+
+Procedure:
+	1. Loading required modules; defining the output file format.
+	2. Defining the functions of the module.
+
+Known bugs and limitations:
+	- There is no quality-checking integrated into the code.
+	- Empty cells (and cells missing from the end of a line) are skipped. Unlike when the
+		results file is read with Pandas, text like "NA" or "nan" is treated as a protein ID.
+	- The temporary files of the species are written to the default temporary directory
+		of the system (which can be changed with the TMPDIR environment variable), and together
+		take up about as much space as the output file.
+	- This is a module, not a stand-alone program. It should be imported by scripts
+		located in the same directory.
+
+Usage:
+	from og_table_pivot import pivot_og_table
+
+This script was written for Python 3.8.12, in Spyder 5.1.5.
+
+"""
+
+
+# Part 1: Loading required modules; defining the output file format.
+
+#import necessary modules
+import csv #allows line-by-line reading & writing of tab-separated files
+import shutil #allows copying of the temporary files into the output file
+import tempfile #allows creation of the temporary files of the species
+
+
+#the format of the tab-separated input & output files
+#fields are only quoted when necessary, as by Pandas
+og_table_dialect = {'delimiter': '\t', 'lineterminator': '\n', 'quoting': csv.QUOTE_MINIMAL}
+
+
+# Part 2: Defining the functions of the module.
+
+def pivot_og_table(input_db, output_db, og_name, member_sep, og_col=None, og_format='{og}',
+				   skip_col_list=(), null_member=None, species_name='Species'):
+	#og_name: the name given to the OG column of the output file (ex. OrthoFinder_OG)
+	#member_sep: the separator of the proteins in a cell (ex. ', ')
+	#og_col: the input column containing the OG IDs; if None, the OGs are numbered by row (starting at 0)
+	#og_format: the format of the output OG IDs, where {og} is the OG ID from the input file,
+	#and {row} is the row number (ex. 'OG_{row}')
+	#skip_col_list: input columns which do not contain proteins, and are not included in the output
+	#null_member: proteins containing this text are not included in the output (ex. '*')
+	#species_name: the name of the output species column; if None, the species column is not written out
+	with open(input_db, 'r', newline='') as infile, open(output_db, 'w', newline='') as outfile:
+		reader = csv.reader(infile, delimiter='\t')
+		#the first line of the input file is the header line
+		header_list = next(reader, [])
+		#identify the columns containing the proteins of each species
+		species_col_list = [(col_index, col_name) for col_index, col_name in enumerate(header_list)
+							if col_name != og_col and col_name not in skip_col_list]
+		og_index = header_list.index(og_col) if og_col is not None else None
+		#create a temporary file for the rows of each species
+		spool_list = [tempfile.TemporaryFile(mode='w+', newline='') for species_col in species_col_list]
+		writer_list = [csv.writer(spool_file, **og_table_dialect) for spool_file in spool_list]
+
+		row_count = 0
+		for row_index, line_list in enumerate(reader):
+			#iterate over the input file line by line (ie. OG by OG)
+			og_id = og_format.format(og=line_list[og_index] if og_index is not None else '', row=row_index)
+			for (col_index, col_name), writer in zip(species_col_list, writer_list):
+				#iterate over the species columns
+				if col_index >= len(line_list) or line_list[col_index] == '':
+					#skip species without proteins in the OG
+					continue
+				for member in line_list[col_index].split(member_sep):
+					#give each protein ID its own row, while still associated with the species ID and OG
+					if null_member is not None and null_member in member:
+						#skip the null indicators
+						continue
+					writer.writerow([member, col_name, og_id] if species_name is not None else [member, og_id])
+					row_count += 1
+
+		#write out the header line, followed by the rows of the species in the column order of the input file
+		out_writer = csv.writer(outfile, **og_table_dialect)
+		out_writer.writerow(['Query', species_name, og_name] if species_name is not None else ['Query', og_name])
+		for spool_file in spool_list:
+			#copy each temporary file into the output file
+			spool_file.seek(0)
+			shutil.copyfileobj(spool_file, outfile)
+			spool_file.close()
+	#define objects to return
+	return row_count
@@ -19,11 +19,15 @@ Description:
 		- InterProScan (with options: `--goterms --iprlookup --pathways`)
 
 List of functions:
-	No functions are used in this script.
+	No functions are defined in this script. The parsers are imported as functions from
+		the modules listed below.
 
 List of standard and non-standard modules used:
 	argparse
 	os
+	sys
+	multiprocessing
+	concurrent.futures
 	deepLoc_Parser__v2.py
 	signalP_Parser__v2.py
 	targetP_Parser__v2.py
@@ -35,24 +39,41 @@ List of standard and non-standard modules used:
 
 Procedure:
 	1. Assignment of command-line arguments.
-	2. The called argument is executed to parse the input file.
-	3. Outputs from functions are written out to a results file.
+	2. The parser functions of the called arguments are looked up in the parser registry,
+		and a parsing job is created for each input file given to each argument.
+	3. The parsing jobs are run in parallel in a pool of worker processes, and the outputs
+		from the functions are written out to results files.
 
 Known bugs and limitations:
 	- There is no quality-checking integrated into the code.
 	- The name of the output file is not user-defined.
-	- The program cannot accept multiple input files, nor can it determine the type
-		of input file it was given (ie. which program's results file was used as input).
+	- The program cannot determine the type of input file it was given (ie. which program's
+		results file was used as input), so each input file must be given after the argument
+		of the program that created it.
+	- Parallel parsing requires a system that supports forking; otherwise, the parsing jobs
+		are run one after the other. Jobs that fail are reported, and do not stop the other jobs.
 
 Version:
 	This is version 2.0 of this program. Modifications were made to accomadate new versions
 		of the imported module scripts, and a new command line argument was added for the
 		InterProScan results parser.
+	In version 2.1, the parsers are imported as functions (rather than run with `os.system()`
+		in a new Python interpreter for each file), any number of input files can be given to
+		each argument (ex. the results files of all of the prediction programs, for all of the
+		species), and the parsing jobs are run in parallel.
 
 Usage:
-	./predictionParser__v2.py [-h] [-dl] [-sp] [-tp] [-en] [-pfen] [-mf] [-yl] [-ipr] [-v] input_file
+	./predictionParser__v2.py [-h] [-dl INPUT_FILE [INPUT_FILE ...]] [-sp INPUT_FILE [INPUT_FILE ...]]
+		[-tp INPUT_FILE [INPUT_FILE ...]] [-en INPUT_FILE [INPUT_FILE ...]] [-pfen INPUT_FILE [INPUT_FILE ...]]
+		[-mf INPUT_FILE [INPUT_FILE ...]] [-yl INPUT_FILE [INPUT_FILE ...]] [-ipr INPUT_FILE [INPUT_FILE ...]]
+		[-t THREADS] [-v]
 	OR
-	python predictionParser__v2.py [-h] [-dl] [-sp] [-tp] [-en] [-pfen] [-mf] [-yl] [-ipr] [-v] input_file
+	python predictionParser__v2.py [-h] [-dl INPUT_FILE [INPUT_FILE ...]] [-sp INPUT_FILE [INPUT_FILE ...]]
+		[-tp INPUT_FILE [INPUT_FILE ...]] [-en INPUT_FILE [INPUT_FILE ...]] [-pfen INPUT_FILE [INPUT_FILE ...]]
+		[-mf INPUT_FILE [INPUT_FILE ...]] [-yl INPUT_FILE [INPUT_FILE ...]] [-ipr INPUT_FILE [INPUT_FILE ...]]
+		[-t THREADS] [-v]
+	Where each argument is followed by the results file(s) of that program, ex.:
+		python predictionParser__v2.py -sp A_summary.signalp5 B_summary.signalp5 -tp A_summary.targetp2 B_summary.targetp2
 
 This script was written for Python 3.8.12, in Spyder 5.1.5.
 """
@@ -61,6 +82,7 @@ This script was written for Python 3.8.12, in Spyder 5.1.5.
 import argparse
 #the argparse module allows for a single program script to be able to carry out a variety of specified functions
 #this can be done with the specification of unique flags for each command
+import os #allows access to the operating system
 
 
 parser = argparse.ArgumentParser(description =
@@ -68,73 +90,80 @@ parser = argparse.ArgumentParser(description =
 								 and performs pre-determined data restructuring and extraction processes on the file. \
 								 The resulting files can be combined into a large protein database. \
 								 The prediction software whose results files can be used as input are: \
-								 DeepLoc, SignalP, TargetP, eggNOG, PFam via eggNOG, MitoFates & YLoc.')
+								 DeepLoc, SignalP, TargetP, eggNOG, PFam via eggNOG, MitoFates, YLoc & InterProScan.')
 #The most general description of what this program can do is defined here
 
 
 #adding the arguments that the program can use
 parser.add_argument(
 	'-dl', '--DeepLoc',
-	action='store_true',
-	help = 'This argument will parse the results of the DeepLoc program.'
+	nargs='+',
+	metavar='INPUT_FILE',
+	help = 'This argument will parse the results of the DeepLoc program, in the results file(s) given after it.'
 	)
-	#the '-dl' flag will call the deepLoc_Parser__v2.py program to parse the input file
+	#the '-dl' flag will call the parse_deeploc() function of the deepLoc_Parser__v2.py program to parse each of the input files given after it
 parser.add_argument(
 	'-sp', '--SignalP',
-	action='store_true',
-	help = 'This argument will parse the results of the SignalP program.'
+	nargs='+',
+	metavar='INPUT_FILE',
+	help = 'This argument will parse the results of the SignalP program, in the results file(s) given after it.'
 	)
-	#the '-sp' flag will call the signalP_Parser__v2.py program to parse the input file
+	#the '-sp' flag will call the parse_signalp() function of the signalP_Parser__v2.py program to parse each of the input files given after it
 parser.add_argument(
 	'-tp', '--TargetP',
-	action='store_true',
-	help = 'This argument will parse the results of the TargetP program.'
+	nargs='+',
+	metavar='INPUT_FILE',
+	help = 'This argument will parse the results of the TargetP program, in the results file(s) given after it.'
 	)
-	#the '-tp' flag will call the targetP_Parser__v2.py program to parse the input file
+	#the '-tp' flag will call the parse_targetp() function of the targetP_Parser__v2.py program to parse each of the input files given after it
 parser.add_argument(
 	'-en', '--EggNOG',
-	action='store_true',
-	help = 'This argument will parse the results of the eggNOG program.'
+	nargs='+',
+	metavar='INPUT_FILE',
+	help = 'This argument will parse the results of the eggNOG program, in the results file(s) given after it.'
 	)
-	#the '-en' flag will call the eggNOG_dn_Parser__v2.py program to parse the input file
+	#the '-en' flag will call the parse_eggnog() function of the eggNOG_dn_Parser__v2.py program to parse each of the input files given after it
 parser.add_argument(
 	'-pfen', '--PFamEggNOG',
-	action='store_true',
-	help = 'This argument will parse the results of a PFam matching run of the eggNOG program.'
+	nargs='+',
+	metavar='INPUT_FILE',
+	help = 'This argument will parse the results of a PFam matching run of the eggNOG program, in the results file(s) given after it.'
 	)
-	#the '-pfen' flag will call the eggNOG_dn_PFam_Parser__v2.py program to parse the input file
+	#the '-pfen' flag will call the parse_pfam_eggnog() function of the eggNOG_dn_PFam_Parser__v2.py program to parse each of the input files given after it
 parser.add_argument(
 	'-mf', '--MitoFates',
-	action='store_true',
-	help = 'This argument will parse the results of the MitoFates program.'
+	nargs='+',
+	metavar='INPUT_FILE',
+	help = 'This argument will parse the results of the MitoFates program, in the results file(s) given after it.'
 	)
-	#the '-mf' flag will call the mitoFates_Parser__v2.py program to parse the input file
+	#the '-mf' flag will call the parse_mitofates() function of the mitoFates_Parser__v2.py program to parse each of the input files given after it
 parser.add_argument(
 	'-yl', '--YLoc',
-	action='store_true',
-	help = 'This argument will parse the results of the YLoc program.'
+	nargs='+',
+	metavar='INPUT_FILE',
+	help = 'This argument will parse the results of the YLoc program, in the results file(s) given after it.'
 	)
-	#the '-yl' flag will call the yLoc_Parser__v2.py program to parse the input file
+	#the '-yl' flag will call the parse_yloc() function of the yLoc_Parser__v2.py program to parse each of the input files given after it
 parser.add_argument(
 	'-ipr', '--InterProScan',
-	action='store_true',
-	help = 'This argument will parse the results of the InterProScan program, assuming the following options were used: `--goterms --iprlookup --pathways`.'
+	nargs='+',
+	metavar='INPUT_FILE',
+	help = 'This argument will parse the results of the InterProScan program, in the results file(s) given after it, assuming the following options were used: `--goterms --iprlookup --pathways`.'
 	)
-	#the '-ipr' flag will call the iprScan_Parser.py program to parse the input file
+	#the '-ipr' flag will call the parse_iprscan() function of the iprScan_Parser.py program to parse each of the input files given after it
 parser.add_argument(
-	#'-i', '--input',
-	#the above line of code is left in as further clarification of this argument
-	dest='input_file',
-	metavar='INPUT_FILE',
-	type=argparse.FileType('r')
+	'-t', '--threads',
+	type=int,
+	default=os.cpu_count() or 1,
+	help = 'The number of parsing jobs to run at the same time (default: the number of CPUs).'
 	)
-	#this portion of code specifies that the program requires an input file, and it should be opened for reading ('r')
+	#the '-t' flag sets the number of worker processes that the parsing jobs are divided between
 parser.add_argument(
 	'-v', '--version',
 	action='version',
-	version='%(prog)s 1.0'
+	version='%(prog)s 2.1'
 	)
-	#This portion of the code specifies the version of the program; currently 1.0
+	#This portion of the code specifies the version of the program; currently 2.1
 	#The user can call this flag ('-v') without specifying input and output files
 
 
@@ -145,83 +174,73 @@ args = parser.parse_args()
 #################################   Main Program   ######################################
 
 
-#import necessary module
-import os #allows access to the operating system
-
-
-#designate input file name as variable
-infile = args.input_file.name
-
-
-#parse arguments
-if args.DeepLoc:
-	#if -dl argument is called
-	cmd = "python deepLoc_Parser__v2.py {0}".format(infile)
-	#since the `os.system()` method of calling a python script requires an input string
-	#the command that would be used to run the deepLoc_Parser.py program on its own
-	#is formatted into a string together with the name of the input file
-	#this is then passed as a command for execution
-	os.system(cmd)
-
-if args.SignalP:
-	#if -sp argument is called
-	cmd = "python signalP_Parser__v2.py {0}".format(infile)
-	#since the `os.system()` method of calling a python script requires an input string
-	#the command that would be used to run the signalP_Parser.py program on its own
-	#is formatted into a string together with the name of the input file
-	#this is then passed as a command for execution
-	os.system(cmd)
-
-if args.TargetP:
-	#if -tp argument is called
-	cmd = "python targetP_Parser__v2.py {0}".format(infile)
-	#since the `os.system()` method of calling a python script requires an input string
-	#the command that would be used to run the targetP_Parser.py program on its own
-	#is formatted into a string together with the name of the input file
-	#this is then passed as a command for execution
-	os.system(cmd)
-
-if args.EggNOG:
-	#if -en argument is called
-	cmd = "python eggNOG_dn_Parser__v2.py {0}".format(infile)
-	#since the `os.system()` method of calling a python script requires an input string
-	#the command that would be used to run the eggNOG_dn_Parser.py program on its own
-	#is formatted into a string together with the name of the input file
-	#this is then passed as a command for execution
-	os.system(cmd)
-
-if args.PFamEggNOG:
-	#if -pfen argument is called
-	cmd = "python eggNOG_dn_PFam_Parser__v2.py {0}".format(infile)
-	#since the `os.system()` method of calling a python script requires an input string
-	#the command that would be used to run the eggNOG_dn_PFam_Parser.py program on its own
-	#is formatted into a string together with the name of the input file
-	#this is then passed as a command for execution
-	os.system(cmd)
-
-if args.MitoFates:
-	#if -mf argument is called
-	cmd = "python mitoFates_Parser__v2.py {0}".format(infile)
-	#since the `os.system()` method of calling a python script requires an input string
-	#the command that would be used to run the mitoFates_Parser.py program on its own
-	#is formatted into a string together with the name of the input file
-	#this is then passed as a command for execution
-	os.system(cmd)
-
-if args.YLoc:
-	#if -yl argument is called
-	cmd = "python yLoc_Parser__v2.py {0}".format(infile)
-	#since the `os.system()` method of calling a python script requires an input string
-	#the command that would be used to run the yLoc_Parser.py program on its own
-	#is formatted into a string together with the name of the input file
-	#this is then passed as a command for execution
-	os.system(cmd)
-
-if args.InterProScan:
-	#if -ipr argument is called
-	cmd = "python inprScan_Parser.py {0}".format(infile)
-	#since the `os.system()` method of calling a python script requires an input string
-	#the command that would be used to run the yLoc_Parser.py program on its own
-	#is formatted into a string together with the name of the input file
-	#this is then passed as a command for execution
-	os.system(cmd)
+#import necessary modules
+import sys #allows setting of the exit status
+import multiprocessing #allows the parsing jobs to be run in worker processes
+from concurrent.futures import ProcessPoolExecutor, as_completed #allows the parsing jobs to be run in parallel
+from deepLoc_Parser__v2 import parse_deeploc #DeepLoc results parser
+from signalP_Parser__v2 import parse_signalp #SignalP results parser
+from targetP_Parser__v2 import parse_targetp #TargetP results parser
+from eggNOG_dn_Parser__v2 import parse_eggnog #eggNOG results parser
+from eggNOG_dn_PFam_Parser__v2 import parse_pfam_eggnog #PFam via eggNOG results parser
+from mitoFates_Parser__v2 import parse_mitofates #MitoFates results parser
+from yLoc_Parser__v2 import parse_yloc #YLoc results parser
+from iprScan_Parser import parse_iprscan #InterProScan results parser
+
+
+#the parser registry, in the format: parser_dict[argument_name] = parser_function
+#each parser function takes the name of a results file, writes out the parsed results file
+#and returns the name of the parsed results file
+parser_dict = {
+	'DeepLoc': parse_deeploc,
+	'SignalP': parse_signalp,
+	'TargetP': parse_targetp,
+	'EggNOG': parse_eggnog,
+	'PFamEggNOG': parse_pfam_eggnog,
+	'MitoFates': parse_mitofates,
+	'YLoc': parse_yloc,
+	'InterProScan': parse_iprscan
+	}
+
+
+#create the list of parsing jobs, in the format: (argument_name, input_file)
+#each parser is run on the input files given after its argument
+job_list = [(tool, infile) for tool in parser_dict for infile in (getattr(args, tool) or [])]
+
+if not job_list:
+	#at least 1 results file must be given, after the argument of the program that created it
+	parser.error("No input files were given. Please give the results files after the argument of " +
+				 "their prediction program (ex. -sp A_summary.signalp5 B_summary.signalp5).")
+
+#keep track of the jobs that could not be completed
+failed_list = []
+
+if len(job_list) > 1 and args.threads > 1 and 'fork' in multiprocessing.get_all_start_methods():
+	#run the jobs in a pool of worker processes
+	#the worker processes are forked from this process, so the parsers (& Pandas) are only imported once
+	with ProcessPoolExecutor(max_workers=min(args.threads, len(job_list)),
+							 mp_context=multiprocessing.get_context('fork')) as executor:
+		future_dict = {executor.submit(parser_dict[tool], infile): (tool, infile) for tool, infile in job_list}
+		for future in as_completed(future_dict):
+			#let the user know as each job is finished
+			tool, infile = future_dict[future]
+			try:
+				print(tool + " results written to: " + future.result())
+			except Exception as err:
+				#a failed job does not stop the other jobs
+				print(tool + " parsing of " + infile + " failed: " + repr(err), file=sys.stderr)
+				failed_list.append((tool, infile))
+else:
+	#run the jobs one after the other
+	for tool, infile in job_list:
+		try:
+			print(tool + " results written to: " + parser_dict[tool](infile))
+		except Exception as err:
+			#a failed job does not stop the other jobs
+			print(tool + " parsing of " + infile + " failed: " + repr(err), file=sys.stderr)
+			failed_list.append((tool, infile))
+
+
+if failed_list:
+	#exit with an error status if any of the jobs failed
+	sys.exit(1)
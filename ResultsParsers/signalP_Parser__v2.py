@@ -9,7 +9,9 @@ Description:
 		text file containing selected categories of information	for each query sequence.
 
 List of functions:
-	No functions are defined in this script.
+	parse_signalp(input_file):
+		Parses a SignalP results file, writes out the parsed results, and returns
+		the name of the output file.
 
 List of standard and non-standard modules used:
 	sys
@@ -53,36 +55,45 @@ import sys #allow assignment of files from the command line
 import os #allow access to computer files
 import pandas as pd #allows manipulation of dataframes
 
-#assign command line argument
-input_file = sys.argv[1]
-#input_file = "ParserTestData/EP00771_Trimastix_marina_edit_summary.signalp5"
-base = os.path.basename(input_file)
-out_full = os.path.splitext(base)[0]
-output_file = out_full + "_SignalP.txt"
-#output_file = "ParserTestData/EP00771_Trimastix_marina_SignalP.txt"
 
+def parse_signalp(input_file):
+	#the output file is named after the input file, and written to the current directory
+	base = os.path.basename(input_file)
+	out_full = os.path.splitext(base)[0]
+	output_file = out_full + "_SignalP.txt"
+	#output_file = "ParserTestData/EP00771_Trimastix_marina_SignalP.txt"
 
-#Part 2: Import the data into a Pandas dataframe
 
-#read in the input text file, assigning the second row as a header row
-#this means using Pythonic index 1
-signal_df = pd.read_csv(input_file, sep='\t', header=1)
-#remove the # and space from the name of the first column, and rename it to 'Query'
-#this is done to match other files
-signal_df.rename(columns={'# ID': 'Query', 'SP(Sec/SPI)': 'SP_Probability'}, inplace=True)
-#set the column containing the query IDs as the index
-signal_df.set_index('Query')
+	#Part 2: Import the data into a Pandas dataframe
 
+	#read in the input text file, assigning the second row as a header row
+	#this means using Pythonic index 1
+	signal_df = pd.read_csv(input_file, sep='\t', header=1)
+	#remove the # and space from the name of the first column, and rename it to 'Query'
+	#this is done to match other files
+	signal_df.rename(columns={'# ID': 'Query', 'SP(Sec/SPI)': 'SP_Probability'}, inplace=True)
+	#set the column containing the query IDs as the index
+	signal_df.set_index('Query')
 
-#Part 3: Filter the Pandas dataframe
 
-#remove query sequences without predictions
-filt_signal_df = signal_df[signal_df.Prediction != "OTHER"].copy()
+	#Part 3: Filter the Pandas dataframe
 
+	#remove query sequences without predictions
+	filt_signal_df = signal_df[signal_df.Prediction != "OTHER"].copy()
 
-#Part 4: Create output with prediction probabilities
 
-#create a new dataframe containing only the desired columns
-pred_signal_df = filt_signal_df[['Query', 'Prediction', 'SP_Probability']].copy()
-#write out the results to a tab-separated file
-pred_signal_df.to_csv(output_file, sep='\t', index=False)
+	#Part 4: Create output with prediction probabilities
+
+	#create a new dataframe containing only the desired columns
+	pred_signal_df = filt_signal_df[['Query', 'Prediction', 'SP_Probability']].copy()
+	#write out the results to a tab-separated file
+	pred_signal_df.to_csv(output_file, sep='\t', index=False)
+	#define objects to return
+	return output_file
+
+
+if __name__ == '__main__':
+	#when run as a stand-alone program, assign command line argument
+	input_file = sys.argv[1]
+	#input_file = "ParserTestData/EP00771_Trimastix_marina_edit_summary.signalp5"
+	parse_signalp(input_file)
@@ -9,7 +9,9 @@ Description:
 		text file containing selected categories of information	for each query sequence.
 
 List of functions:
-	No functions are defined in this script.
+	parse_targetp(input_file):
+		Parses a TargetP results file, writes out the parsed results, and returns
+		the name of the output file.
 
 List of standard and non-standard modules used:
 	sys
@@ -53,41 +55,50 @@ import os #allow access to computer files
 import pandas as pd #allows manipulation of dataframes
 import numpy as np #allows numerical manipulations, empty dataframe columns
 
-#assign command line argument
-input_file = sys.argv[1]
-#input_file = "ParserTestData/EP00771_Trimastix_marina_edit_summary.targetp2"
-base = os.path.basename(input_file)
-out_full = os.path.splitext(base)[0]
-output_file = out_full + "_TargetP.txt"
-#output_file = "ParserTestData/EP00771_Trimastix_marina_TargetP.txt"
 
+def parse_targetp(input_file):
+	#the output file is named after the input file, and written to the current directory
+	base = os.path.basename(input_file)
+	out_full = os.path.splitext(base)[0]
+	output_file = out_full + "_TargetP.txt"
+	#output_file = "ParserTestData/EP00771_Trimastix_marina_TargetP.txt"
 
-#Part 2: Import the data into a Pandas dataframe
 
-#read in the input tsv file, assigning the first row as a header row
-target_df = pd.read_csv(input_file, sep='\t', header=1)
-#remove the # and space from the name of the first column, and rename it to 'Query'
-#this is done to match other files
-target_df.rename(columns={'# ID': 'Query'}, inplace=True)
-#set the column containing the query IDs as the index
-target_df.set_index('Query')
+	#Part 2: Import the data into a Pandas dataframe
 
+	#read in the input tsv file, assigning the first row as a header row
+	target_df = pd.read_csv(input_file, sep='\t', header=1)
+	#remove the # and space from the name of the first column, and rename it to 'Query'
+	#this is done to match other files
+	target_df.rename(columns={'# ID': 'Query'}, inplace=True)
+	#set the column containing the query IDs as the index
+	target_df.set_index('Query')
 
-#Part 3: Filter the Pandas dataframe
 
-#remove query sequences without predictions
-filt_target_df = target_df[target_df.Prediction != "noTP"].copy()
-#create an empty column at the end filled with NaN
-filt_target_df['Probability'] = np.nan
+	#Part 3: Filter the Pandas dataframe
 
+	#remove query sequences without predictions
+	filt_target_df = target_df[target_df.Prediction != "noTP"].copy()
+	#create an empty column at the end filled with NaN
+	filt_target_df['Probability'] = np.nan
 
-#Part 4: Create output with prediction probabilities
 
-#copy signal peptide probabilities to 'Probability' column
-filt_target_df.loc[filt_target_df['Prediction']=='SP', 'Probability'] = filt_target_df['SP']
-#copy mitochondrial transit peptide probabilities to 'Probability' column
-filt_target_df.loc[filt_target_df['Prediction']=='mTP', 'Probability'] = filt_target_df['mTP']
-#create a new dataframe containing only the desired columns
-pred_target_df = filt_target_df[['Query', 'Prediction', 'Probability']].copy()
-#write out the results to a tab-separated file
-pred_target_df.to_csv(output_file, sep='\t', index=False)
+	#Part 4: Create output with prediction probabilities
+
+	#copy signal peptide probabilities to 'Probability' column
+	filt_target_df.loc[filt_target_df['Prediction']=='SP', 'Probability'] = filt_target_df['SP']
+	#copy mitochondrial transit peptide probabilities to 'Probability' column
+	filt_target_df.loc[filt_target_df['Prediction']=='mTP', 'Probability'] = filt_target_df['mTP']
+	#create a new dataframe containing only the desired columns
+	pred_target_df = filt_target_df[['Query', 'Prediction', 'Probability']].copy()
+	#write out the results to a tab-separated file
+	pred_target_df.to_csv(output_file, sep='\t', index=False)
+	#define objects to return
+	return output_file
+
+
+if __name__ == '__main__':
+	#when run as a stand-alone program, assign command line argument
+	input_file = sys.argv[1]
+	#input_file = "ParserTestData/EP00771_Trimastix_marina_edit_summary.targetp2"
+	parse_targetp(input_file)
@@ -9,7 +9,9 @@ Description:
 		text file containing selected categories of information	for each query sequence.
 
 List of functions:
-	No functions are defined in this script.
+	parse_yloc(input_file):
+		Parses a YLoc results file, writes out the parsed results, and returns
+		the name of the output file.
 
 List of standard and non-standard modules used:
 	sys
@@ -52,60 +54,68 @@ import os #allow access to computer files
 import re #enables regex pattern matching
 
 
-#assign command line argument
-input_file = sys.argv[1]
-#input_file = "ParserTestData/EP00771_Trimastix_marina_edit_YL.txt"
-base = os.path.basename(input_file)
-out_full = os.path.splitext(base)[0]
-output_file = out_full + "_YLparsed.txt"
-#output_file = "ParserTestData/EP00771_Trimastix_marina_edit_YL_YLparsed.txt"
-
-
-#Part 2: Prepare necessary elements for character removal using regex
-
-#create list of characters to remove with regex
-characters_to_remove = "() =%"
-#use string concatenation of add the [] characters so that the pattern isn't read in order,
-#but instead all of these characters are individually removed
-pattern = "[" + characters_to_remove + "]"
-
-
-#Part 3: Parse through the file to extract desired information
-#Part 4: Write out the results to the output file
-
-with open(input_file, "r") as infile, open(output_file, "w") as outfile:
-	#open the input YLoc result file for reading
-	#open the output file for writing
-	outfile.write("Query" + "\t" + "Prediction" + "\t" + "Probability" + "\n")
-	#the header line is prepared and written out to the output file
-	for line in infile:
-		#read through the file line by line
-		line = line.strip()
-		#remove the '\n' endline character from the line
-		seq_list = [None] * 2
-		#empty list seq_list will hold the alignment data associated with each query-target match
-		#with each iteration of the loop, this list is overwritten
-		if line.startswith('=== Prediction for sequence:'):
-			#identify lines that start with "=== Prediction for sequence:"
-			#this is the first line with information on the next query
-			query_id_line = line.split('\t')
-			#the line with the query id is 'split' - separated into a list based on the locations of spaces
-			query_id = query_id_line[1]
-			#save the second element of the list, which contains the actual query id
-			query_id = re.sub(pattern, "", query_id)
-			#remove the unnecessary characters and save the query id to variable query_id
-			next_line = next(infile).strip()
-			#save the next line, where the query protein prediction will be, without endline character
-			query_results = next_line.split('\t')
-			#the line with the query id is 'split' - separated into a list based on the locations of tabs
-			query_results = query_results[1]
-			#the item with index 1 in the query_results list is the query sequence prediction
-			#so we save only that
-			query_results = query_results.split("(")
-			#split the results-containing string into the result and its probability
-			query_results[1] = re.sub(pattern, "", query_results[1])
-			#remove the unnecessary characters from the probability field
-			query_results[1] = float(query_results[1])/100
-			#turn the probability percentage into a float
-			outfile.write('{}\t{}\t{}\n'.format(query_id, query_results[0], query_results[1]))
-			#write out the results to the output file
+def parse_yloc(input_file):
+	#the output file is named after the input file, and written to the current directory
+	base = os.path.basename(input_file)
+	out_full = os.path.splitext(base)[0]
+	output_file = out_full + "_YLparsed.txt"
+	#output_file = "ParserTestData/EP00771_Trimastix_marina_edit_YL_YLparsed.txt"
+
+
+	#Part 2: Prepare necessary elements for character removal using regex
+
+	#create list of characters to remove with regex
+	characters_to_remove = "() =%"
+	#use string concatenation of add the [] characters so that the pattern isn't read in order,
+	#but instead all of these characters are individually removed
+	pattern = "[" + characters_to_remove + "]"
+
+
+	#Part 3: Parse through the file to extract desired information
+	#Part 4: Write out the results to the output file
+
+	with open(input_file, "r") as infile, open(output_file, "w") as outfile:
+		#open the input YLoc result file for reading
+		#open the output file for writing
+		outfile.write("Query" + "\t" + "Prediction" + "\t" + "Probability" + "\n")
+		#the header line is prepared and written out to the output file
+		for line in infile:
+			#read through the file line by line
+			line = line.strip()
+			#remove the '\n' endline character from the line
+			seq_list = [None] * 2
+			#empty list seq_list will hold the alignment data associated with each query-target match
+			#with each iteration of the loop, this list is overwritten
+			if line.startswith('=== Prediction for sequence:'):
+				#identify lines that start with "=== Prediction for sequence:"
+				#this is the first line with information on the next query
+				query_id_line = line.split('\t')
+				#the line with the query id is 'split' - separated into a list based on the locations of spaces
+				query_id = query_id_line[1]
+				#save the second element of the list, which contains the actual query id
+				query_id = re.sub(pattern, "", query_id)
+				#remove the unnecessary characters and save the query id to variable query_id
+				next_line = next(infile).strip()
+				#save the next line, where the query protein prediction will be, without endline character
+				query_results = next_line.split('\t')
+				#the line with the query id is 'split' - separated into a list based on the locations of tabs
+				query_results = query_results[1]
+				#the item with index 1 in the query_results list is the query sequence prediction
+				#so we save only that
+				query_results = query_results.split("(")
+				#split the results-containing string into the result and its probability
+				query_results[1] = re.sub(pattern, "", query_results[1])
+				#remove the unnecessary characters from the probability field
+				query_results[1] = float(query_results[1])/100
+				#turn the probability percentage into a float
+				outfile.write('{}\t{}\t{}\n'.format(query_id, query_results[0], query_results[1]))
+				#write out the results to the output file
+	#define objects to return
+	return output_file
+
+
+if __name__ == '__main__':
+	#when run as a stand-alone program, assign command line argument
+	input_file = sys.argv[1]
+	#input_file = "ParserTestData/EP00771_Trimastix_marina_edit_YL.txt"
+	parse_yloc(input_file)
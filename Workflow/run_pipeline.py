@@ -0,0 +1,472 @@
+# -*- coding: utf-8 -*-
+#!/bin/python
+"""
+
+Title: run_pipeline.py
+Date: 2026-10-18
+Author: Virág Varga
+
+Description:
+	This program runs the steps of the workflow described in a pipeline file (ex. the
+		metamonad_pipeline.tsv file in the same directory), rerunning only the steps whose
+		outputs are missing or out of date, and running independent steps at the same time.
+	The pipeline file is a tab-separated text file with a header line, and 1 row per step,
+		with the following columns:
+		- Step: the name of the step (ex. prot_DB_plus_OGs)
+		- Foreach: (optional) a variable & the list of its values, in the format
+			variable=value1|value2|... OR variable=@file (with 1 value per line of the file).
+			The step is run once per value (ex. once per species, or once per OG program), and
+			these runs are independent of each other.
+		- Inputs: the input files (or directories) of the step, separated by "|" characters.
+			An input in the format @step_name stands for all of the outputs of that step.
+		- Outputs: the output files (or directories) of the step, separated by "|" characters.
+		- Params: (optional) the parameters of the step, in the format name=value, separated
+			by "|" characters (ex. score_threshold=4).
+		- Command: the command line of the step.
+		The Foreach, Inputs, Outputs, Params and Command columns can contain variables in
+		curly brackets (ex. {species}), which are replaced by: the variables given with the -D
+		argument; the {scripts} variable (the directory of this program, by default); the
+		parameters of the step; the Foreach variable of the step; and (in the Command column)
+		{inputs} & {outputs}, the space-separated lists of inputs & outputs of the step.
+		Lines starting with "#" are comments.
+	The dependencies between the steps are identified from their inputs & outputs (ie. a step
+		that uses the output of another step as input is run after that step). The steps are
+		run in a pool of worker threads, each of which runs the command of a step as its own
+		process, so that independent steps (ex. the parsing of different species) run in parallel.
+	A step is rerun if any of its outputs are missing, if its command (including its parameters)
+		has changed since it was last run, or if its inputs have changed since then:
+		- mtime mode: if any of the inputs were modified after the oldest output
+		- hash mode: if the content hash of the inputs has changed (so that steps whose inputs
+			were rewritten with the same contents are not rerun)
+		The commands & input hashes of the steps that were run are saved to a state file.
+
+List of functions:
+	split_field(field_value):
+		Splits a "|"-separated cell of the pipeline file into a list.
+	fill_variables(text, variable_dict, step_name):
+		Replaces the variables in a cell of the pipeline file with their values.
+	read_pipeline(pipeline_file, variable_dict):
+		Imports a pipeline file, and creates a step (or 1 step per Foreach value) from each row.
+	build_dag(step_dict):
+		Identifies the dependencies between the steps, and checks that there are no cycles.
+	path_file_list(path):
+		Lists the files of an input (all of the files of a directory, or the file itself).
+	file_hash(input_file):
+		Calculates the content hash of an input file.
+	input_hash(step, file_hash_dict):
+		Calculates the content hash of the inputs & command of a step.
+	stale_reason(step, state_dict, check_mode, file_hash_dict):
+		Identifies why a step needs to be rerun (or returns None if it is up to date).
+	run_command(command):
+		Runs the command of a step, and returns its exit status.
+	write_state(state_dict, state_file):
+		Writes out the state file.
+
+List of standard and non-standard modules used:
+	sys
+	os
+	csv
+	json
+	hashlib
+	argparse
+	subprocess
+	concurrent.futures
+	atomic_output.py
+
+Procedure:
+	1. Loading required modules; defining inputs and outputs as command line arguments.
+	2. Importing the pipeline file, and identifying the dependencies between the steps.
+	3. Running the steps in order of their dependencies, starting each step as soon as all
+		of the steps it depends on are finished, and skipping the steps that are up to date.
+	4. Saving the state of each step as it is finished, and informing the user of the steps
+		that failed.
+
+Known bugs and limitations:
+	- There is no quality-checking integrated into the code.
+	- The steps are run with the shell, in the directory this program is run from. Curly
+		brackets that are part of a command (ex. in an awk command) must be doubled ({{ }}).
+	- Inputs that are directories are checked using all of the files they contain.
+	- If a step fails, the steps that depend on it are not run, but independent steps are.
+		Outputs written by a failed step are not removed.
+	- In hash mode, the input files are hashed (once per run; files with the same size &
+		modification time as at the last run are not hashed again).
+	- The state file is named .pipeline_state.json by default, and is written to the
+		directory this program is run from.
+	- A dry run (-n) lists the steps that are out of date, together with all of the steps that
+		depend on them.
+	- The atomic_output.py module (in the DB_Construct/ directory of this repository) must be
+		located in the same directory as this program (ex. when all programs are copied into the
+		same Scripts/ directory, as in the README), or in a directory listed in the PYTHONPATH
+		environment variable (ex. PYTHONPATH=../DB_Construct).
+
+Usage
+	./run_pipeline.py [-h] [-D NAME=VALUE] [-m {mtime,hash}] [-j JOBS] [-s STEPS [STEPS ...]] [-n] [-F]
+		[--state STATE_FILE] [-v] PIPELINE_FILE
+	OR
+	python run_pipeline.py [-h] [-D NAME=VALUE] [-m {mtime,hash}] [-j JOBS] [-s STEPS [STEPS ...]] [-n] [-F]
+		[--state STATE_FILE] [-v] PIPELINE_FILE
+
+This script was written for Python 3.8.12, in Spyder 5.1.5.
+
+"""
+
+
+#Part 1: Import necessary modules, define functions
+
+#import necessary modules
+import sys #allows the setting of the exit status
+import os #allows access to the files and directories of the computer/system
+import csv #allows reading of the tab-separated pipeline file
+import json #allows reading & writing of the state file
+import hashlib #allows calculation of content hashes
+import argparse #allows parsing of named command line arguments
+import subprocess #allows the commands of the steps to be run
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED #allows the steps to be run in parallel
+from atomic_output import atomic_output #writing of complete files only
+
+
+#the columns of the pipeline file
+pipeline_col_list = ['Step', 'Foreach', 'Inputs', 'Outputs', 'Params', 'Command']
+
+#the separator of the items in the cells of the pipeline file
+item_sep = '|'
+
+
+def split_field(field_value):
+	#split the cell into its items, removing empty items & surrounding whitespace
+	#define objects to return
+	return [item.strip() for item in (field_value or '').split(item_sep) if item.strip()]
+
+
+def fill_variables(text, variable_dict, step_name):
+	#replace the variables in curly brackets with their values
+	try:
+		return text.format(**variable_dict)
+	except KeyError as err:
+		#a variable without a value should not fail silently
+		raise ValueError("The step " + step_name + " uses the undefined variable " + str(err) +
+						 ". Please define it with the -D argument.") from None
+
+
+def read_pipeline(pipeline_file, variable_dict):
+	with open(pipeline_file, 'r', newline='') as infile:
+		#the lines starting with "#" (and empty lines) are comments
+		line_list = [line for line in infile if line.strip() and not line.startswith('#')]
+	row_list = list(csv.DictReader(line_list, delimiter='\t'))
+	missing_col_list = [pipeline_col for pipeline_col in pipeline_col_list if pipeline_col not in (row_list[0].keys() if row_list else [])]
+	if missing_col_list:
+		#a pipeline file without all of the columns should not fail silently
+		raise ValueError("The pipeline file " + pipeline_file + " is missing the column(s): " + ", ".join(missing_col_list))
+
+	#create the dictionary in the format: step_dict[step_id] = step
+	#where each step is a dictionary with the name, inputs, outputs & command of the step
+	step_dict = {}
+	#keep track of the steps created from each row, in the format: row_step_dict[step_name] = [step_id, ...]
+	row_step_dict = {}
+	for row in row_list:
+		#iterate over the rows of the pipeline file
+		step_name = row['Step'].strip()
+		if step_name in row_step_dict:
+			raise ValueError("The step name " + step_name + " is used more than once in " + pipeline_file)
+		#the parameters of the step can also contain variables
+		param_dict = {}
+		for param in split_field(row['Params']):
+			param_name, param_value = param.split('=', 1)
+			param_dict[param_name.strip()] = fill_variables(param_value.strip(), variable_dict, step_name)
+		step_variable_dict = {**variable_dict, **param_dict}
+
+		if row['Foreach'] and row['Foreach'].strip():
+			#the step is run once per value of the Foreach variable
+			foreach_var, foreach_values = fill_variables(row['Foreach'].strip(), step_variable_dict, step_name).split('=', 1)
+			if foreach_values.startswith('@'):
+				#the values are read from a file, 1 value per line
+				with open(foreach_values[1:], 'r') as value_file:
+					value_list = [value.strip() for value in value_file.read().splitlines() if value.strip()]
+			else:
+				value_list = split_field(foreach_values)
+			run_list = [(step_name + '[' + value + ']', {**step_variable_dict, foreach_var.strip(): value}) for value in value_list]
+		else:
+			run_list = [(step_name, step_variable_dict)]
+
+		row_step_dict[step_name] = []
+		for step_id, run_variable_dict in run_list:
+			#iterate over the runs of the step
+			step_dict[step_id] = {
+				'id': step_id,
+				'name': step_name,
+				'variables': run_variable_dict,
+				'inputs': [fill_variables(item, run_variable_dict, step_name) for item in split_field(row['Inputs'])],
+				'outputs': [fill_variables(item, run_variable_dict, step_name) for item in split_field(row['Outputs'])],
+				'command': row['Command']
+				}
+			row_step_dict[step_name].append(step_id)
+
+	for step_id, step in step_dict.items():
+		#replace the references to other steps (@step_name) with the outputs of those steps
+		input_list = []
+		for item in step['inputs']:
+			if item.startswith('@'):
+				if item[1:] not in row_step_dict:
+					raise ValueError("The step " + step_id + " refers to the unknown step " + item[1:])
+				input_list.extend(output for ref_id in row_step_dict[item[1:]] for output in step_dict[ref_id]['outputs'])
+			else:
+				input_list.append(item)
+		step['inputs'] = input_list
+		#the command can use the lists of inputs & outputs of the step
+		step['command'] = fill_variables(step['command'], {**step['variables'], 'inputs': ' '.join(input_list),
+														   'outputs': ' '.join(step['outputs'])}, step_id)
+	#define objects to return
+	return step_dict, row_step_dict
+
+
+def build_dag(step_dict):
+	#identify the step producing each output, in the format: producer_dict[output] = step_id
+	producer_dict = {}
+	for step_id, step in step_dict.items():
+		for output in map(os.path.normpath, step['outputs']):
+			if output in producer_dict:
+				raise ValueError("The output " + output + " is produced by both " + producer_dict[output] + " and " + step_id)
+			producer_dict[output] = step_id
+	#create the dictionary in the format: dep_dict[step_id] = set_of_steps_it_depends_on
+	dep_dict = {step_id: {producer_dict[os.path.normpath(step_input)] for step_input in step['inputs']
+						  if os.path.normpath(step_input) in producer_dict} - {step_id}
+				for step_id, step in step_dict.items()}
+
+	#check that the steps can be ordered (ie. that there are no cycles), with Kahn's algorithm
+	remaining_dict = {step_id: set(dep_set) for step_id, dep_set in dep_dict.items()}
+	ready_list = [step_id for step_id, dep_set in remaining_dict.items() if not dep_set]
+	ordered_count = 0
+	while ready_list:
+		finished_id = ready_list.pop()
+		ordered_count += 1
+		for step_id, dep_set in remaining_dict.items():
+			if finished_id in dep_set:
+				dep_set.discard(finished_id)
+				if not dep_set:
+					ready_list.append(step_id)
+	if ordered_count != len(step_dict):
+		cycle_list = [step_id for step_id, dep_set in remaining_dict.items() if dep_set]
+		raise ValueError("The steps depend on each other in a cycle: " + ", ".join(cycle_list))
+	#define objects to return
+	return dep_dict
+
+
+def path_file_list(path):
+	#directories are checked using all of the files they contain
+	if os.path.isdir(path):
+		#define objects to return
+		return sorted(os.path.join(subdir, file_name) for subdir, dir_list, file_list in os.walk(path) for file_name in file_list)
+	return [path]
+
+
+def file_hash(input_file):
+	#calculate the content hash of the input file
+	input_hasher = hashlib.blake2b(digest_size=16)
+	with open(input_file, 'rb') as infile:
+		#the file is read in blocks, so that large files are not loaded into memory
+		for block in iter(lambda: infile.read(1 << 20), b''):
+			input_hasher.update(block)
+	#define objects to return
+	return input_hasher.hexdigest()
+
+
+def input_hash(step, file_hash_dict):
+	#calculate the content hash of the inputs & command of the step
+	step_hash = hashlib.blake2b(step['command'].encode(), digest_size=16)
+	for step_input in step['inputs']:
+		for input_file in path_file_list(step_input):
+			#files with the same size & modification time as at the last run are not hashed again
+			file_stat = os.stat(input_file)
+			file_key = [file_stat.st_size, file_stat.st_mtime_ns]
+			if file_hash_dict.get(input_file, [None])[:2] != file_key:
+				file_hash_dict[input_file] = file_key + [file_hash(input_file)]
+			step_hash.update(input_file.encode() + b'\0' + file_hash_dict[input_file][2].encode() + b'\0')
+	#define objects to return
+	return step_hash.hexdigest()
+
+
+def stale_reason(step, state_dict, check_mode, file_hash_dict):
+	missing_list = [step_input for step_input in step['inputs'] if not os.path.exists(step_input)]
+	if missing_list:
+		#the step can't be run without its inputs
+		raise FileNotFoundError("The input(s) " + ", ".join(missing_list) + " of the step " + step['id'] + " do not exist.")
+	if not all(os.path.exists(output) for output in step['outputs']):
+		return "missing output"
+	step_state = state_dict.get('steps', {}).get(step['id'])
+	if step_state is None or step_state['command'] != step['command']:
+		return "new or changed command"
+	if check_mode == 'hash':
+		if step_state.get('input_hash') != input_hash(step, file_hash_dict):
+			return "changed inputs"
+	else:
+		input_mtime_list = [os.path.getmtime(input_file) for step_input in step['inputs'] for input_file in path_file_list(step_input)]
+		output_mtime_list = [os.path.getmtime(output_file) for output in step['outputs'] for output_file in path_file_list(output)]
+		if input_mtime_list and output_mtime_list and max(input_mtime_list) > min(output_mtime_list):
+			return "inputs newer than outputs"
+	#define objects to return
+	return None
+
+
+def run_command(command):
+	#run the command with the shell, in the current directory
+	#define objects to return
+	return subprocess.run(command, shell=True).returncode
+
+
+def write_state(state_dict, state_file):
+	with atomic_output(state_file) as outfile:
+		json.dump(state_dict, outfile, indent=1, sort_keys=True)
+
+
+if __name__ == '__main__':
+	#when run as a stand-alone program, assign command line arguments
+	parser = argparse.ArgumentParser(description = "This program runs the steps of a workflow described in a pipeline file, "
+									 "rerunning only the steps that are out of date, and running independent steps in parallel.")
+	parser.add_argument('pipeline_file', metavar='PIPELINE_FILE',
+						help = "The tab-separated pipeline file (ex. metamonad_pipeline.tsv).")
+	parser.add_argument('-D', '--define', action='append', default=[], metavar='NAME=VALUE',
+						help = "Assign a value to a variable used in the pipeline file (can be used more than once).")
+	parser.add_argument('-m', '--mode', dest='check_mode', choices=['mtime', 'hash'], default='mtime',
+						help = "How to identify changed inputs: by modification time, or by content hash (default: mtime).")
+	parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+						help = "The number of steps run at the same time (default: the number of CPUs).")
+	parser.add_argument('-s', '--steps', nargs='+',
+						help = "Run only these steps (and the steps they depend on). Steps can be given by name, "
+						"or with their Foreach value (ex. parse_predictions[BM_newprots_may21.anaeromoeba]).")
+	parser.add_argument('-n', '--dry_run', action='store_true',
+						help = "List the steps that would be run, without running them.")
+	parser.add_argument('-F', '--force', action='store_true',
+						help = "Rerun the selected steps even if they are up to date.")
+	parser.add_argument('--state', dest='state_file', default='.pipeline_state.json',
+						help = "The state file (default: .pipeline_state.json).")
+	parser.add_argument('-v', '--version', action='version', version='%(prog)s 1.0')
+	args = parser.parse_args()
+
+
+	#Part 2: Import the pipeline file, and identify the dependencies between the steps
+
+	#the directory of the scripts is the directory of this program, unless given with -D scripts=...
+	variable_dict = {'scripts': os.path.dirname(os.path.abspath(__file__))}
+	for definition in args.define:
+		if '=' not in definition:
+			parser.error("Variables should be given in the format NAME=VALUE: " + definition)
+		var_name, var_value = definition.split('=', 1)
+		variable_dict[var_name.strip()] = var_value
+
+	step_dict, row_step_dict = read_pipeline(args.pipeline_file, variable_dict)
+	dep_dict = build_dag(step_dict)
+
+	if args.steps:
+		#select the requested steps, and all of the steps they depend on
+		selected_set = set()
+		pending_list = []
+		for step_ref in args.steps:
+			if step_ref in row_step_dict:
+				pending_list.extend(row_step_dict[step_ref])
+			elif step_ref in step_dict:
+				pending_list.append(step_ref)
+			else:
+				parser.error("The pipeline file has no step named " + step_ref)
+		while pending_list:
+			step_id = pending_list.pop()
+			if step_id not in selected_set:
+				selected_set.add(step_id)
+				pending_list.extend(dep_dict[step_id])
+	else:
+		selected_set = set(step_dict)
+	#keep the steps in the order of the pipeline file
+	selected_list = [step_id for step_id in step_dict if step_id in selected_set]
+
+	if os.path.isfile(args.state_file):
+		with open(args.state_file, 'r') as infile:
+			state_dict = json.load(infile)
+	else:
+		state_dict = {}
+	state_dict.setdefault('steps', {})
+	#the content hashes of the input files, in the format: file_hash_dict[file] = [size, mtime, hash]
+	file_hash_dict = state_dict.setdefault('files', {})
+
+
+	#Part 3: Run the steps in order of their dependencies
+
+	#keep track of the state of each step
+	finished_set = set()
+	rerun_set = set()
+	failed_set = set()
+	skipped_set = set()
+	running_dict = {}
+
+	with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+		while len(finished_set) + len(failed_set) + len(skipped_set) < len(selected_list):
+			for step_id in selected_list:
+				#iterate over the steps that have not been started yet
+				if step_id in finished_set or step_id in failed_set or step_id in skipped_set or step_id in running_dict:
+					continue
+				dep_set = dep_dict[step_id] & selected_set
+				if dep_set & (failed_set | skipped_set):
+					#the steps depending on a failed step are not run
+					print("Skipping " + step_id + " (an earlier step failed)")
+					skipped_set.add(step_id)
+					continue
+				if not dep_set <= finished_set:
+					#the step is waiting for the steps it depends on
+					continue
+				step = step_dict[step_id]
+				if args.force:
+					reason = "forced"
+				elif args.dry_run and dep_set & rerun_set:
+					#in a dry run, the earlier steps are not actually run
+					reason = "earlier step out of date"
+				else:
+					try:
+						reason = stale_reason(step, state_dict, args.check_mode, file_hash_dict)
+					except FileNotFoundError as err:
+						if not args.dry_run:
+							print("Failed " + step_id + ": " + str(err), file=sys.stderr)
+							failed_set.add(step_id)
+							continue
+						reason = "inputs not yet created"
+				if reason is None:
+					#the step is up to date
+					print("Up to date: " + step_id)
+					finished_set.add(step_id)
+				elif args.dry_run:
+					print("Would run " + step_id + " (" + reason + "): " + step['command'])
+					rerun_set.add(step_id)
+					finished_set.add(step_id)
+				else:
+					print("Running " + step_id + " (" + reason + "): " + step['command'])
+					running_dict[step_id] = executor.submit(run_command, step['command'])
+
+			if not running_dict:
+				continue
+			#wait for at least 1 of the running steps to finish
+			done_set, pending_set = wait(running_dict.values(), return_when=FIRST_COMPLETED)
+			for step_id, future in list(running_dict.items()):
+				if future not in done_set:
+					continue
+				del running_dict[step_id]
+				step = step_dict[step_id]
+				return_code = future.result()
+				missing_list = [output for output in step['outputs'] if not os.path.exists(output)]
+				if return_code != 0 or missing_list:
+					print("Failed " + step_id + (" (exit status " + str(return_code) + ")" if return_code != 0 else
+												 " (missing output(s): " + ", ".join(missing_list) + ")"), file=sys.stderr)
+					failed_set.add(step_id)
+					continue
+				#save the state of the step as soon as it is finished
+				state_dict['steps'][step_id] = {'command': step['command']}
+				if args.check_mode == 'hash':
+					state_dict['steps'][step_id]['input_hash'] = input_hash(step, file_hash_dict)
+				write_state(state_dict, args.state_file)
+				print("Finished " + step_id)
+				rerun_set.add(step_id)
+				finished_set.add(step_id)
+
+
+	#Part 4: Inform the user of the steps that failed
+
+	if failed_set or skipped_set:
+		print(str(len(failed_set)) + " step(s) failed, and " + str(len(skipped_set)) + " step(s) were not run: " +
+			  ", ".join(step_id for step_id in selected_list if step_id in failed_set | skipped_set), file=sys.stderr)
+		sys.exit(1)